@@ -432,7 +432,14 @@ STATICFILES_DIRS = [
     BASE_DIR / "server" / "static" / "karrio",
     BASE_DIR / "server" / "static" / "extra",
 ]
+MEDIA_ROOT = config("MEDIA_ROOT", default=os.path.join(WORK_DIR, "media"))
 STORAGES = {
+    "default": {
+        "BACKEND": config(
+            "FILE_STORAGE_BACKEND",
+            default="django.core.files.storage.FileSystemStorage",
+        ),  # must be shared by the api and the workers (e.g. storages.backends.s3.S3Storage)
+    },
     "staticfiles": {
         "BACKEND": "whitenoise.storage.CompressedManifestStaticFilesStorage",
     },
@@ -485,6 +492,73 @@ REST_FRAMEWORK = {
     "PAGE_SIZE": 100,
 }
 
+# Carrier gateway registry (parsed carrier connection settings per process)
+GATEWAY_CACHE_TTL = config("GATEWAY_CACHE_TTL", default=300, cast=int)
+GATEWAY_CACHE_SIZE = config("GATEWAY_CACHE_SIZE", default=2048, cast=int)
+
+# Compiled shipping markups (per tenant, reloaded when surcharges change)
+MARKUP_CACHE_TTL = config("MARKUP_CACHE_TTL", default=300, cast=int)
+MARKUP_CACHE_SIZE = config("MARKUP_CACHE_SIZE", default=1024, cast=int)
+
+# Document generation (compiled templates cache and PDF rendering workers)
+DOCUMENT_TEMPLATE_CACHE_SIZE = config(
+    "DOCUMENT_TEMPLATE_CACHE_SIZE", default=256, cast=int
+)
+DOCUMENT_RENDER_CHUNK_SIZE = config(
+    "DOCUMENT_RENDER_CHUNK_SIZE", default=50, cast=int
+)  # pages rendered per PDF chunk
+DOCUMENT_RENDER_WORKERS = config(
+    "DOCUMENT_RENDER_WORKERS", default=min(4, os.cpu_count() or 1), cast=int
+)  # processes rendering PDF chunks (1: render in the calling thread)
+DOCUMENT_BUNDLE_CHUNK_SIZE = config(
+    "DOCUMENT_BUNDLE_CHUNK_SIZE", default=100, cast=int
+)  # labels fetched per database round trip when printing bundles
+
+# SDK tracing records sink (buffered and persisted in batches)
+TRACING_SINK = config("TRACING_SINK", default="memory")  # memory | redis
+TRACING_FLUSH_INTERVAL = config("TRACING_FLUSH_INTERVAL", default=5, cast=float)
+TRACING_BATCH_SIZE = config("TRACING_BATCH_SIZE", default=500, cast=int)
+TRACING_BUFFER_SIZE = config("TRACING_BUFFER_SIZE", default=10000, cast=int)
+TRACING_MAX_BODY_SIZE = config(
+    "TRACING_MAX_BODY_SIZE", default=65536, cast=int
+)  # characters kept per request/response body (0: unlimited)
+TRACING_COMPRESS_MIN_SIZE = config("TRACING_COMPRESS_MIN_SIZE", default=1024, cast=int)
+TRACING_SAMPLE_RATES = config(
+    "TRACING_SAMPLE_RATES", default=""
+)  # e.g. "*=1,rates_fetch=0.1,fedex:rates_fetch=0.5" (carrier, operation or both)
+
+# Batch shipments processing (chunk tasks run concurrently across workers)
+BATCH_SHIPMENTS_CHUNK_SIZE = config("BATCH_SHIPMENTS_CHUNK_SIZE", default=50, cast=int)
+BATCH_SHIPMENTS_CONCURRENCY = config(
+    "BATCH_SHIPMENTS_CONCURRENCY", default=4, cast=int
+)  # shipments processed at once per chunk task
+BATCH_CARRIER_CONCURRENCY = config(
+    "BATCH_CARRIER_CONCURRENCY", default=""
+)  # per carrier caps per worker process, e.g. "fedex:2,ups:4"
+BATCH_CHECKPOINT_SIZE = config(
+    "BATCH_CHECKPOINT_SIZE", default=10, cast=int
+)  # processed shipments saved per batch resources checkpoint
+
+# Data import (files are streamed from the default storage by chunks)
+DATA_IMPORT_CHUNK_SIZE = config(
+    "DATA_IMPORT_CHUNK_SIZE", default=500, cast=int
+)  # rows imported per transaction (the first chunk is validated on upload)
+DATA_IMPORT_DIRECTORY = config("DATA_IMPORT_DIRECTORY", default="imports")
+
+# Data export (rows are streamed from a server-side cursor)
+DATA_EXPORT_CHUNK_SIZE = config(
+    "DATA_EXPORT_CHUNK_SIZE", default=500, cast=int
+)  # rows fetched from the database per round trip
+DATA_EXPORT_ASYNC_THRESHOLD = config(
+    "DATA_EXPORT_ASYNC_THRESHOLD", default=10000, cast=int
+)  # larger exports are written to the file storage by a background job (0: never)
+DATA_EXPORT_DIRECTORY = config("DATA_EXPORT_DIRECTORY", default="exports")
+
+# GraphQL connections (keyset pagination)
+GRAPHQL_COUNT_ESTIMATE_THRESHOLD = config(
+    "GRAPHQL_COUNT_ESTIMATE_THRESHOLD", default=10000, cast=int
+)  # logs, tracing records and events counts above are estimated from the query plan
+
 # JWT config
 SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(
@@ -13,6 +13,58 @@ DEFAULT_SCHEDULER_RUN_INTERVAL = 3600  # value is seconds. so 3600 seconds = 1 H
 DEFAULT_TRACKERS_UPDATE_INTERVAL = decouple.config(
     "TRACKING_PULSE", default=7200, cast=int
 )  # value is seconds. so 10800 seconds = 3 Hours
+TRACKERS_SWEEP_INTERVAL = decouple.config(
+    "TRACKERS_SWEEP_INTERVAL", default=900, cast=int
+)  # value is seconds. how often due trackers are looked up
+TRACKERS_MIN_POLL_INTERVAL = decouple.config(
+    "TRACKERS_MIN_POLL_INTERVAL", default=900, cast=int
+)  # value is seconds. shortest delay between two polls of a tracker
+TRACKERS_MAX_POLL_INTERVAL = decouple.config(
+    "TRACKERS_MAX_POLL_INTERVAL", default=86400, cast=int
+)  # value is seconds. longest delay between two polls of a tracker
+TRACKERS_UPDATE_CONCURRENCY = decouple.config(
+    "TRACKERS_UPDATE_CONCURRENCY", default=8, cast=int
+)
+# per carrier tracking limits override. e.g. "fedex:30:10,ups:1:5"
+# (carrier_name:tracking numbers per request:tracking numbers per second)
+TRACKING_CARRIER_LIMITS = decouple.config("TRACKING_CARRIER_LIMITS", default="")
+USAGE_ROLLUP_INTERVAL = decouple.config(
+    "USAGE_ROLLUP_INTERVAL", default=600, cast=int
+)  # value is seconds. how often the usage statistics are rolled up
+USAGE_ROLLUP_LOOKBACK = decouple.config(
+    "USAGE_ROLLUP_LOOKBACK", default=48, cast=int
+)  # value is hours. recomputed by each rollup (records updated after their creation)
+
+# Webhook delivery config
+WEBHOOK_CONNECT_TIMEOUT = decouple.config(
+    "WEBHOOK_CONNECT_TIMEOUT", default=3.0, cast=float
+)  # value is seconds.
+WEBHOOK_READ_TIMEOUT = decouple.config(
+    "WEBHOOK_READ_TIMEOUT", default=10.0, cast=float
+)  # value is seconds.
+WEBHOOK_MAX_ATTEMPTS = decouple.config("WEBHOOK_MAX_ATTEMPTS", default=6, cast=int)
+WEBHOOK_RETRY_BASE_DELAY = decouple.config(
+    "WEBHOOK_RETRY_BASE_DELAY", default=30, cast=int
+)  # value is seconds. doubled after every failed attempt
+WEBHOOK_RETRY_MAX_DELAY = decouple.config(
+    "WEBHOOK_RETRY_MAX_DELAY", default=3600, cast=int
+)  # value is seconds.
+WEBHOOK_DELIVERY_CONCURRENCY = decouple.config(
+    "WEBHOOK_DELIVERY_CONCURRENCY", default=8, cast=int
+)  # number of endpoints delivered to at once
+WEBHOOK_DELIVERY_BATCH_SIZE = decouple.config(
+    "WEBHOOK_DELIVERY_BATCH_SIZE", default=50, cast=int
+)  # max deliveries sent to an endpoint per retry sweep
+WEBHOOK_DELIVERY_LEASE = decouple.config(
+    "WEBHOOK_DELIVERY_LEASE", default=900, cast=int
+)  # value is seconds. a claimed delivery isn't retried before (worker died)
+# max events sent per webhook request. Values above 1 switch every request
+# to the {"events": [...]} payload, so batching is opt-in to keep the
+# single event payload existing receivers parse.
+WEBHOOK_BATCH_SIZE = decouple.config("WEBHOOK_BATCH_SIZE", default=1, cast=int)
+EVENT_OUTBOX_BATCH_SIZE = decouple.config(
+    "EVENT_OUTBOX_BATCH_SIZE", default=100, cast=int
+)  # max events per webhook notification task
 
 # Check if worker is running in detached mode (separate from API server)
 DETACHED_WORKER = decouple.config("DETACHED_WORKER", default=False, cast=bool)
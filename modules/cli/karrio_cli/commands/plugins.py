@@ -166,3 +166,30 @@ def disable_plugin(
     except Exception as e:
         typer.echo(f"Failed to disable plugin '{plugin_id}': {e}", err=True)
         raise typer.Exit(code=1)
+
+@app.command("manifest")
+def build_manifest(
+    path: typing.Optional[str] = typer.Option(
+        None, "--path", help="Manifest file path (defaults to KARRIO_PLUGIN_MANIFEST)"
+    ),
+):
+    """
+    Build the plugin manifest used to load plugins lazily at startup.
+
+    Example:
+    ```terminal
+    KARRIO_PLUGIN_MANIFEST=/var/lib/karrio/plugins.json kcli plugins manifest
+    ```
+
+    Example Output:
+    ```text
+    Plugin manifest written to '/var/lib/karrio/plugins.json' (18 plugins).
+    ```
+    """
+    try:
+        manifest = references.build_manifest(path)
+        target = path or references.manifest.get_manifest_path()
+        typer.echo(f"Plugin manifest written to '{target}' ({len(manifest['plugins'])} plugins).")
+    except Exception as e:
+        typer.echo(f"Failed to build plugin manifest: {e}", err=True)
+        raise typer.Exit(code=1)
@@ -25,6 +25,7 @@ def list_events(
             "shipment_cancelled",
             "shipment_delivery_failed",
             "shipment_fulfilled",
+            "shipment_invoice_generated",
             "shipment_needs_attention",
             "shipment_out_for_delivery",
             "shipment_purchased",
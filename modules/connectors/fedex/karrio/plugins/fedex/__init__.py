@@ -17,6 +17,7 @@ METADATA = metadata.PluginMetadata(
     options=units.ShippingOption,
     connection_configs=units.ConnectionConfig,
     has_intl_accounts=True,
+    tracking_batch_size=30,
     # New fields
     website="https://www.fedex.com",
     description="FedEx Corporation is an American multinational conglomerate holding company which focuses on transportation, e-commerce and business services.",
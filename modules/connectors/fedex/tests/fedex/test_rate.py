@@ -1,3 +1,4 @@
+import asyncio
 import unittest
 from unittest.mock import patch, ANY
 from .fixture import gateway
@@ -36,6 +37,15 @@ class TestFedExRating(unittest.TestCase):
 
             self.assertListEqual(lib.to_dict(parsed_response), ParsedRateResponse)
 
+    def test_parse_rate_response_async(self):
+        with patch("karrio.mappers.fedex.proxy.lib.request") as mock:
+            mock.return_value = RateResponse
+            parsed_response = asyncio.run(
+                karrio.Rating.fetch(self.RateRequest).afrom_(gateway)
+            ).parse()
+
+            self.assertListEqual(lib.to_dict(parsed_response), ParsedRateResponse)
+
     def test_parse_intl_rate_response(self):
         with patch("karrio.mappers.fedex.proxy.lib.request") as mock:
             mock.return_value = IntlRateResponse
@@ -29,6 +29,25 @@ class Proxy(proxy.Proxy):
             lambda __: [lib.to_dict(_) for _ in __],
         )
 
+    async def aget_rates(self, requests: lib.Serializable) -> lib.Deserializable[str]:
+        async def _get_rates(payload):
+            return await lib.arequest(
+                url=f"{self.settings.server_url}/api/products?{urllib.parse.urlencode(payload)}",
+                trace=self.trace_as("json"),
+                method="GET",
+                headers={
+                    "Accept": "application/json",
+                    "Authorization": f"Basic {self.settings.authorization}",
+                },
+            )
+
+        responses = await lib.arun_asynchronously(_get_rates, requests.serialize())
+
+        return lib.Deserializable(
+            responses,
+            lambda __: [lib.to_dict(_) for _ in __],
+        )
+
     def create_shipment(self, requests: lib.Serializable) -> lib.Deserializable[str]:
         orders = lib.run_asynchronously(
             lambda payload: lib.request(
@@ -123,3 +142,27 @@ class Proxy(proxy.Proxy):
             response,
             lambda __: [(ref, lib.to_dict(_)) for ref, _ in __],
         )
+
+    async def aget_tracking(
+        self, request: lib.Serializable
+    ) -> lib.Deserializable[str]:
+        async def _get_tracking(payload):
+            response = await lib.arequest(
+                url=f"{self.settings.server_url}/api/tracking/{payload['ref']}",
+                trace=self.trace_as("json"),
+                method="GET",
+                headers={
+                    "Accept": "application/json",
+                    "Content-type": "application/json",
+                    "Authorization": f"Basic {self.settings.authorization}",
+                },
+            )
+
+            return payload["ref"], response
+
+        response = await lib.arun_asynchronously(_get_tracking, request.serialize())
+
+        return lib.Deserializable(
+            response,
+            lambda __: [(ref, lib.to_dict(_)) for ref, _ in __],
+        )
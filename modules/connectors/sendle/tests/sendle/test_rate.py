@@ -1,3 +1,4 @@
+import asyncio
 import unittest
 import urllib.parse
 from unittest.mock import patch, ANY
@@ -37,6 +38,15 @@ class TestSendleRating(unittest.TestCase):
 
             self.assertListEqual(lib.to_dict(parsed_response), ParsedRateResponse)
 
+    def test_parse_rate_response_async(self):
+        with patch("karrio.mappers.sendle.proxy.lib.arequest") as mock:
+            mock.side_effect = [RateResponse, RateResponse]
+            parsed_response = asyncio.run(
+                karrio.Rating.fetch(self.RateRequest).afrom_(gateway)
+            ).parse()
+
+            self.assertListEqual(lib.to_dict(parsed_response), ParsedRateResponse)
+
     def test_parse_error_response(self):
         with patch("karrio.mappers.sendle.proxy.lib.request") as mock:
             mock.side_effect = [ErrorResponse, ErrorResponse]
@@ -1,3 +1,4 @@
+import asyncio
 import unittest
 from unittest.mock import patch, ANY
 from .fixture import gateway
@@ -36,6 +37,15 @@ class TestSendleTracking(unittest.TestCase):
 
             self.assertListEqual(lib.to_dict(parsed_response), ParsedTrackingResponse)
 
+    def test_parse_tracking_response_async(self):
+        with patch("karrio.mappers.sendle.proxy.lib.arequest") as mock:
+            mock.return_value = TrackingResponse
+            parsed_response = asyncio.run(
+                karrio.Tracking.fetch(self.TrackingRequest).afrom_(gateway)
+            ).parse()
+
+            self.assertListEqual(lib.to_dict(parsed_response), ParsedTrackingResponse)
+
     def test_parse_error_response(self):
         with patch("karrio.mappers.sendle.proxy.lib.request") as mock:
             mock.return_value = ErrorResponse
@@ -0,0 +1,44 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0006_add_api_log_requested_at_index"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="UsageRollup",
+            fields=[
+                ("id", models.BigAutoField(primary_key=True, serialize=False)),
+                ("metric", models.CharField(max_length=50)),
+                (
+                    "bucket",
+                    models.DateTimeField(help_text="The start of the rolled up hour"),
+                ),
+                ("org_id", models.CharField(blank=True, max_length=50, null=True)),
+                ("test_mode", models.BooleanField(default=False)),
+                ("count", models.BigIntegerField(default=0)),
+                ("amount", models.FloatField(blank=True, null=True)),
+                (
+                    "computed_at",
+                    models.DateTimeField(
+                        db_index=True,
+                        help_text="The rolled up records were created before this date",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Usage Rollup",
+                "verbose_name_plural": "Usage Rollups",
+                "db_table": "usage_rollup",
+                "indexes": [
+                    models.Index(
+                        fields=["metric", "test_mode", "bucket"],
+                        name="usage_rollup_metric_idx",
+                    )
+                ],
+            },
+        ),
+    ]
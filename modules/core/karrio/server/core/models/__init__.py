@@ -19,6 +19,7 @@ from karrio.server.core.models.third_party import (
 from karrio.server.core.models.metafield import (
     Metafield,
 )
+from karrio.server.core.models.usage import UsageRollup
 from karrio.server.core.models.entity import Entity, OwnedEntity
 
 
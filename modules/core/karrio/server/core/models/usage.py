@@ -0,0 +1,31 @@
+import django.db.models as models
+
+
+class UsageRollup(models.Model):
+    """Hourly usage counters per metric, organization and test mode.
+
+    Maintained by the periodic usage rollup task (see `karrio.server.core.usage`).
+    """
+
+    class Meta:
+        db_table = "usage_rollup"
+        verbose_name = "Usage Rollup"
+        verbose_name_plural = "Usage Rollups"
+        indexes = [
+            models.Index(
+                fields=["metric", "test_mode", "bucket"],
+                name="usage_rollup_metric_idx",
+            ),
+        ]
+
+    id = models.BigAutoField(primary_key=True)
+    metric = models.CharField(max_length=50)
+    bucket = models.DateTimeField(help_text="The start of the rolled up hour")
+    org_id = models.CharField(max_length=50, null=True, blank=True)
+    test_mode = models.BooleanField(default=False)
+    count = models.BigIntegerField(default=0)
+    amount = models.FloatField(null=True, blank=True)
+    computed_at = models.DateTimeField(
+        db_index=True,
+        help_text="The rolled up records were created before this date",
+    )
@@ -33,10 +33,17 @@ class TrackerStatus(utils.Enum):
     return_to_sender = "return_to_sender"
 
 
+class InvoiceStatus(utils.Enum):
+    pending = "pending"
+    generated = "generated"
+    failed = "failed"
+
+
 Serializer = serializers.Serializer
 HTTP_STATUS = [getattr(drf.status, a) for a in dir(drf.status) if "HTTP" in a]
 SHIPMENT_STATUS = [(c.name, c.name) for c in list(ShipmentStatus)]
 TRACKER_STATUS = [(c.name, c.name) for c in list(TrackerStatus)]
+INVOICE_STATUS = [(c.name, c.name) for c in list(InvoiceStatus)]
 INCOTERMS = [(c.name, c.name) for c in list(units.Incoterm)]
 CARRIERS = [(k, k) for k in dataunits.CARRIER_NAMES]
 COUNTRIES = [(c.name, c.name) for c in list(units.Country)]
@@ -1626,6 +1633,12 @@ class Shipment(serializers.EntitySerializer, ShipmentContent, ShipmentDetails):
         allow_null=True,
         help_text="The shipment invoice URL",
     )
+    invoice_status = serializers.ChoiceField(
+        required=False,
+        allow_null=True,
+        choices=INVOICE_STATUS,
+        help_text="The state of the custom invoice generation",
+    )
 
 
 class ShipmentCancelRequest(serializers.Serializer):
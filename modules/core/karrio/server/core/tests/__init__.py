@@ -19,6 +19,8 @@ from karrio.server.core.tests.test_resource_token import (
     TestResourceAccessTokenUnit,
     TestResourceTokenAPI,
 )
+from karrio.server.core.tests.test_tracing_sink import TestTracingSink
+from karrio.server.core.tests.test_usage_rollup import TestUsageRollup
 
 # Import our custom APITestCase (must be last to avoid being overridden)
 from karrio.server.core.tests.base import APITestCase
@@ -0,0 +1,79 @@
+"""Tests for the buffered SDK tracing records sink."""
+
+from unittest import mock
+from django.test import TestCase
+from django.contrib.auth import get_user_model
+
+import karrio.lib as lib
+import karrio.server.tracing.sink as sink
+import karrio.server.tracing.utils as tracing
+import karrio.server.tracing.models as models
+
+
+class TestTracingSink(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            email="test@example.com", password="testpass123"
+        )
+        self.sink = sink.TracingSink(buffer=sink.MemoryBuffer())
+        self.context = mock.Mock(user=self.user, org=None, tracer=self._tracer())
+
+    def test_records_are_persisted_on_flush(self):
+        with mock.patch.object(sink, "get_sink", return_value=self.sink):
+            tracing.save_tracing_records(self.context)
+            tracing.save_tracing_records(self.context)
+
+        self.assertEqual(models.TracingRecord.objects.count(), 0)
+        self.assertEqual(self.sink.flush(), 2)
+
+        record = models.TracingRecord.objects.get(key="response")
+        self.assertEqual(record.record["encoding"], sink.COMPRESSION)
+        self.assertEqual(record.content["response"], RESPONSE)
+        self.assertEqual(record.meta["carrier_name"], "fedex")
+        self.assertEqual(record.meta["operation"], "rates_fetch")
+
+    def test_sampled_out_records_are_dropped(self):
+        rates = {"fedex:rates_fetch": 0}
+
+        with mock.patch.object(sink, "TRACING_SAMPLE_RATES", rates), mock.patch.object(
+            sink, "get_sink", return_value=self.sink
+        ):
+            tracing.save_tracing_records(self.context)
+            tracing.save_tracing_records(self._context_with_error())
+
+        self.assertEqual(self.sink.flush(), 1)
+        self.assertEqual(models.TracingRecord.objects.get().key, "error")
+
+    def test_record_bodies_are_capped(self):
+        with mock.patch.object(sink, "TRACING_MAX_BODY_SIZE", 10):
+            record = sink.encode_record({"request_id": "1", "data": {"a": "b" * 20}})
+
+        self.assertListEqual(record["truncated"], ["data"])
+        self.assertEqual(sink.decode_record(record)["data"], '{"a": "bbb')
+        self.assertListEqual(
+            list(sink.parse_sample_rates("*=1, fedex:rates_fetch=0.5").items()),
+            [("*", 1.0), ("fedex:rates_fetch", 0.5)],
+        )
+
+    def _tracer(self) -> lib.Tracer:
+        tracer = lib.Tracer()
+        tracer.context.update(operation="rates_fetch")
+        trace = tracer.with_metadata(
+            dict(connection=dict(id="car_1", carrier_name="fedex", test_mode=True))
+        )
+        trace({"request_id": "1", "url": "https://fedex.com", "data": "{}"}, "request")
+        trace({"request_id": "1", "response": RESPONSE}, "response")
+
+        return tracer
+
+    def _context_with_error(self):
+        tracer = lib.Tracer()
+        tracer.context.update(operation="rates_fetch")
+        tracer.with_metadata(dict(connection=dict(carrier_name="fedex")))(
+            {"request_id": "2", "error": "timeout"}, "error"
+        )
+
+        return mock.Mock(user=self.user, org=None, tracer=tracer)
+
+
+RESPONSE = "<rates>" + "<rate>10.00</rate>" * 100 + "</rates>"
@@ -0,0 +1,75 @@
+"""Tests for the usage statistics rollups."""
+
+import datetime
+from unittest.mock import patch
+from django.test import TestCase
+from django.utils import timezone
+
+import karrio.server.core.usage as usage
+import karrio.server.core.models as models
+
+
+class TestUsageRollup(TestCase):
+    def setUp(self):
+        self.now = timezone.now()
+        self.date_after = self.now - datetime.timedelta(days=3)
+
+    def test_stats_before_the_first_rollup(self):
+        self.assertIsNone(usage.get_usage_stats(self.date_after, self.now, False))
+
+    def test_stats_combine_rollups_and_live_records(self):
+        self._log(hours=50, status_code=200)
+        self._log(hours=26, status_code=500)
+        self._log(hours=26, status_code=200, test_mode=True)
+        usage.compact_usage(end=self.now - datetime.timedelta(hours=1))
+        self._log(hours=0, status_code=404)
+
+        stats = usage.get_usage_stats(self.date_after, self.now, False)
+
+        self.assertEqual(sum(_["count"] for _ in stats["api_requests"]), 3)
+        self.assertEqual(sum(_["count"] for _ in stats["api_errors"]), 2)
+        self.assertTrue(
+            models.UsageRollup.objects.filter(metric="api_requests").exists()
+        )
+
+    def test_compaction_is_idempotent(self):
+        self._log(hours=5, status_code=200)
+        end = self.now - datetime.timedelta(hours=1)
+
+        usage.compact_usage(end=end)
+        usage.compact_usage(end=end)
+
+        self.assertEqual(
+            models.UsageRollup.objects.filter(metric="api_requests").count(), 1
+        )
+
+    def test_failed_compaction_keeps_the_watermark(self):
+        self._log(hours=50, status_code=200)
+        self._log(hours=2, status_code=200)
+        aggregate = usage._aggregate
+
+        def _aggregate(metric, start, end, *args, **kwargs):
+            if end > self.now - datetime.timedelta(hours=3):
+                raise Exception("database error")
+
+            return aggregate(metric, start, end, *args, **kwargs)
+
+        with patch.object(usage, "_aggregate", side_effect=_aggregate):
+            with self.assertRaises(Exception):
+                usage.compact_usage(end=self.now)
+
+        stats = usage.get_usage_stats(self.date_after, self.now, False)
+
+        self.assertLessEqual(
+            usage.get_watermark(), self.now - datetime.timedelta(hours=50)
+        )
+        self.assertEqual(sum(_["count"] for _ in stats["api_requests"]), 2)
+
+    def _log(self, hours: int, status_code: int, test_mode: bool = False):
+        return models.APILogIndex.objects.create(
+            requested_at=self.now - datetime.timedelta(hours=hours),
+            path="/v1/shipments",
+            method="GET",
+            status_code=status_code,
+            test_mode=test_mode,
+        )
@@ -0,0 +1,277 @@
+"""
+Usage statistics rollups.
+
+The usage metrics (api requests, shipments, spend...) are aggregated into
+hourly `UsageRollup` counters per organization and test mode by a periodic
+compaction task. The usage statistics are read from the rollups and only the
+records created since the last compaction are aggregated live.
+"""
+
+import typing
+import datetime
+import django.conf as conf
+import django.db.models as models
+import django.db.models.functions as functions
+from django.db import transaction
+from django.utils import dateparse, timezone
+
+import karrio.server.core.models as core
+from karrio.server.core.logging import logger
+
+USAGE_ROLLUP_LOOKBACK = getattr(conf.settings, "USAGE_ROLLUP_LOOKBACK", 48)
+USAGE_ROLLUP_WINDOW = datetime.timedelta(days=1)
+
+
+class UsageMetric(typing.NamedTuple):
+    queryset: models.QuerySet
+    date_field: str
+    count: models.Aggregate
+    amount: typing.Optional[models.Aggregate] = None
+
+
+def get_metrics() -> typing.Dict[str, UsageMetric]:
+    import karrio.server.manager.models as manager
+    import karrio.server.orders.models as orders
+
+    return dict(
+        api_requests=UsageMetric(
+            core.APILogIndex.objects.all(), "requested_at", models.Count("id")
+        ),
+        api_errors=UsageMetric(
+            core.APILogIndex.objects.filter(status_code__range=[400, 599]),
+            "requested_at",
+            models.Count("id"),
+        ),
+        order_volumes=UsageMetric(
+            orders.Order.objects.exclude(status__in=["cancelled", "unfulfilled"]),
+            "created_at",
+            models.Count("id", distinct=True),
+            models.Sum(
+                models.F("line_items__value_amount") * models.F("line_items__quantity"),
+                output_field=models.FloatField(),
+            ),
+        ),
+        shipment_count=UsageMetric(
+            manager.Shipment.objects.all(), "created_at", models.Count("id")
+        ),
+        shipping_spend=UsageMetric(
+            manager.Shipment.objects.exclude(status__in=["cancelled", "draft"]),
+            "created_at",
+            models.Count("id"),
+            models.Sum(
+                functions.Cast("selected_rate__total_charge", models.FloatField())
+            ),
+        ),
+        tracker_count=UsageMetric(
+            manager.Tracking.objects.all(), "created_at", models.Count("id")
+        ),
+    )
+
+
+def compact_usage(
+    start: datetime.datetime = None,
+    end: datetime.datetime = None,
+) -> int:
+    """(Re)compute the hourly rollups of the records created in [start, end).
+
+    By default the last `USAGE_ROLLUP_LOOKBACK` hours before the previous
+    compaction are recomputed (to account for records updated after their
+    creation) or, on the first run, every record since the oldest one.
+
+    The watermark only moves to `end` once every window is compacted, a failed
+    run is resumed from the previous one. Runs must not overlap (the periodic
+    rollup task holds a lock).
+    """
+    metrics = get_metrics()
+    end = end or timezone.now()
+
+    if start is None:
+        watermark = get_watermark()
+        start = (
+            watermark - datetime.timedelta(hours=USAGE_ROLLUP_LOOKBACK)
+            if watermark is not None
+            else _get_oldest_date(metrics.values()) or end
+        )
+
+    start = compacted_after = _truncate_hour(start)
+    rollup_count = 0
+
+    # compacted by windows to keep each aggregation query small, the windows
+    # rollups are marked computed at the run start (behind the watermark).
+    while start < end:
+        window_end = min(start + USAGE_ROLLUP_WINDOW, end)
+        rollups = [
+            core.UsageRollup(metric=name, computed_at=compacted_after, **values)
+            for name, metric in metrics.items()
+            for values in _aggregate(metric, start, window_end, functions.TruncHour)
+        ]
+
+        with transaction.atomic():
+            core.UsageRollup.objects.filter(
+                bucket__gte=start, bucket__lt=window_end
+            ).delete()
+            core.UsageRollup.objects.bulk_create(rollups, batch_size=1000)
+
+        rollup_count += len(rollups)
+        start = window_end
+
+    core.UsageRollup.objects.filter(
+        bucket__gte=compacted_after, bucket__lt=end
+    ).update(computed_at=end)
+
+    logger.info("Usage rollups compacted", rollup_count=rollup_count, computed_at=end)
+
+    return rollup_count
+
+
+def get_watermark() -> typing.Optional[datetime.datetime]:
+    """Return the date before which the records are rolled up."""
+    return core.UsageRollup.objects.aggregate(value=models.Max("computed_at"))["value"]
+
+
+def get_usage_stats(
+    date_after: typing.Any,
+    date_before: typing.Any,
+    test_mode: bool,
+) -> typing.Optional[typing.Dict[str, typing.List[dict]]]:
+    """Return the daily usage stats (most recent first) of every metric.
+
+    None is returned when the usage was never rolled up.
+    """
+    watermark = get_watermark()
+
+    if watermark is None:
+        return None
+
+    date_after = _to_datetime(date_after)
+    date_before = _to_datetime(date_before)
+    stats: typing.Dict[str, typing.Dict[datetime.datetime, dict]] = {}
+
+    # whole hours are read from the rollups, the partial hours and the
+    # records created since the last compaction are aggregated live.
+    rolled_after = _truncate_hour(date_after + datetime.timedelta(hours=1, microseconds=-1))
+    rolled_before = watermark if watermark <= date_before else _truncate_hour(date_before)
+
+    if rolled_after < rolled_before:
+        live_ranges = [(date_after, rolled_after, False), (rolled_before, date_before, True)]
+        rollups = (
+            core.UsageRollup.objects.filter(
+                test_mode=test_mode,
+                bucket__gte=rolled_after,
+                bucket__lt=rolled_before,
+            )
+            .annotate(date=functions.TruncDay("bucket"))
+            .values("metric", "date")
+            .annotate(count=models.Sum("count"), amount=models.Sum("amount"))
+            .order_by()
+        )
+        for item in rollups:
+            _merge(stats.setdefault(item["metric"], {}), item)
+    else:
+        live_ranges = [(date_after, date_before, True)]
+
+    for name, metric in get_metrics().items():
+        queryset = metric.queryset.filter(test_mode=test_mode)
+
+        for start, end, inclusive in live_ranges:
+            if start > end or (start == end and not inclusive):
+                continue
+
+            for item in _aggregate(
+                metric._replace(queryset=queryset),
+                start,
+                end,
+                functions.TruncDay,
+                key="date",
+                inclusive=inclusive,
+            ):
+                _merge(stats.setdefault(name, {}), item)
+
+    return {
+        name: sorted(
+            (stats.get(name) or {}).values(), key=lambda _: _["date"], reverse=True
+        )
+        for name in get_metrics().keys()
+    }
+
+
+def _aggregate(
+    metric: UsageMetric,
+    start: datetime.datetime,
+    end: datetime.datetime,
+    truncate: typing.Type[functions.Trunc],
+    key: str = "bucket",
+    inclusive: bool = False,
+) -> typing.Iterator[dict]:
+    field = metric.date_field
+    groups = [key, *(["test_mode", *_org_group(metric)] if key == "bucket" else [])]
+
+    queryset = (
+        metric.queryset.filter(
+            **{f"{field}__gte": start, f"{field}__{'lte' if inclusive else 'lt'}": end}
+        )
+        .annotate(**{key: truncate(field)})
+        .values(*groups)
+        .annotate(
+            count=metric.count,
+            **(dict(amount=metric.amount) if metric.amount is not None else {}),
+        )
+        .order_by()
+    )
+
+    for item in queryset:
+        if key == "bucket":
+            item.update(
+                org_id=item.pop("org__id", None),
+                test_mode=bool(item.get("test_mode")),
+            )
+
+        yield item
+
+
+def _org_group(metric: UsageMetric) -> typing.List[str]:
+    if not conf.settings.MULTI_ORGANIZATIONS:
+        return []
+
+    try:
+        metric.queryset.model._meta.get_field("org")
+        return ["org__id"]
+    except Exception:
+        return []
+
+
+def _merge(stats: dict, item: dict):
+    current = stats.setdefault(item["date"], dict(date=item["date"], count=0, amount=None))
+    current["count"] += item.get("count") or 0
+
+    if item.get("amount") is not None:
+        current["amount"] = (current["amount"] or 0) + item["amount"]
+
+
+def _get_oldest_date(
+    metrics: typing.Iterable[UsageMetric],
+) -> typing.Optional[datetime.datetime]:
+    dates = [
+        metric.queryset.order_by().aggregate(value=models.Min(metric.date_field))["value"]
+        for metric in metrics
+    ]
+
+    return min([_ for _ in dates if _ is not None], default=None)
+
+
+def _truncate_hour(value: datetime.datetime) -> datetime.datetime:
+    return value.replace(minute=0, second=0, microsecond=0)
+
+
+def _to_datetime(value: typing.Any) -> datetime.datetime:
+    if isinstance(value, str):
+        value = dateparse.parse_datetime(value) or datetime.datetime.combine(
+            dateparse.parse_date(value), datetime.time.min
+        )
+    elif not isinstance(value, datetime.datetime):
+        value = datetime.datetime.combine(value, datetime.time.min)
+
+    if timezone.is_naive(value):
+        value = timezone.make_aware(value)
+
+    return value
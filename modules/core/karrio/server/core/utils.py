@@ -202,6 +202,8 @@ def with_telemetry(operation_name: str = None):
 
             # Get tracer from context
             tracer = _get_tracer_from_context(context)
+            # the outermost operation names the tracing records (and their sampling)
+            tracer.context.setdefault("operation", op_name)
 
             # Build span attributes
             attributes = {"operation": op_name}
@@ -3,6 +3,7 @@ from django import forms
 from django.db import models
 from django.contrib import admin
 from django.conf import settings
+from django.utils import timezone
 from django.contrib.auth import get_user_model
 from django.utils.translation import gettext_lazy as _
 
@@ -187,7 +188,7 @@ def model_admin(ext: str, carrierProxy):
                     )
                     if config is None
                     else providers.CarrierConfig.objects.filter(carrier=carrier).update(
-                        config=config_value
+                        config=config_value, updated_at=timezone.now()
                     )
                 )
 
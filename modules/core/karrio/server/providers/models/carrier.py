@@ -289,20 +289,9 @@ class Carrier(core.OwnedEntity):
 
     @property
     def gateway(self) -> gateway.Gateway:
-        import karrio.server.core.middleware as middleware
-        import karrio.server.core.config as system_config
-
-        _context = middleware.SessionContext.get_current_request()
-        _tracer = getattr(_context, "tracer", lib.Tracer())
-        _cache = lib.Cache(caching.cache)
-        _config = lib.SystemConfig(system_config.config)
-
-        return karrio.gateway[self.ext].create(
-            self.data.to_dict(),
-            _tracer,
-            _cache,
-            _config,
-        )
+        import karrio.server.providers.registry as registry
+
+        return registry.get_gateway(self)
 
     @staticmethod
     def resolve_config(
@@ -0,0 +1,121 @@
+"""Carrier gateway registry.
+
+Building a carrier gateway resolves the connection config, the rate sheet
+services and parses the provider settings (several DB queries per carrier).
+The registry keeps the parsed settings of every carrier connection in an
+in-process LRU and only binds the request tracer (and new mapper/proxy/hooks
+handles) on access.
+
+Entries are versioned by the last change (`updated_at`) of the carrier, its
+configs, its rate sheet and the rate sheet services (and their counts, so
+deletions are caught too). The version is read from the database with a
+single aggregate query so changes made by any process (API servers or
+background workers) are picked up on the next access.
+"""
+
+import copy
+import typing
+import django.conf as conf
+import django.db.models as models
+import django.core.cache as caching
+
+import karrio.lib as lib
+import karrio.sdk as karrio
+import karrio.api.gateway as gateway
+from karrio.server.core.logging import logger
+
+GATEWAY_CACHE_TTL = getattr(conf.settings, "GATEWAY_CACHE_TTL", 300)
+GATEWAY_CACHE_SIZE = getattr(conf.settings, "GATEWAY_CACHE_SIZE", 2048)
+
+_registry = lib.LRUCache(maxsize=GATEWAY_CACHE_SIZE, ttl=GATEWAY_CACHE_TTL)
+
+
+def clear() -> None:
+    """Drop every gateway kept by this process."""
+    _registry.clear()
+
+
+def get_version(carrier) -> tuple:
+    """Return the last changes of the data a carrier gateway is built from."""
+    import karrio.server.providers.models as providers
+
+    version = (
+        providers.Carrier.objects.filter(pk=carrier.pk)
+        .order_by()
+        .aggregate(
+            updated_at=models.Max("updated_at"),
+            config_count=models.Count("configs", distinct=True),
+            config_updated_at=models.Max("configs__updated_at"),
+            rate_sheet_updated_at=models.Max("rate_sheet__updated_at"),
+            service_count=models.Count("rate_sheet__services", distinct=True),
+            service_updated_at=models.Max("rate_sheet__services__updated_at"),
+        )
+    )
+
+    return tuple(version.values())
+
+
+def get_context_key(carrier) -> tuple:
+    """Return the (org, user) a system carrier config is resolved for.
+
+    User connections always resolve the same config.
+    """
+    import karrio.server.core.middleware as middleware
+
+    if not carrier.is_system:
+        return (None, None)
+
+    ctx = lib.failsafe(lambda: middleware.SessionContext.get_current_request())
+
+    return (
+        getattr(getattr(ctx, "org", None), "pk", None),
+        getattr(getattr(ctx, "user", None), "pk", None),
+    )
+
+
+def get_gateway(carrier) -> gateway.Gateway:
+    """Return the carrier gateway bound to the current request tracer."""
+    import karrio.server.core.middleware as middleware
+    import karrio.server.core.config as system_config
+
+    _context = middleware.SessionContext.get_current_request()
+    _tracer = getattr(_context, "tracer", lib.Tracer())
+    _cache = lib.Cache(caching.cache)
+    _config = lib.SystemConfig(system_config.config)
+
+    if carrier.pk is None:
+        return karrio.gateway[carrier.ext].create(
+            carrier.data.to_dict(), _tracer, _cache, _config
+        )
+
+    key = (carrier.pk, carrier.ext, *get_context_key(carrier))
+    version = get_version(carrier)
+    entry: typing.Optional[tuple] = _registry.get(key)
+
+    if entry is not None and entry[0] == version:
+        # bind the request handles to a copy of the parsed settings
+        return karrio.gateway[carrier.ext].create(
+            copy.copy(entry[1]), _tracer, _cache, _config
+        )
+
+    _gateway = karrio.gateway[carrier.ext].create(
+        carrier.data.to_dict(), _tracer, _cache, _config
+    )
+    _registry.set(key, (version, get_cached_settings(_gateway.settings)))
+    logger.debug("Carrier gateway cached", carrier_id=carrier.carrier_id)
+
+    return _gateway
+
+
+def get_cached_settings(settings):
+    """Return a copy of the parsed settings without the request handles.
+
+    The tracer (with the request and response records), cache and system
+    config handles are bound again to the copy of every access.
+    """
+    settings = copy.copy(settings)
+
+    for handle in ("tracer", "cache", "system_config"):
+        setattr(settings, handle, None)
+
+    return settings
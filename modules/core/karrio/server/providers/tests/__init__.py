@@ -3,3 +3,4 @@ import logging
 logging.disable(logging.CRITICAL)
 
 from karrio.server.providers.tests.test_connections import *
+from karrio.server.providers.tests.test_registry import *
@@ -0,0 +1,59 @@
+"""Tests for the carrier gateway registry."""
+
+from unittest.mock import patch
+from karrio.server.core.tests import APITestCase
+import karrio.server.providers.models as providers
+import karrio.server.providers.registry as registry
+
+
+class TestGatewayRegistry(APITestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        registry.clear()
+
+    def test_reuse_parsed_settings(self):
+        carrier = providers.Carrier.objects.get(pk=self.carrier.pk)
+        first = carrier.gateway
+
+        with patch.object(providers.Carrier, "data") as data:
+            second = carrier.gateway
+
+        data.to_dict.assert_not_called()
+        self.assertIsNot(first, second)
+        self.assertIsNot(first.settings, second.settings)
+        self.assertEqual(first.settings.carrier_id, second.settings.carrier_id)
+
+    def test_request_handles_are_not_cached(self):
+        carrier = providers.Carrier.objects.get(pk=self.carrier.pk)
+        first = carrier.gateway
+        _, settings = registry._registry.get(
+            (carrier.pk, carrier.ext, *registry.get_context_key(carrier))
+        )
+
+        self.assertIsNone(settings.tracer)
+        self.assertIsNotNone(first.settings.tracer)
+        self.assertIsNot(carrier.gateway.settings.tracer, first.settings.tracer)
+
+    def test_invalidate_on_carrier_update(self):
+        carrier = providers.Carrier.objects.get(pk=self.carrier.pk)
+        self.assertTrue(carrier.gateway.settings.test_mode)
+
+        carrier.test_mode = False
+        carrier.save()
+
+        self.assertFalse(
+            providers.Carrier.objects.get(pk=carrier.pk).gateway.settings.test_mode
+        )
+
+    def test_version_follows_config_changes(self):
+        carrier = providers.Carrier.objects.get(pk=self.carrier.pk)
+        version = registry.get_version(carrier)
+
+        config = providers.CarrierConfig.objects.create(
+            carrier=carrier, config=dict(language="en"), created_by=self.user
+        )
+        self.assertNotEqual(registry.get_version(carrier), version)
+
+        version = registry.get_version(carrier)
+        config.delete()
+        self.assertNotEqual(registry.get_version(carrier), version)
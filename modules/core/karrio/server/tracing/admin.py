@@ -1,7 +1,9 @@
+import json
 import datetime
 from django.urls import reverse
 from django.contrib import admin
 from django.conf import settings
+from django.utils.html import format_html
 from django.utils.safestring import mark_safe
 from django.utils.translation import gettext_lazy as _
 from rest_framework_tracking.admin import APIRequestLog
@@ -14,7 +16,7 @@ class TracingRecordAdmin(admin.ModelAdmin):
     search_fields = ("meta__request_log_id", "meta__carrier_name")
     list_filter = ("key", "test_mode")
     readonly_fields = [
-        f.name
+        ("content" if f.name == "record" else f.name)
         for f in models.TracingRecord._meta.get_fields()
         if f.name not in ["org", "link"]
     ]
@@ -49,6 +51,14 @@ class TracingRecordAdmin(admin.ModelAdmin):
 
         return ""
 
+    def content(self, obj):
+        """The record with its compressed request/response bodies restored."""
+        return format_html(
+            "<pre>{}</pre>", json.dumps(obj.content, indent=2, default=str)
+        )
+
+    content.short_description = _("record")
+
     def request_timestamp(self, obj):
         timestamp = datetime.datetime.fromtimestamp(obj.timestamp)
 
@@ -80,3 +80,10 @@ class TracingRecord(OwnedEntity):
     @property
     def object_type(self):
         return "tracking_record"
+
+    @property
+    def content(self):
+        """The record with its compressed request/response bodies restored."""
+        from karrio.server.tracing.sink import decode_record
+
+        return decode_record(self.record)
@@ -0,0 +1,280 @@
+"""Buffered persistence of SDK tracing records.
+
+Requests hand their tracing records to the sink instead of writing them to
+the database. Records are sampled per carrier and operation, their bodies are
+capped and compressed, and they are buffered in memory (or in Redis when
+`TRACING_SINK = "redis"`, so every process feeds the same buffer). A daemon
+thread flushes the buffer every `TRACING_FLUSH_INTERVAL` seconds with one
+`bulk_create` per batch of `TRACING_BATCH_SIZE` records.
+"""
+
+import os
+import json
+import zlib
+import atexit
+import base64
+import typing
+import hashlib
+import itertools
+import threading
+import collections
+from django.db import close_old_connections
+from django.conf import settings
+
+import karrio.server.core.utils as utils
+from karrio.server.core.logging import logger
+
+TRACING_SINK = getattr(settings, "TRACING_SINK", "memory")
+TRACING_FLUSH_INTERVAL = getattr(settings, "TRACING_FLUSH_INTERVAL", 5)
+TRACING_BATCH_SIZE = getattr(settings, "TRACING_BATCH_SIZE", 500)
+TRACING_BUFFER_SIZE = getattr(settings, "TRACING_BUFFER_SIZE", 10000)
+TRACING_MAX_BODY_SIZE = getattr(settings, "TRACING_MAX_BODY_SIZE", 65536)
+TRACING_COMPRESS_MIN_SIZE = getattr(settings, "TRACING_COMPRESS_MIN_SIZE", 1024)
+TRACING_SAMPLE_RATES = getattr(settings, "TRACING_SAMPLE_RATES", {})
+
+BODY_KEYS = ("data", "response", "error")
+COMPRESSION = "zlib+base64"
+
+# serialized TracingRecord fields with the tenant schema and org to link
+Entry = typing.Dict[str, typing.Any]
+
+
+def get_sample_rate(carrier_name: str = None, operation: str = None) -> float:
+    """Return the most specific rate of `carrier:operation`, `carrier`, `operation` or `*`."""
+    rates = parse_sample_rates(TRACING_SAMPLE_RATES)
+
+    for key in (f"{carrier_name}:{operation}", carrier_name, operation, "*"):
+        if key in rates:
+            return rates[key]
+
+    return 1.0
+
+
+def parse_sample_rates(value: typing.Union[dict, list, str]) -> typing.Dict[str, float]:
+    """Parse sample rates given as a dict or as `key=rate` items (e.g. `fedex:rates_fetch=0.1`)."""
+    if isinstance(value, dict):
+        return {key: float(rate) for key, rate in value.items()}
+
+    items = value.split(",") if isinstance(value, str) else value
+
+    return {
+        key.strip(): float(rate)
+        for key, _, rate in (item.partition("=") for item in items if "=" in item)
+    }
+
+
+def is_sampled(tracer_id: str, carrier_name: str = None, operation: str = None) -> bool:
+    """Deterministic per tracer and carrier so a request and its response are kept together."""
+    rate = get_sample_rate(carrier_name, operation)
+
+    if rate >= 1:
+        return True
+    if rate <= 0:
+        return False
+
+    digest = hashlib.blake2b(f"{tracer_id}:{carrier_name}".encode(), digest_size=8)
+
+    return int.from_bytes(digest.digest(), "big") / 2**64 < rate
+
+
+def encode_record(data: dict) -> dict:
+    """Cap the request/response bodies of a record and compress them when large."""
+    record = {key: value for key, value in data.items() if key not in BODY_KEYS}
+    bodies = {key: data[key] for key in BODY_KEYS if data.get(key) is not None}
+    truncated = []
+
+    for key, value in bodies.items():
+        content = value if isinstance(value, str) else json.dumps(value, default=str)
+
+        if TRACING_MAX_BODY_SIZE and len(content) > TRACING_MAX_BODY_SIZE:
+            bodies[key] = content[:TRACING_MAX_BODY_SIZE]
+            truncated.append(key)
+
+    if truncated:
+        record.update(truncated=truncated)
+
+    content = json.dumps(bodies, default=str)
+
+    if len(content) < TRACING_COMPRESS_MIN_SIZE:
+        return {**record, **bodies}
+
+    return {
+        **record,
+        "encoding": COMPRESSION,
+        "payload": base64.b64encode(zlib.compress(content.encode("utf-8"))).decode(),
+    }
+
+
+def decode_record(data: typing.Any) -> typing.Any:
+    """Return a stored record with its compressed bodies restored."""
+    if not isinstance(data, dict) or data.get("encoding") != COMPRESSION:
+        return data
+
+    record = {k: v for k, v in data.items() if k not in ("encoding", "payload")}
+    bodies = json.loads(zlib.decompress(base64.b64decode(data["payload"])))
+
+    return {**record, **bodies}
+
+
+class MemoryBuffer:
+    def __init__(self, size: int = TRACING_BUFFER_SIZE):
+        self.entries: typing.Deque[Entry] = collections.deque(maxlen=size)
+
+    def push(self, entries: typing.List[Entry]) -> int:
+        # the oldest records are dropped once the buffer is full
+        self.entries.extend(entries)
+        return len(self.entries)
+
+    def pop(self, count: int) -> typing.List[Entry]:
+        entries = []
+        try:
+            for _ in range(count):
+                entries.append(self.entries.popleft())
+        except IndexError:
+            pass
+        return entries
+
+
+class RedisBuffer:
+    def __init__(self, size: int = TRACING_BUFFER_SIZE):
+        import redis
+
+        self.size = size
+        self.key = f"{getattr(settings, 'REDIS_PREFIX', 'karrio')}:tracing:records"
+        self.client = redis.Redis.from_url(settings.REDIS_CONNECTION_URL)
+
+    def push(self, entries: typing.List[Entry]) -> int:
+        pipeline = self.client.pipeline()
+        pipeline.rpush(self.key, *[json.dumps(entry) for entry in entries])
+        pipeline.ltrim(self.key, -self.size, -1)
+        length, _ = pipeline.execute()
+        return min(length, self.size)
+
+    def pop(self, count: int) -> typing.List[Entry]:
+        pipeline = self.client.pipeline()
+        pipeline.lrange(self.key, 0, count - 1)
+        pipeline.ltrim(self.key, count, -1)
+        entries, _ = pipeline.execute()
+
+        return [json.loads(entry) for entry in entries]
+
+
+class TracingSink:
+    def __init__(self, buffer=None, interval: float = TRACING_FLUSH_INTERVAL):
+        self.buffer = buffer or (
+            RedisBuffer() if TRACING_SINK == "redis" else MemoryBuffer()
+        )
+        self.interval = interval
+        self.lock = threading.Lock()
+        self.wakeup = threading.Event()
+        self.thread: typing.Optional[threading.Thread] = None
+        self.pid: typing.Optional[int] = None
+
+    def push(self, entries: typing.List[Entry]):
+        if len(entries) == 0:
+            return
+
+        buffered = self.buffer.push(entries)
+        self.start()
+
+        # flush early rather than letting a full buffer drop records
+        if buffered >= TRACING_BATCH_SIZE:
+            self.wakeup.set()
+
+    def start(self):
+        # (re)start the flusher in forked worker processes
+        if self.thread is not None and self.pid == os.getpid():
+            return
+
+        with self.lock:
+            if self.thread is None or self.pid != os.getpid():
+                self.pid = os.getpid()
+                self.thread = threading.Thread(
+                    target=self.run, name="tracing-sink", daemon=True
+                )
+                self.thread.start()
+
+    def run(self):
+        while True:
+            self.wakeup.wait(self.interval)
+            self.wakeup.clear()
+            self.flush()
+
+    def flush(self) -> int:
+        """Persist the buffered records and return how many were saved."""
+        saved = 0
+
+        with self.lock:
+            close_old_connections()
+
+            while True:
+                entries = self.buffer.pop(TRACING_BATCH_SIZE)
+                if len(entries) == 0:
+                    break
+
+                try:
+                    saved += save_entries(entries)
+                except Exception as e:
+                    logger.error("Failed to save tracing records", error=str(e))
+
+        return saved
+
+
+def save_entries(entries: typing.List[Entry]) -> int:
+    key = lambda entry: entry.get("schema") or ""
+    saved = 0
+
+    for schema, group in itertools.groupby(sorted(entries, key=key), key=key):
+        saved += _save_entries(list(group), schema=schema or None)
+
+    if saved > 0:
+        logger.info("Tracing records saved successfully", record_count=saved)
+
+    return saved
+
+
+@utils.tenant_aware
+def _save_entries(entries: typing.List[Entry], **kwargs) -> int:
+    import karrio.server.tracing.models as models
+
+    records = models.TracingRecord.objects.bulk_create(
+        [
+            models.TracingRecord(
+                key=entry["key"],
+                record=entry["record"],
+                timestamp=entry["timestamp"],
+                created_by_id=entry.get("created_by_id"),
+                test_mode=entry.get("test_mode") or False,
+                meta=entry.get("meta"),
+            )
+            for entry in entries
+        ]
+    )
+
+    if settings.MULTI_ORGANIZATIONS:
+        RecordLink = models.TracingRecord.link.related.related_model
+        RecordLink.objects.bulk_create(
+            [
+                RecordLink(org_id=entry["org_id"], item=record)
+                for entry, record in zip(entries, records)
+                if entry.get("org_id") is not None
+            ]
+        )
+
+    return len(records)
+
+
+_sink: typing.Optional[TracingSink] = None
+_sink_lock = threading.Lock()
+
+
+def get_sink() -> TracingSink:
+    """Return the process wide tracing sink."""
+    global _sink
+
+    with _sink_lock:
+        if _sink is None:
+            _sink = TracingSink()
+            atexit.register(_sink.flush)
+
+    return _sink
@@ -1,73 +1,46 @@
+import typing
+from django.db import connection as db_connection
+
 import karrio.lib as lib
 import karrio.server.conf as conf
 import karrio.server.core.utils as utils
-import karrio.server.tracing.models as models
-import karrio.server.serializers as serializers
-from karrio.server.core.logging import logger
+import karrio.server.tracing.sink as sink
+from karrio.core.utils import Record
 
 
 @utils.error_wrapper
 def save_tracing_records(context, tracer: lib.Tracer = None, schema: str = None):
+    """Hand the request tracing records to the tracing sink (persisted in batches)."""
     if conf.settings.PERSIST_SDK_TRACING is False:
         return
 
     tracer = tracer or getattr(context, "tracer", lib.Tracer())
+    actor = getattr(context, "user", None)
+
+    if len(tracer.inner_recordings) == 0 or getattr(actor, "id", None) is None:
+        return
+
+    # a request tracer is only persisted once
+    if tracer.context.get("persisted"):
+        return
+
+    def get_meta(record: Record) -> dict:
+        carrier = record.metadata.get("connection") or {}
 
-    # Process Karrio SDK tracing records to persist records of interest.
-    @utils.async_wrapper
-    @utils.tenant_aware
-    def persist_records(**kwarg):
-        actor = getattr(context, "user", None)
-        if len(tracer.records) == 0 or getattr(actor, "id", None) is None:
-            return
-
-        try:
-            records = []
-            exists = lib.identity(
-                models.TracingRecord.access_by(context)
-                .filter(
-                    meta__request_log_id__isnull=False,
-                    meta__request_log_id=tracer.context.get("request_log_id"),
-                )
-                .exists()
-            )
-
-            if exists:
-                return
-
-            for record in tracer.records:
-                connection: dict = record.metadata.get("connection")
-
-                records.append(
-                    models.TracingRecord(
-                        key=record.key,
-                        record=record.data,
-                        timestamp=record.timestamp,
-                        created_by_id=getattr(actor, "id", None),
-                        test_mode=connection.get("test_mode", False),
-                        meta=lib.to_dict(
-                            {
-                                "tracer_id": tracer.id,
-                                "object_id": tracer.context.get("object_id"),
-                                "carrier_account_id": connection.get("id"),
-                                "carrier_id": connection.get("carrier_id"),
-                                "carrier_name": connection.get("carrier_name"),
-                                "request_log_id": tracer.context.get("request_log_id"),
-                            }
-                        ),
-                    )
-                )
-
-            saved_records = models.TracingRecord.objects.bulk_create(records)
-
-            if getattr(context, "org", None) is not None:
-                serializers.bulk_link_org(saved_records, context)
-
-            logger.info("Tracing records saved successfully", record_count=len(saved_records))
-        except Exception as e:
-            logger.error("Failed to save tracing records", error=str(e))
-
-    persist_records(schema=schema)
+        return {
+            "tracer_id": tracer.id,
+            "object_id": tracer.context.get("object_id"),
+            "carrier_account_id": carrier.get("id"),
+            "carrier_id": carrier.get("carrier_id"),
+            "carrier_name": carrier.get("carrier_name"),
+            "request_log_id": tracer.context.get("request_log_id"),
+            "operation": tracer.context.get("operation"),
+        }
+
+    tracer.context.update(persisted=True)
+    entries = get_tracing_entries(tracer, get_meta, context=context, schema=schema)
+
+    sink.get_sink().push(entries)
 
 
 @utils.error_wrapper
@@ -75,30 +48,61 @@ def bulk_save_tracing_records(tracer: lib.Tracer, context=None):
     if conf.settings.PERSIST_SDK_TRACING is False:
         return
 
-    if len(tracer.records) == 0 or context is None:
+    if len(tracer.inner_recordings) == 0 or context is None:
         return
 
-    records = []
-
-    for record in tracer.records:
-        logger.debug("Processing tracing record", record_key=record.key, metadata=record.metadata)
-        records.append(
-            models.TracingRecord(
-                key=record.key,
-                record=record.data,
-                timestamp=record.timestamp,
-                test_mode=getattr(context, "test_mode", False),
-                created_by_id=getattr(context.user, "id", None),
-                meta=lib.to_dict({"tracer_id": tracer.id, **(record.metadata or {})}),
-            )
+    entries = get_tracing_entries(
+        tracer,
+        lambda record: {"tracer_id": tracer.id, **(record.metadata or {})},
+        context=context,
+        schema=getattr(db_connection, "schema_name", None),
+        test_mode=getattr(context, "test_mode", False),
+    )
+
+    sink.get_sink().push(entries)
+
+
+def get_tracing_entries(
+    tracer: lib.Tracer,
+    get_meta: typing.Callable[[Record], dict],
+    context=None,
+    schema: str = None,
+    test_mode: bool = None,
+) -> typing.List[sink.Entry]:
+    """Return the sampled tracing records of `tracer` as sink entries."""
+    records = tracer.records
+    operation = tracer.context.get("operation")
+    org_id = getattr(getattr(context, "org", None), "id", None)
+    created_by_id = getattr(getattr(context, "user", None), "id", None)
+    carrier_name = lambda record: (record.metadata.get("connection") or {}).get(
+        "carrier_name"
+    )
+
+    # carrier exchanges that failed are always kept
+    failed = set(carrier_name(record) for record in records if record.key == "error")
+    sampled = {
+        name: name in failed or sink.is_sampled(tracer.id, name, operation)
+        for name in set(carrier_name(record) for record in records)
+    }
+
+    return [
+        dict(
+            key=record.key,
+            record=sink.encode_record(record.data),
+            timestamp=record.timestamp,
+            created_by_id=created_by_id,
+            test_mode=(
+                test_mode
+                if test_mode is not None
+                else (record.metadata.get("connection") or {}).get("test_mode", False)
+            ),
+            meta=lib.to_dict(get_meta(record)),
+            org_id=org_id,
+            schema=schema,
         )
-
-    saved_records = models.TracingRecord.objects.bulk_create(records)
-
-    if getattr(context, "org", None) is not None:
-        serializers.bulk_link_org(saved_records, context)
-
-    logger.info("Tracing records saved successfully", record_count=len(saved_records))
+        for record in records
+        if sampled[carrier_name(record)]
+    ]
 
 
 def set_tracing_context(**kwargs):
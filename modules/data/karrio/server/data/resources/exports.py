@@ -0,0 +1,175 @@
+import io
+import os
+import csv
+import json
+import typing
+import decimal
+import datetime
+import tempfile
+from django.conf import settings
+from django.core.files import File
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from import_export.resources import ModelResource
+
+import karrio.server.core.models as core
+
+DATA_EXPORT_CHUNK_SIZE = getattr(settings, "DATA_EXPORT_CHUNK_SIZE", 500)
+DATA_EXPORT_ASYNC_THRESHOLD = getattr(settings, "DATA_EXPORT_ASYNC_THRESHOLD", 10000)
+DATA_EXPORT_DIRECTORY = getattr(settings, "DATA_EXPORT_DIRECTORY", "exports")
+EXPORT_COMPLETE_SUFFIX = ".complete"
+EXPORT_FAILED_SUFFIX = ".failed"
+STREAMING_FORMATS = ("csv", "jsonl", "xlsx")
+CONTENT_TYPES = {
+    "csv": "text/csv",
+    "jsonl": "application/x-ndjson",
+    "xls": "application/vnd.ms-excel",
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+}
+
+
+def count_rows(resource: ModelResource) -> int:
+    return resource.get_queryset().count()
+
+
+def iter_rows(resource: ModelResource) -> typing.Iterator[list]:
+    """Yield the exported rows, fetched by chunks from a server-side cursor."""
+    queryset = resource.get_queryset()
+
+    for instance in queryset.iterator(chunk_size=DATA_EXPORT_CHUNK_SIZE):
+        yield resource.export_resource(instance)
+
+
+def stream_export(
+    resource: ModelResource,
+    export_format: str,
+) -> typing.Iterator[bytes]:
+    """Render the export file incrementally.
+
+    CSV and JSONL are yielded by chunks of rows. XLSX is written row by row to
+    a temporary file (a zip archive can't be streamed) then yielded by chunks.
+    Other formats are rendered at once by tablib.
+    """
+    headers = resource.get_export_headers()
+
+    if export_format == "csv":
+        yield from _stream_csv(headers, iter_rows(resource))
+    elif export_format == "jsonl":
+        yield from _stream_jsonl(headers, iter_rows(resource))
+    elif export_format == "xlsx":
+        yield from _stream_xlsx(headers, iter_rows(resource))
+    else:
+        content = getattr(resource.export(), export_format, "")
+        yield content.encode("utf-8") if isinstance(content, str) else content
+
+
+def get_export_path(context, export_id: str, export_format: str) -> str:
+    """Return the storage path of a background export owned by the context."""
+    org = getattr(context, "org", None)
+    owner = getattr(org, "id", None) or getattr(context.user, "id", None)
+
+    return os.path.join(DATA_EXPORT_DIRECTORY, str(owner), f"{export_id}.{export_format}")
+
+
+def generate_export_id() -> str:
+    return core.uuid(prefix="export_")
+
+
+def save_export(resource: ModelResource, export_format: str, path: str) -> str:
+    """Write the export file to the storage without holding it in memory.
+
+    Storages write the file progressively, a marker file is saved once the
+    export file is complete so it isn't served truncated.
+    """
+    with tempfile.TemporaryFile() as file:
+        for chunk in stream_export(resource, export_format):
+            file.write(chunk)
+
+        file.seek(0)
+        path = default_storage.save(path, File(file))
+
+    default_storage.save(f"{path}{EXPORT_COMPLETE_SUFFIX}", ContentFile(b""))
+
+    return path
+
+
+def save_export_failure(path: str, error: Exception):
+    """Record the export failure so the file isn't awaited forever."""
+    default_storage.save(f"{path}{EXPORT_FAILED_SUFFIX}", ContentFile(str(error)))
+
+
+def get_export_status(path: str) -> str:
+    """Return the background export status: `failed`, `completed` or `queued`."""
+    if default_storage.exists(f"{path}{EXPORT_FAILED_SUFFIX}"):
+        return "failed"
+    if default_storage.exists(f"{path}{EXPORT_COMPLETE_SUFFIX}"):
+        return "completed"
+
+    return "queued"
+
+
+def _stream_csv(headers: list, rows: typing.Iterator[list]) -> typing.Iterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(headers)
+
+    for index, row in enumerate(rows, start=1):
+        writer.writerow(row)
+
+        if index % DATA_EXPORT_CHUNK_SIZE == 0:
+            yield _flush(buffer)
+
+    yield _flush(buffer)
+
+
+def _stream_jsonl(headers: list, rows: typing.Iterator[list]) -> typing.Iterator[bytes]:
+    buffer = io.StringIO()
+
+    for index, row in enumerate(rows, start=1):
+        buffer.write(json.dumps(dict(zip(headers, row)), default=str))
+        buffer.write("\n")
+
+        if index % DATA_EXPORT_CHUNK_SIZE == 0:
+            yield _flush(buffer)
+
+    yield _flush(buffer)
+
+
+def _stream_xlsx(headers: list, rows: typing.Iterator[list]) -> typing.Iterator[bytes]:
+    import openpyxl
+
+    workbook = openpyxl.Workbook(write_only=True)
+    sheet = workbook.create_sheet()
+    sheet.append(headers)
+
+    for row in rows:
+        sheet.append([_to_cell(value) for value in row])
+
+    with tempfile.TemporaryFile() as file:
+        workbook.save(file)
+        file.seek(0)
+
+        while True:
+            chunk = file.read(64 * 1024)
+            if not chunk:
+                break
+
+            yield chunk
+
+
+def _flush(buffer: io.StringIO) -> bytes:
+    content = buffer.getvalue().encode("utf-8")
+    buffer.seek(0)
+    buffer.truncate()
+
+    return content
+
+
+def _to_cell(value):
+    if value is None or isinstance(value, (str, int, float, bool, decimal.Decimal)):
+        return value
+    # excel doesn't support timezone aware datetimes
+    if isinstance(value, datetime.date) and getattr(value, "tzinfo", None) is None:
+        return value
+
+    return str(value)
@@ -0,0 +1,98 @@
+import io
+import os
+import csv
+import typing
+import tablib
+import itertools
+import contextlib
+from django.conf import settings
+from django.core.files.storage import default_storage
+
+from karrio.server.core.logging import logger
+import karrio.server.core.models as core
+
+DATA_IMPORT_CHUNK_SIZE = getattr(settings, "DATA_IMPORT_CHUNK_SIZE", 500)
+DATA_IMPORT_DIRECTORY = getattr(settings, "DATA_IMPORT_DIRECTORY", "imports")
+XLSX_EXTENSIONS = (".xlsx", ".xlsm")
+
+
+def save_import_file(data_file) -> str:
+    """Save the uploaded data file to the storage (written by chunks)."""
+    _, extension = os.path.splitext(getattr(data_file, "name", "") or "")
+    name = os.path.join(
+        DATA_IMPORT_DIRECTORY, f"{core.uuid(prefix='import_')}{extension.lower()}"
+    )
+
+    return default_storage.save(name, data_file)
+
+
+def delete_import_file(path: str):
+    try:
+        default_storage.delete(path)
+    except Exception as e:
+        logger.warning("Failed to delete import file", path=path, error=str(e))
+
+
+@contextlib.contextmanager
+def read_import_file(
+    path: str,
+) -> typing.Iterator[typing.Tuple[typing.List[str], typing.Iterator[list]]]:
+    """Open a stored CSV, TSV or XLSX data file.
+
+    Yields the header row and an iterator reading the data rows one at a time.
+    """
+    with default_storage.open(path, "rb") as file:
+        if path.lower().endswith(XLSX_EXTENSIONS):
+            rows = _read_xlsx_rows(file)
+        else:
+            rows = _read_csv_rows(file, delimiter="\t" if path.lower().endswith(".tsv") else ",")
+
+        headers = [str(_ or "").strip() for _ in next(rows, [])]
+        yield headers, (_fit_row(row, len(headers)) for row in rows if any(row))
+
+
+def iter_datasets(
+    path: str,
+    chunk_size: int = None,
+) -> typing.Iterator[typing.Tuple[int, tablib.Dataset]]:
+    """Yield `(offset, dataset)` chunks of at most `chunk_size` data file rows."""
+    chunk_size = chunk_size or DATA_IMPORT_CHUNK_SIZE
+
+    with read_import_file(path) as (headers, rows):
+        offset = 0
+        while True:
+            chunk = list(itertools.islice(rows, chunk_size))
+            if not any(chunk):
+                break
+
+            yield offset, tablib.Dataset(*chunk, headers=headers)
+            offset += len(chunk)
+
+
+def load_dataset(path: str, size: int = None) -> tablib.Dataset:
+    """Return the first `size` rows of the data file."""
+    return next(
+        (dataset for _, dataset in iter_datasets(path, size)),
+        tablib.Dataset(),
+    )
+
+
+def _read_csv_rows(file, delimiter: str = ",") -> typing.Iterator[list]:
+    text = io.TextIOWrapper(file, encoding="utf-8-sig", newline="")
+
+    yield from csv.reader(text, delimiter=delimiter)
+
+
+def _read_xlsx_rows(file) -> typing.Iterator[list]:
+    import openpyxl
+
+    workbook = openpyxl.load_workbook(file, read_only=True, data_only=True)
+    try:
+        for row in workbook.active.iter_rows(values_only=True):
+            yield ["" if value is None else value for value in row]
+    finally:
+        workbook.close()
+
+
+def _fit_row(row: list, size: int) -> list:
+    return [*row[:size], *([""] * (size - len(row)))]
@@ -90,7 +90,19 @@ def order_export_resource(query_params: dict, context, **kwargs):
 
         def get_queryset(self):
             orders = OrderFilters(query_params, models.Order.access_by(context)).qs
-            return queryset.filter(commodity_order__in=orders)
+            # only load the relations read by the exported columns
+            return (
+                queryset.filter(commodity_order__in=orders)
+                .select_related(None)
+                .select_related(
+                    "parent",
+                    "order_link__order__shipping_to",
+                    "order_link__order__shipping_from",
+                    "order_link__order__billing_address",
+                )
+                .prefetch_related(None)
+                .prefetch_related("order_link__order__line_items")
+            )
 
         def get_export_headers(self, **kwargs):
             headers = super().get_export_headers(**kwargs)
@@ -115,7 +115,14 @@ def shipment_export_resource(query_params: dict, context, **kwargs):
             export_order = [k for k in DEFAULT_HEADERS.keys() if k not in _exclude]
 
         def get_queryset(self):
-            return ShipmentFilters(query_params, queryset).qs
+            # only load the relations read by the exported columns
+            return (
+                ShipmentFilters(query_params, queryset)
+                .qs.select_related(None)
+                .select_related("shipper", "recipient", "selected_rate_carrier")
+                .prefetch_related(None)
+                .prefetch_related("parcels", "parcels__items")
+            )
 
         def get_export_headers(self, **kwargs):
             headers = super().get_export_headers(**kwargs)
@@ -123,8 +130,14 @@ def shipment_export_resource(query_params: dict, context, **kwargs):
 
         @staticmethod
         def packages(row):
-            parcels = core.Parcel(row.parcels, many=True).data
-            return Packages([lib.to_object(types.Parcel, p) for p in parcels])
+            # computed once per row for all the parcel columns
+            if "_export_packages" not in row.__dict__:
+                parcels = core.Parcel(row.parcels, many=True).data
+                row._export_packages = Packages(
+                    [lib.to_object(types.Parcel, p) for p in parcels]
+                )
+
+            return row._export_packages
 
         if "service" not in _exclude:
             service = resources.Field()
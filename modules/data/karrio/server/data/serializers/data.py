@@ -1,4 +1,3 @@
-import tablib
 from django.db import transaction
 
 from karrio.server.conf import settings
@@ -6,6 +5,7 @@ from karrio.server.core.logging import logger
 import karrio.server.core.exceptions as exceptions
 import karrio.server.data.models as models
 import karrio.server.data.resources as resources
+import karrio.server.data.resources.imports as imports
 import karrio.server.data.serializers as serializers
 import karrio.server.data.serializers.batch as batch
 
@@ -45,14 +45,18 @@ class ImportDataSerializer(serializers.ImportData):
             params=validated_data,
             context=context,
         )
-        dataset = tablib.Dataset().load(
-            data_field.read().decode(),
-            headers=data_fields.values(),
-        )
+        # the file is imported by chunks from the storage by the worker.
+        file_path = imports.save_import_file(data_field)
 
-        # dry run data import to validate file content.
-        validation = resource.import_data(dataset, dry_run=True)
-        check_dataset_validation_errors(validation)
+        try:
+            # dry run the first chunk of rows to validate the file content.
+            # the errors of the remaining rows are recorded as they are imported.
+            dataset = imports.load_dataset(file_path, imports.DATA_IMPORT_CHUNK_SIZE)
+            validation = resource.import_data(dataset, dry_run=True)
+            check_dataset_validation_errors(validation)
+        except Exception:
+            imports.delete_import_file(file_path)
+            raise
 
         operation = (
             batch.BatchOperationModelSerializer.map(
@@ -66,8 +70,12 @@ class ImportDataSerializer(serializers.ImportData):
         tasks.queue_batch_import(
             operation.id,
             data=dict(
-                dataset=dataset,
-                import_data=validated_data,
+                file_path=file_path,
+                import_data={
+                    key: value
+                    for key, value in validated_data.items()
+                    if key != "data_file"
+                },
             ),
             ctx=dict(
                 org_id=getattr(context.org, "id", None),
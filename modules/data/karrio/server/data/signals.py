@@ -5,6 +5,7 @@ from karrio.server.core.logging import logger
 import karrio.server.core.utils as utils
 import karrio.server.data.models as models
 import karrio.server.events.tasks as tasks
+import karrio.server.events.outbox as outbox
 import karrio.server.data.serializers as serializers
 
 
@@ -47,4 +48,4 @@ def batch_operation_updated(sender, instance, *args, **kwargs):
     if settings.MULTI_ORGANIZATIONS and context["org_id"] is None:
         return
 
-    tasks.notify_webhooks(event, data, event_at, context, schema=settings.schema)
+    outbox.publish(event, data, event_at, context, schema=settings.schema)
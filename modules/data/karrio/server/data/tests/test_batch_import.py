@@ -0,0 +1,176 @@
+import tablib
+from unittest.mock import patch
+from django.core.exceptions import ValidationError
+from import_export.resources import ModelResource
+from karrio.server.core.tests import APITestCase
+from karrio.server.manager import models as manager
+from karrio.server.data import models
+import karrio.server.events.task_definitions.data as data
+from karrio.server.events.task_definitions.data import batch
+
+
+class TestBatchImport(APITestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        user = self.user
+
+        class TemplateResource(ModelResource):
+            class Meta:
+                model = models.DataTemplate
+                fields = ("id", "name", "slug", "resource_type")
+
+            def before_save_instance(self, instance, row, **kwargs):
+                if instance.name == "failing":
+                    raise Exception("database error")
+                if instance.name == "invalid":
+                    raise ValidationError({"name": ["invalid name"]})
+
+                instance.created_by = user
+
+        self.resource = TemplateResource()
+        self.batch = models.BatchOperation.objects.create(
+            resource_type="trackers",
+            status="queued",
+            test_mode=True,
+            created_by=self.user,
+        )
+
+    def test_process_resources_retries_without_failing_rows(self):
+        dataset = tablib.Dataset(
+            *[
+                ("first", "first", "trackers"),
+                ("failing", "failing", "trackers"),
+                ("invalid", "invalid", "trackers"),
+                ("last", "last", "trackers"),
+            ],
+            headers=["name", "slug", "resource_type"],
+        )
+
+        resources = batch.process_resources(self.resource, dataset, offset=10)
+
+        templates = {
+            _.slug: _.id for _ in models.DataTemplate.objects.filter(created_by=self.user)
+        }
+        self.assertListEqual(sorted(templates.keys()), ["first", "last"])
+        self.assertListEqual(
+            resources,
+            [
+                dict(id=templates["first"], status="queued"),
+                dict(
+                    id=None,
+                    status="has_errors",
+                    errors=dict(row=12, messages=["database error"]),
+                ),
+                dict(
+                    id=None,
+                    status="has_errors",
+                    errors=dict(row=13, messages=["name: invalid name"]),
+                ),
+                dict(id=templates["last"], status="queued"),
+            ],
+        )
+
+    def test_batch_import_keeps_the_chunks_resources(self):
+        headers = ["name", "slug", "resource_type"]
+        chunks = [
+            (
+                0,
+                tablib.Dataset(
+                    ("first", "first", "trackers"),
+                    ("failing", "failing", "trackers"),
+                    headers=headers,
+                ),
+            ),
+            (2, tablib.Dataset(("last", "last", "trackers"), headers=headers)),
+        ]
+
+        with patch.object(
+            batch.resources, "get_import_resource", return_value=self.resource
+        ), patch.object(
+            batch.imports, "iter_datasets", return_value=iter(chunks)
+        ), patch.object(
+            batch.imports, "delete_import_file"
+        ) as delete_import_file:
+            batch.trigger_batch_import(
+                self.batch.id,
+                dict(import_data=dict(resource_type="trackers"), file_path="imports/data.csv"),
+                dict(user_id=self.user.id, test_mode=True),
+            )
+
+        self.batch.refresh_from_db()
+        delete_import_file.assert_called_once_with("imports/data.csv")
+        self.assertEqual(self.batch.status, "running")
+        self.assertListEqual(
+            [(bool(res["id"]), res["status"]) for res in self.batch.resources],
+            [(True, "queued"), (False, "has_errors"), (True, "queued")],
+        )
+        self.assertDictEqual(
+            self.batch.resources[1]["errors"], dict(row=2, messages=["database error"])
+        )
+
+
+    def test_batch_import_failure_keeps_the_committed_chunks(self):
+        headers = ["name", "slug", "resource_type"]
+
+        def iter_datasets(path):
+            yield 0, tablib.Dataset(("first", "first", "trackers"), headers=headers)
+            raise Exception("invalid file")
+
+        with patch.object(
+            batch.resources, "get_import_resource", return_value=self.resource
+        ), patch.object(
+            batch.imports, "iter_datasets", side_effect=iter_datasets
+        ), patch.object(
+            batch.imports, "delete_import_file"
+        ):
+            batch.trigger_batch_import(
+                self.batch.id,
+                dict(import_data=dict(resource_type="trackers"), file_path="imports/data.csv"),
+                dict(user_id=self.user.id, test_mode=True),
+            )
+
+        self.batch.refresh_from_db()
+        template = models.DataTemplate.objects.get(slug="first")
+        self.assertEqual(self.batch.status, "failed")
+        self.assertListEqual(
+            self.batch.resources, [dict(id=template.id, status="queued")]
+        )
+
+
+class TestBatchTrackersProcessing(APITestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.tracker = manager.Tracking.objects.create(
+            tracking_number="1Z12345E6205277936",
+            test_mode=True,
+            status="in_transit",
+            created_by=self.user,
+            tracking_carrier=self.ups_carrier,
+        )
+        self.failed_row = dict(
+            id=None,
+            status="has_errors",
+            errors=dict(row=2, messages=["A tracking number is required."]),
+        )
+
+    def test_process_trackers_keeps_failed_rows(self):
+        with patch(
+            "karrio.server.events.task_definitions.base.tracking.update_trackers"
+        ) as update_trackers:
+            resources = data._process_trackers(
+                [dict(id=self.tracker.id, status="queued"), self.failed_row]
+            )
+
+        update_trackers.assert_called_once_with(tracker_ids=[self.tracker.id])
+        self.assertListEqual(
+            resources, [dict(id=self.tracker.id, status="processed"), self.failed_row]
+        )
+
+    def test_process_trackers_without_trackers_to_update(self):
+        with patch(
+            "karrio.server.events.task_definitions.base.tracking.update_trackers"
+        ) as update_trackers:
+            resources = data._process_trackers([self.failed_row])
+
+        update_trackers.assert_not_called()
+        self.assertListEqual(resources, [self.failed_row])
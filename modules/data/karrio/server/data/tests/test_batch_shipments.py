@@ -0,0 +1,106 @@
+from unittest.mock import patch
+from karrio.server.core.tests import APITestCase
+from karrio.server.manager import models as manager
+from karrio.server.data import models
+import karrio.server.events.task_definitions.data as data
+from karrio.server.events.task_definitions.data import shipments
+
+
+class TestBatchShipmentsProcessing(APITestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        address = dict(
+            address_line1="125 Church St",
+            city="Moncton",
+            country_code="CA",
+            postal_code="E1C4Z8",
+            created_by=self.user,
+        )
+        self.shipments = [
+            manager.Shipment.objects.create(
+                shipper=manager.Address.objects.create(**address),
+                recipient=manager.Address.objects.create(**address),
+                test_mode=True,
+                status="draft",
+                created_by=self.user,
+            )
+            for _ in range(5)
+        ]
+        self.batch = models.BatchOperation.objects.create(
+            resource_type="shipment",
+            status="running",
+            test_mode=True,
+            created_by=self.user,
+            resources=[
+                *[dict(id=_.id, status="queued") for _ in self.shipments],
+                dict(id=None, status="has_errors", errors=dict(row=6, messages=["invalid"])),
+            ],
+        )
+
+    def test_process_shipments_in_chunks(self):
+        with patch.object(shipments, "BATCH_SHIPMENTS_CHUNK_SIZE", 2), patch.object(
+            data, "process_batch_shipments"
+        ) as task:
+            data._process_shipments(self.batch)
+
+        self.assertListEqual(
+            [call.args[1] for call in task.call_args_list],
+            [
+                [_.id for _ in self.shipments[0:2]],
+                [_.id for _ in self.shipments[2:4]],
+                [_.id for _ in self.shipments[4:]],
+            ],
+        )
+
+    def test_resumed_batch_skips_processed_shipments(self):
+        shipments.checkpoint_resources(
+            self.batch.id, {_.id: "processed" for _ in self.shipments[:3]}
+        )
+        self.batch.refresh_from_db()
+
+        with patch.object(data, "process_batch_shipments") as task:
+            data._process_shipments(self.batch)
+
+        self.batch.refresh_from_db()
+        self.assertEqual(task.call_count, 1)
+        self.assertListEqual(task.call_args.args[1], [_.id for _ in self.shipments[3:]])
+        self.assertListEqual(
+            [res["status"] for res in self.batch.resources],
+            ["processed", "processed", "processed", "queued", "queued", "has_errors"],
+        )
+
+    def test_last_chunk_completes_the_batch(self):
+        failing = self.shipments[0]
+
+        def process_shipment(shipment, **kwargs):
+            if shipment.id == failing.id:
+                raise Exception("carrier error")
+
+            shipment.status = "purchased"
+            shipment.save(update_fields=["status"])
+            return shipment
+
+        # test transactions aren't visible to the executor threads connections
+        with patch.object(shipments, "BATCH_SHIPMENTS_CONCURRENCY", 1), patch.object(
+            shipments, "process_shipment", side_effect=process_shipment
+        ):
+            shipments.process_batch_shipments(
+                self.batch.id, [_.id for _ in self.shipments[:3]]
+            )
+            self.batch.refresh_from_db()
+            self.assertEqual(self.batch.status, "running")
+
+            shipments.process_batch_shipments(
+                self.batch.id, [_.id for _ in self.shipments[3:]]
+            )
+
+        self.batch.refresh_from_db()
+        self.assertEqual(self.batch.status, "completed")
+        self.assertListEqual(
+            self.batch.resources,
+            [
+                dict(id=failing.id, status="has_errors"),
+                *[dict(id=_.id, status="processed") for _ in self.shipments[1:]],
+                dict(id=None, status="has_errors", errors=dict(row=6, messages=["invalid"])),
+            ],
+        )
@@ -0,0 +1,37 @@
+from types import SimpleNamespace
+from unittest.mock import patch
+from django.core.files.storage import default_storage
+from karrio.server.core.tests import APITestCase
+import karrio.server.data.resources.exports as exports
+from karrio.server.events.task_definitions.data import export
+
+
+class TestBackgroundDataExport(APITestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.path = exports.get_export_path(
+            SimpleNamespace(user=self.user), exports.generate_export_id(), "csv"
+        )
+        self.ctx = dict(user_id=self.user.id, test_mode=True)
+
+    def tearDown(self) -> None:
+        for suffix in ("", exports.EXPORT_COMPLETE_SUFFIX, exports.EXPORT_FAILED_SUFFIX):
+            default_storage.delete(f"{self.path}{suffix}")
+
+    def test_export_is_completed_once_saved(self):
+        self.assertEqual(exports.get_export_status(self.path), "queued")
+
+        export.trigger_data_export("trackers", "csv", "", self.path, self.ctx)
+
+        self.assertEqual(exports.get_export_status(self.path), "completed")
+        with default_storage.open(self.path, "rb") as file:
+            self.assertTrue(file.read().startswith(b"ID,Tracking Number"))
+
+    def test_export_failure_is_recorded(self):
+        with patch.object(
+            export.resources, "get_export_resource", side_effect=Exception("failed")
+        ):
+            export.trigger_data_export("trackers", "csv", "", self.path, self.ctx)
+
+        self.assertEqual(exports.get_export_status(self.path), "failed")
+        self.assertFalse(default_storage.exists(self.path))
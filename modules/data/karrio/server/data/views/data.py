@@ -1,7 +1,8 @@
 import io
-from django.http import JsonResponse, HttpResponse
-from django.urls import re_path, path
+from django.http import JsonResponse, FileResponse, StreamingHttpResponse
+from django.urls import re_path, path, reverse
 from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
 from django_downloadview import VirtualDownloadView
 from django.views.decorators.csrf import csrf_exempt
 from rest_framework.parsers import MultiPartParser, FormParser
@@ -9,7 +10,9 @@ from rest_framework.response import Response
 from rest_framework.request import Request
 from rest_framework import status
 
+from karrio.server.conf import settings
 from karrio.server.data.serializers.data import ImportDataSerializer
+import karrio.server.data.resources.exports as exports
 import karrio.server.data.serializers as serializers
 import karrio.server.data.resources as resources
 import karrio.server.core.views.api as api
@@ -136,28 +139,26 @@ class DataExport(api.BaseAPIView):
         try:
             """Generate a file to export."""
             query_params = request.GET
-
-            # Export the data
-            dataset = resources.export(
+            resource = resources.get_export_resource(
                 resource_type, query_params, context=request
             )
 
-            # Get the content
-            content = getattr(dataset, export_format, "")
-
-            # Determine content type
-            content_types = {
-                'csv': 'text/csv',
-                'xls': 'application/vnd.ms-excel',
-                'xlsx': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
-            }
-            content_type = content_types.get(export_format, 'application/octet-stream')
+            # large exports are written to the file storage by a background job
+            if (
+                export_format in exports.STREAMING_FORMATS
+                and exports.DATA_EXPORT_ASYNC_THRESHOLD > 0
+                and exports.count_rows(resource) > exports.DATA_EXPORT_ASYNC_THRESHOLD
+            ):
+                return queue_export(request, resource_type, export_format)
 
-            # Create response
-            if isinstance(content, str):
-                response = HttpResponse(content.encode('utf-8'), content_type=content_type)
-            else:
-                response = HttpResponse(content, content_type=content_type)
+            # Stream the content as the rows are fetched
+            content_type = exports.CONTENT_TYPES.get(
+                export_format, "application/octet-stream"
+            )
+            response = StreamingHttpResponse(
+                exports.stream_export(resource, export_format),
+                content_type=content_type,
+            )
 
             # Set headers
             filename = f"{resource_type}.{export_format}"
@@ -176,8 +177,86 @@ class DataExport(api.BaseAPIView):
             )
 
 
+class DataExportFile(api.BaseAPIView):
+    @openapi.extend_schema(
+        tags=["Batches"],
+        operation_id=f"{ENDPOINT_ID}export_download",
+        summary="Download an export file",
+        responses={
+            (200, "application/octet-stream"): openapi.OpenApiTypes.BINARY,
+            404: serializers.ErrorResponse(),
+            409: serializers.ErrorResponse(),
+        },
+    )
+    def get(self, request: Request, export_id: str, export_format: str):
+        """Download a file generated by a background export.<br/>
+        **The file is available once the export is complete.**
+        """
+        path = exports.get_export_path(request, export_id, export_format)
+        export_status = exports.get_export_status(path)
+
+        if export_status == "failed":
+            return JsonResponse(
+                dict(errors=[{"message": "The data export failed"}]),
+                status=status.HTTP_409_CONFLICT,
+            )
+
+        if export_status != "completed":
+            return JsonResponse(
+                dict(errors=[{"message": "Export file not found or not ready yet"}]),
+                status=status.HTTP_404_NOT_FOUND,
+            )
+
+        response = FileResponse(
+            default_storage.open(path, "rb"),
+            as_attachment=True,
+            filename=f"{export_id}.{export_format}",
+            content_type=exports.CONTENT_TYPES.get(
+                export_format, "application/octet-stream"
+            ),
+        )
+        response['X-Frame-Options'] = 'ALLOWALL'
+
+        return response
+
+
+def queue_export(request: Request, resource_type: str, export_format: str):
+    import karrio.server.events.tasks as tasks
+
+    export_id = exports.generate_export_id()
+    tasks.queue_data_export(
+        resource_type,
+        export_format,
+        request.GET.urlencode(),
+        exports.get_export_path(request, export_id, export_format),
+        ctx=dict(
+            org_id=getattr(getattr(request, "org", None), "id", None),
+            user_id=getattr(request.user, "id", None),
+            test_mode=request.test_mode,
+        ),
+        schema=settings.schema,
+    )
+
+    return JsonResponse(
+        dict(
+            id=export_id,
+            status="queued",
+            file_url=reverse(
+                "karrio.server.data:data-export-file",
+                kwargs=dict(export_id=export_id, export_format=export_format),
+            ),
+        ),
+        status=status.HTTP_202_ACCEPTED,
+    )
+
+
 urlpatterns = [
     path("batches/data/import", DataImport.as_view(), name="data-import"),
+    re_path(
+        r"^batches/data/exports/(?P<export_id>\w+)\.(?P<export_format>\w+)$",
+        DataExportFile.as_view(),
+        name="data-export-file",
+    ),
     re_path(
         r"^batches/data/export/(?P<resource_type>\w+).(?P<export_format>\w+)",
         csrf_exempt(DataExport.as_view()),
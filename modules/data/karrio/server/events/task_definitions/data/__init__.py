@@ -32,6 +32,16 @@ def save_batch_resources(*args, **kwargs):
     batch.trigger_batch_saving(*args, **kwargs)
 
 
+@db_task()
+@utils.error_wrapper
+@utils.tenant_aware
+@with_task_telemetry("queue_data_export")
+def queue_data_export(*args, **kwargs):
+    from karrio.server.events.task_definitions.data import export
+
+    export.trigger_data_export(*args, **kwargs)
+
+
 @db_task()
 @utils.tenant_aware
 @with_task_telemetry("process_batch_resources")
@@ -47,7 +57,9 @@ def process_batch_resources(batch_id, **kwargs):
             batch_operation.resources = _process_orders(batch_operation.resources)
 
         elif batch_operation.resource_type == serializers.ResourceType.shipment.value:
-            batch_operation.resources = _process_shipments(batch_operation.resources)
+            # the shipments are processed by chunk tasks, the last one completes the batch
+            _process_shipments(batch_operation, schema=kwargs.get("schema"))
+            return
 
         elif batch_operation.resource_type == serializers.ResourceType.billing.value:
             pass
@@ -62,73 +74,84 @@ def process_batch_resources(batch_id, **kwargs):
     logger.info(f"> ending batch ({batch_id}) resources processing...")
 
 
-def _process_shipments(resources: typing.List[dict]):
-    from karrio.server.manager import models
+def _process_shipments(batch_operation: models.BatchOperation, schema: str = None):
     from karrio.server.events.task_definitions.data import shipments
 
-    resource_ids = [res["id"] for res in resources]
-    shipment_ids = [
+    resource_ids = [
         res["id"]
-        for res in resources
-        if res["status"] != serializers.ResourceStatus.processed.value
+        for res in batch_operation.resources
+        if res.get("id") and res["status"] != serializers.ResourceStatus.processed.value
     ]
-    shipments.process_shipments(shipment_ids=shipment_ids)
-    # check results and update resource statuses
-    results = models.Shipment.objects.filter(id__in=resource_ids)
-
-    def _compute_state(shipment=None):
-        # shipment with service not purchased
-        if (
-            any(shipment.options.get("perferred_service") or "")
-            and shipment.status == "draft"
-        ):
-            return serializers.ResourceStatus.incomplete
-        # shipment has errors and no rates
-        if len(shipment.rates) == 0 and any(shipment.messages):
-            return serializers.ResourceStatus.has_errors
-        # shipment is at the right state
-        return serializers.ResourceStatus.processed.value
-
-    return [
-        dict(
-            id=res["id"],
-            status=_compute_state(results.filter(id=res["id"]).first()),
-        )
-        for res in resources
+    chunks = [
+        resource_ids[i : i + shipments.BATCH_SHIPMENTS_CHUNK_SIZE]
+        for i in range(0, len(resource_ids), shipments.BATCH_SHIPMENTS_CHUNK_SIZE)
     ]
 
+    # mark the shipments to process so the batch completes once none is queued
+    shipments.checkpoint_resources(
+        batch_operation.id,
+        {id: serializers.ResourceStatus.queued.value for id in resource_ids},
+    )
 
-def _process_orders(resources: typing.List[dict]):
-    resource_ids = [res["id"] for res in resources]
+    for chunk in chunks:
+        process_batch_shipments(batch_operation.id, chunk, schema=schema)
+
+    if not any(chunks):
+        shipments.complete_batch(batch_operation.id)
 
-    return [dict(id=id, status="processed") for id in resource_ids]
+    logger.info(f"> batch ({batch_operation.id}) shipments queued in {len(chunks)} chunk(s)...")
+
+
+@db_task()
+@utils.tenant_aware
+@with_task_telemetry("process_batch_shipments")
+def process_batch_shipments(batch_id: str, shipment_ids: typing.List[str], **kwargs):
+    from karrio.server.events.task_definitions.data import shipments
+
+    shipments.process_batch_shipments(
+        batch_id, shipment_ids, schema=kwargs.get("schema")
+    )
+
+
+def _process_orders(resources: typing.List[dict]):
+    # rows that failed to import are kept with their errors
+    return [
+        dict(id=res["id"], status="processed") if res.get("id") else res
+        for res in resources
+    ]
 
 
 def _process_trackers(resources: typing.List[dict]):
     from karrio.server.manager import models
     from karrio.server.events.task_definitions.base import tracking
 
-    resource_ids = [res["id"] for res in resources]
+    resource_ids = [res["id"] for res in resources if res.get("id")]
     tracker_ids = [
         res["id"]
         for res in resources
-        if res["status"] != serializers.ResourceStatus.processed.value
+        if res.get("id") and res["status"] != serializers.ResourceStatus.processed.value
     ]
-    tracking.update_trackers(tracker_ids=tracker_ids)
+
+    # an empty list of tracker ids updates all the active trackers
+    if any(tracker_ids):
+        tracking.update_trackers(tracker_ids=tracker_ids)
+
     # check results and update resource statuses
-    results = models.Tracking.objects.filter(id__in=resource_ids)
+    trackers = set(
+        models.Tracking.objects.filter(id__in=resource_ids).values_list("id", flat=True)
+    )
 
-    def _compute_tracker_state(tracker=None):
-        if tracker is None:
+    def _compute_tracker_state(tracker_id: str):
+        if tracker_id not in trackers:
             return serializers.ResourceStatus.incomplete.value
 
         return serializers.ResourceStatus.processed.value
 
+    # rows that failed to import are kept with their errors
     return [
-        dict(
-            id=res["id"],
-            status=_compute_tracker_state(results.filter(id=res["id"]).first()),
-        )
+        dict(id=res["id"], status=_compute_tracker_state(res["id"]))
+        if res.get("id")
+        else res
         for res in resources
     ]
 
@@ -136,5 +159,7 @@ def _process_trackers(resources: typing.List[dict]):
 TASK_DEFINITIONS = [
     queue_batch_import,
     save_batch_resources,
+    queue_data_export,
     process_batch_resources,
+    process_batch_shipments,
 ]
@@ -1,6 +1,7 @@
 import typing
 import tablib
 from django.conf import settings
+from django.db import transaction
 from django.contrib.auth import get_user_model
 from import_export.resources import ModelResource
 
@@ -8,6 +9,7 @@ from karrio.server.core.logging import logger
 import karrio.server.core.utils as utils
 import karrio.server.data.serializers as serializers
 import karrio.server.data.resources as resources
+import karrio.server.data.resources.imports as imports
 import karrio.server.data.models as models
 
 User = get_user_model()
@@ -28,22 +30,42 @@ def trigger_batch_import(
         )
 
         if batch_operation is not None:
-            dataset = data["dataset"]
             import_data = data["import_data"]
             resource = resources.get_import_resource(
                 resource_type=batch_operation.resource_type,
+                data_fields=retrieve_data_fields(batch_operation, import_data, context),
                 params=import_data,
                 context=context,
                 batch_id=batch_id,
             )
 
-            batch_resources = process_resources(resource, dataset)
-            update_batch_operation_resources(batch_operation, batch_resources)
+            datasets = (
+                imports.iter_datasets(data["file_path"])
+                if "file_path" in data
+                else [(0, data["dataset"])]
+            )
+
+            # each chunk resources are recorded once the chunk is committed
+            for offset, dataset in datasets:
+                batch_resources = process_resources(resource, dataset, offset=offset)
+                append_batch_operation_resources(batch_id, batch_resources)
+                logger.debug("Batch import chunk processed", batch_id=batch_id, offset=offset, row_count=len(dataset))
+
+            batch_operation.refresh_from_db(fields=["resources"])
+            update_batch_operation_resources(batch_operation, batch_operation.resources)
         else:
             logger.info("Batch operation not found", batch_id=batch_id)
 
     except Exception as e:
         logger.exception("Batch import operation failed", batch_id=batch_id, error=str(e))
+        # the resources of the committed chunks stay recorded on the failed batch
+        models.BatchOperation.objects.filter(pk=batch_id).update(
+            status=serializers.BatchOperationStatus.failed.value
+        )
+
+    finally:
+        if "file_path" in data:
+            imports.delete_import_file(data["file_path"])
 
     logger.info("Batch import operation complete", batch_id=batch_id)
 
@@ -80,23 +102,93 @@ def trigger_batch_saving(
 def process_resources(
     resource: ModelResource,
     dataset: tablib.Dataset,
+    offset: int = 0,
 ):
-    result = resource.import_data(dataset, dry_run=False)
-    _object_ids = [(row.object_id, row.errors) for row in result.rows]
+    """Import a chunk of rows in its own transaction.
+
+    A row error rolls the chunk transaction back, the chunk is then imported
+    again without the failing rows. Rows failing to import are returned with
+    their (file) row number and errors.
+    """
+    indexes = list(range(len(dataset)))
+    errors: typing.Dict[int, typing.List[str]] = {}
+    object_ids: typing.Dict[int, typing.Any] = {}
+
+    while len(indexes) > 0:
+        chunk = tablib.Dataset(*[dataset[i] for i in indexes], headers=dataset.headers)
+        result = resource.import_data(chunk, dry_run=False, use_transactions=True)
+
+        if any(result.base_errors):
+            messages = [str(_.error) for _ in result.base_errors]
+            errors.update({index: messages for index in indexes})
+            break
+
+        failed = {
+            indexes[i]: get_row_errors(row)
+            for i, row in enumerate(result.rows)
+            if any(row.errors)
+        }
+
+        if not any(failed):
+            for i, row in enumerate(result.rows):
+                if row.validation_error is not None:
+                    errors[indexes[i]] = get_row_errors(row)
+                else:
+                    object_ids[indexes[i]] = row.object_id
+            break
+
+        errors.update(failed)
+        indexes = [index for index in indexes if index not in failed]
 
     return [
-        dict(
-            id=id,
-            status=(
-                serializers.ResourceStatus.failed.value
-                if any(errors)
-                else serializers.ResourceStatus.queued.value
-            ),
+        (
+            dict(
+                id=None,
+                status=serializers.ResourceStatus.has_errors.value,
+                errors=dict(row=offset + index + 1, messages=errors[index]),
+            )
+            if index in errors
+            else dict(id=object_ids.get(index), status=serializers.ResourceStatus.queued.value)
         )
-        for id, errors in _object_ids
+        for index in range(len(dataset))
     ]
 
 
+def get_row_errors(row) -> typing.List[str]:
+    messages = [str(_.error) for _ in row.errors]
+
+    if row.validation_error is not None:
+        messages += [
+            f"{field}: {', '.join(errors)}" if field != "__all__" else ", ".join(errors)
+            for field, errors in getattr(
+                row.validation_error,
+                "message_dict",
+                {"__all__": row.validation_error.messages},
+            ).items()
+        ]
+
+    return messages
+
+
+def append_batch_operation_resources(
+    batch_id: str,
+    batch_resources: typing.List[dict],
+):
+    """Append the imported chunk resources to the batch operation (row locked)."""
+    with transaction.atomic():
+        batch_operation = (
+            models.BatchOperation.objects.select_for_update().filter(pk=batch_id).first()
+        )
+
+        if batch_operation is None:
+            return
+
+        # a queryset update doesn't trigger the batch operation signals
+        models.BatchOperation.objects.filter(pk=batch_id).update(
+            resources=[*(batch_operation.resources or []), *batch_resources]
+        )
+
+
 def update_batch_operation_resources(
     batch_operation: models.BatchOperation,
     batch_resources: typing.List[dict],
@@ -114,6 +206,26 @@ def update_batch_operation_resources(
         logger.error("Batch operation update error", batch_id=batch_operation.id, error=str(update_error))
 
 
+def retrieve_data_fields(
+    batch_operation: models.BatchOperation,
+    import_data: dict,
+    context: serializers.Context,
+) -> dict:
+    template = (
+        models.DataTemplate.access_by(context)
+        .filter(slug=import_data["data_template"])
+        .first()
+        if "data_template" in import_data
+        else None
+    )
+
+    return getattr(
+        template,
+        "data_fields",
+        serializers.ResourceType.get_default_mapping(batch_operation.resource_type),
+    )
+
+
 def retrieve_context(info: dict) -> serializers.Context:
     org = None
 
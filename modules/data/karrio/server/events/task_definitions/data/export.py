@@ -0,0 +1,31 @@
+from django.http import QueryDict
+
+from karrio.server.core.logging import logger
+import karrio.server.core.utils as utils
+import karrio.server.data.resources as resources
+import karrio.server.data.resources.exports as exports
+from karrio.server.events.task_definitions.data.batch import retrieve_context
+
+
+@utils.tenant_aware
+def trigger_data_export(
+    resource_type: str,
+    export_format: str,
+    query: str,
+    file_path: str,
+    ctx: dict,
+    **kwargs,
+):
+    logger.info("Starting data export", resource_type=resource_type, file_path=file_path)
+    try:
+        context = retrieve_context(ctx)
+        resource = resources.get_export_resource(
+            resource_type, QueryDict(query), context
+        )
+
+        exports.save_export(resource, export_format, file_path)
+    except Exception as e:
+        logger.exception("Data export failed", file_path=file_path, error=str(e))
+        utils.failsafe(lambda: exports.save_export_failure(file_path, e))
+
+    logger.info("Data export complete", file_path=file_path)
@@ -1,23 +1,72 @@
+import typing
+import threading
+from django.conf import settings
+from django.db import connection, transaction
+
+import karrio.lib as lib
+from karrio.core.utils.executor import CarrierLimiter, parse_carrier_limits
 from karrio.server.core.logging import logger
 import karrio.server.core.utils as utils
 import karrio.server.manager.models as models
 import karrio.server.serializers as serializers
+import karrio.server.data.serializers as data_serializers
 from karrio.server.manager.serializers import (
     fetch_shipment_rates,
     can_mutate_shipment,
     buy_shipment_label,
 )
 
+BATCH_SHIPMENTS_CHUNK_SIZE = getattr(settings, "BATCH_SHIPMENTS_CHUNK_SIZE", 50)
+BATCH_SHIPMENTS_CONCURRENCY = getattr(settings, "BATCH_SHIPMENTS_CONCURRENCY", 4)
+BATCH_CARRIER_CONCURRENCY = getattr(settings, "BATCH_CARRIER_CONCURRENCY", "")
+BATCH_CHECKPOINT_SIZE = getattr(settings, "BATCH_CHECKPOINT_SIZE", 10)
+
+# shipments processed at once per carrier by a worker process (all chunks)
+carrier_limiter = CarrierLimiter(
+    default_limit=BATCH_SHIPMENTS_CONCURRENCY,
+    limits=parse_carrier_limits(BATCH_CARRIER_CONCURRENCY),
+)
+
 
 @utils.error_wrapper
-def process_shipments(shipment_ids=[]):
+def process_shipments(shipment_ids=[], schema: str = None, on_processed=None):
+    """Fetch rates and buy labels for the draft shipments concurrently.
+
+    Shipments are processed by up to `BATCH_SHIPMENTS_CONCURRENCY` threads
+    with at most `BATCH_CARRIER_CONCURRENCY` shipments per carrier at once.
+    `on_processed(shipment_id, status)` is called as each shipment is done.
+    """
     logger.info("Starting batch shipments processing", shipment_count=len(shipment_ids))
 
-    shipments = models.Shipment.objects.filter(id__in=shipment_ids, status="draft")
+    shipments = list(
+        models.Shipment.objects.filter(id__in=shipment_ids, status="draft")
+    )
+    caller = threading.get_ident()
+
+    def _process(shipment: models.Shipment):
+        try:
+            with carrier_limiter.slot(get_carrier_name(shipment)):
+                shipment = utils.tenant_aware(process_shipment)(shipment, schema=schema)
+            status = compute_resource_status(shipment)
+        except Exception as e:
+            logger.warning("Batch shipment processing failed", shipment_id=shipment.id, error=str(e))
+            status = data_serializers.ResourceStatus.has_errors.value
+        finally:
+            # don't keep a database connection open per executor thread
+            if threading.get_ident() != caller:
+                connection.close()
+
+        if on_processed is not None:
+            on_processed(shipment.id, status)
+
+        return status
 
     if any(shipments):
-        for shipment in shipments:
-            process_shipment(shipment)
+        if BATCH_SHIPMENTS_CONCURRENCY > 1:
+            lib.run_concurently(_process, shipments, BATCH_SHIPMENTS_CONCURRENCY)
+        else:
+            for shipment in shipments:
+                _process(shipment)
     else:
         logger.info("No shipments found for processing", shipment_ids=shipment_ids)
 
@@ -25,7 +74,7 @@ def process_shipments(shipment_ids=[]):
 
 
 @utils.error_wrapper
-def process_shipment(shipment):
+def process_shipment(shipment, **kwargs):
     preferred_service = shipment.options.get("preferred_service")
     should_purchase = any(preferred_service or "")
     should_update = should_purchase or len(shipment.rates) == 0
@@ -46,3 +95,148 @@ def process_shipment(shipment):
             context=context,
             service=preferred_service,
         )
+
+    return shipment
+
+
+def process_batch_shipments(batch_id: str, shipment_ids: typing.List[str], schema: str = None):
+    """Process a chunk of a batch operation shipments.
+
+    The resources status is checkpointed every `BATCH_CHECKPOINT_SIZE`
+    shipments so a resumed batch skips the ones already processed. The chunk
+    completing the batch computes the final statuses.
+    """
+    logger.info("Processing batch shipments chunk", batch_id=batch_id, shipment_count=len(shipment_ids))
+
+    lock = threading.Lock()
+    pending: typing.Dict[str, str] = {}
+    processed: typing.Set[str] = set()
+
+    def _flush():
+        with lock:
+            statuses = dict(pending)
+            pending.clear()
+
+        checkpoint_resources(batch_id, statuses)
+
+    def _on_processed(shipment_id: str, status: str):
+        with lock:
+            pending[shipment_id] = status
+            processed.add(shipment_id)
+            should_flush = len(pending) >= BATCH_CHECKPOINT_SIZE
+
+        if should_flush:
+            _flush()
+
+    try:
+        process_shipments(
+            shipment_ids=shipment_ids, schema=schema, on_processed=_on_processed
+        )
+    except Exception:
+        # the unprocessed shipments stay queued for the batch to be resumed
+        _flush()
+        raise
+
+    # shipments no longer draft are settled by the batch final status read
+    pending.update(
+        {
+            id: data_serializers.ResourceStatus.processed.value
+            for id in shipment_ids
+            if id not in processed
+        }
+    )
+    _flush()
+    complete_batch(batch_id)
+
+
+def checkpoint_resources(batch_id: str, statuses: typing.Dict[str, str]):
+    """Merge the resources status into the batch operation (row locked)."""
+    from karrio.server.data.models import BatchOperation
+
+    if not any(statuses):
+        return
+
+    with transaction.atomic():
+        batch = BatchOperation.objects.select_for_update().filter(pk=batch_id).first()
+
+        if batch is None:
+            return
+
+        resources = [
+            {**res, "status": statuses.get(res.get("id"), res.get("status"))}
+            for res in (batch.resources or [])
+        ]
+        # a queryset update doesn't trigger the batch operation signals
+        BatchOperation.objects.filter(pk=batch_id).update(resources=resources)
+
+
+def complete_batch(batch_id: str):
+    """Complete the batch operation once none of its shipments is queued.
+
+    The final resources status is computed from a single read of the
+    batch shipments, statuses checkpointed as `has_errors` are kept.
+    """
+    from karrio.server.data.models import BatchOperation
+
+    with transaction.atomic():
+        batch = BatchOperation.objects.select_for_update().filter(pk=batch_id).first()
+
+        if batch is None or batch.status != data_serializers.BatchOperationStatus.running.value:
+            return
+
+        resources = batch.resources or []
+        if any(res.get("status") == data_serializers.ResourceStatus.queued.value for res in resources):
+            return
+
+        shipments = {
+            shipment.id: shipment
+            for shipment in models.Shipment.objects.filter(
+                id__in=[res["id"] for res in resources if res.get("id")]
+            )
+            .select_related(None)
+            .prefetch_related(None)
+            .only("id", "status", "options", "rates", "messages")
+        }
+
+        # failed rows (no id) and shipments that failed processing are kept as is
+        batch.resources = [
+            (
+                res
+                if not res.get("id")
+                or res.get("status") == data_serializers.ResourceStatus.has_errors.value
+                else dict(res, status=compute_resource_status(shipments.get(res["id"])))
+            )
+            for res in resources
+        ]
+        batch.status = data_serializers.BatchOperationStatus.completed.value
+        batch.save(update_fields=["resources", "status"])
+
+    logger.info("Batch shipments processing completed", batch_id=batch_id, resource_count=len(resources))
+
+
+def compute_resource_status(shipment: typing.Optional[models.Shipment]) -> str:
+    if shipment is None:
+        return data_serializers.ResourceStatus.incomplete.value
+    # shipment with service not purchased
+    if any(shipment.options.get("preferred_service") or "") and shipment.status == "draft":
+        return data_serializers.ResourceStatus.incomplete.value
+    # shipment has errors and no rates
+    if len(shipment.rates) == 0 and any(shipment.messages):
+        return data_serializers.ResourceStatus.has_errors.value
+    # shipment is at the right state
+    return data_serializers.ResourceStatus.processed.value
+
+
+def get_carrier_name(shipment: models.Shipment) -> str:
+    """Return the carrier the shipment will be purchased from (best effort)."""
+    preferred_service = shipment.options.get("preferred_service")
+    rates = shipment.rates or []
+
+    return next(
+        (
+            rate.get("carrier_name")
+            for rate in rates
+            if not preferred_service or rate.get("service") == preferred_service
+        ),
+        None,
+    ) or (preferred_service or "").split("_")[0] or "default"
@@ -2,12 +2,13 @@ import io
 import typing
 import base64
 import jinja2
-import weasyprint
+import functools
+from django.conf import settings
 from django.db.models import Sum
-import weasyprint.text.fonts as fonts
 
 import karrio.lib as lib
 import karrio.server.documents.utils as utils
+import karrio.server.documents.rendering as rendering
 import karrio.server.core.dataunits as dataunits
 import karrio.server.orders.models as order_models
 import karrio.server.manager.models as manager_models
@@ -15,21 +16,12 @@ import karrio.server.documents.models as document_models
 import karrio.server.orders.serializers as orders_serializers
 import karrio.server.manager.serializers as manager_serializers
 
-FONT_CONFIG = fonts.FontConfiguration()
+DOCUMENT_TEMPLATE_CACHE_SIZE = getattr(settings, "DOCUMENT_TEMPLATE_CACHE_SIZE", 256)
+DOCUMENT_RENDER_CHUNK_SIZE = getattr(settings, "DOCUMENT_RENDER_CHUNK_SIZE", 50)
+DOCUMENT_RENDER_WORKERS = getattr(settings, "DOCUMENT_RENDER_WORKERS", 1)
+FONT_CONFIG = rendering.FONT_CONFIG
 PAGE_SEPARATOR = '<p style="page-break-before: always"></p>'
-STYLESHEETS = [
-    weasyprint.CSS(url="https://cdn.jsdelivr.net/npm/bulma@0.9.3/css/bulma.min.css"),
-    weasyprint.CSS(
-        string="""
-        @page { margin: 1cm }
-        @font-face {
-            font-family: 'system';
-            src: local('Arial');
-        }
-        body { font-family: 'system', sans-serif; }
-    """
-    ),
-]
+ENVIRONMENT = jinja2.Environment()
 UNITS = {
     "PAGE_SEPARATOR": PAGE_SEPARATOR,
     "CountryISO": lib.units.CountryISO.as_dict(),
@@ -47,6 +39,12 @@ class TemplateRenderingError(Exception):
         super().__init__(self.message)
 
 
+@functools.lru_cache(maxsize=DOCUMENT_TEMPLATE_CACHE_SIZE)
+def compile_template(source: str) -> jinja2.Template:
+    """Return the compiled jinja template of a source (cached by content)."""
+    return ENVIRONMENT.from_string(source)
+
+
 class Documents:
     @staticmethod
     def generate(
@@ -84,12 +82,23 @@ class Documents:
             dict(filename=kwargs.get("doc_name")) if kwargs.get("doc_name") else {}
         )
 
+        prefetch_templates = {}
+        for key, value in options.get("prefetch", {}).items():
+            try:
+                prefetch_templates[key] = compile_template(value)
+            except jinja2.TemplateError:
+                # Invalid prefetch templates render as empty strings
+                prefetch_templates[key] = None
+
         def safe_render_prefetch(ctx):
             """Safely render prefetch templates with error handling"""
             result = {}
-            for key, value in options.get("prefetch", {}).items():
+            for key, template_obj in prefetch_templates.items():
                 try:
-                    template_obj = jinja2.Template(value)
+                    if template_obj is None:
+                        result[key] = ""
+                        continue
+
                     rendered = template_obj.render(
                         **ctx,
                         metadata=metadata,
@@ -104,7 +113,7 @@ class Documents:
             return result
 
         try:
-            jinja_template = jinja2.Template(template)
+            jinja_template = compile_template(template)
         except jinja2.TemplateSyntaxError as e:
             raise TemplateRenderingError(
                 f"Template syntax error: {e.message}",
@@ -155,19 +164,22 @@ class Documents:
                     template_error=e,
                 )
 
-        content = PAGE_SEPARATOR.join(rendered_pages)
+        # Large documents are rendered by chunks of pages in the process pool
+        # and merged. Otherwise the document is rendered at once so CSS
+        # counters and page numbering span every page.
+        chunk_size = lib.identity(
+            max(DOCUMENT_RENDER_CHUNK_SIZE, 1)
+            if DOCUMENT_RENDER_WORKERS > 1
+            else len(rendered_pages)
+        )
+        contents = [
+            PAGE_SEPARATOR.join(rendered_pages[start : start + chunk_size])
+            for start in range(0, len(rendered_pages), chunk_size)
+        ]
 
         # Handle PDF generation errors
         try:
-            buffer = io.BytesIO()
-            html = weasyprint.HTML(string=content, encoding="utf-8")
-            html.write_pdf(
-                buffer,
-                stylesheets=STYLESHEETS,
-                font_config=FONT_CONFIG,
-                optimize_size=("fonts", "images"),
-            )
-            return buffer
+            return rendering.render_pdfs(contents, workers=DOCUMENT_RENDER_WORKERS)
         except Exception as e:
             raise TemplateRenderingError(
                 f"PDF generation error: {str(e)}", template_error=e
@@ -0,0 +1,110 @@
+"""PDF rendering of generated documents.
+
+This module does not depend on Django so it can be imported by the
+rendering worker processes. Large documents are rendered by chunks of pages
+in a process pool and merged into a single PDF.
+"""
+
+import io
+import os
+import typing
+import functools
+import threading
+import multiprocessing
+import concurrent.futures as futures
+import concurrent.futures.process as process
+import PyPDF2
+import weasyprint
+import weasyprint.text.fonts as fonts
+
+BULMA_STYLESHEET = os.path.join(
+    os.path.dirname(__file__), "static", "documents", "css", "bulma.min.css"
+)
+BASE_STYLESHEET = """
+    @page { margin: 1cm }
+    @font-face {
+        font-family: 'system';
+        src: local('Arial');
+    }
+    body { font-family: 'system', sans-serif; }
+"""
+FONT_CONFIG = fonts.FontConfiguration()
+
+_pool: typing.Optional[futures.ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+@functools.lru_cache(maxsize=None)
+def get_stylesheets() -> typing.Tuple[weasyprint.CSS, ...]:
+    """Return the bundled stylesheets (parsed once per process)."""
+    return (
+        weasyprint.CSS(filename=BULMA_STYLESHEET, font_config=FONT_CONFIG),
+        weasyprint.CSS(string=BASE_STYLESHEET, font_config=FONT_CONFIG),
+    )
+
+
+def render_pdf(content: str) -> bytes:
+    buffer = io.BytesIO()
+    html = weasyprint.HTML(string=content, encoding="utf-8")
+    html.write_pdf(
+        buffer,
+        stylesheets=list(get_stylesheets()),
+        font_config=FONT_CONFIG,
+        optimize_size=("fonts", "images"),
+    )
+
+    return buffer.getvalue()
+
+
+def render_pdfs(contents: typing.List[str], workers: int = 1) -> io.BytesIO:
+    """Render HTML chunks to PDF (in the worker pool if `workers` > 1) and merge them."""
+    if len(contents) > 1 and workers > 1:
+        try:
+            documents = list(get_pool(workers).map(render_pdf, contents))
+        except process.BrokenProcessPool:
+            shutdown_pool()
+            documents = [render_pdf(content) for content in contents]
+    else:
+        documents = [render_pdf(content) for content in contents]
+
+    if len(documents) == 1:
+        return io.BytesIO(documents[0])
+
+    return merge_pdfs(documents)
+
+
+def merge_pdfs(documents: typing.List[bytes]) -> io.BytesIO:
+    buffer = io.BytesIO()
+    merger = PyPDF2.PdfMerger()
+
+    for document in documents:
+        merger.append(io.BytesIO(document))
+
+    merger.write(buffer)
+    merger.close()
+
+    return buffer
+
+
+def get_pool(workers: int) -> futures.ProcessPoolExecutor:
+    """Return the process wide rendering pool (spawned, so safe in threaded servers)."""
+    global _pool
+
+    with _pool_lock:
+        if _pool is None:
+            _pool = futures.ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+
+    return _pool
+
+
+def shutdown_pool():
+    global _pool
+
+    with _pool_lock:
+        pool, _pool = _pool, None
+
+    if pool is not None:
+        pool.shutdown(wait=False, cancel_futures=True)
@@ -1,6 +1,8 @@
+import io
 import json
 import base64
-from unittest.mock import ANY
+import PyPDF2
+from unittest.mock import ANY, patch
 from django.urls import reverse
 from rest_framework import status
 from karrio.server.core.tests import APITestCase
@@ -8,6 +10,7 @@ from karrio.server.core.utils import ResourceAccessToken
 from karrio.server.documents.models import DocumentTemplate
 import karrio.server.manager.models as manager_models
 import karrio.server.orders.models as order_models
+import karrio.server.documents.generator as generator
 
 
 class TestDocumentGenerator(APITestCase):
@@ -329,6 +332,48 @@ class TestDocumentGeneratorIntegration(APITestCase):
             self.fail(f"Invalid base64 PDF content: {e}")
 
 
+class TestDocumentRendering(APITestCase):
+    def test_compiled_template_cache(self):
+        template = generator.compile_template(SIMPLE_HTML_TEMPLATE)
+
+        self.assertIs(generator.compile_template(SIMPLE_HTML_TEMPLATE), template)
+        self.assertIsNot(
+            generator.compile_template(SIMPLE_HTML_TEMPLATE + " "), template
+        )
+
+    def test_generate_multi_page_document(self):
+        contexts = [dict(data=dict(title=f"Page {index}")) for index in range(5)]
+
+        with patch.object(generator, "DOCUMENT_RENDER_CHUNK_SIZE", 2), patch.object(
+            generator, "DOCUMENT_RENDER_WORKERS", 1
+        ):
+            document = generator.Documents.generate(
+                "<h1>{{ data.title }}</h1>",
+                data=dict(generic_context=contexts),
+            )
+
+        pdf = PyPDF2.PdfReader(io.BytesIO(document.getvalue()))
+        self.assertEqual(len(pdf.pages), 5)
+        self.assertIn("Page 4", pdf.pages[4].extract_text())
+
+    def test_chunk_documents_only_for_the_process_pool(self):
+        contexts = [dict(data=dict(title=f"Page {index}")) for index in range(5)]
+
+        for workers, chunks in [(1, 1), (2, 3)]:
+            with patch.object(
+                generator, "DOCUMENT_RENDER_CHUNK_SIZE", 2
+            ), patch.object(generator, "DOCUMENT_RENDER_WORKERS", workers), patch.object(
+                generator.rendering, "render_pdfs"
+            ) as render_pdfs:
+                generator.Documents.generate(
+                    "<h1>{{ data.title }}</h1>",
+                    data=dict(generic_context=contexts),
+                )
+
+            contents = render_pdfs.call_args.args[0]
+            self.assertEqual(len(contents), chunks)
+
+
 # Test Data and Fixtures
 SIMPLE_HTML_TEMPLATE = """
 <!DOCTYPE html>
@@ -1,11 +1,10 @@
-import io
 import sys
-import base64
+from django.conf import settings
 from django.urls import re_path
 from django.utils import timezone
 from django.http import JsonResponse
 from django.core.files.base import ContentFile
-from django_downloadview import VirtualDownloadView
+from django_downloadview import VirtualDownloadView, VirtualFile
 from rest_framework import status
 
 import karrio.lib as lib
@@ -15,6 +14,8 @@ import karrio.server.documents.generator as generator
 from karrio.server.core.logging import logger
 from karrio.server.core.utils import validate_resource_token
 
+DOCUMENT_BUNDLE_CHUNK_SIZE = getattr(settings, "DOCUMENT_BUNDLE_CHUNK_SIZE", 100)
+
 
 class TemplateDocsPrinter(VirtualDownloadView):
     def get(self, request, pk: str, slug: str, **kwargs):
@@ -59,7 +60,40 @@ class TemplateDocsPrinter(VirtualDownloadView):
         return ContentFile(self.document.getvalue(), name=self.name)
 
 
-class ShipmentDocsPrinter(VirtualDownloadView):
+class Documents:
+    """Re-iterable documents of a queryset, fetched by chunks from a server-side cursor."""
+
+    def __init__(self, queryset, field: str):
+        self.queryset = queryset
+        self.field = field
+
+    def __iter__(self):
+        return (
+            self.queryset.prefetch_related(None)
+            .values_list(self.field, flat=True)
+            .iterator(chunk_size=DOCUMENT_BUNDLE_CHUNK_SIZE)
+        )
+
+
+class BundleFile(VirtualFile):
+    """Document bundle generated while the response is streamed."""
+
+    @property
+    def size(self):
+        raise NotImplementedError("The bundle size is only known once streamed")
+
+    def __iter__(self):
+        return iter(self.file)
+
+
+class BundleDocsPrinter(VirtualDownloadView):
+    def get_file(self):
+        return BundleFile(
+            lib.stream_bundle(self.documents, self.format.upper()), name=self.name
+        )
+
+
+class ShipmentDocsPrinter(BundleDocsPrinter):
     @openapi.extend_schema(exclude=True)
     def get(self, request, doc: str = "label", format: str = "pdf", **kwargs):
         """Retrieve batch shipment labels or invoices."""
@@ -92,26 +126,19 @@ class ShipmentDocsPrinter(VirtualDownloadView):
         elif doc == "invoice":
             _queryset = _queryset.filter(invoice__isnull=False)
 
-        self.documents = _queryset.values_list(doc, "label_type")
+        self.documents = Documents(_queryset, doc)
 
         response = super().get(request, doc, self.format, **kwargs)
         response["X-Frame-Options"] = "ALLOWALL"
         return response
 
-    def get_file(self):
-        content = base64.b64decode(
-            lib.bundle_base64([doc for doc, _ in self.documents], self.format.upper())
-        )
-        buffer = io.BytesIO()
-        buffer.write(content)
-        return ContentFile(buffer.getvalue(), name=self.name)
-
 
-class OrderDocsPrinter(VirtualDownloadView):
+class OrderDocsPrinter(BundleDocsPrinter):
     @openapi.extend_schema(exclude=True)
     def get(self, request, doc: str = "label", format: str = "pdf", **kwargs):
         """Retrieve batch order labels or invoices."""
         from karrio.server.orders.models import Order
+        from karrio.server.manager.models import Shipment
 
         if doc not in ["label", "invoice"]:
             return JsonResponse(
@@ -131,36 +158,26 @@ class OrderDocsPrinter(VirtualDownloadView):
         self.format = (format or "").lower()
         self.name = f"{doc}s - {timezone.now()}.{self.format}"
 
-        _queryset = Order.objects.filter(
-            id__in=resource_ids, shipments__id__isnull=False
-        ).distinct()
+        _queryset = Shipment.objects.filter(
+            id__in=Order.objects.filter(id__in=resource_ids).values("shipments__id")
+        )
 
         if doc == "label":
             _queryset = _queryset.filter(
-                shipments__label__isnull=False,
-                shipments__label_type__contains=self.format.upper(),
+                label__isnull=False,
+                label_type__contains=self.format.upper(),
             )
         elif doc == "invoice":
-            _queryset = _queryset.filter(shipments__invoice__isnull=False)
+            _queryset = _queryset.filter(invoice__isnull=False)
 
-        self.documents = list(
-            set(_queryset.values_list(f"shipments__{doc}", "shipments__label_type"))
-        )
+        self.documents = Documents(_queryset, doc)
 
         response = super().get(request, doc, self.format, **kwargs)
         response["X-Frame-Options"] = "ALLOWALL"
         return response
 
-    def get_file(self):
-        content = base64.b64decode(
-            lib.bundle_base64([doc for doc, _ in self.documents], self.format.upper())
-        )
-        buffer = io.BytesIO()
-        buffer.write(content)
-        return ContentFile(buffer.getvalue(), name=self.name)
-
 
-class ManifestDocsPrinter(VirtualDownloadView):
+class ManifestDocsPrinter(BundleDocsPrinter):
     @openapi.extend_schema(exclude=True)
     def get(self, request, doc: str = "manifest", format: str = "pdf", **kwargs):
         """Retrieve batch manifests."""
@@ -184,20 +201,12 @@ class ManifestDocsPrinter(VirtualDownloadView):
         self.name = f"{doc}s - {timezone.now()}.{self.format}"
 
         queryset = Manifest.objects.filter(id__in=resource_ids, manifest__isnull=False)
-        self.documents = queryset.values_list(doc, "reference")
+        self.documents = Documents(queryset, doc)
 
         response = super().get(request, doc, self.format, **kwargs)
         response["X-Frame-Options"] = "ALLOWALL"
         return response
 
-    def get_file(self):
-        content = base64.b64decode(
-            lib.bundle_base64([doc for doc, _ in self.documents], self.format.upper())
-        )
-        buffer = io.BytesIO()
-        buffer.write(content)
-        return ContentFile(buffer.getvalue(), name=self.name)
-
 
 urlpatterns = [
     re_path(
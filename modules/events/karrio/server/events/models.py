@@ -83,3 +83,50 @@ class Event(core.OwnedEntity):
     @property
     def object_type(self):
         return "event"
+
+
+class WebhookDelivery(core.Entity):
+    class Meta:
+        db_table = "webhook_delivery"
+        verbose_name = "Webhook Delivery"
+        verbose_name_plural = "Webhook Deliveries"
+        ordering = ["-created_at"]
+        indexes = [
+            # Index for the retry sweep of pending deliveries
+            models.Index(
+                fields=["next_attempt_at"],
+                condition=models.Q(status="pending"),
+                name="webhook_delivery_due_idx",
+            ),
+        ]
+
+    id = models.CharField(
+        max_length=50,
+        primary_key=True,
+        default=partial(core.uuid, prefix="whd_"),
+        editable=False,
+    )
+
+    webhook = models.ForeignKey(
+        Webhook, on_delete=models.CASCADE, related_name="deliveries"
+    )
+    event = models.ForeignKey(
+        Event, on_delete=models.CASCADE, related_name="deliveries"
+    )
+    status = models.CharField(
+        max_length=20,
+        choices=serializers.DELIVERY_STATUS,
+        default=serializers.DeliveryStatus.pending.value,
+        db_index=True,
+    )
+    event_at = models.DateTimeField(null=True)
+    attempts = models.IntegerField(default=0)
+    next_attempt_at = models.DateTimeField(null=True)
+    delivered_at = models.DateTimeField(null=True)
+    response_status = models.IntegerField(null=True)
+    response_body = models.TextField(null=True, blank=True)
+    error = models.TextField(null=True, blank=True)
+
+    @property
+    def object_type(self):
+        return "webhook_delivery"
@@ -0,0 +1,106 @@
+"""Webhook event outbox.
+
+Events published while a transaction is open are buffered and enqueued once
+it commits (and dropped if it rolls back). Events published inside a
+`batch()` scope are enqueued when the scope exits. Buffered events are
+grouped by tenant and context and sent as `notify_webhook_events` tasks of
+at most `EVENT_OUTBOX_BATCH_SIZE` events, so bulk updates do not enqueue one
+task per row.
+"""
+
+import json
+import typing
+import functools
+import itertools
+import threading
+import contextlib
+from django.db import transaction
+from django.conf import settings
+
+from karrio.server.core.logging import logger
+
+EVENT_OUTBOX_BATCH_SIZE = getattr(settings, "EVENT_OUTBOX_BATCH_SIZE", 100)
+
+# (schema, context, event)
+Entry = typing.Tuple[typing.Optional[str], dict, dict]
+
+_local = threading.local()
+
+
+def publish(
+    event: str,
+    data: dict,
+    event_at: typing.Any,
+    ctx: dict,
+    schema: str = None,
+):
+    """Queue a webhook event for delivery."""
+    entry = (schema, ctx, dict(event=event, data=data, event_at=event_at))
+
+    if getattr(_local, "depth", 0) > 0:
+        _local.entries.append(entry)
+    else:
+        dispatch([entry])
+
+
+@contextlib.contextmanager
+def batch():
+    """Buffer the events published in this scope and enqueue them on exit."""
+    depth = getattr(_local, "depth", 0)
+
+    if depth == 0:
+        _local.entries = []
+
+    _local.depth = depth + 1
+
+    try:
+        yield
+    finally:
+        _local.depth -= 1
+
+        if _local.depth == 0:
+            entries, _local.entries = _local.entries, []
+            dispatch(entries)
+
+
+def dispatch(entries: typing.List[Entry]):
+    """Enqueue events now or after the current transaction commits."""
+    if not any(entries):
+        return
+
+    connection = transaction.get_connection()
+
+    if not connection.in_atomic_block:
+        return flush(entries)
+
+    pending, callback = getattr(_local, "pending", (None, None))
+    registered = any(hook[1] is callback for hook in connection.run_on_commit)
+
+    # commit hooks are cleared once run or rolled back: start a new buffer
+    if pending is None or not registered:
+        pending = []
+        callback = functools.partial(flush, pending)
+        _local.pending = (pending, callback)
+        transaction.on_commit(callback)
+
+    pending.extend(entries)
+
+
+def flush(entries: typing.List[Entry]):
+    import karrio.server.events.tasks as tasks
+
+    key = lambda entry: (
+        entry[0] or "",
+        json.dumps(entry[1], sort_keys=True, default=str),
+    )
+
+    for _, group in itertools.groupby(sorted(entries, key=key), key=key):
+        group = list(group)
+        schema, ctx, _ = group[0]
+
+        for start in range(0, len(group), EVENT_OUTBOX_BATCH_SIZE):
+            events = [
+                event for *_, event in group[start : start + EVENT_OUTBOX_BATCH_SIZE]
+            ]
+            logger.debug("Enqueuing webhook events", event_count=len(events))
+            tasks.notify_webhook_events(events, ctx, schema=schema)
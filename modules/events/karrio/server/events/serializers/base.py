@@ -10,6 +10,7 @@ class EventTypes(lib.StrEnum):
     shipment_out_for_delivery = "shipment_out_for_delivery"
     shipment_needs_attention = "shipment_needs_attention"
     shipment_delivery_failed = "shipment_delivery_failed"
+    shipment_invoice_generated = "shipment_invoice_generated"
     tracker_created = "tracker_created"
     tracker_updated = "tracker_updated"
     order_created = "order_created"
@@ -26,6 +27,15 @@ class EventTypes(lib.StrEnum):
 EVENT_TYPES = [(c.value, c.value) for c in list(EventTypes)]
 
 
+class DeliveryStatus(lib.StrEnum):
+    pending = "pending"
+    succeeded = "succeeded"
+    failed = "failed"
+
+
+DELIVERY_STATUS = [(c.value, c.value) for c in list(DeliveryStatus)]
+
+
 class WebhookData(serializers.Serializer):
     url = serializers.URLField(
         required=True, help_text="The URL of the webhook endpoint."
@@ -1,3 +1,4 @@
+from django.db import transaction
 from django.db.models import signals
 
 from karrio.server.core import utils
@@ -6,11 +7,12 @@ from karrio.server.conf import settings
 from karrio.server.events.serializers import EventTypes
 import karrio.server.core.serializers as serializers
 import karrio.server.manager.models as models
-import karrio.server.events.tasks as tasks
+import karrio.server.events.outbox as outbox
 
 
 def register_signals():
     signals.post_save.connect(shipment_updated, sender=models.Shipment)
+    signals.post_save.connect(shipment_invoice_queued, sender=models.Shipment)
     signals.post_delete.connect(shipment_cancelled, sender=models.Shipment)
     signals.post_save.connect(tracker_updated, sender=models.Tracking)
 
@@ -25,9 +27,11 @@ def shipment_updated(
     """Shipment related events:
     - shipment purchased (label purchased)
     - shipment fulfilled (shipped)
+    - shipment invoice generated
     """
     is_bound = "created_at" in (update_fields or [])
     status_updated = "status" in (update_fields or [])
+    invoice_updated = "invoice_status" in (update_fields or [])
 
     if created:
         return
@@ -61,6 +65,11 @@ def shipment_updated(
         and instance.status == serializers.ShipmentStatus.delivery_failed.value
     ):
         event = EventTypes.shipment_delivery_failed.value
+    elif (
+        invoice_updated
+        and instance.invoice_status == serializers.InvoiceStatus.generated.value
+    ):
+        event = EventTypes.shipment_invoice_generated.value
     else:
         return
 
@@ -77,7 +86,31 @@ def shipment_updated(
     if settings.MULTI_ORGANIZATIONS and context["org_id"] is None:
         return
 
-    tasks.notify_webhooks(event, data, event_at, context, schema=settings.schema)
+    outbox.publish(event, data, event_at, context, schema=settings.schema)
+
+
+@utils.disable_for_loaddata
+@utils.error_wrapper
+def shipment_invoice_queued(
+    sender, instance, created, raw, using, update_fields, *args, **kwargs
+):
+    """Generate the custom invoice of a shipment marked as pending in the background."""
+    if "invoice_status" not in (update_fields or []):
+        return
+    if instance.invoice_status != serializers.InvoiceStatus.pending.value:
+        return
+
+    import karrio.server.events.tasks as tasks
+
+    shipment_id = instance.id
+    idempotency_key = (instance.meta or {}).get("invoice_idempotency_key")
+    schema = settings.schema
+
+    transaction.on_commit(
+        lambda: tasks.generate_shipment_invoice(
+            shipment_id, idempotency_key, schema=schema
+        )
+    )
 
 
 @utils.disable_for_loaddata
@@ -99,7 +132,7 @@ def shipment_cancelled(sender, instance, *args, **kwargs):
     if settings.MULTI_ORGANIZATIONS and context["org_id"] is None:
         return
 
-    tasks.notify_webhooks(event, data, event_at, context, schema=settings.schema)
+    outbox.publish(event, data, event_at, context, schema=settings.schema)
 
 
 @utils.disable_for_loaddata
@@ -133,4 +166,4 @@ def tracker_updated(
     if settings.MULTI_ORGANIZATIONS and context["org_id"] is None:
         return
 
-    tasks.notify_webhooks(event, data, event_at, context, schema=settings.schema)
+    outbox.publish(event, data, event_at, context, schema=settings.schema)
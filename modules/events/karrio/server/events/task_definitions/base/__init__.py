@@ -1,19 +1,24 @@
 import logging
 from django.conf import settings
 from huey import crontab
-from huey.contrib.djhuey import db_task, db_periodic_task
+from huey.exceptions import TaskLockedException
+from huey.contrib.djhuey import db_task, db_periodic_task, lock_task
 
 import karrio.server.core.utils as utils
 from karrio.server.core.telemetry import with_task_telemetry
 
 logger = logging.getLogger(__name__)
 DATA_ARCHIVING_SCHEDULE = int(getattr(settings, "DATA_ARCHIVING_SCHEDULE", 168))
-DEFAULT_TRACKERS_UPDATE_INTERVAL = int(
-    getattr(settings, "DEFAULT_TRACKERS_UPDATE_INTERVAL", 7200) / 60
+# Trackers carry their own next poll time, the sweep only picks up the due ones.
+TRACKERS_SWEEP_INTERVAL = max(
+    int(getattr(settings, "TRACKERS_SWEEP_INTERVAL", 900) / 60), 1
+)
+USAGE_ROLLUP_INTERVAL = max(
+    int(getattr(settings, "USAGE_ROLLUP_INTERVAL", 600) / 60), 1
 )
 
 
-@db_periodic_task(crontab(minute=f"*/{DEFAULT_TRACKERS_UPDATE_INTERVAL}"))
+@db_periodic_task(crontab(minute=f"*/{TRACKERS_SWEEP_INTERVAL}"))
 @with_task_telemetry("background_trackers_update")
 def background_trackers_update():
     from karrio.server.events.task_definitions.base import tracking
@@ -25,6 +30,18 @@ def background_trackers_update():
     _run()
 
 
+@db_periodic_task(crontab(minute="*"))
+@with_task_telemetry("background_webhook_deliveries")
+def background_webhook_deliveries():
+    from karrio.server.events.task_definitions.base import webhook
+
+    @utils.run_on_all_tenants
+    def _run(**kwargs):
+        webhook.retry_webhook_deliveries()
+
+    _run()
+
+
 @db_task(retries=5, retry_delay=60)
 @utils.tenant_aware
 @with_task_telemetry("notify_webhooks")
@@ -34,6 +51,24 @@ def notify_webhooks(*args, **kwargs):
     webhook.notify_webhook_subscribers(*args, **kwargs)
 
 
+@db_task(retries=5, retry_delay=60)
+@utils.tenant_aware
+@with_task_telemetry("notify_webhook_events")
+def notify_webhook_events(*args, **kwargs):
+    from karrio.server.events.task_definitions.base import webhook
+
+    webhook.notify_webhook_events(*args, **kwargs)
+
+
+@db_task(retries=3, retry_delay=60)
+@utils.tenant_aware
+@with_task_telemetry("generate_shipment_invoice")
+def generate_shipment_invoice(*args, **kwargs):
+    from karrio.server.events.task_definitions.base import invoice
+
+    invoice.generate_shipment_invoice(*args, **kwargs)
+
+
 @db_periodic_task(crontab(hour=f"*/{DATA_ARCHIVING_SCHEDULE}"))
 @with_task_telemetry("periodic_data_archiving")
 def periodic_data_archiving(*args, **kwargs):
@@ -49,8 +84,32 @@ def periodic_data_archiving(*args, **kwargs):
     _run()
 
 
+@db_periodic_task(crontab(minute=f"*/{USAGE_ROLLUP_INTERVAL}"))
+@with_task_telemetry("periodic_usage_rollup")
+def periodic_usage_rollup(*args, **kwargs):
+    import karrio.server.core.usage as usage
+
+    @utils.run_on_all_tenants
+    def _run(**kwargs):
+        utils.failsafe(
+            lambda: usage.compact_usage(),
+            "An error occured during usage rollup: $error",
+        )
+
+    # a long backfill can outlast the rollup interval, runs must not overlap
+    try:
+        with lock_task("periodic_usage_rollup"):
+            _run()
+    except TaskLockedException:
+        logger.info("Skipping usage rollup, a previous run is in progress")
+
+
 TASK_DEFINITIONS = [
     background_trackers_update,
+    background_webhook_deliveries,
     periodic_data_archiving,
+    periodic_usage_rollup,
     notify_webhooks,
+    notify_webhook_events,
+    generate_shipment_invoice,
 ]
@@ -0,0 +1,43 @@
+from karrio.server.core.logging import logger
+from karrio.server.core.serializers import InvoiceStatus
+import karrio.server.manager.models as models
+import karrio.server.manager.serializers.shipment as serializers
+
+
+def generate_shipment_invoice(shipment_id: str, idempotency_key: str, **kwargs):
+    """Generate the custom invoice of a purchased shipment.
+
+    The job is a no-op if the invoice was already generated for the same
+    idempotency key or if the shipment was re-queued with a newer key.
+    A failure marks the invoice as failed and is re-raised so the task is retried.
+    """
+    shipment = models.Shipment.objects.filter(id=shipment_id).first()
+
+    if shipment is None:
+        logger.warning(
+            "Shipment not found for invoice generation", shipment_id=shipment_id
+        )
+        return
+
+    if (shipment.meta or {}).get("invoice_idempotency_key") != idempotency_key:
+        logger.info("Skipping superseded invoice generation", shipment_id=shipment_id)
+        return
+
+    if shipment.invoice_status == InvoiceStatus.generated.value:
+        logger.info("Invoice already generated", shipment_id=shipment_id)
+        return
+
+    template = (shipment.options or {}).get("invoice_template")
+
+    try:
+        serializers.generate_custom_invoice(template, shipment)
+    except Exception as e:
+        logger.exception(
+            "Failed to generate shipment invoice",
+            shipment_id=shipment_id,
+            template=template,
+            error=str(e),
+        )
+        shipment.invoice_status = InvoiceStatus.failed.value
+        shipment.save(update_fields=["invoice_status"])
+        raise
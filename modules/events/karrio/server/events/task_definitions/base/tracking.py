@@ -2,32 +2,79 @@ import time
 import typing
 import datetime
 import functools
-from itertools import groupby
+import itertools
+import threading
 
 from django.conf import settings
+from django.db.models import Q
 from django.utils import timezone
 
 import karrio.sdk as karrio
 import karrio.lib as lib
+import karrio.references as references
 from karrio.api.gateway import Gateway
 from karrio.api.interface import IRequestFrom
 from karrio.core.models import TrackingDetails, Message, TrackingEvent
 
 import karrio.server.core.utils as utils
+import karrio.server.events.outbox as outbox
 from karrio.server.core.logging import logger
 import karrio.server.manager.models as models
 import karrio.server.tracing.utils as tracing
 import karrio.server.core.datatypes as datatypes
 import karrio.server.manager.serializers as serializers
-Delay = int
-RequestBatches = typing.Tuple[
-    Gateway, IRequestFrom, Delay, typing.List[models.Tracking]
-]
-BatchResponse = typing.List[typing.Tuple[TrackingDetails, typing.List[Message]]]
 
 DEFAULT_TRACKERS_UPDATE_INTERVAL = getattr(
     settings, "DEFAULT_TRACKERS_UPDATE_INTERVAL", 7200
 )
+TRACKERS_MIN_POLL_INTERVAL = getattr(settings, "TRACKERS_MIN_POLL_INTERVAL", 900)
+TRACKERS_MAX_POLL_INTERVAL = getattr(settings, "TRACKERS_MAX_POLL_INTERVAL", 86400)
+TRACKERS_UPDATE_CONCURRENCY = getattr(settings, "TRACKERS_UPDATE_CONCURRENCY", 8)
+TRACKING_CARRIER_LIMITS = getattr(settings, "TRACKING_CARRIER_LIMITS", "")
+DEFAULT_TRACKING_BATCH_SIZE = 10
+DEFAULT_TRACKING_RATE_LIMIT = 5.0  # tracking numbers per second per connection
+
+# Poll interval multiplier (of DEFAULT_TRACKERS_UPDATE_INTERVAL) per tracker status.
+# `None` polls at the max interval (terminal statuses).
+STATUS_POLL_FACTORS: typing.Dict[str, typing.Optional[float]] = {
+    "out_for_delivery": 0.25,
+    "delivery_failed": 0.5,
+    "delivery_delayed": 0.5,
+    "ready_for_pickup": 0.5,
+    "on_hold": 0.5,
+    "in_transit": 1.0,
+    "return_to_sender": 1.0,
+    "pending": 2.0,
+    "unknown": 2.0,
+    "cancelled": None,
+    "delivered": None,
+}
+
+
+class RateLimiter:
+    """Pace the tracking numbers sent to a carrier connection (thread-safe)."""
+
+    def __init__(self, rate: typing.Optional[float] = None):
+        self.rate = rate
+        self._next = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, count: int = 1):
+        if not self.rate:
+            return
+
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next)
+            self._next = start + (count / self.rate)
+
+        time.sleep(max(start - now, 0))
+
+
+RequestBatches = typing.Tuple[
+    Gateway, IRequestFrom, RateLimiter, typing.List[models.Tracking]
+]
+BatchResponse = typing.List[typing.Tuple[TrackingDetails, typing.List[Message]]]
 
 
 def update_trackers(
@@ -38,80 +85,160 @@ def update_trackers(
 ):
     logger.info("Starting scheduled trackers update", delta_seconds=delta.seconds, tracker_count=len(tracker_ids) if tracker_ids else 0)
 
-    # TrackingManager now handles all necessary prefetching including carrier config
-    active_trackers = lib.identity(
+    active_trackers = get_active_trackers(delta, tracker_ids)
+    request_batches = create_carrier_request_batches(active_trackers)
+    window_size = TRACKERS_UPDATE_CONCURRENCY * 4
+    updated_count = 0
+
+    # process the streamed batches by windows to bound memory usage
+    while True:
+        window = list(itertools.islice(request_batches, window_size))
+
+        if not any(window):
+            break
+
+        trackers = [tracker for *_, batch_trackers in window for tracker in batch_trackers]
+        responses = lib.run_concurently(
+            fetch_tracking_info, window, TRACKERS_UPDATE_CONCURRENCY
+        )
+        save_tracing_records(window)
+        with outbox.batch():
+            save_updated_trackers(responses, trackers)
+        schedule_next_polls(trackers)
+        updated_count += len(trackers)
+
+    if updated_count == 0:
+        logger.info("No active trackers found needing update")
+
+    logger.info("Finished scheduled trackers update", tracker_count=updated_count)
+
+
+def get_active_trackers(
+    delta: datetime.timedelta,
+    tracker_ids: typing.List[str] = [],
+) -> typing.Iterator[models.Tracking]:
+    """Stream the trackers due for a refresh ordered by carrier connection.
+
+    Trackers are due when their `next_poll_at` has passed. Trackers never
+    scheduled yet fall back to the fixed `delta` since their last update.
+    """
+    now = timezone.now()
+    queryset = lib.identity(
         models.Tracking.objects.filter(id__in=tracker_ids)
         if any(tracker_ids)
         else models.Tracking.objects.filter(
+            Q(next_poll_at__lte=now)
+            | Q(next_poll_at__isnull=True, updated_at__lt=now - delta),
             delivered=False,
-            updated_at__lt=timezone.now() - delta,
         )
     )
 
-    if any(active_trackers):
-        trackers_grouped_by_carrier = [
-            list(g) for _, g in groupby(active_trackers, key=lambda t: t.carrier_id)
-        ]
-        request_batches: typing.List[RequestBatches] = sum(
-            [create_request_batches(group) for group in trackers_grouped_by_carrier], []
-        )
+    return (
+        queryset.select_related("tracking_carrier")
+        .order_by("tracking_carrier_id", "next_poll_at")
+        .iterator(chunk_size=500)
+    )
 
-        responses = lib.run_concurently(fetch_tracking_info, request_batches, 2)
-        save_tracing_records(request_batches)
-        save_updated_trackers(responses, active_trackers)
-    else:
-        logger.info("No active trackers found needing update")
 
-    logger.info("Finished scheduled trackers update")
+def get_carrier_limits(
+    carrier_name: str,
+) -> typing.Tuple[int, typing.Optional[float]]:
+    """Return the (batch size, tracking numbers per second) of a carrier.
+
+    `TRACKING_CARRIER_LIMITS` ("fedex:30:10,ups:1:5") overrides the limits
+    declared by the carrier plugin metadata.
+    """
+    overrides = parse_carrier_limits(TRACKING_CARRIER_LIMITS)
+    metadata = references.PROVIDERS.get(carrier_name)
+    batch_size, rate_limit = overrides.get(carrier_name, (None, None))
+
+    return (
+        batch_size
+        or getattr(metadata, "tracking_batch_size", None)
+        or DEFAULT_TRACKING_BATCH_SIZE,
+        rate_limit
+        or getattr(metadata, "tracking_rate_limit", None)
+        or DEFAULT_TRACKING_RATE_LIMIT,
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def parse_carrier_limits(
+    value: str,
+) -> typing.Dict[str, typing.Tuple[int, typing.Optional[float]]]:
+    limits = {}
+
+    for entry in (value or "").split(","):
+        name, *values = [part.strip() for part in entry.split(":")]
+        if not name or not any(values):
+            continue
+
+        batch_size = lib.failsafe(lambda: int(values[0])) or None
+        rate_limit = lib.failsafe(lambda: float(values[1])) if len(values) > 1 else None
+        limits[name] = (batch_size, rate_limit or None)
+
+    return limits
+
+
+def create_carrier_request_batches(
+    trackers: typing.Iterable[models.Tracking],
+) -> typing.Iterator[RequestBatches]:
+    """Group the carrier ordered trackers stream into request batches."""
+    for _, group in itertools.groupby(trackers, key=lambda t: t.tracking_carrier_id):
+        carrier_trackers = iter(group)
+        first = next(carrier_trackers)
+        carrier = first.tracking_carrier
+        batch_size, rate_limit = get_carrier_limits(carrier.ext)
+        limiter = RateLimiter(rate_limit)
+        remaining = itertools.chain([first], carrier_trackers)
+
+        while True:
+            batch = list(itertools.islice(remaining, batch_size))
+
+            if not any(batch):
+                break
+
+            yield from create_request_batches(batch, limiter=limiter)
 
 
 def create_request_batches(
     trackers: typing.List[models.Tracking],
+    limiter: RateLimiter = None,
 ) -> typing.List[RequestBatches]:
-    start = 0
-    end = 10
     batches = []
 
-    while any(trackers[start:end]):
-        try:
-            # Add a request delay to avoid sending two request batches to a carrier at the same time
-            delay = int(((end / 10) * 10) - 10)
-            # Get the common tracking carrier
-            carrier = trackers[0].tracking_carrier
-            # Collect the 5 trackers between the start and end indexes
-            batch_trackers = trackers[start:end]
-            tracking_numbers = [t.tracking_number for t in batch_trackers]
-            options: dict = functools.reduce(
-                lambda acc, t: {**acc, **(t.options or {})}, batch_trackers, {}
-            )
+    try:
+        # Get the common tracking carrier
+        carrier = trackers[0].tracking_carrier
+        tracking_numbers = [t.tracking_number for t in trackers]
+        options: dict = functools.reduce(
+            lambda acc, t: {**acc, **(t.options or {})}, trackers, {}
+        )
 
-            logger.debug("Preparing tracking request", tracking_numbers=tracking_numbers, batch_range=(start, end))
+        logger.debug("Preparing tracking request", tracking_numbers=tracking_numbers)
 
-            # Prepare and send tracking request(s) using the karrio interface.
-            request: IRequestFrom = karrio.Tracking.fetch(
-                datatypes.TrackingRequest(
-                    tracking_numbers=tracking_numbers, options=options
-                )
+        # Prepare and send tracking request(s) using the karrio interface.
+        request: IRequestFrom = karrio.Tracking.fetch(
+            datatypes.TrackingRequest(
+                tracking_numbers=tracking_numbers, options=options
             )
-            gateway: Gateway = carrier.gateway
-
-            batches.append((gateway, request, delay, batch_trackers))
+        )
+        gateway: Gateway = carrier.gateway
 
-        except Exception as request_error:
-            logger.warning("Failed to prepare tracking batch request", batch_range=(start, end), error=str(request_error))
-            logger.exception("Tracking batch request preparation error", batch_range=(start, end))
+        batches.append((gateway, request, limiter or RateLimiter(), trackers))
 
-        end += 10
-        start += 10
+    except Exception as request_error:
+        logger.warning("Failed to prepare tracking batch request", tracker_count=len(trackers), error=str(request_error))
+        logger.exception("Tracking batch request preparation error", tracker_count=len(trackers))
 
     return batches
 
 
 def fetch_tracking_info(request_batch: RequestBatches) -> BatchResponse:
-    gateway, request, delay, trackers = request_batch
+    gateway, request, limiter, trackers = request_batch
     tracking_numbers = [t.tracking_number for t in trackers]
-    logger.debug("Fetching tracking batch", tracking_numbers=tracking_numbers, delay_seconds=delay)
-    time.sleep(delay)  # apply delay before request
+    logger.debug("Fetching tracking batch", tracking_numbers=tracking_numbers)
+    limiter.acquire(len(tracking_numbers))  # honour the carrier rate limit
 
     try:
         return utils.identity(lambda: request.from_(gateway).parse())
@@ -144,14 +271,15 @@ def save_updated_trackers(
     responses: typing.List[BatchResponse], trackers: typing.List[models.Tracking]
 ):
     logger.info("Saving updated trackers", tracker_count=len(trackers))
+    trackers_by_number: typing.Dict[str, typing.List[models.Tracking]] = {}
+    for tracker in trackers:
+        trackers_by_number.setdefault(tracker.tracking_number, []).append(tracker)
 
-    for tracking_details, _ in responses:
+    for tracking_details, _ in [r for r in responses if isinstance(r, tuple)]:
         for details in tracking_details or []:
             try:
                 logger.debug("Updating tracking info", tracking_number=details.tracking_number)
-                related_trackers = [
-                    t for t in trackers if t.tracking_number == details.tracking_number
-                ]
+                related_trackers = trackers_by_number.get(details.tracking_number, [])
                 for tracker in related_trackers:
                     # Compute status from tracking details
                     status = utils.compute_tracking_status(details).value
@@ -179,3 +307,50 @@ def save_updated_trackers(
             except Exception as update_error:
                 logger.warning("Failed to update tracker", tracking_number=details.tracking_number, error=str(update_error))
                 logger.exception("Tracker update error", tracking_number=details.tracking_number)
+
+
+@utils.error_wrapper
+def schedule_next_polls(trackers: typing.List[models.Tracking]):
+    now = timezone.now()
+
+    for tracker in trackers:
+        tracker.next_poll_at = compute_next_poll(tracker, now)
+
+    models.Tracking.objects.bulk_update(trackers, ["next_poll_at"], batch_size=500)
+
+
+def compute_next_poll(
+    tracker: models.Tracking,
+    now: datetime.datetime = None,
+) -> datetime.datetime:
+    """Compute when a tracker should be polled next.
+
+    The base interval is scaled by the tracker status (e.g. out for delivery
+    trackers are polled more often) and backs off with the age of the last
+    tracking event, bounded by the min and max poll intervals.
+    """
+    now = now or timezone.now()
+    factor = STATUS_POLL_FACTORS.get(tracker.status, 1.0)
+
+    if tracker.delivered or factor is None:
+        return now + datetime.timedelta(seconds=TRACKERS_MAX_POLL_INTERVAL)
+
+    last_activity = get_last_activity(tracker) or now
+    idle_days = max((now - last_activity).total_seconds() / 86400, 0)
+    interval = DEFAULT_TRACKERS_UPDATE_INTERVAL * factor * (1 + idle_days / 2)
+
+    return now + datetime.timedelta(
+        seconds=min(max(interval, TRACKERS_MIN_POLL_INTERVAL), TRACKERS_MAX_POLL_INTERVAL)
+    )
+
+
+def get_last_activity(tracker: models.Tracking) -> typing.Optional[datetime.datetime]:
+    """Return the date of the latest tracking event (or the tracker creation)."""
+    event = next(iter(tracker.events or []), None) or {}
+    date = lib.failsafe(
+        lambda: timezone.make_aware(
+            lib.to_date(event.get("date")), datetime.timezone.utc
+        )
+    )
+
+    return date or tracker.created_at
@@ -1,102 +1,494 @@
+import hmac
+import json
+import time
+import random
 import typing
+import hashlib
+import datetime
+import itertools
+import threading
 import requests
-from datetime import datetime
+import requests.adapters
 from django.conf import settings
-from django.db.models import Q
+from django.db import transaction
+from django.db.models import Q, F, Count, OuterRef, Subquery, Window
+from django.db.models.functions import Coalesce, RowNumber
 from django.contrib.auth import get_user_model
+from django.utils import timezone
 
+import karrio.lib as lib
 from karrio.core import utils
 from karrio.server.core.utils import identity
 from karrio.server.core.logging import logger
-from karrio.server.serializers import Context
+from karrio.server.serializers import Context, bulk_link_org
 from karrio.server.events import models
-import karrio.server.events.serializers.event as serializers
+import karrio.server.events.serializers.base as base
+
+WEBHOOK_CONNECT_TIMEOUT = getattr(settings, "WEBHOOK_CONNECT_TIMEOUT", 3.0)
+WEBHOOK_READ_TIMEOUT = getattr(settings, "WEBHOOK_READ_TIMEOUT", 10.0)
+WEBHOOK_MAX_ATTEMPTS = getattr(settings, "WEBHOOK_MAX_ATTEMPTS", 6)
+WEBHOOK_RETRY_BASE_DELAY = getattr(settings, "WEBHOOK_RETRY_BASE_DELAY", 30)
+WEBHOOK_RETRY_MAX_DELAY = getattr(settings, "WEBHOOK_RETRY_MAX_DELAY", 3600)
+WEBHOOK_DELIVERY_CONCURRENCY = getattr(settings, "WEBHOOK_DELIVERY_CONCURRENCY", 8)
+WEBHOOK_DELIVERY_BATCH_SIZE = getattr(settings, "WEBHOOK_DELIVERY_BATCH_SIZE", 50)
+WEBHOOK_BATCH_SIZE = max(getattr(settings, "WEBHOOK_BATCH_SIZE", 1), 1)
+WEBHOOK_DELIVERY_LEASE = getattr(settings, "WEBHOOK_DELIVERY_LEASE", 900)
+WEBHOOK_MAX_FAILURE_STREAK = 5  # failed deliveries before a webhook is disabled
+SIGNATURE_HEADER = "X-Karrio-Signature"
+RESPONSE_BODY_MAX_LENGTH = 1000
+
 NotificationResponse = typing.Tuple[str, requests.Response]
+# (delivery, response, error) of a delivery attempt
+DeliveryResult = typing.Tuple[
+    models.WebhookDelivery, typing.Optional[requests.Response], typing.Optional[str]
+]
 User = get_user_model()
 
+_session: typing.Optional[requests.Session] = None
+_session_lock = threading.Lock()
+
 
 def notify_webhook_subscribers(
     event: str,
     data: dict,
-    event_at: datetime,
+    event_at: datetime.datetime,
     ctx: dict,
     **kwargs,
 ):
-    logger.info("Starting webhook subscribers notification", event=event)
+    notify_webhook_events([dict(event=event, data=data, event_at=event_at)], ctx)
+
+
+def notify_webhook_events(events: typing.List[dict], ctx: dict, **kwargs):
+    """Record a batch of events of a tenant and deliver them to their subscribers.
+
+    Each event is a dict(event=<type>, data=<object data>, event_at=<datetime>).
+    """
+    logger.info("Starting webhook subscribers notification", event_count=len(events))
     context = retrieve_context(ctx)
-    query = (
-        (Q(enabled_events__icontains=event) | Q(enabled_events__icontains="all")),
-        (Q(disabled__isnull=True) | Q(disabled=False)),
+    webhooks = list(
+        models.Webhook.access_by(context).filter(
+            Q(disabled__isnull=True) | Q(disabled=False)
+        )
+    )
+    subscribers = [
+        [webhook for webhook in webhooks if is_subscribed(webhook, event["event"])]
+        for event in events
+    ]
+    records = models.Event.objects.bulk_create(
+        [
+            models.Event(
+                type=event["event"],
+                data=event["data"],
+                test_mode=context.test_mode,
+                created_by=context.user,
+                pending_webhooks=len(event_subscribers),
+            )
+            for event, event_subscribers in zip(events, subscribers)
+        ]
     )
 
-    webhooks = models.Webhook.access_by(context).filter(*query)
-    serializers.EventSerializer.map(
-        data=dict(
-            type=event,
-            data=data,
-            test_mode=context.test_mode,
-            pending_webhooks=webhooks.count(),
-        ),
-        context=context,
-    ).save()
-
-    if any(webhooks):
-        payload = dict(event=event, data=data)
-        responses: typing.List[NotificationResponse] = notify_subscribers(
-            webhooks, payload
-        )
-        update_notified_webhooks(webhooks, responses, event_at)
+    if context.org is not None and hasattr(models.Event, "org"):
+        bulk_link_org(records, context)
+
+    backlogged = get_backlogged_webhooks(
+        [webhook.id for event_subscribers in subscribers for webhook in event_subscribers]
+    )
+    deliveries = create_deliveries(
+        [
+            (webhook, record, event["event_at"])
+            for event, record, event_subscribers in zip(events, records, subscribers)
+            for webhook in event_subscribers
+        ],
+        backlogged=backlogged,
+    )
+
+    if any(deliveries):
+        inline_deliveries = [
+            delivery for delivery in deliveries if delivery.webhook_id not in backlogged
+        ]
+        results = deliver(inline_deliveries)
+        save_delivery_results(results)
+        release_deliveries(inline_deliveries, results)
     else:
-        logger.info("No webhook subscribers found", event=event)
+        logger.info("No webhook subscribers found", event_count=len(events))
 
-    logger.info("Finished webhook subscribers notification", event=event)
+    logger.info("Finished webhook subscribers notification", event_count=len(events))
 
 
-def notify_subscribers(webhooks: typing.List[models.Webhook], payload: dict):
-    def notify_subscriber(webhook: models.Webhook):
-        response = identity(
-            lambda: requests.post(
-                webhook.url,
-                json=payload,
-                headers={
-                    "Content-type": "application/json",
-                    "X-Event-Id": webhook.secret,
-                },
+def is_subscribed(webhook: models.Webhook, event: str) -> bool:
+    enabled_events = webhook.enabled_events or []
+
+    return "all" in enabled_events or event in enabled_events
+
+
+def retry_webhook_deliveries():
+    """Send the pending deliveries due for a (re)try.
+
+    Every endpoint gets at most `WEBHOOK_DELIVERY_BATCH_SIZE` deliveries per
+    sweep, sent in order until one fails. The deliveries are claimed first so
+    an overlapping sweep doesn't send them again.
+    """
+    now = timezone.now()
+    due_deliveries = list(
+        models.WebhookDelivery.objects.filter(
+            Q(webhook__disabled__isnull=True) | Q(webhook__disabled=False),
+            status=base.DeliveryStatus.pending.value,
+            next_attempt_at__lte=now,
+        )
+        .select_related("webhook", "event")
+        .annotate(
+            position=Window(
+                RowNumber(),
+                partition_by=[F("webhook_id")],
+                order_by=F("created_at").asc(),
             )
         )
+        .filter(position__lte=WEBHOOK_DELIVERY_BATCH_SIZE)
+        .order_by("webhook_id", "created_at")
+    )
+    claimed = claim_deliveries(due_deliveries, now)
+    deliveries = [delivery for delivery in due_deliveries if delivery.id in claimed]
 
-        return webhook.id, response
+    if not any(deliveries):
+        return
+
+    logger.info("Retrying webhook deliveries", delivery_count=len(deliveries))
+    results = deliver(deliveries)
+    save_delivery_results(results)
+    release_deliveries(deliveries, results)
+    logger.info("Finished webhook deliveries retry", attempted_count=len(results))
 
-    return utils.exec_async(notify_subscriber, webhooks)
 
+def create_deliveries(
+    subscriptions: typing.List[
+        typing.Tuple[models.Webhook, models.Event, datetime.datetime]
+    ],
+    backlogged: typing.Set[str] = set(),
+) -> typing.List[models.WebhookDelivery]:
+    """Record the deliveries of the events subscriptions.
 
-def update_notified_webhooks(
-    webhooks: typing.List[models.Webhook],
-    responses: typing.List[NotificationResponse],
-    event_at: datetime,
+    The deliveries sent right away are created claimed (see `claim_deliveries`)
+    while the ones of backlogged endpoints are due for the retry sweep.
+    """
+    now = timezone.now()
+    lease = now + datetime.timedelta(seconds=WEBHOOK_DELIVERY_LEASE)
+
+    return models.WebhookDelivery.objects.bulk_create(
+        [
+            models.WebhookDelivery(
+                webhook=webhook,
+                event=event,
+                event_at=event_at,
+                next_attempt_at=(now if webhook.id in backlogged else lease),
+            )
+            for webhook, event, event_at in subscriptions
+        ],
+        batch_size=500,
+    )
+
+
+def get_backlogged_webhooks(webhook_ids: typing.List[str]) -> typing.Set[str]:
+    """Return the endpoints with deliveries waiting for a retry.
+
+    Their new deliveries are left to the retry sweep so their backlog is sent
+    in order and a failing endpoint is not hit again.
+    """
+    if not any(webhook_ids):
+        return set()
+
+    return set(
+        models.WebhookDelivery.objects.filter(
+            webhook__in=webhook_ids,
+            status=base.DeliveryStatus.pending.value,
+            attempts__gt=0,
+        )
+        .values_list("webhook_id", flat=True)
+        .distinct()
+    )
+
+
+def claim_deliveries(
+    deliveries: typing.List[models.WebhookDelivery],
+    now: datetime.datetime,
+) -> typing.Set[str]:
+    """Claim the due deliveries not locked by another sweep.
+
+    A claimed delivery is not due again before `WEBHOOK_DELIVERY_LEASE`
+    seconds, so it is retried if its worker dies before saving the attempt.
+    """
+    if not any(deliveries):
+        return set()
+
+    with transaction.atomic():
+        claimed = set(
+            models.WebhookDelivery.objects.select_for_update(skip_locked=True)
+            .filter(
+                id__in=[delivery.id for delivery in deliveries],
+                status=base.DeliveryStatus.pending.value,
+                next_attempt_at__lte=now,
+            )
+            .values_list("id", flat=True)
+        )
+        models.WebhookDelivery.objects.filter(id__in=claimed).update(
+            next_attempt_at=now + datetime.timedelta(seconds=WEBHOOK_DELIVERY_LEASE)
+        )
+
+    return claimed
+
+
+def release_deliveries(
+    deliveries: typing.List[models.WebhookDelivery],
+    results: typing.List[DeliveryResult],
 ):
-    logger.info("Saving updated webhooks")
+    """Make the claimed deliveries that were not attempted due again."""
+    attempted = {delivery.id for delivery, *_ in results}
+    skipped = [delivery.id for delivery in deliveries if delivery.id not in attempted]
+
+    if any(skipped):
+        models.WebhookDelivery.objects.filter(
+            id__in=skipped,
+            status=base.DeliveryStatus.pending.value,
+        ).update(next_attempt_at=timezone.now())
+
+
+def deliver(
+    deliveries: typing.List[models.WebhookDelivery],
+) -> typing.List[DeliveryResult]:
+    """Send deliveries through one queue per endpoint.
+
+    Endpoints are served concurrently while each endpoint queue is sent
+    sequentially, so a slow endpoint only holds up its own deliveries.
+    """
+    queues = [
+        list(queue)
+        for _, queue in itertools.groupby(
+            sorted(deliveries, key=lambda delivery: delivery.webhook_id),
+            key=lambda delivery: delivery.webhook_id,
+        )
+    ]
+    responses = lib.run_concurently(deliver_queue, queues, WEBHOOK_DELIVERY_CONCURRENCY)
+
+    return [
+        result
+        for response in responses
+        if isinstance(response, list)
+        for result in response
+    ]
+
+
+def deliver_queue(
+    queue: typing.List[models.WebhookDelivery],
+) -> typing.List[DeliveryResult]:
+    """Send the deliveries of an endpoint in order, stopping at the first failure.
+
+    Up to `WEBHOOK_BATCH_SIZE` deliveries are sent per request. The deliveries
+    not attempted stay due for the next retry sweep.
+    """
+    results: typing.List[DeliveryResult] = []
+
+    for start in range(0, len(queue), WEBHOOK_BATCH_SIZE):
+        chunk = queue[start : start + WEBHOOK_BATCH_SIZE]
+        response, error = None, None
 
-    for webhook_id, response in responses:
         try:
-            logger.debug("Updating webhook", webhook_id=webhook_id)
+            response = send(
+                chunk[0].webhook,
+                to_payload(chunk),
+                event_id=(chunk[0].event_id if WEBHOOK_BATCH_SIZE == 1 else None),
+            )
+        except Exception as e:
+            error = str(e)
+
+        results.extend([(delivery, response, error) for delivery in chunk])
+
+        if error or not response.ok:
+            break
+
+    return results
+
+
+def to_payload(deliveries: typing.List[models.WebhookDelivery]) -> dict:
+    """Return the request payload of one event or a batch of events.
+
+    Receivers opting into batching (`WEBHOOK_BATCH_SIZE` > 1) always get the
+    `{"events": [...]}` payload, even for a single event.
+    """
+    if WEBHOOK_BATCH_SIZE == 1:
+        return dict(event=deliveries[0].event.type, data=deliveries[0].event.data)
+
+    return dict(
+        events=[
+            dict(
+                id=delivery.event_id,
+                event=delivery.event.type,
+                data=delivery.event.data,
+            )
+            for delivery in deliveries
+        ]
+    )
+
+
+def send(
+    webhook: models.Webhook,
+    payload: dict,
+    event_id: str = None,
+) -> requests.Response:
+    body = json.dumps(payload)
+    headers = {
+        "Content-type": "application/json",
+        SIGNATURE_HEADER: sign(webhook.secret, body),
+        **({"X-Event-Id": event_id} if event_id else {}),
+    }
+
+    return identity(
+        lambda: get_session().post(
+            webhook.url,
+            data=body.encode("utf-8"),
+            headers=headers,
+            timeout=(WEBHOOK_CONNECT_TIMEOUT, WEBHOOK_READ_TIMEOUT),
+        )
+    )
+
+
+def sign(secret: str, body: str, timestamp: int = None) -> str:
+    """Return the signature header value of a webhook request body.
+
+    Format: `t=<unix timestamp>,v1=<HMAC-SHA256 hex digest of "<timestamp>.<body>">`
+    computed with the webhook secret.
+    """
+    timestamp = timestamp or int(time.time())
+    digest = hmac.new(
+        secret.encode("utf-8"),
+        f"{timestamp}.{body}".encode("utf-8"),
+        hashlib.sha256,
+    ).hexdigest()
+
+    return f"t={timestamp},v1={digest}"
+
+
+def save_delivery_results(results: typing.List[DeliveryResult]):
+    if not any(results):
+        return
+
+    logger.info("Saving webhook delivery attempts", delivery_count=len(results))
+    now = timezone.now()
+    webhooks: typing.Dict[str, models.Webhook] = {}
+
+    for delivery, response, error in results:
+        webhook = webhooks.setdefault(delivery.webhook_id, delivery.webhook)
+        succeeded = error is None and response.ok
+
+        delivery.attempts += 1
+        delivery.updated_at = now
+        delivery.error = error
+        delivery.response_status = getattr(response, "status_code", None)
+        delivery.response_body = lib.failsafe(
+            lambda: response.text[:RESPONSE_BODY_MAX_LENGTH]
+        )
 
-            webhook = next((w for w in webhooks if w.id == webhook_id))
-            if response.ok:
-                webhook.last_event_at = event_at
-                webhook.failure_streak_count = 0
-            else:
-                webhook.failure_streak_count += 1
-                # Disable the webhook if notification failed more than 5 times
-                webhook.disabled = webhook.failure_streak_count > 5
+        if succeeded:
+            delivery.status = base.DeliveryStatus.succeeded.value
+            delivery.delivered_at = now
+            delivery.next_attempt_at = None
+            webhook.last_event_at = delivery.event_at
+            webhook.failure_streak_count = 0
+        elif delivery.attempts >= WEBHOOK_MAX_ATTEMPTS:
+            delivery.status = base.DeliveryStatus.failed.value
+            delivery.next_attempt_at = None
+            webhook.failure_streak_count += 1
+            # Disable the webhook if too many deliveries failed in a row
+            webhook.disabled = webhook.failure_streak_count > WEBHOOK_MAX_FAILURE_STREAK
+        else:
+            delivery.next_attempt_at = now + get_retry_delay(delivery.attempts)
 
-            webhook.save()
+    models.WebhookDelivery.objects.bulk_update(
+        [delivery for delivery, *_ in results],
+        [
+            "status",
+            "attempts",
+            "error",
+            "response_status",
+            "response_body",
+            "delivered_at",
+            "next_attempt_at",
+            "updated_at",
+        ],
+        batch_size=500,
+    )
+    models.Webhook.objects.bulk_update(
+        list(webhooks.values()),
+        ["last_event_at", "failure_streak_count", "disabled"],
+        batch_size=500,
+    )
 
-            logger.debug("Webhook updated successfully", webhook_id=webhook_id)
+    disabled = [key for key, webhook in webhooks.items() if webhook.disabled]
+    if any(disabled):
+        logger.warning("Disabling failing webhooks", webhook_ids=disabled)
+        models.WebhookDelivery.objects.filter(
+            webhook__in=disabled,
+            status=base.DeliveryStatus.pending.value,
+        ).update(
+            status=base.DeliveryStatus.failed.value,
+            next_attempt_at=None,
+            error="Webhook disabled",
+        )
 
-        except Exception as update_error:
-            logger.warning("Failed to update webhook", webhook_id=webhook_id, error=str(update_error))
-            logger.exception("Webhook update error", webhook_id=webhook_id)
+    update_pending_webhooks({delivery.event_id for delivery, *_ in results})
+
+
+def update_pending_webhooks(event_ids: typing.Set[str]):
+    pending_deliveries = (
+        models.WebhookDelivery.objects.filter(
+            event=OuterRef("pk"),
+            status=base.DeliveryStatus.pending.value,
+        )
+        .values("event")
+        .annotate(count=Count("id"))
+        .values("count")
+    )
+
+    models.Event.objects.filter(id__in=event_ids).update(
+        pending_webhooks=Coalesce(Subquery(pending_deliveries), 0)
+    )
+
+
+def get_retry_delay(attempts: int) -> datetime.timedelta:
+    """Exponential backoff (with up to 10% jitter) after a failed attempt."""
+    delay = min(
+        WEBHOOK_RETRY_BASE_DELAY * (2 ** max(attempts - 1, 0)),
+        WEBHOOK_RETRY_MAX_DELAY,
+    )
+
+    return datetime.timedelta(seconds=delay + random.uniform(0, delay / 10))
+
+
+def get_session() -> requests.Session:
+    """Return the process wide session pooling connections to webhook endpoints."""
+    global _session
+
+    with _session_lock:
+        if _session is None:
+            adapter = requests.adapters.HTTPAdapter(
+                pool_connections=WEBHOOK_DELIVERY_CONCURRENCY * 4,
+                pool_maxsize=WEBHOOK_DELIVERY_CONCURRENCY,
+                max_retries=0,
+            )
+            _session = requests.Session()
+            _session.mount("http://", adapter)
+            _session.mount("https://", adapter)
+
+    return _session
+
+
+def notify_subscribers(
+    webhooks: typing.List[models.Webhook], payload: dict
+) -> typing.List[NotificationResponse]:
+    """Send a payload to webhooks right away (no delivery is recorded)."""
+
+    def notify_subscriber(webhook: models.Webhook):
+        return webhook.id, send(webhook, payload)
+
+    return utils.exec_async(notify_subscriber, webhooks)
 
 
 def retrieve_context(info: dict) -> Context:
@@ -0,0 +1,81 @@
+from unittest.mock import patch
+from karrio.server.core.tests import APITestCase
+from karrio.server.manager import models
+import karrio.server.manager.serializers.shipment as shipment_serializers
+from karrio.server.events.task_definitions.base import invoice
+
+
+class TestShipmentInvoiceGeneration(APITestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        address = dict(
+            address_line1="125 Church St",
+            city="Moncton",
+            country_code="CA",
+            postal_code="E1C4Z8",
+            created_by=self.user,
+        )
+        self.shipment = models.Shipment.objects.create(
+            shipper=models.Address.objects.create(**address),
+            recipient=models.Address.objects.create(**address),
+            test_mode=True,
+            status="purchased",
+            tracking_number="123456789012",
+            options=dict(invoice_template="commercial_invoice"),
+            created_by=self.user,
+        )
+
+    def test_queue_and_generate_shipment_invoice(self):
+        with patch(
+            "karrio.server.events.tasks.generate_shipment_invoice"
+        ) as task, self.captureOnCommitCallbacks(execute=True):
+            shipment_serializers.queue_custom_invoice(
+                "commercial_invoice", self.shipment
+            )
+            shipment_serializers.queue_custom_invoice(
+                "commercial_invoice", self.shipment
+            )
+
+        key = self.shipment.meta["invoice_idempotency_key"]
+        self.assertEqual(task.call_count, 1)
+        self.assertEqual(self.shipment.invoice_status, "pending")
+
+        with patch(
+            "karrio.server.documents.generator.Documents.generate_shipment_document",
+            return_value=DOCUMENT,
+        ) as generate:
+            invoice.generate_shipment_invoice(self.shipment.id, key)
+            invoice.generate_shipment_invoice(self.shipment.id, key)
+            invoice.generate_shipment_invoice(self.shipment.id, "superseded_key")
+
+        self.shipment.refresh_from_db()
+        self.assertEqual(generate.call_count, 1)
+        self.assertEqual(self.shipment.invoice_status, "generated")
+        self.assertEqual(self.shipment.invoice, DOCUMENT["doc_file"])
+
+    def test_generate_shipment_invoice_failure(self):
+        with patch("karrio.server.events.tasks.generate_shipment_invoice"):
+            shipment_serializers.queue_custom_invoice(
+                "commercial_invoice", self.shipment
+            )
+
+        key = self.shipment.meta["invoice_idempotency_key"]
+
+        with patch(
+            "karrio.server.documents.generator.Documents.generate_shipment_document",
+            side_effect=Exception("Template not found"),
+        ):
+            with self.assertRaises(Exception):
+                invoice.generate_shipment_invoice(self.shipment.id, key)
+
+        self.shipment.refresh_from_db()
+        self.assertEqual(self.shipment.invoice_status, "failed")
+        self.assertIsNone(self.shipment.invoice)
+
+
+DOCUMENT = dict(
+    doc_format="PDF",
+    doc_name="Commercial Invoice.pdf",
+    doc_type="commercial_invoice",
+    doc_file="JVBERi0xLjQKJeLjz9MK",
+)
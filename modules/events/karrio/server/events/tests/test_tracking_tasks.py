@@ -86,6 +86,51 @@ class TestTrackersBackgroundUpdate(APITestCase):
             self.assertEqual(response.status_code, status.HTTP_200_OK)
             self.assertDictEqual(response_data, UPDATED_TRACKERS_LIST)
 
+    def test_schedule_next_polls(self):
+        with patch(
+            "karrio.server.events.task_definitions.base.tracking.utils.identity"
+        ) as mocks:
+            mocks.return_value = RETURNED_UPDATED_VALUE
+            sleep(0.1)
+            tracking.update_trackers(delta=datetime.timedelta(seconds=0.1))
+
+        trackers = models.Tracking.objects.all()
+        self.assertTrue(all(tracker.next_poll_at is not None for tracker in trackers))
+
+        # trackers are not polled again before they are due
+        with patch(
+            "karrio.server.events.task_definitions.base.tracking.utils.identity"
+        ) as mocks:
+            tracking.update_trackers(delta=datetime.timedelta(seconds=0.1))
+            mocks.assert_not_called()
+
+    def test_compute_next_poll(self):
+        now = datetime.datetime(2024, 1, 10, tzinfo=datetime.timezone.utc)
+        tracker = models.Tracking(
+            status="out_for_delivery",
+            delivered=False,
+            events=[dict(date="2024-01-10", code="OFD")],
+        )
+        idle_tracker = models.Tracking(
+            status="in_transit",
+            delivered=False,
+            events=[dict(date="2023-12-01", code="IT")],
+        )
+        delivered_tracker = models.Tracking(status="delivered", delivered=True)
+
+        self.assertLess(
+            tracking.compute_next_poll(tracker, now),
+            tracking.compute_next_poll(idle_tracker, now),
+        )
+        self.assertEqual(
+            tracking.compute_next_poll(idle_tracker, now),
+            now + datetime.timedelta(seconds=tracking.TRACKERS_MAX_POLL_INTERVAL),
+        )
+        self.assertEqual(
+            tracking.compute_next_poll(delivered_tracker, now),
+            now + datetime.timedelta(seconds=tracking.TRACKERS_MAX_POLL_INTERVAL),
+        )
+
 
 RETURNED_VALUE = (
     [
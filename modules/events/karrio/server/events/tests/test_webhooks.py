@@ -1,4 +1,6 @@
+import hmac
 import json
+import hashlib
 from unittest.mock import ANY, patch
 from requests import Response
 
@@ -7,9 +9,13 @@ from django.utils import timezone
 from rest_framework import status
 
 from karrio.server.core.tests import APITestCase
-from karrio.server.events.models import Webhook
+import karrio.server.events.outbox as outbox
+from karrio.server.events.models import Event, Webhook, WebhookDelivery
 from karrio.server.events.task_definitions.base.webhook import (
+    notify_webhook_events,
     notify_webhook_subscribers,
+    retry_webhook_deliveries,
+    sign,
 )
 
 NOTIFICATION_DATETIME = timezone.now()
@@ -82,6 +88,187 @@ class TestWebhookDetails(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertDictEqual(response_data, WEBHOOK_NOTIFIED_RESPONSE)
 
+    def test_webhook_notify_failure_retry(self):
+        with patch(
+            "karrio.server.events.task_definitions.base.webhook.identity"
+        ) as mocks:
+            response = Response()
+            response.status_code = 503
+            mocks.return_value = response
+
+            notify_webhook_subscribers(
+                event="shipment.purchased",
+                data={"shipment": "content"},
+                event_at=NOTIFICATION_DATETIME,
+                ctx=dict(
+                    user_id=self.user.id,
+                    test_mode=True,
+                ),
+            )
+
+        delivery = WebhookDelivery.objects.get(webhook=self.webhook)
+        self.assertEqual(delivery.status, "pending")
+        self.assertEqual(delivery.attempts, 1)
+        self.assertEqual(delivery.response_status, 503)
+        self.assertGreater(delivery.next_attempt_at, timezone.now())
+        self.assertEqual(delivery.event.pending_webhooks, 1)
+
+        # the retry is sent once due
+        delivery.next_attempt_at = timezone.now()
+        delivery.save()
+
+        with patch(
+            "karrio.server.events.task_definitions.base.webhook.identity"
+        ) as mocks:
+            response = Response()
+            response.status_code = 200
+            mocks.return_value = response
+
+            retry_webhook_deliveries()
+
+        delivery.refresh_from_db()
+        self.assertEqual(delivery.status, "succeeded")
+        self.assertEqual(delivery.attempts, 2)
+        self.assertEqual(delivery.event.pending_webhooks, 0)
+
+    def test_webhook_signature(self):
+        body = json.dumps({"event": "shipment.purchased"})
+        digest = hmac.new(
+            b"whsec_test", f"1700000000.{body}".encode(), hashlib.sha256
+        ).hexdigest()
+
+        self.assertEqual(
+            sign("whsec_test", body, timestamp=1700000000),
+            f"t=1700000000,v1={digest}",
+        )
+
+
+class TestEventOutbox(APITestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.webhook: Webhook = Webhook.objects.create(
+            url="https://api.karrio.io",
+            enabled_events=["tracker_updated"],
+            test_mode=True,
+            created_by=self.user,
+        )
+        self.ctx = dict(user_id=self.user.id, test_mode=True)
+
+    def test_outbox_enqueues_batch_on_commit(self):
+        with patch("karrio.server.events.tasks.notify_webhook_events") as task:
+            with self.captureOnCommitCallbacks(execute=True):
+                for index in range(3):
+                    outbox.publish(
+                        "tracker_updated",
+                        {"id": f"trk_{index}"},
+                        NOTIFICATION_DATETIME,
+                        self.ctx,
+                    )
+
+                task.assert_not_called()
+
+        task.assert_called_once()
+        events, ctx = task.call_args.args
+        self.assertEqual(len(events), 3)
+        self.assertDictEqual(ctx, self.ctx)
+
+    def test_notify_webhook_events(self):
+        events = [
+            dict(
+                event="tracker_updated",
+                data={"id": "trk_1"},
+                event_at=NOTIFICATION_DATETIME,
+            ),
+            dict(
+                event="tracker_created",
+                data={"id": "trk_2"},
+                event_at=NOTIFICATION_DATETIME,
+            ),
+            dict(
+                event="tracker_updated",
+                data={"id": "trk_3"},
+                event_at=NOTIFICATION_DATETIME,
+            ),
+        ]
+
+        with patch(
+            "karrio.server.events.task_definitions.base.webhook.identity"
+        ) as mocks:
+            response = Response()
+            response.status_code = 200
+            mocks.return_value = response
+
+            notify_webhook_events(events, self.ctx)
+
+        self.assertEqual(Event.objects.filter(created_by=self.user).count(), 3)
+        self.assertEqual(
+            WebhookDelivery.objects.filter(
+                webhook=self.webhook, status="succeeded"
+            ).count(),
+            2,
+        )
+
+    def test_notify_webhook_events_in_batches(self):
+        events = [
+            dict(
+                event="tracker_updated",
+                data={"id": f"trk_{index}"},
+                event_at=NOTIFICATION_DATETIME,
+            )
+            for index in range(3)
+        ]
+
+        with patch(
+            "karrio.server.events.task_definitions.base.webhook.WEBHOOK_BATCH_SIZE", 2
+        ), patch(
+            "karrio.server.events.task_definitions.base.webhook.send"
+        ) as send:
+            response = Response()
+            response.status_code = 200
+            send.return_value = response
+
+            notify_webhook_events(events, self.ctx)
+
+        payloads = [call.args[1] for call in send.call_args_list]
+        self.assertListEqual([len(_["events"]) for _ in payloads], [2, 1])
+        self.assertListEqual(
+            [event["data"]["id"] for _ in payloads for event in _["events"]],
+            ["trk_0", "trk_1", "trk_2"],
+        )
+        self.assertEqual(
+            WebhookDelivery.objects.filter(
+                webhook=self.webhook, status="succeeded"
+            ).count(),
+            3,
+        )
+
+    def test_inline_deliveries_are_not_swept_while_sending(self):
+        events = [
+            dict(
+                event="tracker_updated",
+                data={"id": "trk_1"},
+                event_at=NOTIFICATION_DATETIME,
+            )
+        ]
+        response = Response()
+        response.status_code = 200
+
+        def send(*args, **kwargs):
+            # a retry sweep running while the inline delivery is sent
+            retry_webhook_deliveries()
+            return response
+
+        with patch(
+            "karrio.server.events.task_definitions.base.webhook.send",
+            side_effect=send,
+        ) as mock:
+            notify_webhook_events(events, self.ctx)
+
+        delivery = WebhookDelivery.objects.get(webhook=self.webhook)
+        self.assertEqual(mock.call_count, 1)
+        self.assertEqual(delivery.status, "succeeded")
+        self.assertEqual(delivery.attempts, 1)
+
 
 WEBHOOK_DATA = {
     "url": "https://api.karrio.io",
@@ -76,4 +76,6 @@ class EventType:
         queryset = filters.EventFilter(
             _filter.to_dict(), models.Event.access_by(info.context.request)
         ).qs
-        return utils.paginated_connection(queryset, **_filter.pagination())
+        return utils.paginated_connection(
+            queryset, estimate_count=True, **_filter.pagination()
+        )
@@ -11,6 +11,7 @@ from django.utils.translation import gettext_lazy as _
 import karrio.lib as lib
 import karrio.server.conf as conf
 import karrio.server.user.models as auth
+import karrio.server.core.usage as usage
 import karrio.server.core.models as core
 import karrio.server.graph.utils as utils
 import karrio.server.graph.models as graph
@@ -305,6 +306,21 @@ class SystemUsageType:
             .order_by("-date")
         )
 
+        # read the pre-aggregated usage once the rollups are maintained
+        stats = usage.get_usage_stats(
+            _filter["date_after"], _filter["date_before"], test_mode=_test_mode
+        )
+        if stats is not None:
+            api_errors = stats["api_errors"]
+            api_requests = stats["api_requests"]
+            order_volumes = [
+                dict(date=item["date"], count=item["amount"])
+                for item in stats["order_volumes"]
+            ]
+            shipment_count = stats["shipment_count"]
+            shipping_spend = stats["shipping_spend"]
+            tracker_count = stats["tracker_count"]
+
         total_errors = sum([item["count"] for item in api_errors], 0)
         total_requests = sum([item["count"] for item in api_requests], 0)
         total_trackers = sum([item["count"] for item in tracker_count], 0)
@@ -476,7 +492,9 @@ class LogType:
         queryset = filters.LogFilter(
             _filter.to_dict(), core.APILogIndex.access_by(info.context.request)
         ).qs
-        return utils.paginated_connection(queryset, **_filter.pagination())
+        return utils.paginated_connection(
+            queryset, estimate_count=True, **_filter.pagination()
+        )
 
 
 @strawberry.type
@@ -493,9 +511,9 @@ class TracingRecordType:
     @strawberry.field
     def record(self: tracing.TracingRecord) -> typing.Optional[utils.JSON]:
         try:
-            return lib.to_dict(self.record)
+            return lib.to_dict(self.content)
         except:
-            return self.record
+            return self.content
 
     @strawberry.field
     def meta(self: tracing.TracingRecord) -> typing.Optional[utils.JSON]:
@@ -521,7 +539,9 @@ class TracingRecordType:
         queryset = filters.TracingRecordFilter(
             _filter.to_dict(), tracing.TracingRecord.access_by(info.context.request)
         ).qs
-        return utils.paginated_connection(queryset, **_filter.pagination())
+        return utils.paginated_connection(
+            queryset, estimate_count=True, **_filter.pagination()
+        )
 
 
 @strawberry.type
@@ -1093,6 +1113,7 @@ class ShipmentType:
     tracker_id: typing.Optional[str]
     label_url: typing.Optional[str]
     invoice_url: typing.Optional[str]
+    invoice_status: typing.Optional[str]
     tracker: typing.Optional[TrackerType]
     created_at: datetime.datetime
     updated_at: datetime.datetime
@@ -7,3 +7,4 @@ from karrio.server.graph.tests.test_carrier_connections import *
 from karrio.server.graph.tests.test_user_info import *
 from karrio.server.graph.tests.test_rate_sheets import *
 from karrio.server.graph.tests.test_metafield import *
+from karrio.server.graph.tests.test_pagination import *
@@ -0,0 +1,94 @@
+from karrio.server.core.models import Metafield, MetafieldType
+from karrio.server.graph.tests import GraphTestCase
+
+
+class TestKeysetPagination(GraphTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        for index in range(7):
+            Metafield.objects.create(
+                key=f"key_{index}",
+                value=str(index),
+                type=MetafieldType.text,
+                created_by=self.user,
+            )
+
+        # newest first, the id breaks created_at ties
+        self.expected = list(
+            Metafield.objects.order_by("-created_at", "-pk").values_list("id", flat=True)
+        )
+
+    def _page(self, **filter):
+        response = self.query(
+            METAFIELDS_QUERY,
+            operation_name="GetMetafields",
+            variables=dict(filter=filter),
+        )
+        self.assertResponseNoErrors(response)
+
+        return response.data["data"]["metafields"]
+
+    def test_forward_pagination(self):
+        ids, after = [], None
+
+        while True:
+            page = self._page(first=3, **(dict(after=after) if after else {}))
+            ids += [edge["node"]["id"] for edge in page["edges"]]
+            after = page["page_info"]["end_cursor"]
+
+            if not page["page_info"]["has_next_page"]:
+                break
+
+        self.assertListEqual(ids, self.expected)
+        self.assertEqual(page["page_info"]["count"], 7)
+        self.assertTrue(page["page_info"]["has_previous_page"])
+
+    def test_backward_pagination(self):
+        ids, before = [], None
+
+        while True:
+            page = self._page(last=3, **(dict(before=before) if before else {}))
+            ids = [edge["node"]["id"] for edge in page["edges"]] + ids
+            before = page["page_info"]["start_cursor"]
+
+            if not page["page_info"]["has_previous_page"]:
+                break
+
+        self.assertListEqual(ids, self.expected)
+
+    def test_offset_pagination(self):
+        page = self._page(first=2, offset=3)
+
+        self.assertListEqual(
+            [edge["node"]["id"] for edge in page["edges"]], self.expected[3:5]
+        )
+
+    def test_invalid_cursor(self):
+        response = self.query(
+            METAFIELDS_QUERY,
+            operation_name="GetMetafields",
+            variables=dict(filter=dict(after="invalid")),
+        )
+
+        self.assertIsNotNone(response.data.get("errors"))
+
+
+METAFIELDS_QUERY = """
+query GetMetafields($filter: MetafieldFilter) {
+    metafields(filter: $filter) {
+        edges {
+            node {
+                id
+            }
+            cursor
+        }
+        page_info {
+            count
+            has_next_page
+            has_previous_page
+            start_cursor
+            end_cursor
+        }
+    }
+}
+"""
@@ -1,9 +1,12 @@
 from karrio.server.core.utils import *
+import json
 import typing
 import base64
 import functools
 import strawberry
 import dataclasses
+from django.conf import settings
+from django.db import connections, models
 from rest_framework import exceptions
 from django.utils.translation import gettext_lazy as _
 
@@ -22,6 +25,7 @@ T = typing.TypeVar("T")
 GenericType = typing.TypeVar("GenericType")
 
 error_logger = utils.error_wrapper
+COUNT_ESTIMATE_THRESHOLD = getattr(settings, "GRAPHQL_COUNT_ESTIMATE_THRESHOLD", 10000)
 
 JSON: typing.Any = strawberry.scalar(
     typing.NewType("JSON", object),
@@ -222,11 +226,19 @@ class PageInfo:
         - https://relay.dev/graphql/connections.htm
     """
 
-    count: int
     has_next_page: bool
     has_previous_page: bool
     start_cursor: typing.Optional[str]
     end_cursor: typing.Optional[str]
+    total: strawberry.Private[typing.Union[int, typing.Callable[[], int]]] = 0
+
+    @strawberry.field
+    def count(self) -> int:
+        """The total count (estimated for large tables), only computed when queried."""
+        if callable(self.total):
+            self.total = self.total()
+
+        return self.total
 
 
 @dataclasses.dataclass
@@ -242,45 +254,221 @@ class Edge(typing.Generic[GenericType]):
 class Paginated(BaseInput):
     offset: typing.Optional[int] = strawberry.UNSET
     first: typing.Optional[int] = strawberry.UNSET
+    last: typing.Optional[int] = strawberry.UNSET
+    after: typing.Optional[str] = strawberry.UNSET
+    before: typing.Optional[str] = strawberry.UNSET
+
+
+def build_entity_cursor(entity: T, keys: typing.List[str] = None, offset: int = None):
+    """Build an *opaque* cursor holding the entity ordering keys values
+    (or its position when the ordering can't be used for seeking)
+    """
+    if keys is None:
+        data = dict(o=offset) if offset is not None else dict(k=[getattr(entity, "pk", id(entity))])
+    else:
+        data = dict(k=[_get_value(entity, key.lstrip("-")) for key in keys])
+
+    return base64.urlsafe_b64encode(
+        json.dumps(data, default=_encode_value).encode("utf-8")
+    ).decode()
 
 
-def build_entity_cursor(entity: T):
-    """Adapt this method to build an *opaque* ID from an instance"""
-    entityid = f"{getattr(entity, 'id', id(entity))}".encode("utf-8")
-    return base64.b64encode(entityid).decode()
+def parse_entity_cursor(cursor: str) -> dict:
+    try:
+        data = json.loads(base64.urlsafe_b64decode(cursor.encode("utf-8")))
+        assert isinstance(data, dict) and ("k" in data or "o" in data)
+        return data
+    except Exception:
+        raise exceptions.ValidationError({"cursor": _("Invalid pagination cursor")})
 
 
 def paginated_connection(
     queryset,
-    first: int = 25,
+    first: int = None,
     offset: int = 0,
+    last: int = None,
+    after: str = None,
+    before: str = None,
+    estimate_count: bool = False,
 ) -> Connection[T]:
-    """A non-trivial implementation should efficiently fetch only
-    the necessary books after the offset.
-    For simplicity, here we build the list and then slice it accordingly
-    """
+    """Paginate the queryset with keyset (cursor) pagination.
 
-    # Fetch the requested results plus one, just to calculate `has_next_page`
-    # fmt: off
-    results = queryset[offset:offset+first+1]
-    # fmt: on
+    The page is fetched by seeking past the `after`/`before` cursor on the
+    queryset ordering (`-created_at` by default, the primary key is added as
+    tie breaker) so deep pages cost the same as the first one. Querysets
+    ordered by expressions or nullable fields fall back to offset cursors.
+
+    The total count is only computed when `page_info.count` is queried and
+    is estimated from the query plan for large results when `estimate_count`.
+    """
+    keys = get_keyset_ordering(queryset)
+    backward = last is not None and first is None or before is not None and after is None
+    size = (last if backward else first) or 25
+    cursor = parse_entity_cursor(before if backward else after) if (before if backward else after) else None
+
+    if keys is None:
+        # offset pagination for querysets that can't be seeked
+        start = cursor["o"] + 1 if cursor and "o" in cursor else (offset or 0)
+        if backward:
+            end = cursor["o"] if cursor and "o" in cursor else queryset.count()
+            start = max(end - size, 0)
+            results = list(queryset[start:end])
+            has_previous_page, has_next_page = start > 0, cursor is not None
+        else:
+            results = list(queryset[start:start + size + 1])
+            has_previous_page, has_next_page = start > 0, len(results) > size
+            results = results[:size]
+
+        edges = [
+            Edge(node=typing.cast(T, entity), cursor=build_entity_cursor(entity, offset=start + index))
+            for index, entity in enumerate(results)
+        ]
+    else:
+        ordering = [_reverse_key(key) for key in keys] if backward else keys
+        paged = queryset.order_by(*ordering)
+
+        if cursor is not None:
+            paged = paged.filter(_keyset_filter(queryset.model, ordering, cursor["k"]))
+        elif offset:
+            paged = paged[offset:]
+
+        results = list(paged[: size + 1])
+        has_more = len(results) > size
+        results = results[:size]
+
+        if backward:
+            results.reverse()
+            has_previous_page, has_next_page = has_more, cursor is not None
+        else:
+            has_previous_page, has_next_page = cursor is not None or bool(offset), has_more
+
+        edges = [
+            Edge(node=typing.cast(T, entity), cursor=build_entity_cursor(entity, keys))
+            for entity in results
+        ]
 
-    edges: typing.List[typing.Any] = [
-        Edge(node=typing.cast(T, entity), cursor=build_entity_cursor(entity))
-        for entity in results
-    ]
     return Connection(
         page_info=PageInfo(
-            count=queryset.count(),
-            has_previous_page=False,
-            has_next_page=len(results) > first,
+            total=functools.partial(
+                estimated_count if estimate_count else _count, queryset
+            ),
+            has_previous_page=has_previous_page,
+            has_next_page=has_next_page,
             start_cursor=edges[0].cursor if edges else None,
-            end_cursor=edges[-2].cursor if len(edges) > 1 else None,
+            end_cursor=edges[-1].cursor if edges else None,
         ),
-        edges=(edges[:-1] if len(edges) > first else edges),
+        edges=edges,
     )
 
 
+def get_keyset_ordering(queryset) -> typing.Optional[typing.List[str]]:
+    """Return the queryset ordering with the primary key as tie breaker
+    or None if it can't be used for keyset pagination.
+    """
+    model = queryset.model
+    ordering = list(queryset.query.order_by or model._meta.ordering or [])
+
+    if not any(ordering):
+        ordering = ["-created_at" if _get_field(model, "created_at") else "-pk"]
+
+    for key in ordering:
+        field = _get_field(model, key.lstrip("-")) if isinstance(key, str) else None
+        if field is None or field.null:
+            return None
+
+    if not any(key.lstrip("-") in ("pk", model._meta.pk.name) for key in ordering):
+        ordering.append("-pk" if ordering[-1].startswith("-") else "pk")
+
+    return ordering
+
+
+def estimated_count(queryset, threshold: int = None) -> int:
+    """Return the planner estimated count of large results (PostgreSQL only)."""
+    threshold = COUNT_ESTIMATE_THRESHOLD if threshold is None else threshold
+    connection = connections[queryset.db]
+
+    if connection.vendor != "postgresql":
+        return queryset.count()
+
+    try:
+        sql, params = queryset.order_by().query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+            plan = cursor.fetchone()[0]
+
+        plan = json.loads(plan) if isinstance(plan, str) else plan
+        estimate = int(plan[0]["Plan"]["Plan Rows"])
+    except Exception as e:
+        logger.warning("Failed to estimate the queryset count", error=str(e))
+        return queryset.count()
+
+    return estimate if estimate > threshold else queryset.count()
+
+
+def _count(queryset) -> int:
+    return queryset.count()
+
+
+def _keyset_filter(model, ordering: typing.List[str], values: list) -> models.Q:
+    """Build `(k1, k2...) > (v1, v2...)` honoring each key direction."""
+    if len(values) != len(ordering):
+        raise exceptions.ValidationError({"cursor": _("Invalid pagination cursor")})
+
+    values = [
+        _get_field(model, key.lstrip("-")).to_python(value)
+        for key, value in zip(ordering, values)
+    ]
+    query = models.Q()
+
+    for index, key in enumerate(ordering):
+        name = key.lstrip("-")
+        lookup = "lt" if key.startswith("-") else "gt"
+        condition = models.Q(
+            **{ordering[i].lstrip("-"): values[i] for i in range(index)},
+            **{f"{name}__{lookup}": values[index]},
+        )
+        query |= condition
+
+    return query
+
+
+def _encode_value(value):
+    # keep the full (microseconds) precision of the datetimes
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+
+    return str(value)
+
+
+def _reverse_key(key: str) -> str:
+    return key[1:] if key.startswith("-") else f"-{key}"
+
+
+def _get_field(model, path: str):
+    field = None
+
+    for name in path.split("__"):
+        if model is None:
+            return None
+        try:
+            field = model._meta.pk if name == "pk" else model._meta.get_field(name)
+        except Exception:
+            return None
+        model = field.related_model
+
+    return field
+
+
+def _get_value(entity, path: str):
+    value = entity
+
+    for name in path.split("__"):
+        value = getattr(value, name, None)
+        value = getattr(value, "pk", value) if isinstance(value, models.Model) else value
+
+    return value
+
+
 def is_unset(v: typing.Any) -> bool:
     return isinstance(v, type(strawberry.UNSET)) or v == strawberry.UNSET
 
@@ -0,0 +1,30 @@
+# Generated by Django 5.2.5 on 2026-10-18 10:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("manager", "0066_commodity_image_url_commodity_product_id_and_more"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="tracking",
+            name="next_poll_at",
+            field=models.DateTimeField(
+                blank=True,
+                help_text="When the background tracking refresh should poll the carrier next",
+                null=True,
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="tracking",
+            index=models.Index(
+                condition=models.Q(("delivered", False)),
+                fields=["next_poll_at"],
+                name="tracking_next_poll_at_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.5 on 2026-10-18 12:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("manager", "0067_tracking_next_poll_at"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="shipment",
+            name="invoice_status",
+            field=models.CharField(
+                blank=True,
+                choices=[
+                    ("pending", "pending"),
+                    ("generated", "generated"),
+                    ("failed", "failed"),
+                ],
+                help_text="The state of the custom invoice generation",
+                max_length=20,
+                null=True,
+            ),
+        ),
+    ]
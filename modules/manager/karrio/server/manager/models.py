@@ -599,6 +599,12 @@ class Tracking(core.OwnedEntity):
         indexes = [
             # Index for archiving queries based on creation date
             models.Index(fields=["created_at"], name="tracking_created_at_idx"),
+            # Index for the background tracking refresh scheduler
+            models.Index(
+                fields=["next_poll_at"],
+                condition=models.Q(delivered=False),
+                name="tracking_next_poll_at_idx",
+            ),
         ]
 
     id = models.CharField(
@@ -644,6 +650,12 @@ class Tracking(core.OwnedEntity):
 
     # System Reference fields
 
+    next_poll_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text="When the background tracking refresh should poll the carrier next",
+    )
+
     tracking_carrier = models.ForeignKey(providers.Carrier, on_delete=models.CASCADE)
     shipment = models.OneToOneField(
         "Shipment", on_delete=models.CASCADE, related_name="shipment_tracker", null=True
@@ -803,6 +815,13 @@ class Shipment(core.OwnedEntity):
 
     label = models.TextField(max_length=None, null=True, blank=True)
     invoice = models.TextField(max_length=None, null=True, blank=True)
+    invoice_status = models.CharField(
+        max_length=20,
+        choices=serializers.INVOICE_STATUS,
+        null=True,
+        blank=True,
+        help_text="The state of the custom invoice generation",
+    )
     reference = models.CharField(max_length=100, null=True, blank=True)
     selected_rate = models.JSONField(blank=True, null=True)
     payment = models.JSONField(
@@ -36,6 +36,7 @@ from karrio.server.core.serializers import (
     ShipmentDetails,
     ShipmentStatus,
     TrackerStatus,
+    InvoiceStatus,
     ShipmentData,
     Documents,
     Shipment,
@@ -707,7 +708,7 @@ def buy_shipment_label(
             (
                 None
                 if pre_purchase_generation
-                else generate_custom_invoice(invoice_template, purchased_shipment)
+                else queue_custom_invoice(invoice_template, purchased_shipment)
             ),
         )
     )
@@ -907,7 +908,8 @@ def generate_custom_invoice(template: str, shipment: models.Shipment, **kwargs):
 
     if getattr(shipment, "tracking_number", None) is not None:
         shipment.invoice = document["doc_file"]
-        shipment.save(update_fields=["invoice"])
+        shipment.invoice_status = InvoiceStatus.generated.value
+        shipment.save(update_fields=["invoice", "invoice_status"])
 
     logger.info(
         "Custom document successfully generated",
@@ -918,6 +920,49 @@ def generate_custom_invoice(template: str, shipment: models.Shipment, **kwargs):
     return document
 
 
+def queue_custom_invoice(template: str, shipment: models.Shipment):
+    """Schedule the custom invoice generation of a purchased shipment
+    in the background so the label purchase does not wait for the PDF rendering.
+
+    The job is keyed by shipment, template and tracking number so a retried
+    or re-enqueued job does not generate the same invoice twice.
+    """
+    if any(template or "") is False:
+        return
+
+    if conf.settings.DOCUMENTS_MANAGEMENT is False:
+        logger.info("Document generation not supported", documents_management=False)
+        return
+
+    idempotency_key = get_invoice_idempotency_key(template, shipment)
+    already_queued = lib.identity(
+        (shipment.meta or {}).get("invoice_idempotency_key") == idempotency_key
+        and shipment.invoice_status
+        in (InvoiceStatus.pending.value, InvoiceStatus.generated.value)
+    )
+
+    if already_queued:
+        return
+
+    shipment.invoice_status = InvoiceStatus.pending.value
+    shipment.meta = {
+        **(shipment.meta or {}),
+        "invoice_idempotency_key": idempotency_key,
+    }
+    # the generation job is enqueued by the events module on save
+    shipment.save(update_fields=["invoice_status", "meta"])
+
+    logger.info(
+        "Custom document generation queued",
+        shipment_id=shipment.id,
+        template=template,
+    )
+
+
+def get_invoice_idempotency_key(template: str, shipment: models.Shipment) -> str:
+    return f"{shipment.id}:{template}:{shipment.tracking_number}"
+
+
 def upload_customs_forms(shipment: models.Shipment, document: dict, context=None):
     return (
         DocumentUploadSerializer.map(
@@ -435,6 +435,7 @@ SHIPMENT_RESPONSE = {
     "label_type": "PDF",
     "label_url": None,
     "invoice_url": None,
+    "invoice_status": None,
     "meta": {},
     "metadata": {},
     "tracking_number": None,
@@ -747,6 +748,7 @@ PURCHASED_SHIPMENT = {
     "test_mode": True,
     "label_url": ANY,
     "invoice_url": None,
+    "invoice_status": None,
 }
 
 CANCEL_RESPONSE = {
@@ -885,6 +887,7 @@ CANCEL_RESPONSE = {
     "test_mode": True,
     "label_url": None,
     "invoice_url": None,
+    "invoice_status": None,
 }
 
 CANCEL_PURCHASED_RESPONSE = {
@@ -1023,6 +1026,7 @@ CANCEL_PURCHASED_RESPONSE = {
     "test_mode": True,
     "label_url": None,
     "invoice_url": None,
+    "invoice_status": None,
 }
 
 SINGLE_CALL_LABEL_DATA = {
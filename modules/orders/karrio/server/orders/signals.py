@@ -10,7 +10,7 @@ from karrio.server.core.logging import logger
 import karrio.server.orders.serializers as serializers
 import karrio.server.manager.models as manager
 import karrio.server.orders.models as models
-import karrio.server.events.tasks as tasks
+import karrio.server.events.outbox as outbox
 import karrio.server.core.exceptions as exceptions
 
 
@@ -132,7 +132,7 @@ def order_updated(sender, instance, *args, **kwargs):
     if settings.MULTI_ORGANIZATIONS and context["org_id"] is None:
         return
 
-    tasks.notify_webhooks(event, data, event_at, context, schema=settings.schema)
+    outbox.publish(event, data, event_at, context, schema=settings.schema)
 
 
 @utils.disable_for_loaddata
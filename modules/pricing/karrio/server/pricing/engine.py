@@ -0,0 +1,187 @@
+"""Compiled markup engine.
+
+Active surcharges are loaded once per tenant (with their carrier accounts
+prefetched) and compiled into immutable `Markup` rules kept in an in-process
+LRU. The compiled rules are versioned by the last change (`updated_at`) and
+count of the tenant's surcharges and of their carrier accounts, read with a
+single aggregate query so every process (API servers or background workers)
+reloads them on the next access after a change.
+
+`apply_markups` applies all matching markups to a rate in one pass (in the
+surcharge query order, percentages compound like sequential application) and
+sorts the rates once.
+"""
+
+import attr
+import typing
+import importlib
+import django.conf as conf
+import django.db.models as models
+from django.db.models import Q
+
+import karrio.lib as lib
+import karrio.core.models as karrio
+import karrio.server.core.datatypes as datatypes
+from karrio.server.core.logging import logger
+
+MARKUP_CACHE_TTL = getattr(conf.settings, "MARKUP_CACHE_TTL", 300)
+MARKUP_CACHE_SIZE = getattr(conf.settings, "MARKUP_CACHE_SIZE", 1024)
+
+_markups = lib.LRUCache(maxsize=MARKUP_CACHE_SIZE, ttl=MARKUP_CACHE_TTL)
+
+
+@attr.s(auto_attribs=True, frozen=True)
+class Markup:
+    """A compiled surcharge rule."""
+
+    id: str
+    name: str
+    amount: float
+    surcharge_type: str
+    carriers: typing.FrozenSet[str] = frozenset()
+    carrier_ids: typing.FrozenSet[str] = frozenset()
+    services: typing.FrozenSet[str] = frozenset()
+
+    @classmethod
+    def compile(cls, surcharge) -> "Markup":
+        return cls(
+            id=surcharge.id,
+            name=surcharge.name,
+            amount=surcharge.amount,
+            surcharge_type=surcharge.surcharge_type,
+            carriers=frozenset(surcharge.carriers or []),
+            carrier_ids=frozenset(
+                c.carrier_id for c in surcharge.carrier_accounts.all()
+            ),
+            services=frozenset(surcharge.services or []),
+        )
+
+    def applies(self, rate: datatypes.Rate) -> bool:
+        applicable = []
+
+        if any(self.carriers):
+            # For custom carriers (ext="generic"), check if "generic" is in the addon's carrier list
+            # since rate.carrier_name contains custom_carrier_name but users select "generic"
+            if (
+                rate.meta
+                and rate.meta.get("ext") == "generic"
+                and "generic" in self.carriers
+            ):
+                applicable.append(True)
+            else:
+                applicable.append(rate.carrier_name in self.carriers)
+
+        if any(self.carrier_ids):
+            applicable.append(rate.carrier_id in self.carrier_ids)
+
+        if any(self.services):
+            applicable.append(rate.service in self.services)
+
+        return any(applicable) and all(applicable)
+
+    def charge(self, total_charge: float) -> float:
+        return lib.to_decimal(
+            self.amount
+            if self.surcharge_type == "AMOUNT"
+            else (total_charge * (typing.cast(float, self.amount) / 100))
+        )
+
+
+def clear() -> None:
+    """Drop every compiled markup kept by this process."""
+    _markups.clear()
+
+
+def get_filters(org_id: str = None) -> tuple:
+    if importlib.util.find_spec("karrio.server.orgs") is not None:
+        return (Q(active=True, org__id=org_id) | Q(active=True, org=None),)
+
+    return (Q(active=True),)
+
+
+def get_version(org_id: str = None) -> tuple:
+    """Return the last changes of the active surcharges of a tenant."""
+    import karrio.server.pricing.models as pricing
+
+    version = (
+        pricing.Surcharge.objects.filter(*get_filters(org_id))
+        .order_by()
+        .aggregate(
+            count=models.Count("id", distinct=True),
+            updated_at=models.Max("updated_at"),
+            account_count=models.Count("carrier_accounts", distinct=True),
+            account_updated_at=models.Max("carrier_accounts__updated_at"),
+        )
+    )
+
+    return tuple(version.values())
+
+
+def get_markups(org_id: str = None) -> typing.List[Markup]:
+    """Return the compiled active markups of a tenant."""
+    import karrio.server.pricing.models as pricing
+
+    key = f"{org_id}"
+    version = get_version(org_id)
+    entry = _markups.get(key)
+
+    if entry is not None and entry[0] == version:
+        return entry[1]
+
+    markups = [
+        Markup.compile(surcharge)
+        for surcharge in pricing.Surcharge.objects.filter(
+            *get_filters(org_id)
+        ).prefetch_related("carrier_accounts")
+    ]
+    _markups.set(key, (version, markups))
+
+    return markups
+
+
+def apply_markups(
+    markups: typing.List[Markup],
+    response: datatypes.RateResponse,
+) -> datatypes.RateResponse:
+    def apply(rate: datatypes.Rate) -> datatypes.Rate:
+        total_charge = rate.total_charge
+        extra_charges = []
+
+        for markup in markups:
+            if not markup.applies(rate):
+                continue
+
+            logger.debug(
+                "Applying broker surcharge to rate",
+                rate_id=rate.id,
+                surcharge_id=markup.id,
+            )
+            amount = markup.charge(total_charge)
+            total_charge = lib.to_decimal(total_charge + amount)
+            extra_charges.append(
+                karrio.ChargeDetails(
+                    name=typing.cast(str, markup.name),
+                    amount=amount,
+                    currency=rate.currency,
+                    id=markup.id,
+                )
+            )
+
+        if not any(extra_charges):
+            return rate
+
+        return datatypes.Rate(
+            **{
+                **lib.to_dict(rate),
+                "total_charge": total_charge,
+                "extra_charges": rate.extra_charges + extra_charges,
+            }
+        )
+
+    return datatypes.RateResponse(
+        messages=response.messages,
+        rates=sorted(
+            [apply(rate) for rate in response.rates],
+            key=lambda rate: rate.total_charge,
+        ),
+    )
@@ -1,33 +1,47 @@
-import functools
-import importlib
-from django.db.models import Q
+from django.utils import timezone
+from django.db.models import signals
 
 from karrio.server.serializers import Context
 from karrio.server.core.gateway import Rates
 from karrio.server.core.logging import logger
+import karrio.lib as lib
 import karrio.server.pricing.models as models
+import karrio.server.pricing.engine as engine
 
 
 def register_rate_post_processing(*args, **kwargs):
     Rates.post_process_functions += [apply_custom_surcharges]
+
+    signals.m2m_changed.connect(
+        carrier_accounts_changed, sender=models.Surcharge.carrier_accounts.through
+    )
+
     logger.info("Signal registration complete", module="karrio.pricing")
 
 
-def apply_custom_surcharges(context: Context, result):
-    _filters = tuple()
-
-    if importlib.util.find_spec("karrio.server.orgs") is not None:
-        _filters += (
-            Q(active=True, org__id=getattr(context.org, "id", None))
-            | Q(active=True, org=None),
-        )
-    else:
-        _filters += (Q(active=True),)
-
-    charges = models.Surcharge.objects.filter(*_filters)
-
-    return functools.reduce(
-        lambda cummulated_result, charge: charge.apply_charge(cummulated_result),
-        charges,
-        result,
+def carrier_accounts_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    """Mark surcharges as updated when their carrier accounts change.
+
+    The compiled markups are versioned by the surcharges `updated_at`, which
+    m2m changes don't touch.
+    """
+    if action not in ("post_add", "post_remove", "pre_clear"):
+        return
+
+    surcharges = lib.identity(
+        models.Surcharge.objects.filter(pk=instance.pk)
+        if not reverse
+        else models.Surcharge.objects.filter(carrier_accounts__pk=instance.pk)
+        if action == "pre_clear"
+        else models.Surcharge.objects.filter(pk__in=pk_set or [])
     )
+    surcharges.update(updated_at=timezone.now())
+
+
+def apply_custom_surcharges(context: Context, result):
+    markups = engine.get_markups(getattr(context.org, "id", None))
+
+    if not any(markups):
+        return result
+
+    return engine.apply_markups(markups, result)
@@ -5,6 +5,7 @@ from django.urls import reverse
 from rest_framework import status
 from karrio.core.models import RateDetails, ChargeDetails
 from karrio.server.core.tests import APITestCase
+import karrio.server.pricing.engine as engine
 import karrio.server.pricing.models as models
 
 logging.disable(logging.CRITICAL)
@@ -50,6 +51,29 @@ class TestPricing(APITestCase):
             self.assertEqual(response.status_code, status.HTTP_200_OK)
             self.assertDictEqual(response_data, RATING_WITH_PERCENTAGE_RESPONSE)
 
+    def test_compiled_markups_cached_until_surcharge_saved(self):
+        markups = engine.get_markups()
+
+        # only the version query runs
+        with self.assertNumQueries(1):
+            self.assertIs(engine.get_markups(), markups)
+
+        self.charge.amount = 2.0
+        self.charge.save()
+
+        self.assertListEqual([_.amount for _ in engine.get_markups()], [2.0])
+
+    def test_compiled_markups_follow_carrier_accounts(self):
+        markups = engine.get_markups()
+
+        self.carrier.save()
+        self.assertIs(engine.get_markups(), markups)
+
+        self.charge.carrier_accounts.add(self.carrier)
+        self.assertSetEqual(
+            set(engine.get_markups()[0].carrier_ids), {self.carrier.carrier_id}
+        )
+
 
 RATING_DATA = {
     "shipper": {
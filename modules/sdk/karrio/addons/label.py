@@ -1,8 +1,10 @@
+import typing
+import functools
 from jinja2 import Template
 from karrio.core.utils import DP
 from karrio.core.units import Package, CountryISO
 from karrio.core.models import ShipmentRequest
-from karrio.addons.renderer import render_label
+from karrio.addons.renderer import render_labels
 from karrio.universal.providers.shipping import (
     ShippingMixinSettings,
 )
@@ -16,8 +18,51 @@ def generate_label(
     settings: ShippingMixinSettings,
     index: int = 1,
 ) -> str:
-    template = getattr(settings.label_template, "template", DEFAULT_SVG_LABEL_TEMPLATE)
-    context = DP.to_dict(
+    return generate_labels(
+        shipment, [(package, tracking_number)], service_name, settings, index
+    )
+
+
+def generate_labels(
+    shipment: ShipmentRequest,
+    packages: typing.List[typing.Tuple[Package, str]],
+    service_name: str,
+    settings: ShippingMixinSettings,
+    start_index: int = 1,
+) -> str:
+    """Render the labels of a list of (package, tracking number) into a single
+    multi-page PDF or ZPL document.
+    """
+    template = compile_template(
+        getattr(settings.label_template, "template", DEFAULT_SVG_LABEL_TEMPLATE)
+    )
+    labels = [
+        template.render(
+            **get_label_context(
+                shipment, package, service_name, tracking_number, settings, index
+            )
+        )
+        for index, (package, tracking_number) in enumerate(packages, start_index)
+    ]
+
+    return render_labels(
+        labels,
+        label_type=getattr(shipment, "label_type", "PDF"),
+        template_type=getattr(settings.label_template, "type", "SVG"),
+        width=getattr(settings.label_template, "width", 4),
+        height=getattr(settings.label_template, "height", 6),
+    )
+
+
+def get_label_context(
+    shipment: ShipmentRequest,
+    package: Package,
+    service_name: str,
+    tracking_number: str,
+    settings: ShippingMixinSettings,
+    index: int = 1,
+) -> dict:
+    return DP.to_dict(
         dict(
             package_index=index,
             items=package.parcel.items,
@@ -36,13 +81,10 @@ def generate_label(
         )
     )
 
-    return render_label(
-        label=Template(template).render(**context),
-        label_type=getattr(shipment, "label_type", "PDF"),
-        template_type=getattr(settings.label_template, "type", "SVG"),
-        width=getattr(settings.label_template, "width", 4),
-        height=getattr(settings.label_template, "height", 6),
-    )
+
+@functools.lru_cache(maxsize=64)
+def compile_template(template: str) -> Template:
+    return Template(template)
 
 
 DEFAULT_SVG_LABEL_TEMPLATE = """
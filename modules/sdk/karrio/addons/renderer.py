@@ -1,141 +1,223 @@
 import io
 import base64
+import typing
+import functools
 from pathlib import Path
 from barcode import Code128
 from lxml.etree import fromstring
 from barcode.writer import ImageWriter
 from PIL import Image, ImageDraw, ImageFont
-from karrio.core.utils import DP, request
+import karrio.core.utils.zpl as zpl
 
 FONTS_DIR = Path(__file__).resolve().parent / "fonts"
 LINE_SEPARATOR = """
 """
 
 
-def generate_pdf_from_svg_label(content: str, **kwargs):
-    template = fromstring(content)
-    label = Image.new("L", (1200, 1800), "white")
-    draw = ImageDraw.Draw(label)
+class Barcode(typing.NamedTuple):
+    x: int
+    y: int
+    width: int
+    height: int
+    value: str
+    module_width: int
+    width_ratio: int
+
+
+class Line(typing.NamedTuple):
+    x1: int
+    y1: int
+    x2: int
+    y2: int
+    fill: typing.Optional[str]
+    stroke_width: int
+
+
+class Text(typing.NamedTuple):
+    x: int
+    y: int
+    text: typing.Optional[str]
+    fill: typing.Optional[str]
+    font_size: int
+    bold: bool
+    is_barcode_text: bool
 
-    font = lambda size=10, bold=False: ImageFont.truetype(
+
+DrawPlan = typing.Tuple[typing.Union[Barcode, Line, Text], ...]
+
+
+@functools.lru_cache(maxsize=None)
+def get_font(size: int = 10, bold: bool = False):
+    return ImageFont.truetype(
         f"{FONTS_DIR}/Oswald-{'SemiBold' if bold else 'Regular'}.ttf", size
     )
 
+
+@functools.lru_cache(maxsize=1024)
+def parse_style(style_text: str, default_font_size: str) -> typing.Tuple[int, bool]:
+    """Return the (font size, bold) of an inline style attribute."""
+    style = dict(
+        [[k.strip() for k in s.split(":")] for s in style_text.split(";") if s != ""]
+    )
+    font_size = int(style.get("font-size", default_font_size).replace("px", ""))
+
+    return font_size, "bold" in style_text
+
+
+def compile_svg_label(content: str) -> DrawPlan:
+    """Parse a rendered SVG label into a draw plan shared by the PDF and ZPL renderers.
+
+    Rendered labels hold shipment specific values so the plan is not cached.
+    """
+    template = fromstring(content)
+    plan: typing.List[typing.Union[Barcode, Line, Text]] = []
+
     for element in template:
         tag = element.tag if isinstance(element.tag, str) else ""
 
         if "g" in tag and element.get("data-type") == "barcode":
-            x = int(element.get("x") or 0)
-            y = int(element.get("y") or 0)
-            width = int(element.get("width") or 0)
-            height = int(element.get("height") or 0)
-            value = element.get("data-value")
-            style_text = element.get("style")
-            style = dict(
-                [
-                    [k.strip() for k in s.split(":")]
-                    for s in style_text.split(";")
-                    if s != ""
-                ]
+            plan.append(
+                Barcode(
+                    x=int(element.get("x") or 0),
+                    y=int(element.get("y") or 0),
+                    width=int(element.get("width") or 0),
+                    height=int(element.get("height") or 0),
+                    value=element.get("data-value"),
+                    module_width=int(element.get("data-module-width") or 3),
+                    width_ratio=int(element.get("data-width-ratio") or 2),
+                )
             )
-            bold = "bold" in style_text
-            font_size = int(style.get("font-size", "40").replace("px", ""))
-
-            barcode = Code128(value, writer=ImageWriter()).render(
-                writer_options=dict(
-                    quiet_zone=1.0,
-                    module_width=0.5,
-                    module_height=30.0,
-                    font_size=1,
-                    text_distance=0.0,
-                    dpi=300,
-                ),
-                text="",
+
+        if "line" in tag:
+            plan.append(
+                Line(
+                    x1=int(element.get("x1") or 0),
+                    y1=int(element.get("y1") or 0),
+                    x2=int(element.get("x2") or 0),
+                    y2=int(element.get("y2") or 0),
+                    fill=element.get("fill"),
+                    stroke_width=int(element.get("stroke-width") or 3),
+                )
             )
-            barcode.thumbnail((width, height))
 
-            label.paste(barcode, (x, y))
+        if "text" in tag:
+            font_size, bold = parse_style(element.get("style") or "", "10")
+            plan.append(
+                Text(
+                    x=int(element.get("x") or 0),
+                    y=int(element.get("y") or 0),
+                    text=element.text,
+                    fill=element.get("fill"),
+                    font_size=font_size,
+                    bold=bold,
+                    is_barcode_text=element.get("data-type") == "barcode-text",
+                )
+            )
 
-        if "line" in tag:
-            fill = element.get("fill")
-            width = int(element.get("stroke-width") or 3)
-            x1 = int(element.get("x1") or 0)
-            y1 = int(element.get("y1") or 0) + 20
-            x2 = int(element.get("x2") or 0)
-            y2 = int(element.get("y2") or 0) + 20
+    return tuple(plan)
 
-            draw.line((x1, y1, x2, y2), fill=fill, width=width)
 
-        if "text" in tag:
-            x = int(element.get("x") or 0)
-            y = int(element.get("y") or 0) - 20
-            text = element.text or ""
-            fill = element.get("fill")
-            style_text = element.get("style")
-            style = dict(
-                [
-                    [k.strip() for k in s.split(":")]
-                    for s in style_text.split(";")
-                    if s != ""
-                ]
+def render_barcode(value: str, width: int, height: int):
+    barcode = Code128(value, writer=ImageWriter()).render(
+        writer_options=dict(
+            quiet_zone=1.0,
+            module_width=0.5,
+            module_height=30.0,
+            font_size=1,
+            text_distance=0.0,
+            dpi=300,
+        ),
+        text="",
+    )
+    barcode.thumbnail((width, height))
+
+    return barcode
+
+
+@functools.lru_cache(maxsize=4096)
+def render_text(text: str, size: int, bold: bool, start: float = 0.0):
+    """Return the (mask, offset) of a rendered text (glyph rendering is the costly part)."""
+    font = get_font(size, bold)
+    left, top, right, bottom = font.getbbox(text)
+    mask = Image.new("L", (right - left + 1, bottom - top + 1), 0)
+    ImageDraw.Draw(mask).text((start - left, -top), text, fill=255, font=font)
+
+    return mask, (left, top)
+
+
+def draw_text(label, x: float, y: float, text: str, fill, size: int, bold: bool):
+    if text == "":
+        return
+
+    if "\n" in text or "\r" in text:
+        font = get_font(size, bold)
+        return ImageDraw.Draw(label).text((x, y), text, fill=fill, font=font)
+
+    mask, (left, top) = render_text(text, size, bold, x - int(x))
+    label.paste(fill or 0, (int(x) + left, int(y) + top), mask)
+
+
+def generate_pdf_from_svg_label(content: str, **kwargs):
+    label = Image.new("L", (1200, 1800), "white")
+    draw = ImageDraw.Draw(label)
+
+    for element in compile_svg_label(content):
+        if isinstance(element, Barcode):
+            barcode = render_barcode(element.value, element.width, element.height)
+            label.paste(barcode, (element.x, element.y))
+
+        elif isinstance(element, Line):
+            draw.line(
+                (element.x1, element.y1 + 20, element.x2, element.y2 + 20),
+                fill=element.fill,
+                width=element.stroke_width,
+            )
+
+        elif element.is_barcode_text:
+            step = element.font_size * 0.66
+
+            for i, char in enumerate(element.text or "", 0):
+                draw_text(
+                    label,
+                    element.x + (step * i),
+                    element.y - 20,
+                    char,
+                    "black",
+                    element.font_size,
+                    False,
+                )
+
+        else:
+            draw_text(
+                label,
+                element.x,
+                element.y - 20,
+                element.text or "",
+                element.fill,
+                element.font_size,
+                element.bold,
             )
-            bold = "bold" in style_text
-            font_size = int(style.get("font-size", "10").replace("px", ""))
-
-            if element.get("data-type") == "barcode-text":
-                for i, char in enumerate(text, 0):
-                    draw.text(
-                        (x + ((font_size * 0.66) * i), y),
-                        char,
-                        fill="black",
-                        font=font(font_size, False),
-                    )
-            else:
-                draw.text((x, y), text, fill=fill, font=font(font_size, bold))
 
     return label
 
 
 def generate_zpl_from_svg_label(content: str, **kwargs) -> str:
-    template = fromstring(content)
     concat = lambda *args: LINE_SEPARATOR.join(args)
     doc = "^XA"
 
-    for element in template:
-        tag = element.tag if isinstance(element.tag, str) else ""
-
-        if "g" in tag and element.get("data-type") == "barcode":
-            x = int(element.get("x") or 0)
-            y = int(element.get("y") or 0)
-            width = int(element.get("width") or 0)
-            height = int(element.get("height") or 0)
-            module_width = int(element.get("data-module-width") or 3)
-            width_ratio = int(element.get("data-width-ratio") or 2)
-            value = element.get("data-value")
-            style_text = element.get("style")
-            style = dict(
-                [
-                    [k.strip() for k in s.split(":")]
-                    for s in style_text.split(";")
-                    if s != ""
-                ]
-            )
-            bold = "bold" in style_text
-            font_size = int(style.get("font-size", "40").replace("px", ""))
-
+    for element in compile_svg_label(content):
+        if isinstance(element, Barcode):
             doc = concat(
                 doc,
                 "",
-                f"^BY{module_width},{width_ratio},{height}",
-                f"^FO{x},{y}^BCN,{height},N,Y,Y,D^FD{value}^FS",
+                f"^BY{element.module_width},{element.width_ratio},{element.height}",
+                f"^FO{element.x},{element.y}^BCN,{element.height},N,Y,Y,D^FD{element.value}^FS",
             )
 
-        if "line" in tag:
-            stroke = int(element.get("stroke-width") or 3) + 1
-            x1 = int(element.get("x1") or 0)
-            y1 = int(element.get("y1") or 0) + 20
-            x2 = int(element.get("x2") or 0)
-            y2 = int(element.get("y2") or 0) + 20
+        elif isinstance(element, Line):
+            stroke = element.stroke_width + 1
+            x1, y1 = element.x1, element.y1 + 20
+            x2, y2 = element.x2, element.y2 + 20
 
             width = x2 - x1 if x2 != x1 else stroke
             height = y2 - y1 if y2 != y1 else stroke
@@ -146,26 +228,12 @@ def generate_zpl_from_svg_label(content: str, **kwargs) -> str:
                 f"^FO{x1},{y1}^GB{width},{height},{stroke}^FS",
             )
 
-        if "text" in tag:
-            x = int(element.get("x") or 0)
-            y = int(element.get("y") or 0)
-            text = element.text
-            style_text = element.get("style")
-            style = dict(
-                [
-                    [k.strip() for k in s.split(":")]
-                    for s in style_text.split(";")
-                    if s != ""
-                ]
-            )
-            bold = "bold" in style_text
-            font_size = int(style.get("font-size", "10").replace("px", ""))
-
+        else:
             doc = concat(
                 doc,
                 "",
-                f"^CF{'0' if bold else 'A'},{font_size}",
-                f"^FO{x},{y}^FD{text}^FS",
+                f"^CF{'0' if element.bold else 'A'},{element.font_size}",
+                f"^FO{element.x},{element.y}^FD{element.text}^FS",
             )
 
     doc = concat(
@@ -179,30 +247,35 @@ def generate_zpl_from_svg_label(content: str, **kwargs) -> str:
 
 def render_label(label: str, label_type: str, template_type: str, **kwargs) -> str:
     """Return a base64 string from a label."""
+    return render_labels([label], label_type, template_type, **kwargs)
+
+
+def render_labels(
+    labels: typing.List[str], label_type: str, template_type: str, **kwargs
+) -> str:
+    """Return a single base64 document (multi-page PDF or ZPL stream) from labels."""
     result = io.BytesIO()
 
     if template_type == "SVG" and label_type == "PDF":
-        pdf = generate_pdf_from_svg_label(label, **kwargs)
-        pdf.save(result, label_type, resolution=300)
+        pages = [generate_pdf_from_svg_label(label, **kwargs) for label in labels]
+        pages[0].save(
+            result,
+            label_type,
+            resolution=300,
+            save_all=True,
+            append_images=pages[1:],
+        )
 
     elif template_type == "ZPL" and label_type == "PDF":
         width, height = kwargs.get("width"), kwargs.get("height")
-        data = DP.jsonify(dict(file=label))
-        pdf = request(
-            url=f"http://api.labelary.com/v1/printers/12dpmm/labels/{width}x{height}/0/",
-            data=data,
-            headers={"Accept": "application/pdf"},
-            decoder=lambda b: base64.encodebytes(b).decode("utf-8"),
-        )
-
-        # return it as is because it's already a base64 string.
-        return pdf
+        images = zpl.render(LINE_SEPARATOR.join(labels), width, height, dpmm=12)
+        result.write(zpl.to_pdf(images, dpmm=12))
 
     elif template_type == "SVG" and label_type == "ZPL":
-        doc = generate_zpl_from_svg_label(label, **kwargs)
-        result.write(doc.encode("utf-8"))
+        docs = [generate_zpl_from_svg_label(label, **kwargs) for label in labels]
+        result.write(LINE_SEPARATOR.join(docs).encode("utf-8"))
 
     else:
-        result.write(label.encode("utf-8"))
+        result.write(LINE_SEPARATOR.join(labels).encode("utf-8"))
 
     return base64.b64encode(result.getvalue()).decode("utf-8")
@@ -2,6 +2,7 @@
 
 import attr
 import typing
+import asyncio
 import functools
 import karrio.lib as lib
 import karrio.core.errors as errors
@@ -49,6 +50,7 @@ def abort(
 
 def fail_safe(gateway: gateway.Gateway):
     """Decorate operation and requests calls to enrich any failure context
+    and attribute the carrier calls made to the gateway's carrier
 
     Args:
         gateway (gateway.Gateway): The gateway in use
@@ -57,19 +59,32 @@ def fail_safe(gateway: gateway.Gateway):
         Decorator
     """
 
+    def on_failure(error: Exception) -> "IDeserialize":
+        logger.exception("Operation failed", carrier=gateway.settings.carrier_name)
+
+        # abort reports any exception (detailed SDK errors or not) as messages
+        return IDeserialize(functools.partial(abort, gateway=gateway, error=error))  # type: ignore
+
     def catcher(func):
+        if asyncio.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                try:
+                    with lib.carrier_scope(gateway.settings.carrier_name):
+                        return await func(*args, **kwargs)
+                except Exception as error:
+                    return on_failure(error)
+
+            return async_wrapper
+
         @functools.wraps(func)
         def wrapper(*args, **kwargs):
             try:
-                return func(*args, **kwargs)
+                with lib.carrier_scope(gateway.settings.carrier_name):
+                    return func(*args, **kwargs)
             except Exception as error:
-                logger.exception(
-                    "Operation failed", carrier=gateway.settings.carrier_name
-                )
-
-                return IDeserialize(
-                    functools.partial(abort, gateway=gateway, error=error)
-                )
+                return on_failure(error)
 
         return wrapper
 
@@ -125,22 +140,46 @@ class IRequestFrom:
     """A lazy request (from) type class"""
 
     action: typing.Callable[[gateway.Gateway], IDeserialize]
+    async_action: typing.Optional[
+        typing.Callable[[gateway.Gateway], typing.Awaitable[IDeserialize]]
+    ] = None
 
     def from_(self, gateway: gateway.Gateway) -> IDeserialize:
         """Execute the request action from the provided gateway"""
         return fail_safe(gateway)(self.action)(gateway)
 
+    async def afrom_(self, gateway: gateway.Gateway) -> IDeserialize:
+        """Execute the request action from the provided gateway on the running event loop"""
+        if self.async_action is None:
+            return await lib.run_in_executor(self.from_, gateway)
+
+        return await fail_safe(gateway)(self.async_action)(gateway)
+
 
 @attr.s(auto_attribs=True)
 class IRequestFromMany:
     """A lazy request (from one or many) type class"""
 
     action: typing.Callable[[typing.List[gateway.Gateway]], IDeserialize]
+    async_action: typing.Optional[
+        typing.Callable[
+            [typing.List[gateway.Gateway]], typing.Awaitable[IDeserialize]
+        ]
+    ] = None
 
     def from_(self, *gateways: gateway.Gateway) -> IDeserialize:
         """Execute the request action(s) from the provided gateway(s)"""
         return self.action(list({_.settings.carrier_id: _ for _ in gateways}.values()))
 
+    async def afrom_(self, *gateways: gateway.Gateway) -> IDeserialize:
+        """Execute the request action(s) from the provided gateway(s) on the running event loop"""
+        _gateways = list({_.settings.carrier_id: _ for _ in gateways}.values())
+
+        if self.async_action is None:
+            return await lib.run_in_executor(self.action, _gateways)
+
+        return await self.async_action(_gateways)
+
 
 class Address:
     """The unified Address API fluent interface"""
@@ -290,29 +329,46 @@ class Rating:
         logger.debug("Fetching shipment rates", payload=lib.to_dict(args))
         payload = lib.to_object(models.RateRequest, lib.to_dict(args))
 
-        def action(gateways: typing.List[gateway.Gateway]):
-            def process(gateway: gateway.Gateway):
-                is_valid, abortion = check_operation(
-                    gateway,
-                    "get_rates",
-                    origin_country_code=payload.shipper.country_code,
-                )
-                if not is_valid:
-                    return abortion
+        def prepare(gateway: gateway.Gateway):
+            is_valid, abortion = check_operation(
+                gateway,
+                "get_rates",
+                origin_country_code=payload.shipper.country_code,
+            )
+            if not is_valid:
+                return None, abortion
 
-                request: lib.Serializable = gateway.mapper.create_rate_request(payload)
-                response: lib.Deserializable = gateway.proxy.get_rates(request)
+            return gateway.mapper.create_rate_request(payload), None
 
-                @fail_safe(gateway)
-                def deserialize():
-                    return gateway.mapper.parse_rate_response(response)
+        def deserializer(gateway: gateway.Gateway, response: lib.Deserializable):
+            @fail_safe(gateway)
+            def deserialize():
+                return gateway.mapper.parse_rate_response(response)
 
-                return IDeserialize(deserialize)
+            return IDeserialize(deserialize)
 
-            deserializable_collection: typing.List[IDeserialize] = (
-                lib.run_asynchronously(lambda g: fail_safe(g)(process)(g), gateways)
-            )
+        def process(gateway: gateway.Gateway):
+            request, abortion = prepare(gateway)
+            if abortion is not None:
+                return abortion
 
+            response: lib.Deserializable = gateway.proxy.get_rates(request)
+
+            return deserializer(gateway, response)
+
+        async def aprocess(gateway: gateway.Gateway):
+            request, abortion = prepare(gateway)
+            if abortion is not None:
+                return abortion
+
+            response: lib.Deserializable = await gateway.proxy.aget_rates(request)
+
+            return deserializer(gateway, response)
+
+        def collect(
+            gateways: typing.List[gateway.Gateway],
+            deserializable_collection: typing.List[IDeserialize],
+        ):
             def flatten(*args):
                 responses = [p.parse() for p in deserializable_collection]
                 flattened_rates = sum(
@@ -343,7 +399,21 @@ class Rating:
 
             return IDeserialize(flatten)
 
-        return IRequestFromMany(action)
+        def action(gateways: typing.List[gateway.Gateway]):
+            deserializable_collection: typing.List[IDeserialize] = (
+                lib.run_asynchronously(lambda g: fail_safe(g)(process)(g), gateways)
+            )
+
+            return collect(gateways, deserializable_collection)
+
+        async def async_action(gateways: typing.List[gateway.Gateway]):
+            deserializable_collection: typing.List[IDeserialize] = list(
+                await asyncio.gather(*[fail_safe(g)(aprocess)(g) for g in gateways])
+            )
+
+            return collect(gateways, deserializable_collection)
+
+        return IRequestFromMany(action, async_action)
 
 
 class Shipment:
@@ -431,6 +501,13 @@ class Tracking:
         logger.debug("Tracking shipment", payload=lib.to_dict(args))
         payload = lib.to_object(models.TrackingRequest, lib.to_dict(args))
 
+        def deserializer(gateway: gateway.Gateway, response: lib.Deserializable):
+            @fail_safe(gateway)
+            def deserialize():
+                return gateway.mapper.parse_tracking_response(response)
+
+            return IDeserialize(deserialize)
+
         def action(gateway: gateway.Gateway) -> IDeserialize:
             is_valid, abortion = check_operation(gateway, "get_tracking")
             if not is_valid:
@@ -439,13 +516,19 @@ class Tracking:
             request: lib.Serializable = gateway.mapper.create_tracking_request(payload)
             response: lib.Deserializable = gateway.proxy.get_tracking(request)
 
-            @fail_safe(gateway)
-            def deserialize():
-                return gateway.mapper.parse_tracking_response(response)
+            return deserializer(gateway, response)
 
-            return IDeserialize(deserialize)
+        async def async_action(gateway: gateway.Gateway) -> IDeserialize:
+            is_valid, abortion = check_operation(gateway, "get_tracking")
+            if not is_valid:
+                return abortion
 
-        return IRequestFrom(action)
+            request: lib.Serializable = gateway.mapper.create_tracking_request(payload)
+            response: lib.Deserializable = await gateway.proxy.aget_tracking(request)
+
+            return deserializer(gateway, response)
+
+        return IRequestFrom(action, async_action)
 
 
 class Document:
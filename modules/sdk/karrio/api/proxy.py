@@ -61,6 +61,34 @@ class Proxy(abc.ABC):
             self.__class__.get_tracking.__name__, self.settings.carrier_name
         )
 
+    async def aget_rates(self, request: lib.Serializable) -> lib.Deserializable:
+        """Async variant of `get_rates` running on the caller's event loop
+
+        Connectors override this method with a native `lib.arequest` implementation.
+        By default `get_rates` runs on the shared bounded executor.
+
+        Args:
+            request (Serializable): a carrier specific serializable request data type
+
+        Returns:
+            Deserializable: a Deserializable rate response (xml, json, text...)
+        """
+        return await lib.run_in_executor(self.get_rates, request)
+
+    async def aget_tracking(self, request: lib.Serializable) -> lib.Deserializable:
+        """Async variant of `get_tracking` running on the caller's event loop
+
+        Connectors override this method with a native `lib.arequest` implementation.
+        By default `get_tracking` runs on the shared bounded executor.
+
+        Args:
+            request (Serializable): a carrier specific serializable request data type
+
+        Returns:
+           Deserializable: a Deserializable tracking response (xml, json, text...)
+        """
+        return await lib.run_in_executor(self.get_tracking, request)
+
     def create_shipment(self, request: lib.Serializable) -> lib.Deserializable:
         """Send one or many request(s) to create a shipment from a carrier webservice
 
@@ -0,0 +1,277 @@
+"""
+Karrio Plugin Manifest Module.
+
+The plugin manifest is a JSON file recording, for every discovered plugin,
+its metadata, the module defining it and the reference data it contributes
+(services, options, connection fields, capabilities...). When a manifest is
+configured through the `KARRIO_PLUGIN_MANIFEST` environment variable,
+`karrio.references` builds its registry from it and only imports a plugin
+module when one of its components (Mapper, Proxy, Settings, units...) is
+first used, typically when a gateway is created for that carrier.
+
+The manifest records a fingerprint of the installed plugins (names,
+entrypoints, versions and modification times). A stale or missing manifest
+is ignored and rebuilt after the plugins are imported eagerly. Rebuild it
+explicitly with `kcli plugins manifest` after changing plugin code in place.
+"""
+
+import os
+import sys
+import json
+import attr
+import typing
+import pkgutil
+import hashlib
+import builtins
+import tempfile
+import importlib
+import threading
+import importlib.metadata as importlib_metadata
+
+import karrio.core.plugins as plugins
+import karrio.core.metadata as metadata
+from karrio.core.utils.logger import logger
+
+MANIFEST_VERSION = 1
+MANIFEST_ENV = "KARRIO_PLUGIN_MANIFEST"
+NAMESPACES = ["karrio.plugins", "karrio.mappers"]
+
+# Components and units only available once the plugin module is imported
+LAZY_FIELDS = (
+    "Proxy",
+    "Mapper",
+    "Hooks",
+    "Settings",
+    "options",
+    "services",
+    "countries",
+    "packaging_types",
+    "package_presets",
+    "service_levels",
+    "connection_configs",
+)
+COMPONENTS = ("Proxy", "Mapper", "Hooks", "Settings")
+
+_load_lock = threading.RLock()
+
+
+class LazyPluginMetadata(metadata.PluginMetadata):
+    """
+    Plugin metadata restored from the manifest.
+
+    The descriptive fields are available immediately. Accessing a component
+    or unit field imports the plugin module and copies its METADATA over.
+    """
+
+    module: str
+    components: typing.Dict[str, bool]
+    references: dict
+    loaded: bool
+    on_load: typing.Optional[typing.Callable[["LazyPluginMetadata"], typing.Any]]
+
+    def __init__(
+        self,
+        module: str,
+        components: typing.Dict[str, bool],
+        references: dict,
+        **fields,
+    ):
+        super().__init__(**fields)
+        self.__dict__.update(
+            module=module,
+            components=components,
+            references=references,
+            loaded=False,
+            on_load=None,
+        )
+
+    def __getattribute__(self, name: str):
+        if name in LAZY_FIELDS and not object.__getattribute__(self, "loaded"):
+            object.__getattribute__(self, "load")()
+
+        return object.__getattribute__(self, name)
+
+    def load(self) -> "LazyPluginMetadata":
+        """Import the plugin module and take over its METADATA components."""
+        with _load_lock:
+            if self.loaded:
+                return self
+
+            module = importlib.import_module(self.module)
+            plugin = getattr(module, "METADATA")
+
+            for field in attr.fields(metadata.PluginMetadata):
+                object.__setattr__(self, field.name, getattr(plugin, field.name))
+
+            self.__dict__.update(loaded=True)
+            logger.debug("Plugin module imported", plugin_id=self.id, module=self.module)
+
+            if self.on_load is not None:
+                self.on_load(self)
+
+        return self
+
+    def is_integration(self) -> bool:
+        if self.loaded:
+            return super().is_integration()
+
+        return all(self.components.get(name) for name in ("Mapper", "Proxy", "Settings"))
+
+    def has_hooks(self) -> bool:
+        if self.loaded:
+            return super().has_hooks()
+
+        return bool(self.components.get("Hooks"))
+
+
+def get_manifest_path() -> typing.Optional[str]:
+    return os.environ.get(MANIFEST_ENV) or None
+
+
+def fingerprint() -> str:
+    """Hash the installed plugins without importing them."""
+    items = [f"karrio={_version('karrio')}", f"python={sys.version_info[:2]}"]
+
+    for namespace in NAMESPACES:
+        module = sys.modules.get(namespace) or _import(namespace)
+
+        for info in pkgutil.iter_modules(getattr(module, "__path__", [])):
+            path = os.path.join(getattr(info.module_finder, "path", ""), info.name)
+            items.append(f"{namespace}.{info.name}:{_mtime(path)}")
+
+    for entry_point in plugins.get_entrypoints():
+        dist = getattr(entry_point, "dist", None)
+        items.append(
+            f"entrypoint.{entry_point.name}={entry_point.value}:{getattr(dist, 'version', '')}"
+        )
+
+    return hashlib.sha256("\n".join(sorted(items)).encode()).hexdigest()
+
+
+def read(path: str) -> typing.Optional[dict]:
+    """Return the manifest at `path` if it exists and matches the installed plugins."""
+    try:
+        with open(path) as file:
+            manifest = json.load(file)
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        logger.warning("Invalid plugin manifest", path=path, error=str(e))
+        return None
+
+    if manifest.get("version") != MANIFEST_VERSION:
+        return None
+
+    if manifest.get("fingerprint") != fingerprint():
+        logger.info("Plugin manifest is stale", path=path)
+        return None
+
+    return manifest
+
+
+def write(path: str, manifest: dict) -> str:
+    """Write the manifest atomically so concurrent workers never read a partial file."""
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+
+    with tempfile.NamedTemporaryFile(
+        "w", dir=directory, prefix=".plugins-", suffix=".json", delete=False
+    ) as file:
+        json.dump(manifest, file, default=str)
+
+    os.chmod(file.name, 0o644)
+    os.replace(file.name, path)
+    logger.info("Plugin manifest written", path=path, count=len(manifest["plugins"]))
+
+    return path
+
+
+def to_entry(
+    metadata_obj: metadata.PluginMetadata,
+    references: dict,
+) -> typing.Optional[dict]:
+    """Return the manifest entry of a plugin (None if its module can't be located)."""
+    module = _find_module(metadata_obj)
+
+    if module is None:
+        return None
+
+    fields = {
+        field.name: getattr(metadata_obj, field.name)
+        for field in attr.fields(metadata.PluginMetadata)
+        if field.name not in LAZY_FIELDS
+    }
+    fields.update(system_config=_dump_system_config(fields.get("system_config")))
+
+    return dict(
+        module=module,
+        fields=fields,
+        components={
+            name: getattr(metadata_obj, name, None) is not None for name in COMPONENTS
+        },
+        references=references,
+    )
+
+
+def from_entry(entry: dict) -> LazyPluginMetadata:
+    fields = dict(entry["fields"])
+    fields.update(system_config=_load_system_config(fields.get("system_config")))
+
+    return LazyPluginMetadata(
+        module=entry["module"],
+        components=entry["components"],
+        references=entry["references"],
+        **fields,
+    )
+
+
+def _find_module(metadata_obj: metadata.PluginMetadata) -> typing.Optional[str]:
+    for name, module in list(sys.modules.items()):
+        if getattr(module, "__dict__", {}).get("METADATA") is metadata_obj:
+            return name
+
+    return None
+
+
+def _dump_system_config(config: typing.Optional[dict]) -> typing.Optional[dict]:
+    if not config:
+        return config
+
+    return {
+        key: [default, description, getattr(value_type, "__name__", "str")]
+        for key, (default, description, value_type) in config.items()
+    }
+
+
+def _load_system_config(config: typing.Optional[dict]) -> typing.Optional[dict]:
+    if not config:
+        return config
+
+    return {
+        key: (default, description, getattr(builtins, value_type, str))
+        for key, (default, description, value_type) in config.items()
+    }
+
+
+def _import(name: str):
+    try:
+        return importlib.import_module(name)
+    except ImportError:
+        return None
+
+
+def _version(name: str) -> str:
+    try:
+        return importlib_metadata.version(name)
+    except Exception:
+        return ""
+
+
+def _mtime(path: str) -> float:
+    for candidate in (os.path.join(path, "__init__.py"), f"{path}.py", path):
+        try:
+            return os.stat(candidate).st_mtime
+        except OSError:
+            continue
+
+    return 0
@@ -60,6 +60,11 @@ class PluginMetadata:
     hub_carriers: Optional[Dict[str, str]] = None
     has_intl_accounts: Optional[bool] = False
 
+    # Background tracking refresh limits
+    # (tracking numbers per request and tracking numbers per second per connection)
+    tracking_batch_size: Optional[int] = None
+    tracking_rate_limit: Optional[float] = None
+
     # System configuration for runtime settings (e.g., OAuth credentials)
     # Format: Dict[str, Tuple[default_value, description, type]]
     # Example: {"CARRIER_OAUTH_CLIENT_ID": ("", "OAuth client ID", str)}
@@ -515,6 +515,22 @@ def get_failed_plugin_modules() -> Dict[str, Any]:
     return FAILED_PLUGIN_MODULES  # type: ignore
 
 
+def get_entrypoints() -> List[Any]:
+    """Return the entrypoints registered in the 'karrio.plugins' group (without loading them)."""
+    entry_points = importlib_metadata.entry_points()
+
+    # Handle different entry_points behavior in different versions of importlib_metadata
+    if hasattr(entry_points, "select"):  # Python 3.10+
+        return list(entry_points.select(group=ENTRYPOINT_GROUP))
+    elif hasattr(entry_points, "get"):  # Python 3.8, 3.9
+        return list(entry_points.get(ENTRYPOINT_GROUP, []))  # type: ignore
+
+    # Older versions or different implementation
+    return [
+        ep for ep in entry_points if getattr(ep, "group", None) == ENTRYPOINT_GROUP
+    ]  # type: ignore
+
+
 def discover_entrypoint_plugins() -> Dict[str, Dict[str, Any]]:
     """
     Discover plugins registered via setuptools entrypoints.
@@ -530,22 +546,7 @@ def discover_entrypoint_plugins() -> Dict[str, Dict[str, Any]]:
     entrypoint_plugins = {}
 
     try:
-        # Find all entry points in the karrio.plugins group
-        entry_points = importlib_metadata.entry_points()
-
-        # Handle different entry_points behavior in different versions of importlib_metadata
-        if hasattr(entry_points, "select"):  # Python 3.10+
-            plugin_entry_points = entry_points.select(group=ENTRYPOINT_GROUP)
-        elif hasattr(entry_points, "get"):  # Python 3.8, 3.9
-            plugin_entry_points = entry_points.get(ENTRYPOINT_GROUP, [])  # type: ignore
-        else:  # Older versions or different implementation
-            plugin_entry_points = [
-                ep
-                for ep in entry_points
-                if getattr(ep, "group", None) == ENTRYPOINT_GROUP
-            ]  # type: ignore
-
-        for entry_point in plugin_entry_points:
+        for entry_point in get_entrypoints():
             plugin_name = entry_point.name
 
             try:
@@ -21,7 +21,24 @@ from karrio.core.utils.tracing import (
     get_default_telemetry,
 )
 from karrio.core.utils.transformer import to_multi_piece_rates, to_multi_piece_shipment
-from karrio.core.utils.caching import Cache
+from karrio.core.utils.caching import Cache, LRUCache
+from karrio.core.utils.transport import (
+    Transport,
+    UrllibTransport,
+    PooledTransport,
+    HTTP2Transport,
+    get_transport,
+    set_transport,
+)
+from karrio.core.utils.executor import (
+    Executor,
+    CarrierLimiter,
+    carrier_scope,
+    current_carrier,
+    get_executor,
+    get_carrier_limiter,
+    run_in_executor,
+)
 from karrio.core.utils.config import SystemConfig, AbstractSystemConfig
 from karrio.core.utils.functional import typed
 from karrio.core.utils.logger import logger, configure_logger, intercept_standard_logging
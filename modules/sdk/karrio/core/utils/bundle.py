@@ -0,0 +1,272 @@
+"""Streaming document bundler.
+
+Bundles base64 encoded labels into a single PDF, ZPL or PNG document while
+yielding the output in chunks, so the bundle never has to be held in memory
+at once. Only one source document is decoded at a time; the PDF writer keeps
+the object offsets it needs for the cross-reference table and the PNG writer
+compresses the rows as they are produced.
+
+Usage:
+    for chunk in bundle.stream(labels, "PDF"):
+        response.write(chunk)
+"""
+
+import io
+import zlib
+import base64
+import struct
+import typing
+import PyPDF2
+import PyPDF2.generic as generic
+import PIL.Image
+
+from karrio.core.utils.logger import logger
+
+PDF_HEADER = b"%PDF-1.7\n%\xe2\xe3\xcf\xd3\n"
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+CATALOG_ID, PAGES_ID = 1, 2
+
+
+def stream(
+    documents: typing.Iterable[str], format: str = "PDF"
+) -> typing.Iterator[bytes]:
+    """Yield a bundle of the base64 `documents` in the given format.
+
+    Image bundles read the documents twice (sizes first, then pixels) so
+    `documents` must be re-iterable for them.
+    """
+    format = (format or "PDF").upper()
+
+    if format == "PDF":
+        return stream_pdfs(documents)
+    if "ZPL" in format:
+        return stream_zpls(documents)
+    if format == "PNG":
+        return stream_pngs(documents)
+
+    return _stream_image(documents, format)
+
+
+def stream_zpls(documents: typing.Iterable[str]) -> typing.Iterator[bytes]:
+    for document in documents:
+        yield base64.b64decode(document) + b"\n"
+
+
+def stream_pdfs(documents: typing.Iterable[str]) -> typing.Iterator[bytes]:
+    """Yield a PDF made of the pages of all `documents`, written incrementally."""
+    writer = _PDFWriter()
+
+    yield writer.header()
+
+    for document in documents:
+        try:
+            reader = PyPDF2.PdfReader(
+                io.BytesIO(base64.b64decode(document)), strict=False
+            )
+            yield writer.append(reader)
+        except Exception as e:
+            logger.error("Failed to bundle PDF document", error=str(e))
+
+    yield writer.trailer()
+
+
+def stream_pngs(documents: typing.Iterable[str]) -> typing.Iterator[bytes]:
+    """Yield a PNG of the `documents` stacked vertically on a black background."""
+    sizes = [_image_size(document) for document in documents]
+    width = max([w for w, _ in sizes], default=0)
+    height = sum(h for _, h in sizes)
+    compressor = zlib.compressobj()
+
+    yield PNG_SIGNATURE
+    yield _png_chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0))
+
+    for document in documents:
+        image = PIL.Image.open(io.BytesIO(base64.b64decode(document))).convert("RGB")
+        stride = image.width * 3
+        padding = bytes((width - image.width) * 3)
+        pixels = image.tobytes()
+
+        data = compressor.compress(
+            b"".join(
+                b"\x00" + pixels[row : row + stride] + padding
+                for row in range(0, len(pixels), stride)
+            )
+        )
+        if data:
+            yield _png_chunk(b"IDAT", data)
+
+    yield _png_chunk(b"IDAT", compressor.flush())
+    yield _png_chunk(b"IEND", b"")
+
+
+def _stream_image(
+    documents: typing.Iterable[str], format: str
+) -> typing.Iterator[bytes]:
+    from karrio.core.utils.helpers import bundle_imgs
+
+    buffer = io.BytesIO()
+    bundle_imgs(list(documents)).save(buffer, format)
+
+    yield buffer.getvalue()
+
+
+def _image_size(document: str) -> typing.Tuple[int, int]:
+    # PIL only parses the header until the pixels are accessed.
+    return PIL.Image.open(io.BytesIO(base64.b64decode(document))).size
+
+
+def _png_chunk(kind: bytes, data: bytes) -> bytes:
+    return (
+        struct.pack(">I", len(data))
+        + kind
+        + data
+        + struct.pack(">I", zlib.crc32(kind + data))
+    )
+
+
+class _PDFWriter:
+    """Append-only PDF writer.
+
+    The catalog and page tree root are reserved upfront and written last, so
+    every copied page can reference its parent before the tree is complete.
+    """
+
+    def __init__(self):
+        self.offset = 0
+        self.offsets: typing.Dict[int, int] = {}
+        self.kids: typing.List[int] = []
+        self.next_id = PAGES_ID + 1
+
+    def header(self) -> bytes:
+        return self._emit(PDF_HEADER)
+
+    def append(self, reader: PyPDF2.PdfReader) -> bytes:
+        """Return the pages of `reader` renumbered after the objects already written."""
+        offset, next_id, kids = self.offset, self.next_id, len(self.kids)
+
+        try:
+            return b"".join(self._copy(reader))
+        except Exception:
+            self.offset, self.next_id = offset, next_id
+            self.offsets = {k: v for k, v in self.offsets.items() if k < next_id}
+            del self.kids[kids:]
+            raise
+
+    def _copy(self, reader: PyPDF2.PdfReader) -> typing.Iterator[bytes]:
+        refs: typing.Dict[typing.Tuple[int, int], int] = {}
+        pending: typing.List[typing.Tuple[int, generic.IndirectObject]] = []
+        pages: typing.Dict[int, PyPDF2.PageObject] = {}
+
+        def ref(obj: generic.IndirectObject) -> int:
+            key = (obj.idnum, obj.generation)
+            if key not in refs:
+                refs[key] = self._allocate()
+                pending.append((refs[key], obj))
+            return refs[key]
+
+        # pages are numbered first so annotations and links can point to them
+        for page in reader.pages:
+            page_id = self._allocate()
+            pages[page_id] = page
+            self.kids.append(page_id)
+
+            if page.indirect_reference is not None:
+                ref_key = (
+                    page.indirect_reference.idnum,
+                    page.indirect_reference.generation,
+                )
+                refs[ref_key] = page_id
+
+        for page_id, page in pages.items():
+            yield self._object(page_id, page, ref, is_page=True)
+
+            while pending:
+                obj_id, obj = pending.pop()
+                yield self._object(obj_id, obj.get_object(), ref)
+
+    def trailer(self) -> bytes:
+        kids = " ".join(f"{kid} 0 R" for kid in self.kids)
+        chunks = [
+            self._indirect(
+                PAGES_ID,
+                f"<< /Type /Pages /Kids [{kids}] /Count {len(self.kids)} >>".encode(),
+            ),
+            self._indirect(
+                CATALOG_ID, f"<< /Type /Catalog /Pages {PAGES_ID} 0 R >>".encode()
+            ),
+        ]
+
+        xref_offset = self.offset
+        xref = io.BytesIO()
+        xref.write(f"xref\n0 {self.next_id}\n0000000000 65535 f \n".encode())
+        for obj_id in range(1, self.next_id):
+            if obj_id in self.offsets:
+                xref.write(f"{self.offsets[obj_id]:010d} 00000 n \n".encode())
+            else:
+                xref.write(b"0000000000 65535 f \n")
+        xref.write(
+            f"trailer\n<< /Size {self.next_id} /Root {CATALOG_ID} 0 R >>\n"
+            f"startxref\n{xref_offset}\n%%EOF\n".encode()
+        )
+        chunks.append(self._emit(xref.getvalue()))
+
+        return b"".join(chunks)
+
+    def _allocate(self) -> int:
+        obj_id, self.next_id = self.next_id, self.next_id + 1
+        return obj_id
+
+    def _object(
+        self, obj_id: int, obj: typing.Any, ref, is_page: bool = False
+    ) -> bytes:
+        buffer = io.BytesIO()
+        _serialize(obj, buffer, ref, is_page=is_page)
+        return self._indirect(obj_id, buffer.getvalue())
+
+    def _indirect(self, obj_id: int, content: bytes) -> bytes:
+        self.offsets[obj_id] = self.offset
+        return self._emit(b"%d 0 obj\n%s\nendobj\n" % (obj_id, content))
+
+    def _emit(self, content: bytes) -> bytes:
+        self.offset += len(content)
+        return content
+
+
+def _serialize(obj: typing.Any, buffer: io.BytesIO, ref, is_page: bool = False):
+    """Write `obj` with its indirect references renumbered through `ref`."""
+    if isinstance(obj, generic.IndirectObject):
+        buffer.write(b"%d 0 R" % ref(obj))
+
+    elif isinstance(obj, generic.DictionaryObject):
+        buffer.write(b"<<")
+        if is_page and "/Parent" not in obj:
+            buffer.write(b"\n/Parent %d 0 R" % PAGES_ID)
+        for key, value in obj.items():
+            if key == "/Length" and isinstance(obj, generic.StreamObject):
+                continue
+            buffer.write(b"\n")
+            generic.NameObject(key).write_to_stream(buffer, None)
+            buffer.write(b" ")
+            if is_page and key == "/Parent":
+                buffer.write(b"%d 0 R" % PAGES_ID)
+            else:
+                _serialize(value, buffer, ref)
+        if isinstance(obj, generic.StreamObject):
+            buffer.write(b"\n/Length %d\n>>\nstream\n" % len(obj._data))
+            buffer.write(obj._data)
+            buffer.write(b"\nendstream")
+        else:
+            buffer.write(b"\n>>")
+
+    elif isinstance(obj, generic.ArrayObject):
+        buffer.write(b"[")
+        for item in obj:
+            buffer.write(b" ")
+            _serialize(item, buffer, ref)
+        buffer.write(b" ]")
+
+    elif obj is None:
+        buffer.write(b"null")
+
+    else:
+        obj.write_to_stream(buffer, None)
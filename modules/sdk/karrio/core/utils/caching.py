@@ -1,7 +1,16 @@
+import os
+import time
 import typing
 import threading
 import datetime
-import concurrent.futures as futures
+import contextlib
+import collections
+
+DEFAULT_LOCAL_CACHE_SIZE = 1024
+DEFAULT_LOCAL_CACHE_TTL = 300  # seconds
+# the process wide tier fronts a cache shared with other processes: keep its
+# entries short lived so updates and deletes made elsewhere are seen quickly.
+DEFAULT_SHARED_LOCAL_CACHE_TTL = 5  # seconds
 
 
 class AbstractCache:
@@ -12,51 +21,214 @@ class AbstractCache:
         pass
 
 
+class LRUCache(AbstractCache):
+    """Thread-safe bounded in-process LRU cache with per entry TTL.
+
+    Entries expire after the smallest of the `timeout` given on set and the
+    cache `ttl`. The least recently used entry is evicted when full.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = DEFAULT_LOCAL_CACHE_SIZE,
+        ttl: float = DEFAULT_LOCAL_CACHE_TTL,
+    ):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: "collections.OrderedDict[str, typing.Tuple[typing.Any, float]]" = (
+            collections.OrderedDict()
+        )
+        self._flights: typing.Dict[str, typing.Tuple[threading.Lock, int]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: str):
+        with self._lock:
+            entry = self._entries.get(key)
+
+            if entry is None:
+                self.misses += 1
+                return None
+
+            value, expires_at = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: str, value: typing.Any, timeout: float = None, **kwargs):
+        ttl = self.ttl if timeout is None else min(timeout, self.ttl)
+
+        with self._lock:
+            self._entries[key] = (value, time.monotonic() + ttl)
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, key: str):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    @contextlib.contextmanager
+    def single_flight(self, key: str):
+        """Serialize the loading of a key so concurrent misses compute once."""
+        with self._lock:
+            lock, count = self._flights.get(key, (None, 0))
+            lock = lock or threading.Lock()
+            self._flights[key] = (lock, count + 1)
+
+        try:
+            with lock:
+                yield
+        finally:
+            with self._lock:
+                _, count = self._flights[key]
+                if count == 1:
+                    del self._flights[key]
+                else:
+                    self._flights[key] = (lock, count - 1)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return dict(
+                size=len(self._entries),
+                maxsize=self.maxsize,
+                hits=self.hits,
+                misses=self.misses,
+                evictions=self.evictions,
+                expirations=self.expirations,
+            )
+
+
+_local_cache: typing.Optional[LRUCache] = None
+_local_cache_lock = threading.Lock()
+
+
+def get_local_cache() -> LRUCache:
+    """Get or create the process wide in-process cache tier (lazy initialization, thread-safe)."""
+    global _local_cache
+    if _local_cache is None:
+        with _local_cache_lock:
+            if _local_cache is None:
+                _local_cache = LRUCache(
+                    maxsize=int(
+                        os.getenv("KARRIO_LOCAL_CACHE_SIZE", DEFAULT_LOCAL_CACHE_SIZE)
+                    ),
+                    ttl=float(
+                        os.getenv(
+                            "KARRIO_LOCAL_CACHE_TTL", DEFAULT_SHARED_LOCAL_CACHE_TTL
+                        )
+                    ),
+                )
+    return _local_cache
+
+
 class Cache(AbstractCache):
-    def __init__(self, cache: typing.Optional[AbstractCache] = None, **kwargs) -> None:
+    """Two-tier cache: a bounded in-process LRU in front of the system cache.
+
+    When a system cache (e.g. Django/Redis) is provided, the in-process tier is
+    shared by every Cache of the process and only holds entries for a few
+    seconds (KARRIO_LOCAL_CACHE_TTL), which bounds how long a value updated or
+    deleted by another process can be served. Standalone caches get their own tier.
+    """
+
+    def __init__(
+        self,
+        cache: typing.Optional[AbstractCache] = None,
+        local: typing.Optional[LRUCache] = None,
+        **kwargs,
+    ) -> None:
         self._cache = cache  # system cache
-        self._values: typing.Dict[str, futures.Future] = {}  # shallow cache
+        self._local = local or (
+            get_local_cache() if cache is not None else LRUCache()
+        )  # in-process cache
+        self.remote_hits = 0
+        self.remote_misses = 0
+        self.loads = 0
 
         for key, value in kwargs.items():
             self.set(key, value)
 
     def get(self, key: str):
-        _value = self._values.get(key)
-        _cache_value = None if self._cache is None else self._cache.get(key)
-        _result = None
-
-        if _value is not None:
-            _result = _value.result()
+        _value = self._local.get(key)
+        if _value is not None or self._cache is None:
+            return _value
 
-        if self._cache is not None and _cache_value is not None:
-            _result = _cache_value
+        _value = self._cache.get(key)
 
-        # sync value in shallow cache if it only exist in the cache
-        if _value is None and _cache_value is not None:
-            self.set(key, _cache_value)
+        if _value is None:
+            self.remote_misses += 1
+            return None
 
-        # sync value in cache if it only exist shallow cache
-        if _cache_value is None and _value is not None and self._cache is not None:
-            self._cache.set(key, _cache_value)
+        # sync value in the in-process cache if it only exist in the system cache
+        self.remote_hits += 1
+        self._local.set(key, _value)
 
-        return _result
+        return _value
 
     def set(self, key: str, value: typing.Any, timeout: int = 86400, **kwargs):
-        def _save():
-            if isinstance(value, typing.Callable):
-                return value()
+        if callable(value):
+            self.loads += 1
+            value = value()
 
-            return value
-
-        executor = futures.ThreadPoolExecutor(max_workers=1)
-        promise = executor.submit(_save)
-        self._values.update({key: promise})
+        self._local.set(key, value, timeout=timeout)
 
         # set value in cache if it exist
         if self._cache is not None:
-            promise.add_done_callback(
-                lambda _: self._cache.set(key, _.result(), timeout=timeout)
-            )
+            self._cache.set(key, value, timeout=timeout)
+
+    def delete(self, key: str):
+        self._local.delete(key)
+
+        if self._cache is not None and hasattr(self._cache, "delete"):
+            self._cache.delete(key)
+
+    def get_or_set(
+        self,
+        key: str,
+        loader: typing.Callable[[], typing.Any],
+        timeout: int = 86400,
+    ):
+        """Return the cached value or compute it once, even on concurrent misses."""
+        _value = self.get(key)
+        if _value is not None:
+            return _value
+
+        with self.single_flight(key):
+            _value = self.get(key)
+            if _value is not None:
+                return _value
+
+            self.loads += 1
+            _value = loader()
+            self.set(key, _value, timeout=timeout)
+
+            return _value
+
+    def single_flight(self, key: str):
+        return self._local.single_flight(key)
+
+    def stats(self) -> dict:
+        return dict(
+            local=self._local.stats(),
+            remote_hits=self.remote_hits,
+            remote_misses=self.remote_misses,
+            loads=self.loads,
+        )
 
     def thread_safe(
         self,
@@ -195,7 +367,7 @@ class ThreadSafeTokenManager:
             return token
 
         # Token is expired or doesn't exist - need to refresh
-        with self._lock:
+        with self._refresh_lock():
             # Double-check pattern: another thread might have refreshed
             token_data = self.cache.get(self.cache_key) or {}
             token = token_data.get(self.token_field)
@@ -218,6 +390,17 @@ class ThreadSafeTokenManager:
             except Exception as e:
                 raise Exception(f"Token refresh failed: {str(e)}")
 
+    def _refresh_lock(self):
+        """Return the lock serializing token refreshes for the cache key.
+
+        Caches supporting single flight share it across token managers
+        (and gateways) of the process.
+        """
+        if isinstance(self.cache, Cache):
+            return self.cache.single_flight(self.cache_key)
+
+        return self._lock
+
     def get_state(self) -> str:
         """Get the current token state (valid token or refresh if needed).
 
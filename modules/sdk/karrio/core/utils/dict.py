@@ -4,7 +4,7 @@ import attr
 import json
 import types
 import jstruct.utils as jstruct
-from typing import Union, Any, TypeVar, Callable, Type, Optional
+from typing import Union, Any, TypeVar, Callable, Type, Optional, FrozenSet, Dict, Tuple
 
 T = TypeVar("T")
 
@@ -17,28 +17,9 @@ class DICTPARSE:
         :param value: a value that can be serialized to JSON.
         :return: a string.
         """
-
-        def _parser(item):
-            if attr.has(item):
-                if isinstance(item, Callable) and hasattr(item, "__name__"):
-                    return item.__name__
-                return attr.asdict(item)
-            if isinstance(item, types.FunctionType):
-                return None
-            if isinstance(item, type):
-                return str(item)
-            if isinstance(item, Callable):
-                return str(item)
-            if isinstance(item, enum.Enum):
-                return item.value
-            if hasattr(item, "__dict__"):
-                return item.__dict__
-
-            return item
-
         return json.dumps(
             entity,
-            default=_parser,
+            default=_serialize,
             sort_keys=True,
             indent=4,
         )
@@ -54,6 +35,11 @@ class DICTPARSE:
         if isinstance(entity, str):
             entity = re.sub(",[ \t\r\n]+}", "}", entity)
             entity = re.sub(r",[ \t\r\n]+\]", "]", entity)
+        elif not isinstance(entity, bytes):
+            try:
+                return _to_builtin(entity, _clear_empty)
+            except (_Unsupported, RecursionError):
+                pass  # fallback to the JSON round trip
 
         return json.loads(
             (
@@ -79,5 +65,128 @@ class DICTPARSE:
         if data is None or object_type is None:
             return None
 
+        if _instantiation_plan(object_type).issuperset(data):
+            return object_type(**data)
+
+        # filter out (and log) the unknown arguments
         entity: object_type = jstruct.instantiate(object_type, data)  # type: ignore
         return entity
+
+
+_EMPTY_VALUES: Tuple[Any, ...] = (None, [], "")
+_PRIMITIVE_TYPES = (str, int, float, bool, type(None))
+_PLANS: Dict[type, FrozenSet[str]] = {}
+
+
+class _Unsupported(Exception):
+    """Raised when a value needs the JSON round trip to be converted."""
+
+
+def _serialize(item):
+    if attr.has(item):
+        if isinstance(item, Callable) and hasattr(item, "__name__"):
+            return item.__name__
+        return attr.asdict(item)
+    if isinstance(item, types.FunctionType):
+        return None
+    if isinstance(item, type):
+        return str(item)
+    if isinstance(item, Callable):
+        return str(item)
+    if isinstance(item, enum.Enum):
+        return item.value
+    if hasattr(item, "__dict__"):
+        return item.__dict__
+
+    return item
+
+
+def _instantiation_plan(object_type: type) -> FrozenSet[str]:
+    """Return (and cache) the argument names supported by a class."""
+    plan = _PLANS.get(object_type)
+
+    if plan is None:
+        plan = _PLANS[object_type] = frozenset(
+            getattr(object_type, "__annotations__", {})
+        )
+
+    return plan
+
+
+def _to_builtin(item: Any, clear_empty: bool) -> Any:
+    """Convert a value to the result of its JSON round trip without encoding it.
+
+    Mirrors `json.loads(DICTPARSE.jsonify(item))`: keys are sorted, tuples
+    become lists, str/int/float subclasses (e.g. enum mixins) become their
+    builtin value and other objects go through `_serialize`.
+    Raises `_Unsupported` for values only the JSON encoder can handle (or fail on).
+    """
+    cls = type(item)
+    kind = _KINDS.get(cls) or _classify(cls)
+
+    if kind is _PRIMITIVE:
+        return item
+    if kind is _ATTRS:
+        return _to_builtin_fields(item, _FIELDS[cls], clear_empty)
+    if kind is _DICT:
+        return _to_builtin_fields(item, _sorted_keys(item), clear_empty, item.get)
+    if kind is _LIST:
+        return [_to_builtin(value, clear_empty) for value in item]
+    if kind is not _OTHER:
+        return kind(item)
+
+    value = _serialize(item)
+
+    if value is item:
+        raise _Unsupported()
+
+    return _to_builtin(value, clear_empty)
+
+
+def _to_builtin_fields(item, keys, clear_empty: bool, getter=None) -> dict:
+    result = {}
+    get = getter or item.__getattribute__
+
+    for key in keys:
+        value = _to_builtin(get(key), clear_empty)
+
+        if not clear_empty or value not in _EMPTY_VALUES:
+            result[key] = value
+
+    return result
+
+
+def _sorted_keys(item: dict) -> list:
+    for key in item:
+        if type(key) is not str:
+            raise _Unsupported()
+
+    return sorted(item)
+
+
+# conversion plan of a type: a marker, or the builtin type to cast to
+_PRIMITIVE, _ATTRS, _DICT, _LIST, _OTHER = (object() for _ in range(5))
+_KINDS: Dict[type, Any] = {_type: _PRIMITIVE for _type in _PRIMITIVE_TYPES}
+_FIELDS: Dict[type, tuple] = {}
+
+
+def _classify(cls: type) -> Any:
+    if issubclass(cls, dict):
+        kind = _DICT
+    elif issubclass(cls, (list, tuple)):
+        kind = _LIST
+    elif issubclass(cls, str):
+        kind = str.__str__
+    elif issubclass(cls, int):
+        kind = int.__int__
+    elif issubclass(cls, float):
+        kind = float.__float__
+    elif attr.has(cls) and not any("__call__" in vars(k) for k in cls.__mro__):
+        # callable attrs instances may serialize to their name (see `_serialize`)
+        kind = _ATTRS
+        _FIELDS[cls] = tuple(sorted(a.name for a in cls.__attrs_attrs__))
+    else:
+        kind = _OTHER
+
+    _KINDS[cls] = kind
+    return kind
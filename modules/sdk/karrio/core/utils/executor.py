@@ -0,0 +1,548 @@
+"""
+Shared execution resources for Karrio SDK.
+
+This module provides:
+1. Executor: the process wide bounded thread pool used by `lib.run_asynchronously`,
+   `lib.run_concurently` and to run blocking (not yet async ported) carrier calls
+   from asyncio code.
+2. CarrierLimiter: per-carrier caps on concurrent carrier API calls.
+3. Metrics: queue depth, wait time and throughput counters.
+
+Fan-outs never wait on a saturated pool: when the queue is full (or a fan-out
+reaches its `max_workers`), the submitting thread runs the pending items itself.
+This applies backpressure and keeps nested fan-outs (e.g. per-package requests
+inside a multi-carrier rate request) from deadlocking the bounded pool.
+
+Configuration (environment variables):
+- KARRIO_MAX_WORKERS: size of the shared thread pool (default: 32)
+- KARRIO_MAX_QUEUE_SIZE: max number of queued fan-out items (default: 256)
+- KARRIO_CARRIER_MAX_CONCURRENCY: default concurrent calls per carrier (default: 16)
+- KARRIO_CARRIER_CONCURRENCY: per carrier overrides (e.g. "canadapost:4,usps:8")
+"""
+
+import os
+import time
+import typing
+import asyncio
+import inspect
+import weakref
+import functools
+import threading
+import contextlib
+import contextvars
+import collections
+import concurrent.futures as futures
+
+T = typing.TypeVar("T")
+S = typing.TypeVar("S")
+
+DEFAULT_MAX_WORKERS = 32
+DEFAULT_MAX_QUEUE_SIZE = 256
+DEFAULT_CARRIER_MAX_CONCURRENCY = 16
+
+current_carrier: contextvars.ContextVar[typing.Optional[str]] = contextvars.ContextVar(
+    "karrio_current_carrier", default=None
+)
+
+
+@contextlib.contextmanager
+def carrier_scope(carrier_name: typing.Optional[str]):
+    """Attribute the work (and nested fan-outs) run in this scope to a carrier."""
+    token = current_carrier.set(carrier_name)
+    try:
+        yield
+    finally:
+        current_carrier.reset(token)
+
+
+# =============================================================================
+# Metrics
+# =============================================================================
+
+
+class WaitStats:
+    """Wait time accumulator (guarded by its owner's lock)."""
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, wait: float):
+        self.count += 1
+        self.total += wait
+        self.max = max(self.max, wait)
+
+    def to_dict(self) -> dict:
+        return dict(
+            count=self.count,
+            total=round(self.total, 6),
+            max=round(self.max, 6),
+            avg=round(self.total / self.count, 6) if self.count else 0.0,
+        )
+
+
+# =============================================================================
+# Per-carrier concurrency limits
+# =============================================================================
+
+
+def parse_carrier_limits(value: typing.Optional[str]) -> typing.Dict[str, int]:
+    """Parse a "carrier:limit,carrier:limit" configuration string."""
+    limits = {}
+
+    for entry in (value or "").split(","):
+        if ":" not in entry:
+            continue
+
+        carrier, limit = entry.split(":", 1)
+        limits[carrier.strip()] = int(limit)
+
+    return limits
+
+
+class CarrierLimiter:
+    """Cap the number of concurrent calls made to each carrier.
+
+    Blocking callers share one semaphore per carrier while coroutines use one
+    asyncio semaphore per (event loop, carrier).
+    """
+
+    def __init__(
+        self,
+        default_limit: int = DEFAULT_CARRIER_MAX_CONCURRENCY,
+        limits: typing.Dict[str, int] = None,
+    ):
+        self.default_limit = default_limit
+        self.limits = dict(limits or {})
+        self._semaphores: typing.Dict[str, threading.BoundedSemaphore] = {}
+        self._async_semaphores: "weakref.WeakKeyDictionary" = (
+            weakref.WeakKeyDictionary()
+        )
+        self._active: typing.Dict[str, int] = collections.defaultdict(int)
+        self._waiting: typing.Dict[str, int] = collections.defaultdict(int)
+        self._waits: typing.Dict[str, WaitStats] = collections.defaultdict(WaitStats)
+        self._lock = threading.Lock()
+
+    def limit(self, carrier_name: str) -> int:
+        return self.limits.get(carrier_name, self.default_limit)
+
+    def _semaphore(self, carrier_name: str) -> threading.BoundedSemaphore:
+        with self._lock:
+            if carrier_name not in self._semaphores:
+                self._semaphores[carrier_name] = threading.BoundedSemaphore(
+                    self.limit(carrier_name)
+                )
+
+            return self._semaphores[carrier_name]
+
+    def _async_semaphore(self, carrier_name: str) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+
+        with self._lock:
+            semaphores = self._async_semaphores.setdefault(loop, {})
+            if carrier_name not in semaphores:
+                semaphores[carrier_name] = asyncio.Semaphore(self.limit(carrier_name))
+
+            return semaphores[carrier_name]
+
+    def _enter(self, carrier_name: str, started_at: float):
+        with self._lock:
+            self._waiting[carrier_name] -= 1
+            self._active[carrier_name] += 1
+            self._waits[carrier_name].record(time.monotonic() - started_at)
+
+    def _wait(self, carrier_name: str) -> float:
+        with self._lock:
+            self._waiting[carrier_name] += 1
+
+        return time.monotonic()
+
+    def _exit(self, carrier_name: str):
+        with self._lock:
+            self._active[carrier_name] -= 1
+
+    @contextlib.contextmanager
+    def slot(self, carrier_name: typing.Optional[str] = None):
+        """Hold one of the carrier's call slots (blocking)."""
+        carrier_name = carrier_name or current_carrier.get()
+        if carrier_name is None:
+            yield
+            return
+
+        semaphore = self._semaphore(carrier_name)
+        started_at = self._wait(carrier_name)
+
+        with semaphore:
+            self._enter(carrier_name, started_at)
+            try:
+                yield
+            finally:
+                self._exit(carrier_name)
+
+    @contextlib.asynccontextmanager
+    async def aslot(self, carrier_name: typing.Optional[str] = None):
+        """Hold one of the carrier's call slots (on the running event loop)."""
+        carrier_name = carrier_name or current_carrier.get()
+        if carrier_name is None:
+            yield
+            return
+
+        semaphore = self._async_semaphore(carrier_name)
+        started_at = self._wait(carrier_name)
+
+        async with semaphore:
+            self._enter(carrier_name, started_at)
+            try:
+                yield
+            finally:
+                self._exit(carrier_name)
+
+    def metrics(self) -> dict:
+        with self._lock:
+            carriers = set(self._waits) | set(self._active) | set(self._waiting)
+
+            return {
+                carrier_name: dict(
+                    limit=self.limit(carrier_name),
+                    active=self._active.get(carrier_name, 0),
+                    waiting=self._waiting.get(carrier_name, 0),
+                    wait_time=self._waits[carrier_name].to_dict(),
+                )
+                for carrier_name in sorted(carriers)
+            }
+
+
+# =============================================================================
+# Bounded executor
+# =============================================================================
+
+
+class Task:
+    """A fan-out item that runs exactly once, on a worker or on the caller."""
+
+    PENDING, RUNNING = 0, 1
+
+    def __init__(self, func: typing.Callable, item: typing.Any):
+        self.func = func
+        self.item = item
+        self.context = contextvars.copy_context()
+        self.future: futures.Future = futures.Future()
+        self.on_done: typing.Optional[typing.Callable[[], None]] = None
+        self._state = Task.PENDING
+        self._lock = threading.Lock()
+
+    def claim(self) -> bool:
+        with self._lock:
+            if self._state != Task.PENDING:
+                return False
+
+            self._state = Task.RUNNING
+            return True
+
+    def run(self):
+        try:
+            self.future.set_result(self.context.run(self.func, self.item))
+        except BaseException as error:
+            self.future.set_exception(error)
+        finally:
+            if self.on_done is not None:
+                self.on_done()
+
+
+class Executor(futures.Executor):
+    """Process wide bounded thread pool with caller-runs backpressure."""
+
+    def __init__(
+        self,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        max_queue_size: int = DEFAULT_MAX_QUEUE_SIZE,
+    ):
+        self.max_workers = max_workers
+        self.max_queue_size = max_queue_size
+        self._pool = futures.ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix="karrio_worker",
+        )
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._active = 0
+        self._submitted = 0
+        self._completed = 0
+        self._caller_runs = 0
+        self._wait = WaitStats()
+
+    def _enqueue(self, func: typing.Callable, *args, **kwargs) -> futures.Future:
+        enqueued_at = time.monotonic()
+
+        def _run():
+            self._start(enqueued_at)
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self._finish()
+
+        with self._lock:
+            self._queued += 1
+            self._submitted += 1
+
+        return self._pool.submit(_run)
+
+    def _enqueue_task(self, task: Task) -> None:
+        enqueued_at = time.monotonic()
+
+        def _run():
+            # the caller stole the task and released its queue slot already
+            if not task.claim():
+                return
+
+            self._start(enqueued_at)
+            try:
+                task.run()
+            finally:
+                self._finish()
+
+        with self._lock:
+            self._queued += 1
+            self._submitted += 1
+
+        self._pool.submit(_run)
+
+    def _start(self, enqueued_at: float):
+        with self._lock:
+            self._queued -= 1
+            self._active += 1
+            self._wait.record(time.monotonic() - enqueued_at)
+
+    def _finish(self):
+        with self._lock:
+            self._active -= 1
+            self._completed += 1
+
+    def _try_reserve(self) -> bool:
+        with self._lock:
+            return self._queued < self.max_queue_size
+
+    def submit(self, fn, /, *args, **kwargs) -> futures.Future:
+        return self._enqueue(fn, *args, **kwargs)
+
+    def map_items(
+        self,
+        func: typing.Callable[[S], T],
+        sequence: typing.Iterable[S],
+        max_workers: typing.Optional[int] = None,
+        return_exceptions: bool = False,
+    ) -> typing.List[typing.Union[T, Exception]]:
+        """Run func over every item and return the results in the sequence order.
+
+        At most `max_workers` items of this fan-out are queued at once. Items that
+        cannot be queued and queued items no worker picked up yet are run by
+        the caller.
+        """
+        tasks = [Task(func, item) for item in sequence]
+        if not tasks:
+            return []
+
+        window = threading.BoundedSemaphore(min(max_workers or len(tasks), len(tasks)))
+        queued = []
+
+        for task in tasks:
+            if len(tasks) > 1 and window.acquire(blocking=False):
+                if self._try_reserve():
+                    task.on_done = window.release
+                    queued.append(task)
+                    self._enqueue_task(task)
+                    continue
+
+                window.release()
+
+            # caller-runs: the window or the queue is full
+            if task.claim():
+                with self._lock:
+                    self._caller_runs += 1
+                task.run()
+
+        # steal queued items no worker has picked up yet
+        for task in queued:
+            if task.claim():
+                with self._lock:
+                    self._queued -= 1
+                    self._caller_runs += 1
+                task.run()
+
+        results = []
+        for task in tasks:
+            try:
+                results.append(task.future.result())
+            except Exception as error:
+                if not return_exceptions:
+                    raise
+                results.append(error)
+
+        return results
+
+    def metrics(self) -> dict:
+        with self._lock:
+            return dict(
+                max_workers=self.max_workers,
+                max_queue_size=self.max_queue_size,
+                queue_depth=self._queued,
+                active=self._active,
+                submitted=self._submitted,
+                completed=self._completed,
+                caller_runs=self._caller_runs,
+                wait_time=self._wait.to_dict(),
+            )
+
+    def shutdown(self, wait: bool = True, *, cancel_futures: bool = False):
+        self._pool.shutdown(wait=wait, cancel_futures=cancel_futures)
+
+
+_executor: typing.Optional[Executor] = None
+_limiter: typing.Optional[CarrierLimiter] = None
+_executor_lock = threading.Lock()
+
+
+def get_executor() -> Executor:
+    """Get or create the shared executor (lazy initialization, thread-safe)."""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = Executor(
+                    max_workers=int(
+                        os.getenv("KARRIO_MAX_WORKERS", DEFAULT_MAX_WORKERS)
+                    ),
+                    max_queue_size=int(
+                        os.getenv("KARRIO_MAX_QUEUE_SIZE", DEFAULT_MAX_QUEUE_SIZE)
+                    ),
+                )
+    return _executor
+
+
+def get_carrier_limiter() -> CarrierLimiter:
+    """Get or create the shared carrier limiter (lazy initialization, thread-safe)."""
+    global _limiter
+    if _limiter is None:
+        with _executor_lock:
+            if _limiter is None:
+                _limiter = CarrierLimiter(
+                    default_limit=int(
+                        os.getenv(
+                            "KARRIO_CARRIER_MAX_CONCURRENCY",
+                            DEFAULT_CARRIER_MAX_CONCURRENCY,
+                        )
+                    ),
+                    limits=parse_carrier_limits(
+                        os.getenv("KARRIO_CARRIER_CONCURRENCY")
+                    ),
+                )
+    return _limiter
+
+
+def configure(
+    max_workers: typing.Optional[int] = None,
+    max_queue_size: typing.Optional[int] = None,
+    carrier_max_concurrency: typing.Optional[int] = None,
+    carrier_limits: typing.Optional[typing.Dict[str, int]] = None,
+) -> None:
+    """Replace the shared executor and carrier limiter with a new configuration.
+
+    Unspecified options keep their environment (or default) values.
+    """
+    global _executor, _limiter
+
+    executor = Executor(
+        max_workers=(
+            max_workers
+            or int(os.getenv("KARRIO_MAX_WORKERS", DEFAULT_MAX_WORKERS))
+        ),
+        max_queue_size=(
+            max_queue_size
+            or int(os.getenv("KARRIO_MAX_QUEUE_SIZE", DEFAULT_MAX_QUEUE_SIZE))
+        ),
+    )
+    limiter = CarrierLimiter(
+        default_limit=(
+            carrier_max_concurrency
+            or int(
+                os.getenv(
+                    "KARRIO_CARRIER_MAX_CONCURRENCY", DEFAULT_CARRIER_MAX_CONCURRENCY
+                )
+            )
+        ),
+        limits={
+            **parse_carrier_limits(os.getenv("KARRIO_CARRIER_CONCURRENCY")),
+            **(carrier_limits or {}),
+        },
+    )
+
+    with _executor_lock:
+        previous, _executor, _limiter = _executor, executor, limiter
+
+    if previous is not None:
+        previous.shutdown(wait=False)
+
+
+def metrics() -> dict:
+    """Return a snapshot of the shared executor and carrier limiter metrics."""
+    return dict(
+        executor=get_executor().metrics(),
+        carriers=get_carrier_limiter().metrics(),
+    )
+
+
+def run_parallel(
+    func: typing.Callable[[S], T],
+    sequence: typing.Iterable[S],
+    max_workers: typing.Optional[int] = None,
+    return_exceptions: bool = False,
+) -> typing.List[typing.Union[T, Exception]]:
+    """Run func over a sequence on the shared executor (results in sequence order)."""
+    return get_executor().map_items(
+        func,
+        sequence,
+        max_workers=max_workers,
+        return_exceptions=return_exceptions,
+    )
+
+
+async def run_in_executor(
+    func: typing.Callable[..., T], *args, **kwargs
+) -> T:
+    """Await a blocking callable on the shared executor from the running loop.
+
+    The caller's context variables are propagated to the worker thread.
+    """
+    loop = asyncio.get_running_loop()
+    context = contextvars.copy_context()
+
+    return await loop.run_in_executor(
+        get_executor(),
+        functools.partial(context.run, func, *args, **kwargs),
+    )
+
+
+async def gather(
+    action: typing.Callable[[typing.Any], typing.Any],
+    sequence: typing.List[typing.Any],
+) -> typing.List[typing.Any]:
+    """Run an action over a sequence concurrently on the running loop.
+
+    Coroutine functions are awaited natively, blocking callables are
+    dispatched to the shared executor (awaitables they return are then
+    awaited on the running loop).
+    """
+
+    async def _run(item):
+        if asyncio.iscoroutinefunction(action):
+            return await action(item)
+
+        result = await run_in_executor(action, item)
+
+        if inspect.isawaitable(result):
+            return await result
+
+        return result
+
+    return list(await asyncio.gather(*[_run(item) for item in sequence]))
@@ -5,17 +5,23 @@ import uuid
 import string
 import base64
 import PyPDF2
-import asyncio
 import datetime
 import urllib.parse
 import PIL.Image
 import PIL.ImageFile
 from functools import reduce
 from urllib.error import HTTPError
-from urllib.request import urlopen, Request, ProxyHandler, build_opener, install_opener
-from typing import List, TypeVar, Callable, Optional, Any, cast
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from urllib.request import Request
+from typing import List, TypeVar, Callable, Optional, Any, Union, cast
 from karrio.core.utils.logger import logger
+import karrio.core.utils.zpl as zpl
+import karrio.core.utils.bundle as bundle
+from karrio.core.utils.transport import Transport, get_transport
+from karrio.core.utils.executor import (
+    get_carrier_limiter,
+    run_in_executor,
+    run_parallel,
+)
 ssl._create_default_https_context = ssl._create_unverified_context  # type: ignore
 PIL.ImageFile.LOAD_TRUNCATED_IMAGES = True
 T = TypeVar("T")
@@ -113,36 +119,41 @@ def bundle_zpls(base64_strings: List[str]) -> str:
 
 def bundle_base64(base64_strings: List[str], format: str = "PDF") -> str:
     """Return a base64 string from a list of base64 strings."""
-    result = io.BytesIO()
+    content = b"".join(bundle.stream(base64_strings, format))
 
-    if format == "PDF":
-        pdf_buffer = bundle_pdfs(base64_strings)
-        pdf_buffer.write(result)
+    return base64.b64encode(content).decode("utf-8")
 
-    elif "ZPL" in format:
-        content = bundle_zpls(base64_strings)
-        result.write(content.encode("utf-8"))
 
-    else:
-        image = bundle_imgs(base64_strings)
-        image.save(result, format)
+def zpl_to_pdf(
+    zpl_str: Union[str, List[str]], width: int, height: int, dpmm: int = 12
+) -> str:
+    """Return a PDF base64 string from a ZPL base64 string (or a list of them).
 
-    return base64.b64encode(result.getvalue()).decode("utf-8")
+    The labels are rasterised in-process, one page per label.
+    """
+    images = zpl.render(_decode_zpls(zpl_str), width, height, dpmm=dpmm)
 
+    return base64.b64encode(zpl.to_pdf(images, dpmm=dpmm)).decode("utf-8")
 
-def zpl_to_pdf(zpl_str: str, width: int, height: int, dpmm: int = 12) -> str:
-    """Return a PDF base64 string from a ZPL string."""
-    import karrio.lib as lib
 
-    data = lib.to_json(dict(file=base64.b64decode(zpl_str).decode("utf-8")))
-    doc = request(
-        url=f"http://api.labelary.com/v1/printers/{dpmm}dpmm/labels/{width}x{height}/",
-        data=data,
-        headers={"Accept": "application/pdf"},
-        decoder=lambda b: base64.encodebytes(b).decode("utf-8"),
-    )
+def zpl_to_image(
+    zpl_str: Union[str, List[str]],
+    width: int,
+    height: int,
+    dpmm: int = 12,
+    format: str = "PNG",
+) -> str:
+    """Return an image base64 string (labels stacked vertically) from a ZPL base64 string."""
+    images = zpl.render(_decode_zpls(zpl_str), width, height, dpmm=dpmm)
 
-    return doc
+    return base64.b64encode(zpl.to_image(images, format=format)).decode("utf-8")
+
+
+def _decode_zpls(zpl_str: Union[str, List[str]]) -> str:
+    return NEW_LINE.join(
+        base64.b64decode(content).decode("utf-8")
+        for content in ([zpl_str] if isinstance(zpl_str, str) else zpl_str)
+    )
 
 
 def binary_to_base64(binary_str: str) -> str:
@@ -162,7 +173,6 @@ def decode_bytes(byte):
 def process_request(
     request_id: str,
     trace: Callable[[Any, str], Any] = None,
-    proxy: str = None,
     **kwargs,
 ) -> Request:
     payload = (
@@ -183,21 +193,6 @@ def process_request(
 
     _request = Request(**{**kwargs, **payload})
 
-    # Apply proxy settings if provided: Proxy Example` 'username:password@IP_Address:Port'
-    if proxy:
-        proxy_info = proxy.split("@")
-        auth_info, host_port = proxy_info[0], proxy_info[1]
-        auth_info = urllib.parse.unquote(auth_info)
-        auth_encoded = base64.b64encode(auth_info.encode()).decode()
-        proxy_url = f"http://{host_port}"
-
-        # Create a ProxyHandler
-        proxy_handler = ProxyHandler({"http": proxy_url, "https": proxy_url})
-        opener = build_opener(proxy_handler)
-        opener.addheaders = [("Proxy-Authorization", f"Basic {auth_encoded}")]
-        install_opener(opener)
-        logger.info("Proxy configured", proxy_url=proxy_url)
-
     logger.info("HTTP request prepared", url=_request.full_url)
 
     return _request
@@ -253,75 +248,116 @@ def request(
     trace: Callable[[Any, str], Any] = None,
     proxy: str = None,
     timeout: Optional[int] = None,
+    transport: Transport = None,
     **kwargs,
 ) -> str:
     """Return an HTTP response body.
 
     make a http request (wrapper around Request method from built in urllib)
+    sent through the process wide transport (keep-alive connection pools by default).
     Proxy example: 'Username:Password@IP_Address:Port'
     """
 
     _request_id = str(uuid.uuid4())
+    _transport = transport or get_transport()
     logger.debug("Sending HTTP request", request_id=_request_id)
 
     try:
-        _request = process_request(_request_id, trace, proxy, **kwargs)
+        _request = process_request(_request_id, trace, **kwargs)
 
-        with urlopen(_request, timeout=timeout) as f:
+        with get_carrier_limiter().slot(), _transport.open(
+            _request, timeout=timeout, proxy=proxy
+        ) as f:
             _response = process_response(
                 _request_id, f, decoder, on_ok=on_ok, trace=trace
             )
 
     except HTTPError as e:
-        _response = process_error(_request_id, e, on_error=on_error, trace=trace)
+        with e:
+            _response = process_error(
+                _request_id, e, on_error=on_error, trace=trace
+            )
 
     return _response
 
 
-def exec_parrallel(
-    function: Callable, sequence: List[S], max_workers: int = None
-) -> List[T]:
-    """Return a list of result for function execution on each element of the sequence."""
-    if not sequence:
-        return []  # No work to do
+async def arequest(
+    decoder: Callable = decode_bytes,
+    on_ok: Callable[[Any], str] = None,
+    on_error: Callable[[HTTPError], str] = None,
+    trace: Callable[[Any, str], Any] = None,
+    proxy: str = None,
+    timeout: Optional[int] = None,
+    transport: Transport = None,
+    **kwargs,
+) -> str:
+    """Return an HTTP response body without blocking the running event loop.
 
-    workers = min(len(sequence), max_workers or len(sequence))
+    Only the `HTTP2Transport` (`KARRIO_HTTP_TRANSPORT=http2`) sends requests
+    natively on the caller's loop. With the default pooled transport, or when
+    a proxy is set, `request` runs on the shared bounded executor instead.
+    """
+    _transport = transport or get_transport()
+
+    if proxy or not _transport.supports_async:
+        return await run_in_executor(
+            request,
+            decoder=decoder,
+            on_ok=on_ok,
+            on_error=on_error,
+            trace=trace,
+            proxy=proxy,
+            timeout=timeout,
+            transport=_transport,
+            **kwargs,
+        )
+
+    _request_id = str(uuid.uuid4())
+    logger.debug("Sending async HTTP request", request_id=_request_id)
 
-    with ThreadPoolExecutor(max_workers=workers) as executor:
-        # Submit tasks
-        futures = [executor.submit(function, item) for item in sequence]
+    try:
+        _request = process_request(_request_id, trace, **kwargs)
 
-        # Collect results as tasks complete
-        results = []
-        for future in as_completed(futures):
-            try:
-                results.append(future.result())  # Append result of the completed task
-            except Exception as e:
-                results.append(e)  # Optionally handle or log exceptions here
+        async with get_carrier_limiter().aslot():
+            _raw_response = await _transport.aopen(_request, timeout=timeout)
 
-        return results
+        with _raw_response as f:
+            _response = process_response(
+                _request_id, f, decoder, on_ok=on_ok, trace=trace
+            )
 
+    except HTTPError as e:
+        with e:
+            _response = process_error(
+                _request_id, e, on_error=on_error, trace=trace
+            )
 
-def exec_async(action: Callable, sequence: List[S]) -> List[T]:
-    async def run_tasks():
-        # Use asyncio.to_thread instead of loop.run_in_executor
-        # This ensures proper task scheduling and prevents potential task dropping
-        return await asyncio.gather(
-            *[asyncio.to_thread(action, args) for args in sequence]
-        )
+    return _response
 
-    async def run_loop():
-        # Simplified to just return the result of run_tasks
-        # No need for manual loop creation and closing
-        return await run_tasks()
 
-    # Use asyncio.run instead of ThreadPoolExecutor
-    # This properly sets up and tears down the event loop
-    # Preventing issues with loop closure and task cleanup
-    result = asyncio.run(run_loop())
+def exec_parrallel(
+    function: Callable, sequence: List[S], max_workers: int = None
+) -> List[Union[T, Exception]]:
+    """Return a list of result for function execution on each element of the sequence.
+
+    Items run on the shared bounded executor with at most `max_workers` at once.
+    Exceptions raised are returned in place of the item result.
+    """
+    if not sequence:
+        return []  # No work to do
 
-    # Cast the result to the expected type
-    return cast(List[T], result)
+    return run_parallel(
+        function, sequence, max_workers=max_workers, return_exceptions=True
+    )
+
+
+def exec_async(action: Callable, sequence: List[S]) -> List[T]:
+    """Return a list of result for action execution on each element of the sequence.
+
+    Items run on the shared bounded executor (no event loop or thread is created
+    per call) and the first exception raised is propagated.
+    """
+    return cast(List[T], run_parallel(action, sequence))
 
 
 class Location:
@@ -151,10 +151,7 @@ def apply_namespaceprefix(
 
 
 def extract_fault(response: Element, settings: Settings) -> typing.List[Message]:
-    faults = [
-        XMLPARSER.to_object(soap.Fault, node)
-        for node in response.xpath(".//*[local-name() = $name]", name="Fault")
-    ]
+    faults = XMLPARSER.find("Fault", response, soap.Fault)
     return [
         Message(
             code=fault.faultcode,
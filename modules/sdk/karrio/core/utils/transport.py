@@ -0,0 +1,507 @@
+"""
+HTTP transport layer for Karrio SDK.
+
+This module provides the pluggable transports used by `lib.request`:
+1. UrllibTransport: one connection per request (legacy `urlopen` behaviour)
+2. PooledTransport: per-host keep-alive connection pools (default)
+3. HTTP2Transport: optional HTTP/2 multiplexing backed by `httpx[http2]`
+
+Every transport returns a file-like response exposing `read()` and raises
+`urllib.error.HTTPError` for non 2xx responses so that the `decoder`,
+`on_ok` and `on_error` contract of `lib.request` is preserved.
+
+The transport can be selected with the `KARRIO_HTTP_TRANSPORT` environment
+variable (`pooled`, `urllib` or `http2`) or injected with `set_transport`.
+
+Only the HTTP2Transport supports asyncio natively (`lib.arequest`). With the
+other transports async requests run on the shared bounded executor.
+"""
+
+import io
+import os
+import abc
+import time
+import asyncio
+import weakref
+import base64
+import typing
+import threading
+import collections
+import http.client
+import urllib.error
+import urllib.parse
+import urllib.request
+from karrio.core.utils.logger import logger
+
+DEFAULT_POOL_SIZE = 10
+DEFAULT_IDLE_TIMEOUT = 30.0  # seconds an idle connection is kept alive
+
+# Errors raised when a kept-alive connection was closed by the server
+# while idle. A request failing with one of these on a reused connection
+# is retried once on a fresh connection.
+STALE_CONNECTION_ERRORS = (
+    http.client.RemoteDisconnected,
+    http.client.BadStatusLine,
+    ConnectionResetError,
+    ConnectionAbortedError,
+    BrokenPipeError,
+)
+
+
+class Transport(abc.ABC):
+    """Abstract HTTP transport.
+
+    Implementations must return a response usable as a context manager that
+    exposes `read()` and raise `urllib.error.HTTPError` on HTTP errors.
+    Transports supporting asyncio natively set `supports_async` and
+    implement `aopen` returning a fully buffered response.
+    """
+
+    supports_async: bool = False
+
+    @abc.abstractmethod
+    def open(
+        self,
+        request: urllib.request.Request,
+        timeout: typing.Optional[float] = None,
+        proxy: typing.Optional[str] = None,
+    ) -> typing.Any:
+        """Send the request and return the response."""
+        pass
+
+    async def aopen(
+        self,
+        request: urllib.request.Request,
+        timeout: typing.Optional[float] = None,
+    ) -> typing.Any:
+        """Send the request on the running event loop and return the response."""
+        raise NotImplementedError()
+
+    def close(self) -> None:
+        """Release any resource (connections) held by the transport."""
+        pass
+
+
+def build_proxy_opener(proxy: str) -> urllib.request.OpenerDirector:
+    """Return an opener routing requests through the given proxy.
+
+    Proxy example: 'username:password@IP_Address:Port'
+    """
+    auth_info, host_port = proxy.split("@")
+    auth_info = urllib.parse.unquote(auth_info)
+    auth_encoded = base64.b64encode(auth_info.encode()).decode()
+    proxy_url = f"http://{host_port}"
+
+    proxy_handler = urllib.request.ProxyHandler({"http": proxy_url, "https": proxy_url})
+    opener = urllib.request.build_opener(proxy_handler)
+    opener.addheaders = [("Proxy-Authorization", f"Basic {auth_encoded}")]
+    logger.info("Proxy configured", proxy_url=proxy_url)
+
+    return opener
+
+
+class UrllibTransport(Transport):
+    """Open a new connection for every request (legacy behaviour)."""
+
+    def open(self, request, timeout=None, proxy=None):
+        if proxy:
+            return build_proxy_opener(proxy).open(request, timeout=timeout)
+
+        return urllib.request.urlopen(request, timeout=timeout)
+
+
+# =============================================================================
+# Keep-alive connection pooling
+# =============================================================================
+
+
+class ConnectionPool:
+    """Thread-safe pool of idle keep-alive connections for a single host."""
+
+    def __init__(
+        self,
+        maxsize: int = DEFAULT_POOL_SIZE,
+        idle_timeout: float = DEFAULT_IDLE_TIMEOUT,
+    ):
+        self.maxsize = maxsize
+        self.idle_timeout = idle_timeout
+        self._idle: typing.Deque[typing.Tuple[http.client.HTTPConnection, float]] = (
+            collections.deque()
+        )
+        self._lock = threading.Lock()
+
+    def acquire(self) -> typing.Optional[http.client.HTTPConnection]:
+        """Return the most recently used idle connection that is still fresh."""
+        now = time.monotonic()
+
+        with self._lock:
+            while self._idle:
+                connection, released_at = self._idle.pop()
+                if now - released_at < self.idle_timeout and connection.sock:
+                    return connection
+
+                connection.close()
+
+        return None
+
+    def release(self, connection: http.client.HTTPConnection) -> None:
+        with self._lock:
+            if connection.sock and len(self._idle) < self.maxsize:
+                self._idle.append((connection, time.monotonic()))
+                return
+
+        connection.close()
+
+    def close(self) -> None:
+        with self._lock:
+            while self._idle:
+                connection, _ = self._idle.pop()
+                connection.close()
+
+    @property
+    def size(self) -> int:
+        return len(self._idle)
+
+
+class PooledHTTPResponse(http.client.HTTPResponse):
+    """HTTP response handing its connection back to the pool once closed.
+
+    The connection is only reused when the body has been fully consumed and
+    the server did not ask to close it, otherwise it is discarded.
+    """
+
+    _release: typing.Optional[typing.Callable[[bool], None]] = None
+
+    def close(self):
+        reusable = self.fp is None and not self.will_close
+        super().close()
+
+        release, self._release = self._release, None
+        if release is not None:
+            release(reusable)
+
+
+class KeepAliveHandlerMixin(urllib.request.AbstractHTTPHandler):
+    """urllib handler mixin sending requests over pooled persistent connections.
+
+    Requests tunneled through a proxy (`HTTPS_PROXY`) are sent by the stock
+    handler over a dedicated connection.
+    """
+
+    def __init__(self, *args, pool_size: int, idle_timeout: float, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.pool_size = pool_size
+        self.idle_timeout = idle_timeout
+        self._pools: typing.Dict[typing.Tuple[str, str], ConnectionPool] = {}
+        self._lock = threading.Lock()
+
+    def get_pool(self, scheme: str, host: str) -> ConnectionPool:
+        key = (scheme, host)
+
+        with self._lock:
+            if key not in self._pools:
+                self._pools[key] = ConnectionPool(self.pool_size, self.idle_timeout)
+
+            return self._pools[key]
+
+    def close_pools(self) -> None:
+        with self._lock:
+            pools, self._pools = list(self._pools.values()), {}
+
+        for pool in pools:
+            pool.close()
+
+    def do_open(self, http_class, req, **http_conn_args):
+        if getattr(req, "_tunnel_host", None):
+            return super().do_open(http_class, req, **http_conn_args)
+
+        host = req.host
+        if not host:
+            raise urllib.error.URLError("no host given")
+
+        pool = self.get_pool(req.type, host)
+        headers = dict(req.unredirected_hdrs)
+        headers.update({k: v for k, v in req.headers.items() if k not in headers})
+        headers = {name.title(): val for name, val in headers.items()}
+
+        connection = pool.acquire()
+        reused = connection is not None
+
+        while True:
+            if connection is None:
+                connection = http_class(host, timeout=req.timeout, **http_conn_args)
+                connection.response_class = PooledHTTPResponse
+                connection.set_debuglevel(self._debuglevel)
+            else:
+                connection.timeout = req.timeout
+                connection.sock.settimeout(req.timeout)
+
+            try:
+                try:
+                    connection.request(
+                        req.get_method(),
+                        req.selector,
+                        req.data,
+                        headers,
+                        encode_chunked=req.has_header("Transfer-encoding"),
+                    )
+                except STALE_CONNECTION_ERRORS:
+                    raise
+                except OSError as err:  # timeout error
+                    raise urllib.error.URLError(err)
+
+                response = connection.getresponse()
+                break
+            except STALE_CONNECTION_ERRORS:
+                connection.close()
+                if not reused:
+                    raise
+
+                logger.debug("Retrying request on a fresh connection", host=host)
+                connection, reused = None, False
+            except:
+                connection.close()
+                raise
+
+        def _release(reusable: bool, _connection=connection):
+            if reusable:
+                pool.release(_connection)
+            else:
+                _connection.close()
+
+        response._release = _release
+        response.url = req.get_full_url()
+        response.msg = response.reason
+
+        return response
+
+
+class KeepAliveHTTPHandler(KeepAliveHandlerMixin, urllib.request.HTTPHandler):
+    def http_open(self, req):
+        return self.do_open(http.client.HTTPConnection, req)
+
+
+class KeepAliveHTTPSHandler(KeepAliveHandlerMixin, urllib.request.HTTPSHandler):
+    def https_open(self, req):
+        return self.do_open(
+            http.client.HTTPSConnection,
+            req,
+            context=self._context,
+        )
+
+
+class PooledTransport(Transport):
+    """Reuse keep-alive connections through per-host connection pools.
+
+    Requests routed through a proxy are sent over a dedicated connection.
+    """
+
+    def __init__(
+        self,
+        pool_size: int = DEFAULT_POOL_SIZE,
+        idle_timeout: float = DEFAULT_IDLE_TIMEOUT,
+    ):
+        self._handlers: typing.List[KeepAliveHandlerMixin] = [
+            KeepAliveHTTPHandler(pool_size=pool_size, idle_timeout=idle_timeout),
+            KeepAliveHTTPSHandler(pool_size=pool_size, idle_timeout=idle_timeout),
+        ]
+        self._opener = urllib.request.build_opener(*self._handlers)
+
+    def open(self, request, timeout=None, proxy=None):
+        if proxy:
+            return build_proxy_opener(proxy).open(request, timeout=timeout)
+
+        return self._opener.open(request, timeout=timeout)
+
+    def close(self):
+        for handler in self._handlers:
+            handler.close_pools()
+
+    def pool_sizes(self) -> typing.Dict[str, int]:
+        """Return the number of idle connections kept per host."""
+        return {
+            f"{scheme}://{host}": pool.size
+            for handler in self._handlers
+            for (scheme, host), pool in handler._pools.items()
+        }
+
+
+# =============================================================================
+# HTTP/2 (optional)
+# =============================================================================
+
+
+class HTTP2Response(io.BytesIO):
+    """File-like wrapper exposing an `httpx.Response` with the urllib API."""
+
+    def __init__(self, response: typing.Any):
+        super().__init__(response.content)
+        self.url = str(response.url)
+        self.status = self.code = response.status_code
+        self.reason = self.msg = response.reason_phrase
+        self.headers = response.headers
+
+    def getcode(self):
+        return self.code
+
+    def info(self):
+        return self.headers
+
+    def getheader(self, name, default=None):
+        return self.headers.get(name, default)
+
+    def getheaders(self):
+        return list(self.headers.items())
+
+
+class HTTP2Transport(Transport):
+    """Multiplex requests over HTTP/2 connections using `httpx`.
+
+    Requires the optional `httpx[http2]` dependency. Async requests use one
+    `httpx.AsyncClient` per event loop, released by `aclose` or `close`.
+    """
+
+    supports_async = True
+
+    def __init__(self, pool_size: int = DEFAULT_POOL_SIZE, **kwargs):
+        import httpx
+
+        self._options = dict(
+            http2=True,
+            verify=False,
+            limits=httpx.Limits(
+                max_connections=None,
+                max_keepalive_connections=pool_size,
+                keepalive_expiry=DEFAULT_IDLE_TIMEOUT,
+            ),
+            **kwargs,
+        )
+        self._client = httpx.Client(**self._options)
+        self._async_clients: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+
+    @staticmethod
+    def _to_response(response) -> HTTP2Response:
+        _response = HTTP2Response(response)
+
+        if response.status_code >= 400:
+            raise urllib.error.HTTPError(
+                _response.url,
+                _response.code,
+                _response.reason,
+                _response.headers,
+                _response,
+            )
+
+        return _response
+
+    def open(self, request, timeout=None, proxy=None):
+        if proxy:
+            return build_proxy_opener(proxy).open(request, timeout=timeout)
+
+        response = self._client.request(
+            request.get_method(),
+            request.full_url,
+            content=request.data,
+            headers=dict(request.header_items()),
+            timeout=timeout,
+        )
+
+        return self._to_response(response)
+
+    async def aopen(self, request, timeout=None):
+        import httpx
+
+        loop = asyncio.get_running_loop()
+        client = self._async_clients.get(loop)
+        if client is None:
+            self._discard_closed_loops()
+            client = self._async_clients[loop] = httpx.AsyncClient(**self._options)
+
+        response = await client.request(
+            request.get_method(),
+            request.full_url,
+            content=request.data,
+            headers=dict(request.header_items()),
+            timeout=timeout,
+        )
+
+        return self._to_response(response)
+
+    async def aclose(self):
+        """Close the async client bound to the running event loop."""
+        client = self._async_clients.pop(asyncio.get_running_loop(), None)
+
+        if client is not None:
+            await client.aclose()
+
+    def close(self):
+        self._client.close()
+
+        for loop, client in list(self._async_clients.items()):
+            self._async_clients.pop(loop, None)
+
+            if loop.is_closed():
+                continue
+            if loop.is_running():
+                asyncio.run_coroutine_threadsafe(client.aclose(), loop)
+            else:
+                loop.run_until_complete(client.aclose())
+
+    def _discard_closed_loops(self):
+        # the connections of a closed loop can't be awaited anymore,
+        # drop their client so it doesn't outlive the loop.
+        for loop in [_ for _ in list(self._async_clients.keys()) if _.is_closed()]:
+            self._async_clients.pop(loop, None)
+
+
+# =============================================================================
+# Default transport
+# =============================================================================
+
+TRANSPORTS: typing.Dict[str, typing.Type[Transport]] = {
+    "pooled": PooledTransport,
+    "urllib": UrllibTransport,
+    "http2": HTTP2Transport,
+}
+
+_default_transport: typing.Optional[Transport] = None
+_default_transport_lock = threading.Lock()
+
+
+def _create_default_transport() -> Transport:
+    name = os.getenv("KARRIO_HTTP_TRANSPORT", "pooled").lower()
+    pool_size = int(os.getenv("KARRIO_HTTP_POOL_SIZE", DEFAULT_POOL_SIZE))
+
+    if name == "urllib":
+        return UrllibTransport()
+
+    if name == "http2":
+        try:
+            return HTTP2Transport(pool_size=pool_size)
+        except ImportError:
+            logger.warning("httpx[http2] is not installed, using pooled transport")
+
+    return PooledTransport(pool_size=pool_size)
+
+
+def get_transport() -> Transport:
+    """Get or create the process wide transport (lazy initialization, thread-safe)."""
+    global _default_transport
+    if _default_transport is None:
+        with _default_transport_lock:
+            if _default_transport is None:
+                _default_transport = _create_default_transport()
+    return _default_transport
+
+
+def set_transport(transport: typing.Optional[Transport]) -> None:
+    """Replace the process wide transport, closing the previous one.
+
+    Passing None resets the transport to the environment default.
+    """
+    global _default_transport
+    with _default_transport_lock:
+        previous, _default_transport = _default_transport, transport
+
+    if previous is not None and previous is not transport:
+        previous.close()
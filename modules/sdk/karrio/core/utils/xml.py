@@ -1,7 +1,10 @@
 """Karrio lxml typing and utilities wrappers"""
 
 import io
+import re
+import sys
 import warnings
+import itertools
 from lxml import etree, html
 from xmltodict import parse
 from typing import Any, List, TypeVar, Type, Optional, cast, Union
@@ -9,6 +12,7 @@ from pysoap.envelope import Envelope
 from lxml.etree import _Element
 
 T = TypeVar("T")
+NCNAME = re.compile(r"^[^\W\d][\w.-]*$")
 
 
 class Element(_Element):
@@ -55,6 +59,7 @@ class XMLPARSER:
         if xml_node is None:
             return None
 
+        _release_tree_nodes(element_type)
         instance = element_type()
         cast(GenerateDSAbstract, instance).build(xml_node)
         return instance
@@ -66,7 +71,17 @@ class XMLPARSER:
         element_type: Type[Union[T, Element]] = None,
         first: bool = None,
     ):
-        nodes = [*in_element.xpath(".//*[local-name() = $name]", name=tag)]
+        # lxml matches `{*}tag` in C (and skips trees without the name at all)
+        # which is much faster than evaluating local-name() on every node.
+        matches = (
+            in_element.iterdescendants(f"{{*}}{tag}")
+            if NCNAME.match(tag or "")
+            else in_element.xpath(".//*[local-name() = $name]", name=tag)
+        )
+        # only the returned nodes are bound to typed objects
+        nodes = cast(
+            List[Element], [*itertools.islice(matches, 1 if first is True else None)]
+        )
         children = [
             (
                 child
@@ -169,3 +184,25 @@ class XMLPARSER:
         :return: Node Element
         """
         return str(cast(bytes, etree.tostring(xml_element)), encoding)
+
+
+_released_modules: set = set()
+
+
+def _release_tree_nodes(element_type: Type[Any]):
+    """Stop generateDS types from keeping a reference to their source node.
+
+    Generated modules default to `SaveElementTreeNode = True` which keeps the
+    whole lxml tree alive as long as any object parsed from it. The node is
+    only used to report line numbers in validation messages.
+    """
+    module_name = getattr(element_type, "__module__", None)
+
+    if module_name in _released_modules:
+        return
+
+    module = sys.modules.get(module_name)
+    if getattr(module, "SaveElementTreeNode", None) is True:
+        setattr(module, "SaveElementTreeNode", False)
+
+    _released_modules.add(module_name)
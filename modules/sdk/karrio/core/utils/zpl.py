@@ -0,0 +1,966 @@
+"""In-process ZPL rasteriser.
+
+Renders ZPL II labels to images without a round trip to a remote service.
+It covers the commands emitted by the carrier integrations: text (^A, ^CF,
+^FB, ^FH), lines and boxes (^GB, ^GC, ^GE, ^GD), Code128 (^BC), QR codes
+(^BQ), DataMatrix (^BX), graphic fields (^GF, ~DG/^XG) and field positioning
+(^FO, ^FT, ^LH, ^FW, ^FR, ^LR, ^PO). Unsupported commands are ignored.
+
+Usage:
+    images = zpl.render(zpl_str, width=4, height=6, dpmm=8)
+    pdf = zpl.to_pdf(images, dpmm=8)
+"""
+
+import io
+import re
+import zlib
+import attr
+import base64
+import typing
+import functools
+import PIL.Image
+import PIL.ImageDraw
+import PIL.ImageFont
+from pathlib import Path
+from barcode.codex import Code128
+
+from karrio.core.utils.logger import logger
+
+FONTS_DIR = Path(__file__).resolve().parents[2] / "addons" / "fonts"
+ORIENTATIONS = "NRIB"
+FNC1 = "\xf1"
+
+# default (height, width) of the printer resident bitmap fonts in dots
+BITMAP_FONTS = {
+    "A": (9, 5),
+    "B": (11, 7),
+    "C": (18, 10),
+    "D": (18, 10),
+    "E": (28, 15),
+    "F": (26, 13),
+    "G": (60, 40),
+    "H": (21, 13),
+}
+
+
+@attr.s(auto_attribs=True)
+class Font:
+    name: str = "A"
+    height: int = 9
+    width: int = 5
+    orientation: typing.Optional[str] = None
+
+
+@attr.s(auto_attribs=True)
+class Field:
+    x: int = 0
+    y: int = 0
+    baseline: bool = False
+    data: typing.Optional[str] = None
+    font: typing.Optional[Font] = None
+    barcode: typing.Optional[typing.Tuple[str, typing.List[str]]] = None
+    block: typing.Optional[typing.List[str]] = None
+    hex_indicator: typing.Optional[str] = None
+    reverse: bool = False
+
+
+@attr.s(auto_attribs=True)
+class Label:
+    canvas: PIL.Image.Image
+    home: typing.Tuple[int, int] = (0, 0)
+    font: Font = attr.Factory(Font)
+    orientation: str = "N"
+    module_width: int = 2
+    bar_ratio: float = 3.0
+    bar_height: int = 10
+    reverse: bool = False
+    inverted: bool = False
+    utf8: bool = False
+    field: Field = attr.Factory(Field)
+
+
+def render(
+    zpl: str,
+    width: float = 4,
+    height: float = 6,
+    dpmm: int = 8,
+) -> typing.List[PIL.Image.Image]:
+    """Render every ^XA...^XZ label of a ZPL document to a 1-bit image.
+
+    :param zpl: the ZPL document.
+    :param width: the label width in inches.
+    :param height: the label height in inches.
+    :param dpmm: the printer density in dots per millimeter.
+    """
+    size = (round(width * dpmm * 25.4), round(height * dpmm * 25.4))
+    graphics: typing.Dict[str, PIL.Image.Image] = {}
+    images: typing.List[PIL.Image.Image] = []
+    label: typing.Optional[Label] = None
+
+    for command, params in tokenize(zpl):
+        if command == "XA":
+            label = Label(canvas=PIL.Image.new("L", size, 255))
+        elif command == "DG":
+            _download_graphic(graphics, params)
+        elif label is None:
+            continue
+        elif command == "XZ":
+            images.append(_finalize(label))
+            label = None
+        else:
+            try:
+                _execute(label, command, params, graphics)
+            except Exception as e:
+                logger.debug(
+                    "Failed to render ZPL command", command=command, error=str(e)
+                )
+
+    return images
+
+
+def to_pdf(images: typing.List[PIL.Image.Image], dpmm: int = 8) -> bytes:
+    """Return a (multi-page) PDF document from rendered labels."""
+    _ensure_labels(images)
+    buffer = io.BytesIO()
+    images[0].save(
+        buffer,
+        "PDF",
+        resolution=dpmm * 25.4,
+        save_all=True,
+        append_images=images[1:],
+    )
+
+    return buffer.getvalue()
+
+
+def to_image(images: typing.List[PIL.Image.Image], format: str = "PNG") -> bytes:
+    """Return a single image of the rendered labels stacked vertically."""
+    _ensure_labels(images)
+    buffer = io.BytesIO()
+    image = images[0]
+
+    if len(images) > 1:
+        image = PIL.Image.new(
+            "1",
+            (max(i.width for i in images), sum(i.height for i in images)),
+            1,
+        )
+        offset = 0
+
+        for page in images:
+            image.paste(page, (0, offset))
+            offset += page.height
+
+    image.save(buffer, format)
+
+    return buffer.getvalue()
+
+
+def _ensure_labels(images: typing.List[PIL.Image.Image]):
+    if not images:
+        raise ValueError("No ZPL label (^XA...^XZ) found to render")
+
+
+def tokenize(zpl: str) -> typing.Iterator[typing.Tuple[str, str]]:
+    """Yield the (command, parameters) of a ZPL document."""
+    for segment in zpl.split("^"):
+        command, params = _split_command(segment)
+
+        if command in ("FD", "FV", "FX"):
+            yield command, params.replace("\r", "").replace("\n", "")
+            continue
+
+        # tilde commands (e.g: ~DG) can follow a caret command parameters
+        head, *tildes = re.split(r"~(?=[A-Z]{2})", segment)
+        command, params = _split_command(head)
+
+        if command:
+            yield command, re.sub(r"\s", "", params)
+
+        for tilde in tildes:
+            yield tilde[:2], re.sub(r"\s", "", tilde[2:])
+
+
+# -----------------------------------------------------------
+# commands
+# -----------------------------------------------------------
+# region
+
+
+def _split_command(segment: str) -> typing.Tuple[str, str]:
+    segment = segment.lstrip("\r\n")
+
+    if segment[:1] == "A" and segment[1:2] not in ("", "\r", "\n"):
+        return "A", segment[1:]
+
+    return segment[:2].upper(), segment[2:]
+
+
+def _execute(
+    label: Label,
+    command: str,
+    params: str,
+    graphics: typing.Dict[str, PIL.Image.Image],
+):
+    args = params.split(",")
+    field = label.field
+
+    if command in ("FO", "FT"):
+        field.x = label.home[0] + _int(args, 0, 0)
+        field.y = label.home[1] + _int(args, 1, 0)
+        field.baseline = command == "FT"
+    elif command == "LH":
+        label.home = (_int(args, 0, 0), _int(args, 1, 0))
+    elif command == "CF":
+        name = (args[0] or label.font.name)[:1]
+        height = _int(args, 1, None)
+        width = _int(args, 2, None)
+        label.font = _font(name, height, width, label.font)
+    elif command == "A":
+        name = params[:1]
+        orientation = params[1:2] if params[1:2] in ORIENTATIONS else None
+        rest = params[1:].lstrip("NRIB").lstrip(",").split(",")
+        field.font = _font(name, _int(rest, 0, None), _int(rest, 1, None))
+        field.font.orientation = orientation
+    elif command == "FW":
+        label.orientation = (args[0] or "N")[:1]
+    elif command == "BY":
+        label.module_width = _int(args, 0, label.module_width)
+        label.bar_ratio = _float(args, 1, label.bar_ratio)
+        label.bar_height = _int(args, 2, label.bar_height)
+    elif command in ("BC", "BQ", "BX"):
+        field.barcode = (command, args)
+    elif command == "FB":
+        field.block = args
+    elif command == "FH":
+        field.hex_indicator = (params or "_")[:1]
+    elif command == "FR":
+        field.reverse = True
+    elif command == "LR":
+        label.reverse = params[:1] == "Y"
+    elif command == "PO":
+        label.inverted = params[:1] == "I"
+    elif command == "CI":
+        label.utf8 = _int(args, 0, 0) in (28, 29, 30)
+    elif command in ("FD", "FV"):
+        field.data = params
+    elif command == "GB":
+        _draw_box(label, args)
+    elif command in ("GC", "GE"):
+        _draw_ellipse(label, command, args)
+    elif command == "GD":
+        _draw_diagonal(label, args)
+    elif command == "GF":
+        data = (params.split(",", 4) + [""] * 4)[4]
+        mask = _decode_graphic(args[0] or "A", _int(args, 2, 0), _int(args, 3, 0), data)
+        _draw_graphic(label, mask)
+    elif command == "XG":
+        name = _graphic_name(args[0])
+        if name in graphics:
+            image = graphics[name]
+            mx, my = _int(args, 1, 1), _int(args, 2, 1)
+            _draw_graphic(label, image.resize((image.width * mx, image.height * my)))
+    elif command == "FS":
+        _draw_field(label)
+        label.field = Field(x=field.x, y=field.y, baseline=field.baseline)
+
+
+def _finalize(label: Label) -> PIL.Image.Image:
+    canvas = label.canvas.point(lambda v: 255 if v >= 128 else 0).convert("1")
+
+    if label.inverted:
+        canvas = canvas.transpose(PIL.Image.Transpose.ROTATE_180)
+
+    return canvas
+
+
+def _draw_field(label: Label):
+    field = label.field
+
+    if field.data is None:
+        return
+
+    data = _decode_field_data(field.data, field.hex_indicator, label.utf8)
+
+    if field.barcode is not None:
+        command, args = field.barcode
+        orientation = (args[0] or label.orientation)[:1]
+        mask, origin = _render_barcode(label, command, args, data)
+    else:
+        font = field.font or label.font
+        orientation = font.orientation or label.orientation
+        mask, origin = _render_text(font, data, field.block)
+
+    mask, origin = _rotate(mask, origin, orientation)
+    position = lambda: (
+        (field.x - origin[0], field.y - origin[1])
+        if field.baseline
+        else (field.x, field.y)
+    )
+    _stamp(label, mask, position(), field.reverse)
+
+
+def _stamp(
+    label: Label,
+    mask: PIL.Image.Image,
+    position: typing.Tuple[int, int],
+    reverse: bool = False,
+    color: int = 0,
+):
+    """Draw a field mask (255 = ink) on the label."""
+    if reverse or label.reverse:
+        box = (*position, position[0] + mask.width, position[1] + mask.height)
+        region = label.canvas.crop(box).point(lambda v: 255 - v)
+        label.canvas.paste(region, position, mask)
+    else:
+        label.canvas.paste(color, position, mask)
+
+
+def _rotate(
+    mask: PIL.Image.Image, origin: typing.Tuple[int, int], orientation: str
+) -> typing.Tuple[PIL.Image.Image, typing.Tuple[int, int]]:
+    w, h = mask.size
+    x, y = origin
+
+    if orientation == "R":
+        return mask.transpose(PIL.Image.Transpose.ROTATE_270), (h - 1 - y, x)
+    if orientation == "I":
+        return mask.transpose(PIL.Image.Transpose.ROTATE_180), (w - 1 - x, h - 1 - y)
+    if orientation == "B":
+        return mask.transpose(PIL.Image.Transpose.ROTATE_90), (y, w - 1 - x)
+
+    return mask, origin
+
+
+# endregion
+
+# -----------------------------------------------------------
+# text
+# -----------------------------------------------------------
+# region
+
+
+def _font(
+    name: str,
+    height: typing.Optional[int],
+    width: typing.Optional[int],
+    default: typing.Optional[Font] = None,
+) -> Font:
+    base_height, base_width = BITMAP_FONTS.get(name, (None, None))
+
+    if height is None and width is None and default is not None:
+        height, width = default.height, default.width
+
+    if base_height is not None:
+        height = height or round((width or base_width) * base_height / base_width)
+        width = width or round(height * base_width / base_height)
+    else:
+        height = height or width or 9
+        width = width or height
+
+    return Font(name=name, height=height, width=width)
+
+
+@functools.lru_cache(maxsize=None)
+def _truetype(name: str, height: int) -> PIL.ImageFont.FreeTypeFont:
+    """Return the TrueType font whose ascent + descent matches a height in dots."""
+    path = f"{FONTS_DIR}/Oswald-{'Regular' if name in BITMAP_FONTS else 'SemiBold'}.ttf"
+    ascent, descent = PIL.ImageFont.truetype(path, 100).getmetrics()
+
+    return PIL.ImageFont.truetype(
+        path, max(1, round(height * 100 / (ascent + descent)))
+    )
+
+
+@functools.lru_cache(maxsize=2048)
+def _text_line(name: str, height: int, width: int, text: str):
+    """Return the (mask, ascent) of a line of text."""
+    font = _truetype(name, height)
+    ascent, descent = font.getmetrics()
+    mask = PIL.Image.new(
+        "L", (max(1, round(font.getlength(text))), ascent + descent), 0
+    )
+    PIL.ImageDraw.Draw(mask).text((0, 0), text, fill=255, font=font)
+
+    base_height, base_width = BITMAP_FONTS.get(name, (1, 1))
+    stretch = (width / height) / (base_width / base_height)
+
+    if abs(stretch - 1) > 0.01:
+        mask = mask.resize((max(1, round(mask.width * stretch)), mask.height))
+
+    return mask, ascent
+
+
+def _render_text(
+    font: Font, text: str, block: typing.Optional[typing.List[str]]
+) -> typing.Tuple[PIL.Image.Image, typing.Tuple[int, int]]:
+    if block is None:
+        mask, ascent = _text_line(font.name, font.height, font.width, text)
+        return mask, (0, ascent)
+
+    width = _int(block, 0, 0)
+    max_lines = _int(block, 1, 1)
+    spacing = _int(block, 2, 0)
+    justification = (block[3] if len(block) > 3 and block[3] else "L")[:1]
+    lines = _wrap(font, text, width)[:max_lines]
+    line_height = font.height + spacing
+    canvas = PIL.Image.new("L", (max(width, 1), line_height * len(lines) or 1), 0)
+    ascent = 0
+
+    for index, line in enumerate(lines):
+        mask, ascent = _text_line(font.name, font.height, font.width, line)
+        offset = {
+            "C": (width - mask.width) // 2,
+            "R": width - mask.width,
+        }.get(justification, 0)
+        canvas.paste(mask, (max(offset, 0), index * line_height), mask)
+
+    return canvas, (0, (len(lines) - 1) * line_height + ascent)
+
+
+def _wrap(font: Font, text: str, width: int) -> typing.List[str]:
+    lines: typing.List[str] = []
+
+    for paragraph in text.split("\\&"):
+        line = ""
+
+        for word in paragraph.split(" "):
+            candidate = f"{line} {word}" if line else word
+            fits = _text_line(font.name, font.height, font.width, candidate)[0].width
+
+            if line and width and fits > width:
+                lines.append(line)
+                line = word
+            else:
+                line = candidate
+
+        lines.append(line)
+
+    return lines
+
+
+def _decode_field_data(data: str, indicator: typing.Optional[str], utf8: bool) -> str:
+    if indicator is None:
+        return data
+
+    raw = re.sub(
+        re.escape(indicator) + r"([0-9A-Fa-f]{2})",
+        lambda m: chr(int(m.group(1), 16)),
+        data,
+    ).encode("latin-1", errors="replace")
+
+    try:
+        return raw.decode("utf-8" if utf8 else "cp1252")
+    except UnicodeDecodeError:
+        return raw.decode("latin-1")
+
+
+# endregion
+
+# -----------------------------------------------------------
+# graphics
+# -----------------------------------------------------------
+# region
+
+
+def _draw_box(label: Label, args: typing.List[str]):
+    thickness = _int(args, 2, 1)
+    width = max(_int(args, 0, 1), thickness)
+    height = max(_int(args, 1, 1), thickness)
+    color = 255 if (args[3:4] or ["B"])[0][:1] == "W" else 0
+    rounding = min(_int(args, 4, 0), 8)
+
+    mask = PIL.Image.new("L", (width, height), 0)
+    PIL.ImageDraw.Draw(mask).rounded_rectangle(
+        (0, 0, width - 1, height - 1),
+        radius=round(min(width, height) / 4 * rounding / 8),
+        outline=255,
+        fill=255 if thickness >= min(width, height) else None,
+        width=thickness,
+    )
+
+    _stamp(label, mask, (label.field.x, label.field.y), label.field.reverse, color)
+
+
+def _draw_ellipse(label: Label, command: str, args: typing.List[str]):
+    if command == "GC":
+        width = height = _int(args, 0, 3)
+        thickness, color = _int(args, 1, 1), (args[2:3] or ["B"])[0]
+    else:
+        width, height = _int(args, 0, 3), _int(args, 1, 3)
+        thickness, color = _int(args, 2, 1), (args[3:4] or ["B"])[0]
+
+    mask = PIL.Image.new("L", (width, height), 0)
+    PIL.ImageDraw.Draw(mask).ellipse(
+        (0, 0, width - 1, height - 1), outline=255, width=thickness
+    )
+
+    _stamp(
+        label,
+        mask,
+        (label.field.x, label.field.y),
+        label.field.reverse,
+        255 if color[:1] == "W" else 0,
+    )
+
+
+def _draw_diagonal(label: Label, args: typing.List[str]):
+    thickness = _int(args, 2, 1)
+    width = max(_int(args, 0, 3), thickness)
+    height = max(_int(args, 1, 3), thickness)
+    color = 255 if (args[3:4] or ["B"])[0][:1] == "W" else 0
+    leaning_left = (args[4:5] or ["R"])[0][:1] == "L"
+
+    mask = PIL.Image.new("L", (width, height), 0)
+    points = lambda: (
+        [(0, 0), (thickness, 0), (width, height), (width - thickness, height)]
+        if leaning_left
+        else [(0, height), (width - thickness, 0), (width, 0), (thickness, height)]
+    )
+    PIL.ImageDraw.Draw(mask).polygon(points(), fill=255)
+
+    _stamp(label, mask, (label.field.x, label.field.y), label.field.reverse, color)
+
+
+def _draw_graphic(label: Label, mask: typing.Optional[PIL.Image.Image]):
+    if mask is not None:
+        _stamp(label, mask, (label.field.x, label.field.y), label.field.reverse)
+
+
+def _download_graphic(graphics: typing.Dict[str, PIL.Image.Image], params: str):
+    name, total, row_bytes, data = (params.split(",", 3) + ["", "", ""])[:4]
+    mask = _decode_graphic("A", _int([total], 0, 0), _int([row_bytes], 0, 0), data)
+
+    if mask is not None:
+        graphics[_graphic_name(name)] = mask
+
+
+def _graphic_name(name: str) -> str:
+    return name.split(":")[-1].split(".")[0].upper()
+
+
+def _decode_graphic(
+    compression: str, total: int, row_bytes: int, data: str
+) -> typing.Optional[PIL.Image.Image]:
+    """Decode ASCII graphic data (hex, Z64 or B64) into a mask."""
+    if compression[:1].upper() != "A" or total <= 0 or row_bytes <= 0:
+        return None
+
+    if data.startswith((":Z64:", ":B64:")):
+        content = base64.b64decode(data[5:].split(":")[0])
+        raw = zlib.decompress(content) if data.startswith(":Z64:") else content
+    else:
+        raw = _decode_hex(data, row_bytes)
+
+    rows = total // row_bytes
+    raw = raw[: rows * row_bytes].ljust(rows * row_bytes, b"\x00")
+
+    return PIL.Image.frombytes("1", (row_bytes * 8, rows), raw).convert("L")
+
+
+def _decode_hex(data: str, row_bytes: int) -> bytes:
+    """Decode ZPL ASCII hex graphic data, including its run-length compression."""
+    row_size = row_bytes * 2
+    rows: typing.List[str] = []
+    row = ""
+    count = 0
+
+    def close(fill: str = "0"):
+        nonlocal row
+        rows.append((row + fill * row_size)[:row_size])
+        row = ""
+
+    for char in data:
+        if "G" <= char <= "Y":
+            count += ord(char) - ord("F")
+        elif "g" <= char <= "z":
+            count += (ord(char) - ord("f")) * 20
+        elif char == ",":
+            close("0")
+        elif char == "!":
+            close("F")
+        elif char == ":":
+            row = rows[-1] if any(rows) else "0" * row_size
+            close()
+        elif char in "0123456789ABCDEFabcdef":
+            row += char * max(count, 1)
+            count = 0
+
+            while len(row) >= row_size:
+                rows.append(row[:row_size])
+                row = row[row_size:]
+
+    if row:
+        close()
+
+    return bytes.fromhex("".join(rows))
+
+
+# endregion
+
+# -----------------------------------------------------------
+# barcodes
+# -----------------------------------------------------------
+# region
+
+
+def _render_barcode(
+    label: Label, command: str, args: typing.List[str], data: str
+) -> typing.Tuple[PIL.Image.Image, typing.Tuple[int, int]]:
+    if command == "BQ":
+        return _render_qr(args, data)
+    if command == "BX":
+        return _render_datamatrix(label, args, data)
+
+    return _render_code128(label, args, data)
+
+
+def _render_code128(label: Label, args: typing.List[str], data: str):
+    height = _int(args, 1, label.bar_height)
+    interpretation = (args[2:3] or ["Y"])[0][:1] != "N"
+    above = (args[3:4] or ["N"])[0][:1] == "Y"
+    mode = (args[5:6] or ["N"])[0][:1]
+
+    # subset invocation codes are replaced by the encoder own optimisation
+    value = re.sub(r">[0-9:;<=]", lambda m: FNC1 if m.group(0) == ">8" else "", data)
+    text = value.replace(FNC1, "")
+
+    if mode == "D":
+        value = FNC1 + re.sub(r"[()]", "", value)
+
+    modules = Code128(value).build()[0]
+    bars = _modules_mask(modules, label.module_width, height)
+
+    if not interpretation:
+        return bars, (0, height)
+
+    font = _font("A", label.module_width * 9, label.module_width * 5)
+    text_mask, _ = _text_line(font.name, font.height, font.width, text)
+    mask = PIL.Image.new("L", (bars.width, height + text_mask.height), 0)
+    bars_y = text_mask.height if above else 0
+    text_y = 0 if above else height
+
+    mask.paste(bars, (0, bars_y))
+    mask.paste(text_mask, (max((bars.width - text_mask.width) // 2, 0), text_y))
+
+    return mask, (0, bars_y + height)
+
+
+def _modules_mask(modules: str, module_width: int, height: int) -> PIL.Image.Image:
+    row = bytes(255 if bit == "1" else 0 for bit in modules)
+    line = PIL.Image.frombytes("L", (len(modules), 1), row)
+
+    return line.resize(
+        (len(modules) * module_width, max(height, 1)), PIL.Image.Resampling.NEAREST
+    )
+
+
+def _matrix_mask(matrix: typing.List[typing.List[bool]], scale: int):
+    size = (len(matrix[0]), len(matrix))
+    raw = bytes(255 if cell else 0 for row in matrix for cell in row)
+    image = PIL.Image.frombytes("L", size, raw)
+
+    return image.resize(
+        (size[0] * scale, size[1] * scale), PIL.Image.Resampling.NEAREST
+    )
+
+
+def _render_qr(args: typing.List[str], data: str):
+    import qrcode
+
+    magnification = _int(args, 2, 1)
+    error_correction = (args[3:4] or ["Q"])[0][:1] or "Q"
+
+    # the field data is prefixed by the error correction and input mode: "QA,"
+    if re.match(r"^[HQML][AM],", data):
+        error_correction, mode, data = data[0], data[1], data[3:]
+
+        if mode == "M" and data[:1] == "B":
+            data = data[5:]
+        elif mode == "M" and data[:1] in ("N", "A", "K"):
+            data = data[1:]
+
+    qr = qrcode.QRCode(
+        border=0,
+        box_size=1,
+        error_correction=getattr(qrcode.constants, f"ERROR_CORRECT_{error_correction}"),
+    )
+    qr.add_data(data)
+    qr.make(fit=True)
+    mask = _matrix_mask(qr.get_matrix(), magnification)
+
+    return mask, (0, mask.height)
+
+
+def _render_datamatrix(label: Label, args: typing.List[str], data: str):
+    module = _int(args, 1, label.module_width)
+    rows = _int(args, 4, 0)
+    escape = (args[6:7] or ["~"])[0][:1] or "~"
+    matrix = datamatrix(_decode_datamatrix_escapes(data, escape), size=rows)
+    mask = _matrix_mask(matrix, max(module, 1))
+
+    return mask, (0, mask.height)
+
+
+def _decode_datamatrix_escapes(data: str, escape: str) -> str:
+    return re.sub(
+        re.escape(escape) + r"(1|d\d{3}|.)",
+        lambda m: {"1": FNC1}.get(
+            m.group(1),
+            chr(int(m.group(1)[1:])) if m.group(1)[:1] == "d" else m.group(1),
+        ),
+        data,
+    )
+
+
+# endregion
+
+# -----------------------------------------------------------
+# DataMatrix ECC200
+# -----------------------------------------------------------
+# region
+
+# symbol size: (data codewords, error codewords, data region size, blocks)
+DATAMATRIX_SYMBOLS = {
+    10: (3, 5, 8, 1),
+    12: (5, 7, 10, 1),
+    14: (8, 10, 12, 1),
+    16: (12, 12, 14, 1),
+    18: (18, 14, 16, 1),
+    20: (22, 18, 18, 1),
+    22: (30, 20, 20, 1),
+    24: (36, 24, 22, 1),
+    26: (44, 28, 24, 1),
+    32: (62, 36, 14, 1),
+    36: (86, 42, 16, 1),
+    40: (114, 48, 18, 1),
+    44: (144, 56, 20, 1),
+    48: (174, 68, 22, 1),
+    52: (204, 84, 24, 2),
+    64: (280, 112, 14, 2),
+    72: (368, 144, 16, 4),
+    80: (456, 192, 18, 4),
+    88: (576, 224, 20, 4),
+    96: (696, 272, 22, 4),
+    104: (816, 336, 24, 6),
+    120: (1050, 408, 18, 6),
+    132: (1304, 496, 20, 8),
+    144: (1558, 620, 22, 10),
+}
+
+
+def datamatrix(data: str, size: int = 0) -> typing.List[typing.List[bool]]:
+    """Encode data as a square ECC200 DataMatrix (ASCII encodation).
+
+    :param data: the data to encode (FNC1 as "\\xf1").
+    :param size: the minimum symbol size (rows), 0 for the smallest fit.
+    """
+    codewords = _datamatrix_ascii(data)
+    size = next(
+        s
+        for s, (capacity, *_) in DATAMATRIX_SYMBOLS.items()
+        if capacity >= len(codewords) and s >= size
+    )
+    capacity, ecc_size, region, blocks = DATAMATRIX_SYMBOLS[size]
+
+    # pad codewords
+    if len(codewords) < capacity:
+        codewords.append(129)
+
+    while len(codewords) < capacity:
+        pad = 129 + ((149 * (len(codewords) + 1)) % 253) + 1
+        codewords.append(pad - 254 if pad > 254 else pad)
+
+    # error correction by interleaved blocks
+    ecc_per_block = ecc_size // blocks
+    stream = codewords + [0] * ecc_size
+
+    for block in range(blocks):
+        ecc = _reed_solomon(codewords[block::blocks], ecc_per_block)
+
+        for index, value in enumerate(ecc):
+            stream[capacity + index * blocks + block] = value
+
+    regions = size // (region + 2)
+    mapping = _datamatrix_placement(regions * region, regions * region, stream)
+    matrix = [[False] * size for _ in range(size)]
+
+    for row in range(size):
+        for col in range(size):
+            r, c = row % (region + 2), col % (region + 2)
+
+            if c == 0 or r == region + 1:
+                matrix[row][col] = True
+            elif r == 0:
+                matrix[row][col] = c % 2 == 0
+            elif c == region + 1:
+                matrix[row][col] = r % 2 == 1
+            else:
+                mapped_row = (row // (region + 2)) * region + r - 1
+                mapped_col = (col // (region + 2)) * region + c - 1
+                matrix[row][col] = mapping[mapped_row][mapped_col] == 1
+
+    return matrix
+
+
+def _datamatrix_ascii(data: str) -> typing.List[int]:
+    codewords: typing.List[int] = []
+    index = 0
+
+    while index < len(data):
+        char = data[index]
+        pair = data[index : index + 2]
+
+        if len(pair) == 2 and pair.isdigit() and pair.isascii():
+            codewords.append(130 + int(pair))
+            index += 2
+            continue
+
+        if char == FNC1:
+            codewords.append(232)
+        elif ord(char) < 128:
+            codewords.append(ord(char) + 1)
+        else:
+            codewords += [235, (ord(char) & 0xFF) - 127]
+
+        index += 1
+
+    return codewords
+
+
+@functools.lru_cache(maxsize=None)
+def _galois_tables() -> typing.Tuple[typing.List[int], typing.List[int]]:
+    exp, log = [0] * 512, [0] * 256
+    value = 1
+
+    for power in range(255):
+        exp[power] = value
+        log[value] = power
+        value <<= 1
+        if value & 0x100:
+            value ^= 0x12D
+
+    for power in range(255, 512):
+        exp[power] = exp[power - 255]
+
+    return exp, log
+
+
+def _reed_solomon(data: typing.List[int], size: int) -> typing.List[int]:
+    exp, log = _galois_tables()
+    multiply = lambda a, b: 0 if a == 0 or b == 0 else exp[log[a] + log[b]]
+
+    generator = [1]
+    for power in range(1, size + 1):
+        generator = [
+            (generator[i] if i < len(generator) else 0)
+            ^ (multiply(generator[i - 1], exp[power]) if i > 0 else 0)
+            for i in range(len(generator) + 1)
+        ]
+
+    ecc = [0] * size
+    for value in data:
+        factor = value ^ ecc[0]
+        ecc = ecc[1:] + [0]
+        ecc = [e ^ multiply(factor, generator[i + 1]) for i, e in enumerate(ecc)]
+
+    return ecc
+
+
+def _datamatrix_placement(
+    nrow: int, ncol: int, codewords: typing.List[int]
+) -> typing.List[typing.List[typing.Optional[int]]]:
+    """ECC200 module placement (ISO/IEC 16022 annex F)."""
+    array: typing.List[typing.List[typing.Optional[int]]] = [
+        [None] * ncol for _ in range(nrow)
+    ]
+
+    def module(row: int, col: int, index: int, bit: int):
+        if row < 0:
+            row += nrow
+            col += 4 - ((nrow + 4) % 8)
+        if col < 0:
+            col += ncol
+            row += 4 - ((ncol + 4) % 8)
+        array[row][col] = (codewords[index] >> (8 - bit)) & 1
+
+    def utah(row: int, col: int, index: int):
+        for bit, (r, c) in enumerate(
+            [(-2, -2), (-2, -1), (-1, -2), (-1, -1), (-1, 0), (0, -2), (0, -1), (0, 0)],
+            1,
+        ):
+            module(row + r, col + c, index, bit)
+
+    def corner(index: int, positions: typing.List[typing.Tuple[int, int]]):
+        for bit, (r, c) in enumerate(positions, 1):
+            module(r, c, index, bit)
+
+    corners = {
+        1: [(nrow - 1, 0), (nrow - 1, 1), (nrow - 1, 2), (0, ncol - 2),
+            (0, ncol - 1), (1, ncol - 1), (2, ncol - 1), (3, ncol - 1)],
+        2: [(nrow - 3, 0), (nrow - 2, 0), (nrow - 1, 0), (0, ncol - 4),
+            (0, ncol - 3), (0, ncol - 2), (0, ncol - 1), (1, ncol - 1)],
+        3: [(nrow - 3, 0), (nrow - 2, 0), (nrow - 1, 0), (0, ncol - 2),
+            (0, ncol - 1), (1, ncol - 1), (2, ncol - 1), (3, ncol - 1)],
+        4: [(nrow - 1, 0), (nrow - 1, ncol - 1), (0, ncol - 3), (0, ncol - 2),
+            (0, ncol - 1), (1, ncol - 3), (1, ncol - 2), (1, ncol - 1)],
+    }  # fmt: skip
+
+    index, row, col = 0, 4, 0
+
+    while row < nrow or col < ncol:
+        if row == nrow and col == 0:
+            corner(index, corners[1])
+            index += 1
+        if row == nrow - 2 and col == 0 and ncol % 4:
+            corner(index, corners[2])
+            index += 1
+        if row == nrow - 2 and col == 0 and ncol % 8 == 4:
+            corner(index, corners[3])
+            index += 1
+        if row == nrow + 4 and col == 2 and not ncol % 8:
+            corner(index, corners[4])
+            index += 1
+
+        while True:  # sweep upward
+            if row < nrow and col >= 0 and array[row][col] is None:
+                utah(row, col, index)
+                index += 1
+            row, col = row - 2, col + 2
+            if not (row >= 0 and col < ncol):
+                break
+
+        row, col = row + 1, col + 3
+
+        while True:  # sweep downward
+            if row >= 0 and col < ncol and array[row][col] is None:
+                utah(row, col, index)
+                index += 1
+            row, col = row + 2, col - 2
+            if not (row < nrow and col >= 0):
+                break
+
+        row, col = row + 3, col + 1
+
+    if array[nrow - 1][ncol - 1] is None:
+        array[nrow - 1][ncol - 1] = array[nrow - 2][ncol - 2] = 1
+        array[nrow - 1][ncol - 2] = array[nrow - 2][ncol - 1] = 0
+
+    return array
+
+
+# endregion
+
+
+def _int(args: typing.List[str], index: int, default: typing.Any) -> typing.Any:
+    try:
+        return int(float(args[index]))
+    except (IndexError, ValueError):
+        return default
+
+
+def _float(args: typing.List[str], index: int, default: float) -> float:
+    try:
+        return float(args[index])
+    except (IndexError, ValueError):
+        return default
@@ -28,6 +28,11 @@ SpanContext = utils.SpanContext
 NoOpSpanContext = utils.NoOpSpanContext
 get_default_telemetry = utils.get_default_telemetry
 Cache = utils.Cache
+LRUCache = utils.LRUCache
+Transport = utils.Transport
+PooledTransport = utils.PooledTransport
+set_transport = utils.set_transport
+carrier_scope = utils.carrier_scope
 SystemConfig = utils.SystemConfig
 AbstractSystemConfig = utils.AbstractSystemConfig
 Job = utils.Job
@@ -815,7 +820,14 @@ def run_concurently(
     predicate: typing.Callable,
     sequence: typing.List[S],
     max_workers: int = 2,
-) -> typing.List[T]:
+) -> typing.List[typing.Union[T, Exception]]:
+    """Run a predicate over a sequence on the shared bounded executor.
+
+    :param predicate: the callable to run on each item.
+    :param sequence: the list of items to process.
+    :param max_workers: the max number of items of this sequence queued at once.
+    :return: the list of results (exceptions raised are returned in place of results).
+    """
     return utils.exec_parrallel(predicate, sequence, max_workers=max_workers)
 
 
@@ -826,6 +838,40 @@ def run_asynchronously(
     return utils.exec_async(predicate, sequence)
 
 
+def executor_metrics() -> dict:
+    """Return a snapshot of the shared executor queue depth, wait times and
+    per-carrier concurrency usage."""
+    return utils.executor.metrics()
+
+
+async def arun_asynchronously(
+    predicate: typing.Callable,
+    sequence: typing.List[S],
+) -> typing.List[T]:
+    """Run a predicate over a sequence concurrently on the running event loop.
+
+    Example:
+        responses = await lib.arun_asynchronously(
+            lambda payload: lib.arequest(url=..., data=lib.to_json(payload)),
+            request.serialize(),
+        )
+
+    :param predicate: a coroutine function or a blocking callable (run on the shared executor).
+    :param sequence: the list of items to process.
+    :return: the list of results in the sequence order.
+    """
+    return await utils.executor.gather(predicate, sequence)
+
+
+async def run_in_executor(
+    predicate: typing.Callable[..., T],
+    *args,
+    **kwargs,
+) -> T:
+    """Await a blocking callable on the shared bounded executor."""
+    return await utils.run_in_executor(predicate, *args, **kwargs)
+
+
 # endregion
 
 # -----------------------------------------------------------
@@ -854,6 +900,31 @@ def request(
     )
 
 
+async def arequest(
+    decoder: typing.Callable = utils.decode_bytes,
+    on_ok: typing.Callable = None,
+    on_error: typing.Callable = None,
+    trace: typing.Callable[[typing.Any, str], typing.Any] = None,
+    proxy: str = None,
+    timeout: typing.Optional[int] = None,
+    **kwargs,
+) -> str:
+    """Async variant of `request` running on the caller's event loop.
+
+    Requests are only sent natively on the loop with the HTTP/2 transport
+    (`KARRIO_HTTP_TRANSPORT=http2`), otherwise they run on the shared executor.
+    """
+    return await utils.arequest(
+        decoder=decoder,
+        on_ok=on_ok,
+        on_error=on_error,
+        trace=trace,
+        proxy=proxy,
+        timeout=timeout,
+        **kwargs,
+    )
+
+
 def parse_http_response(response: urllib.error.HTTPError) -> str:
     return to_json(dict(code=str(response.code), error=response.reason))
 
@@ -893,15 +964,29 @@ def bundle_zpls(
 
 
 def zpl_to_pdf(
-    zpl_str: str,
+    zpl_str: typing.Union[str, typing.List[str]],
     width: int,
     height: int,
     dpmm: int = 12,
 ) -> str:
-    """Return a PDF base64 string from a ZPL string."""
+    """Return a PDF base64 string from a ZPL base64 string.
+
+    A list of ZPL base64 strings is converted into a single multi-page document.
+    """
     return utils.zpl_to_pdf(zpl_str, width, height, dpmm=dpmm)
 
 
+def zpl_to_image(
+    zpl_str: typing.Union[str, typing.List[str]],
+    width: int,
+    height: int,
+    dpmm: int = 12,
+    format: str = "PNG",
+) -> str:
+    """Return an image base64 string from a ZPL base64 string."""
+    return utils.zpl_to_image(zpl_str, width, height, dpmm=dpmm, format=format)
+
+
 def bundle_base64(
     base64_strings: typing.List[str],
     format: str = "PDF",
@@ -909,6 +994,17 @@ def bundle_base64(
     return utils.bundle_base64(base64_strings, format=format)
 
 
+def stream_bundle(
+    base64_strings: typing.Iterable[str],
+    format: str = "PDF",
+) -> typing.Iterator[bytes]:
+    """Yield a bundle of base64 documents chunk by chunk without holding it in memory.
+
+    Image bundles iterate `base64_strings` twice so it must be re-iterable.
+    """
+    return utils.bundle.stream(base64_strings, format=format)
+
+
 def to_buffer(
     base64_string: str,
     **kwargs,
@@ -14,6 +14,7 @@ import functools
 import karrio.lib as lib
 import karrio.core.units as units
 import karrio.core.plugins as plugins
+import karrio.core.manifest as manifest
 import karrio.core.metadata as metadata
 from karrio.core.utils.logger import logger
 
@@ -50,6 +51,11 @@ def import_extensions() -> None:
 
     Plugins already loaded from a higher-priority source are skipped in
     lower-priority sources to avoid duplication and conflicts.
+
+    When `KARRIO_PLUGIN_MANIFEST` points to an up to date manifest, the
+    registry is built from it instead and plugin modules are only imported
+    on first use (see `karrio.core.manifest`). A missing or stale manifest
+    is (re)written after the eager import.
     """
     global PROVIDERS, LSP_PLUGINS, MAPPERS, HOOKS, SCHEMAS, FAILED_IMPORTS, PLUGIN_METADATA, REFERENCES, SYSTEM_CONFIGS
     # Reset collections
@@ -66,6 +72,14 @@ def import_extensions() -> None:
     # Load local plugins to extend karrio namespaces (but don't process metadata yet)
     plugins.load_local_plugins()
 
+    manifest_path = manifest.get_manifest_path()
+    plugin_manifest = manifest.read(manifest_path) if manifest_path else None
+
+    if plugin_manifest is not None:
+        _import_manifest(plugin_manifest)
+        logger.info("Plugins loaded from manifest", count=len(PLUGIN_METADATA), path=manifest_path)
+        return
+
     # =========================================================================
     # STEP 1: Load from entrypoints (highest priority - most explicit)
     # =========================================================================
@@ -175,6 +189,85 @@ def import_extensions() -> None:
 
     logger.info("Plugins loaded", count=len(PLUGIN_METADATA))
 
+    if manifest_path:
+        try:
+            build_manifest(manifest_path)
+        except Exception as e:
+            logger.warning("Failed to write plugin manifest", path=manifest_path, error=str(e))
+
+
+def _import_manifest(plugin_manifest: dict) -> None:
+    """Populate the registry with lazy plugin metadata restored from a manifest."""
+    global PROVIDERS, LSP_PLUGINS
+    FAILED_IMPORTS.update(plugin_manifest.get("failed_imports") or {})
+
+    for plugin_name, entry in plugin_manifest["plugins"].items():
+        metadata_obj = manifest.from_entry(entry)
+        metadata_obj.on_load = _register_components
+        PLUGIN_METADATA[plugin_name] = metadata_obj
+
+        if metadata_obj.is_carrier():
+            PROVIDERS[metadata_obj.id] = metadata_obj
+        elif metadata_obj.is_lsp():
+            LSP_PLUGINS[metadata_obj.id] = metadata_obj
+
+        system_config = metadata_obj.get("system_config")
+        if system_config and isinstance(system_config, dict):
+            SYSTEM_CONFIGS.update(system_config)
+
+    PROVIDERS = dict(sorted(PROVIDERS.items()))
+    LSP_PLUGINS = dict(sorted(LSP_PLUGINS.items()))
+
+
+def _register_components(metadata_obj: metadata.PluginMetadata) -> None:
+    """Register the mapper, hooks and schema of a lazily imported plugin."""
+    if metadata_obj.is_carrier():
+        _register_carrier(metadata_obj, metadata_obj.id)
+    elif metadata_obj.is_lsp():
+        _register_lsp(metadata_obj, metadata_obj.id)
+
+
+def build_manifest(path: str = None) -> dict:
+    """
+    Write the plugin manifest used for lazy plugin loading.
+
+    Args:
+        path: The manifest file path (defaults to `KARRIO_PLUGIN_MANIFEST`)
+
+    Returns:
+        The manifest content
+    """
+    path = path or manifest.get_manifest_path()
+
+    if not path:
+        raise ValueError("No plugin manifest path provided")
+
+    if not PLUGIN_METADATA:
+        import_extensions()
+
+    entries = {}
+    for plugin_name, metadata_obj in PLUGIN_METADATA.items():
+        if isinstance(metadata_obj, manifest.LazyPluginMetadata):
+            metadata_obj.load()
+
+        entry = manifest.to_entry(metadata_obj, _plugin_references(metadata_obj))
+
+        if entry is None:
+            logger.warning("Plugin module not found, skipped from manifest", plugin_name=plugin_name)
+            continue
+
+        entries[plugin_name] = entry
+
+    plugin_manifest = dict(
+        version=manifest.MANIFEST_VERSION,
+        fingerprint=manifest.fingerprint(),
+        plugins=entries,
+        failed_imports=FAILED_IMPORTS,
+    )
+    manifest.write(path, plugin_manifest)
+
+    return plugin_manifest
+
 
 def _register_carrier(metadata_obj: metadata.PluginMetadata, carrier_name: str) -> None:
     """
@@ -479,65 +572,24 @@ def collect_references(
         if registry.get(f"{plugin_id.upper()}_ENABLED", registry.get("ENABLE_ALL_PLUGINS_BY_DEFAULT"))
     )
 
-    services = {
-        key: {c.name: c.value for c in list(mapper.get("services", []))}
-        for key, mapper in PROVIDERS.items()
-        if key in enabled_carrier_ids and mapper.get("services") is not None
+    plugin_references = {
+        key: _plugin_references(metadata_obj)
+        for key, metadata_obj in PROVIDERS.items()
+        if key in enabled_carrier_ids
     }
-    options = {
-        key: {c.name: dict(code=c.value.code, type=parse_type(c.value.type), default=c.value.default) for c in list(mapper.get("options", []))}
-        for key, mapper in PROVIDERS.items()
-        if key in enabled_carrier_ids and mapper.get("options") is not None
+    lsp_references = {
+        key: _plugin_references(metadata_obj)
+        for key, metadata_obj in LSP_PLUGINS.items()
+        if key in enabled_lsp_ids
     }
-    connection_configs = {
-        key: {
-            c.name: lib.to_dict(
-                dict(
-                    name=c.name,
-                    code=c.value.code,
-                    required=False,
-                    type=parse_type(c.value.type),
-                    default=c.value.default,
-                    enum=lib.identity(
-                        None
-                        if "enum" not in str(c.value.type).lower()
-                        else [c.name for c in c.value.type]
-                    ),
-                )
-            )
-            for c in list(mapper.get("connection_configs", []))
+
+    def collect(name: str, references: dict = plugin_references) -> dict:
+        return {
+            key: value[name] for key, value in references.items() if name in value
         }
-        for key, mapper in PROVIDERS.items()
-        if key in enabled_carrier_ids and mapper.get("connection_configs") is not None
-    }
 
-    # Build connection_fields with proper attrs class checking
-    connection_fields = {
-        key: {
-            _.name: lib.to_dict(
-                dict(
-                    name=_.name,
-                    type=parse_type(_.type),
-                    required="NOTHING" in str(_.default),
-                    default=lib.identity(
-                        lib.to_dict(lib.to_json(_.default))
-                        if ("NOTHING" not in str(_.default))
-                        else None
-                    ),
-                    enum=lib.identity(
-                        None
-                        if "enum" not in str(_.type).lower()
-                        else [c.name for c in _.type]
-                    ),
-                )
-            )
-            for _ in getattr(mapper.get("Settings"), "__attrs_attrs__", [])
-            if (_.name not in COMMON_FIELDS)
-            or (mapper.get("has_intl_accounts") and _.name == "account_country_code")
-        } if mapper.get("Settings") is not None and hasattr(mapper.get("Settings"), "__attrs_attrs__") else {}
-        for key, mapper in PROVIDERS.items()
-        if key in enabled_carrier_ids
-    }
+    services = collect("services")
+    options = collect("options")
 
     REFERENCES = {
         "countries": {c.name: c.value for c in list(units.Country)},  # type: ignore
@@ -563,38 +615,16 @@ def collect_references(
         },
         "lsp_plugins": {
             plugin_id: metadata_obj.get("label", "")
-            for plugin_id, metadata_obj in collect_lsp_plugins_data().items()
+            for plugin_id, metadata_obj in LSP_PLUGINS.items()
         },
         "services": services,
         "options": options,
-        "connection_fields": connection_fields,
-        "connection_configs": connection_configs,
-        "carrier_capabilities": {
-            key: detect_capabilities(
-                detect_proxy_methods(mapper.get("Proxy")) if mapper.get("Proxy") else [],
-                detect_hooks_methods(mapper.get("Hooks")) if mapper.get("Hooks") else [],
-            )
-            for key, mapper in PROVIDERS.items()
-            if key in enabled_carrier_ids and mapper.get("Proxy") is not None
-        },
-        "lsp_capabilities": {
-            key: detect_capabilities(
-                detect_proxy_methods(mapper.get("Proxy")) if mapper.get("Proxy") else [],
-                detect_hooks_methods(mapper.get("Hooks")) if mapper.get("Hooks") else [],
-            )
-            for key, mapper in LSP_PLUGINS.items()
-            if key in enabled_lsp_ids and mapper.get("Proxy") is not None
-        },
-        "packaging_types": {
-            key: {c.name: c.value for c in list(mapper.get("packaging_types", []))}
-            for key, mapper in PROVIDERS.items()
-            if key in enabled_carrier_ids and mapper.get("packaging_types") is not None
-        },
-        "package_presets": {
-            key: {c.name: lib.to_dict(c.value) for c in list(mapper.get("package_presets", []))}
-            for key, mapper in PROVIDERS.items()
-            if key in enabled_carrier_ids and mapper.get("package_presets") is not None
-        },
+        "connection_fields": collect("connection_fields"),
+        "connection_configs": collect("connection_configs"),
+        "carrier_capabilities": collect("capabilities"),
+        "lsp_capabilities": collect("capabilities", lsp_references),
+        "packaging_types": collect("packaging_types"),
+        "package_presets": collect("package_presets"),
         "option_names": {
             name: {key: key.upper().replace("_", " ") for key, _ in value.items()}
             for name, value in options.items()
@@ -603,11 +633,7 @@ def collect_references(
             name: {key: key.upper().replace("_", " ") for key, _ in value.items()}
             for name, value in services.items()
         },
-        "service_levels": {
-            key: lib.to_dict(mapper.get("service_levels"))
-            for key, mapper in PROVIDERS.items()
-            if key in enabled_carrier_ids and mapper.get("service_levels") is not None
-        },
+        "service_levels": collect("service_levels"),
         "integration_status": {
             carrier_id: metadata_obj.status for carrier_id, metadata_obj in PROVIDERS.items() if carrier_id in enabled_carrier_ids
         },
@@ -622,7 +648,7 @@ def collect_references(
                 "documentation": metadata_obj.get("documentation", ""),
                 "readme": metadata_obj.get("readme", ""),
             }
-            for plugin_id, metadata_obj in collect_lsp_plugins_data().items()
+            for plugin_id, metadata_obj in LSP_PLUGINS.items()
         },
         "plugins": {
             name: {
@@ -647,6 +673,100 @@ def collect_references(
     return REFERENCES
 
 
+def _plugin_references(metadata_obj: metadata.PluginMetadata) -> dict:
+    """
+    Collect the reference data contributed by a single plugin.
+
+    Lazily loaded plugins return the references recorded in the manifest
+    so their module doesn't need to be imported.
+    """
+    if isinstance(metadata_obj, manifest.LazyPluginMetadata) and not metadata_obj.loaded:
+        return metadata_obj.references
+
+    references: dict = {}
+
+    if metadata_obj.get("services") is not None:
+        references.update(
+            services={c.name: c.value for c in list(metadata_obj.get("services", []))}
+        )
+    if metadata_obj.get("options") is not None:
+        references.update(
+            options={
+                c.name: dict(code=c.value.code, type=parse_type(c.value.type), default=c.value.default)
+                for c in list(metadata_obj.get("options", []))
+            }
+        )
+    if metadata_obj.get("connection_configs") is not None:
+        references.update(
+            connection_configs={
+                c.name: lib.to_dict(
+                    dict(
+                        name=c.name,
+                        code=c.value.code,
+                        required=False,
+                        type=parse_type(c.value.type),
+                        default=c.value.default,
+                        enum=lib.identity(
+                            None
+                            if "enum" not in str(c.value.type).lower()
+                            else [c.name for c in c.value.type]
+                        ),
+                    )
+                )
+                for c in list(metadata_obj.get("connection_configs", []))
+            }
+        )
+
+    # Build connection_fields with proper attrs class checking
+    settings_type = metadata_obj.get("Settings")
+    references.update(
+        connection_fields={
+            _.name: lib.to_dict(
+                dict(
+                    name=_.name,
+                    type=parse_type(_.type),
+                    required="NOTHING" in str(_.default),
+                    default=lib.identity(
+                        lib.to_dict(lib.to_json(_.default))
+                        if ("NOTHING" not in str(_.default))
+                        else None
+                    ),
+                    enum=lib.identity(
+                        None
+                        if "enum" not in str(_.type).lower()
+                        else [c.name for c in _.type]
+                    ),
+                )
+            )
+            for _ in getattr(settings_type, "__attrs_attrs__", [])
+            if (_.name not in COMMON_FIELDS)
+            or (metadata_obj.get("has_intl_accounts") and _.name == "account_country_code")
+        } if settings_type is not None and hasattr(settings_type, "__attrs_attrs__") else {}
+    )
+
+    if metadata_obj.get("Proxy") is not None:
+        references.update(
+            capabilities=detect_capabilities(
+                detect_proxy_methods(metadata_obj.get("Proxy")),
+                detect_hooks_methods(metadata_obj.get("Hooks")) if metadata_obj.get("Hooks") else [],
+            )
+        )
+    if metadata_obj.get("packaging_types") is not None:
+        references.update(
+            packaging_types={c.name: c.value for c in list(metadata_obj.get("packaging_types", []))}
+        )
+    if metadata_obj.get("package_presets") is not None:
+        references.update(
+            package_presets={
+                c.name: lib.to_dict(c.value) for c in list(metadata_obj.get("package_presets", []))
+            }
+        )
+    if metadata_obj.get("service_levels") is not None:
+        references.update(service_levels=lib.to_dict(metadata_obj.get("service_levels")))
+
+    return references
+
+
 def get_carrier_capabilities(carrier_name) -> typing.List[str]:
     """
     Get the capabilities of a specific carrier.
@@ -657,6 +777,10 @@ def get_carrier_capabilities(carrier_name) -> typing.List[str]:
     Returns:
         List of capability identifiers
     """
+    metadata_obj = PROVIDERS.get(carrier_name)
+    if isinstance(metadata_obj, manifest.LazyPluginMetadata) and not metadata_obj.loaded:
+        return metadata_obj.references.get("capabilities", [])
+
     proxy_class = pydoc.locate(f"karrio.mappers.{carrier_name}.Proxy")
     hooks_class = pydoc.locate(f"karrio.mappers.{carrier_name}.Hooks")
     proxy_methods = detect_proxy_methods(proxy_class) if proxy_class else []
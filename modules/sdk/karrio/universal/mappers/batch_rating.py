@@ -0,0 +1,357 @@
+"""Vectorized universal rate sheet quoting.
+
+Quotes N parcels (each with its own destination) against every service of a
+rate sheet at once. The destination coverage, dimension, weight and zone
+matching rules of `rating_proxy.get_available_rates` are evaluated as NumPy
+array operations and the result is a parcel x service rates matrix.
+
+Requires the optional `numpy` dependency (`pip install karrio[batch]`).
+"""
+
+import attr
+import typing
+import numpy as np
+import karrio.lib as lib
+import karrio.core.units as units
+import karrio.core.models as models
+import karrio.universal.mappers.rating_proxy as rating_proxy
+from karrio.universal.providers.rating import RatingMixinSettings
+
+# maximum number of (parcel, zone) cells evaluated at once per service
+CHUNK_SIZE = 2**22
+
+
+@attr.s(auto_attribs=True)
+class RatesMatrix:
+    """
+    Batch quote result with one row per parcel and one column per service.
+
+    `zones` holds the index of the selected zone in `service.zones` (-1 when
+    the service does not rate the parcel). `rates` and `transit_days` are NaN
+    where no zone (or zone value) is available.
+    """
+
+    services: typing.List[models.ServiceLevel]
+    zones: np.ndarray
+    rates: np.ndarray
+    transit_days: np.ndarray
+    settings: RatingMixinSettings = None
+
+    @property
+    def service_codes(self) -> typing.List[str]:
+        return [service.service_code for service in self.services]
+
+    @property
+    def available(self) -> np.ndarray:
+        return self.zones >= 0
+
+    def cheapest(self) -> np.ndarray:
+        """Return the column of the cheapest service of every parcel (-1 if none)."""
+        if self.rates.shape[1] == 0:
+            return np.full(self.rates.shape[0], -1)
+
+        rates = np.where(np.isnan(self.rates), np.inf, self.rates)
+        columns = rates.argmin(axis=1)
+        found = np.isfinite(rates[np.arange(len(rates)), columns])
+
+        return np.where(found, columns, -1)
+
+    def to_rates(self, row: int) -> typing.List[models.RateDetails]:
+        """Return the rate details of a parcel (as `get_available_rates` would)."""
+        return [
+            rating_proxy.to_rate_details(
+                service, service.zones[int(self.zones[row, column])], self.settings
+            )
+            for column, service in enumerate(self.services)
+            if self.zones[row, column] >= 0
+        ]
+
+
+def get_batch_rates(
+    parcels: typing.List[models.Parcel],
+    recipients: typing.List[models.Address],
+    settings: RatingMixinSettings,
+    shipper: models.Address = None,
+    selected_services: typing.List[str] = [],
+) -> RatesMatrix:
+    """
+    Quote every parcel against the active services of a rate sheet.
+
+    Args:
+        parcels: the parcels to quote
+        recipients: the destination of each parcel (same length as parcels)
+        settings: the universal rating settings holding the rate sheet services
+        shipper: the origin shared by every parcel
+        selected_services: restrict the quote to these service codes
+
+    Returns:
+        A RatesMatrix of shape (len(parcels), len(active services))
+    """
+    if len(parcels) != len(recipients):
+        raise ValueError("parcels and recipients must have the same length")
+
+    packages = list(lib.to_packages(parcels))
+    services = [svc for svc in settings.shipping_services if svc.active]
+    columns = _Columns(packages, recipients)
+    size = (len(packages), len(services))
+
+    origin = getattr(shipper, "country_code", None)
+    has_origin = any([origin, settings.account_country_code])
+    is_domicile = np.array(
+        [
+            bool(has_origin)
+            and (origin == country or settings.account_country_code == country)
+            for country in columns.country_codes
+        ],
+        dtype=bool,
+    )
+    is_international = ~is_domicile
+
+    zones = np.full(size, -1, dtype=np.int64)
+    rates = np.full(size, np.nan)
+    transit_days = np.full(size, np.nan)
+
+    for column, service in enumerate(services):
+        explicitly_requested = service.service_code in (selected_services or [])
+        implicitly_requested = len(selected_services or []) == 0
+
+        if not (explicitly_requested or implicitly_requested):
+            continue
+
+        # destination coverage
+        cover_all_destination = (
+            service.domicile is None and service.international is None
+        ) or (service.domicile is True and service.international is True)
+        eligible = np.full(len(packages), cover_all_destination, dtype=bool)
+        if service.domicile is True:
+            eligible |= is_domicile
+        if service.international is True:
+            eligible |= is_international
+
+        # dimension restrictions (missing package dimensions are assumed valid)
+        if service.dimension_unit is not None:
+            for dimension in ["length", "height", "width"]:
+                limit = getattr(service, f"max_{dimension}")
+                if limit is None:
+                    continue
+
+                values = columns.dimension(dimension, service.dimension_unit)
+                eligible &= np.isnan(values) | (
+                    values <= units.Dimension(limit, service.dimension_unit).value
+                )
+
+        # weight restrictions (missing package weights are assumed valid)
+        if service.weight_unit is not None:
+            weights = columns.weight(service.weight_unit)
+            if service.min_weight is not None:
+                eligible &= np.isnan(weights) | (
+                    weights
+                    >= units.Weight(service.min_weight, service.weight_unit).value
+                )
+            if service.max_weight is not None:
+                eligible &= np.isnan(weights) | (
+                    weights
+                    <= units.Weight(service.max_weight, service.weight_unit).value
+                )
+
+        table = _ZoneTable.compile(service)
+        selected = np.where(eligible, table.match(columns), -1)
+        found = selected >= 0
+
+        zones[:, column] = selected
+        rates[found, column] = table.rates[selected[found]]
+        transit_days[found, column] = table.transit_days[selected[found]]
+
+    return RatesMatrix(
+        services=services,
+        zones=zones,
+        rates=rates,
+        transit_days=transit_days,
+        settings=settings,
+    )
+
+
+class _Columns:
+    """Parcel and destination values as arrays, converted once per unit."""
+
+    def __init__(self, packages: typing.List[units.Package], recipients):
+        self.packages = packages
+        self.postal_codes = [
+            None if code is None else str(code).lower()
+            for code in (
+                getattr(address, "postal_code", None) for address in recipients
+            )
+        ]
+        self.cities = [
+            None if city is None else city.lower()
+            for city in (getattr(address, "city", None) for address in recipients)
+        ]
+        self.country_codes = [
+            getattr(address, "country_code", None) for address in recipients
+        ]
+        self._values: typing.Dict[tuple, np.ndarray] = {}
+
+    def weight(self, unit: str) -> np.ndarray:
+        key = ("weight", unit)
+        if key not in self._values:
+            self._values[key] = _to_array(pkg.weight[unit] for pkg in self.packages)
+
+        return self._values[key]
+
+    def dimension(self, name: str, unit: str) -> np.ndarray:
+        key = (name, unit)
+        if key not in self._values:
+            self._values[key] = _to_array(
+                None if getattr(pkg, name) is None else getattr(pkg, name)[unit]
+                for pkg in self.packages
+            )
+
+        return self._values[key]
+
+
+@attr.s(auto_attribs=True)
+class _ZoneTable:
+    """Service zones as arrays (one entry per zone in declaration order)."""
+
+    weight_unit: str
+    min_weights: np.ndarray
+    max_weights: np.ndarray
+    ranks: np.ndarray
+    rates: np.ndarray
+    transit_days: np.ndarray
+    unrestricted: np.ndarray
+    postal_codes: typing.Dict[str, typing.List[int]]
+    cities: typing.Dict[str, typing.List[int]]
+    country_codes: typing.Dict[str, typing.List[int]]
+
+    @classmethod
+    def compile(cls, service: models.ServiceLevel) -> "_ZoneTable":
+        zones = service.zones or []
+        weight_unit = service.weight_unit or "KG"
+        layers: typing.Dict[str, typing.Dict[str, typing.List[int]]] = dict(
+            postal_codes={}, cities={}, country_codes={}
+        )
+
+        for position, zone in enumerate(zones):
+            if zone.postal_codes:
+                keys = {str(code).lower() for code in zone.postal_codes}
+                layer = layers["postal_codes"]
+            elif zone.cities:
+                keys = {city.lower() for city in zone.cities}
+                layer = layers["cities"]
+            elif zone.country_codes:
+                keys = set(zone.country_codes)
+                layer = layers["country_codes"]
+            else:
+                continue
+
+            for key in keys:
+                layer.setdefault(key, []).append(position)
+
+        order = sorted(
+            range(len(zones)),
+            key=lambda position: rating_proxy.zone_priority(zones[position], position),
+        )
+        ranks = np.empty(len(zones), dtype=np.int64)
+        ranks[order] = np.arange(len(zones))
+
+        return cls(
+            weight_unit=weight_unit,
+            min_weights=_to_array(
+                (
+                    None
+                    if zone.min_weight is None
+                    else units.Weight(zone.min_weight, weight_unit).value
+                )
+                for zone in zones
+            ),
+            max_weights=_to_array(
+                (
+                    None
+                    if zone.max_weight is None
+                    else units.Weight(zone.max_weight, weight_unit).value
+                )
+                for zone in zones
+            ),
+            ranks=ranks,
+            rates=_to_array(zone.rate for zone in zones),
+            transit_days=_to_array(
+                service.transit_days if zone.transit_days is None else zone.transit_days
+                for zone in zones
+            ),
+            unrestricted=np.array(
+                [
+                    not (zone.postal_codes or zone.cities or zone.country_codes)
+                    for zone in zones
+                ],
+                dtype=bool,
+            ),
+            **layers,
+        )
+
+    def match(self, columns: _Columns) -> np.ndarray:
+        """Return the position of the best matching zone of every parcel (-1 if none)."""
+        count = len(columns.packages)
+        size = len(self.ranks)
+        selected = np.full(count, -1, dtype=np.int64)
+
+        if size == 0 or count == 0:
+            return selected
+
+        weights = columns.weight(self.weight_unit)
+        layers = [
+            self._layer(self.postal_codes, columns.postal_codes),
+            self._layer(self.cities, columns.cities),
+            self._layer(self.country_codes, columns.country_codes),
+        ]
+        step = max(1, CHUNK_SIZE // size)
+
+        for start in range(0, count, step):
+            rows = slice(start, start + step)
+            matches = np.repeat(
+                self.unrestricted[None, :], min(step, count - start), axis=0
+            )
+            for table, codes, positions in layers:
+                matches[:, positions] |= table[codes[rows]]
+
+            # inclusive min, exclusive max (see `check_weight_match`)
+            weight = weights[rows, None]
+            with np.errstate(invalid="ignore"):
+                matches &= np.isnan(self.min_weights) | (weight >= self.min_weights)
+                matches &= np.isnan(self.max_weights) | (weight < self.max_weights)
+
+            scores = np.where(matches, self.ranks, size)
+            best = scores.argmin(axis=1)
+            found = matches[np.arange(len(best)), best]
+            selected[rows] = np.where(found, best, -1)
+
+        return selected
+
+    @staticmethod
+    def _layer(
+        layer: typing.Dict[str, typing.List[int]],
+        keys: typing.List[typing.Optional[str]],
+    ) -> typing.Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Return the membership table (location key x layer zone) of a location
+        layer, the key code of every parcel and the positions of the layer zones.
+        """
+        positions = sorted({position for group in layer.values() for position in group})
+        columns = {position: column for column, position in enumerate(positions)}
+        lookup = {key: code for code, key in enumerate(layer)}
+        table = np.zeros((len(layer) + 1, len(positions)), dtype=bool)
+
+        for code, group in enumerate(layer.values()):
+            table[code, [columns[position] for position in group]] = True
+
+        # the last table row (no zone) is used for unknown or missing keys
+        codes = np.array([lookup.get(key, len(layer)) for key in keys], dtype=np.int64)
+
+        return table, codes, np.array(positions, dtype=np.int64)
+
+
+def _to_array(values: typing.Iterable[typing.Optional[float]]) -> np.ndarray:
+    return np.array(
+        [np.nan if value is None else value for value in values],
+        dtype=float,
+    )
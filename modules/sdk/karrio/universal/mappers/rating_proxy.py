@@ -1,5 +1,8 @@
+import os
 import attr
+import heapq
 import typing
+import weakref
 import karrio.lib as lib
 import karrio.core.units as units
 import karrio.core.utils as utils
@@ -9,6 +12,8 @@ from karrio.universal.providers.rating import (
     PackageRates,
 )
 
+ZONE_INDEX_CACHE_SIZE = int(os.getenv("KARRIO_ZONE_INDEX_CACHE_SIZE", 1024))
+
 
 @attr.s(auto_attribs=True)
 class RatingMixinProxy:
@@ -70,6 +75,37 @@ class RatingMixinProxy:
 
         return utils.Deserializable(response)
 
+    def get_batch_rates(
+        self,
+        parcels: typing.List[models.Parcel],
+        recipients: typing.List[models.Address],
+        shipper: models.Address = None,
+        services: typing.List[str] = [],
+    ):
+        """Quote parcels in bulk as a (parcel x service) rates matrix.
+
+        Requires `numpy`, installed with the `karrio[batch]` extra
+        (see `karrio.universal.mappers.batch_rating`).
+        """
+        try:
+            import karrio.universal.mappers.batch_rating as batch_rating
+        except ModuleNotFoundError as e:
+            if e.name != "numpy":
+                raise
+
+            raise ImportError(
+                "Batch rating requires numpy. Install it with `pip install karrio[batch]` "
+                "or quote parcels one at a time with `get_rates`."
+            ) from e
+
+        return batch_rating.get_batch_rates(
+            parcels,
+            recipients,
+            self.settings,
+            shipper=shipper,
+            selected_services=services,
+        )
+
 
 def calculate_zone_specificity(
     zone: models.ServiceZone,
@@ -178,6 +214,175 @@ def check_weight_match(
     return True
 
 
+def zone_priority(zone: models.ServiceZone, order: int = 0) -> tuple:
+    """
+    Return the sort key of a matching zone (lowest is best):
+    highest specificity, tightest weight range, lowest rate, first declared.
+    """
+    return (
+        -calculate_zone_specificity(zone),
+        (zone.max_weight or float("inf")) - (zone.min_weight or 0),
+        zone.rate or 0.0,
+        order,
+    )
+
+
+# (min weight, max weight, zone) with bounds in the service weight unit
+ZoneEntry = typing.Tuple[
+    typing.Optional[float], typing.Optional[float], models.ServiceZone
+]
+# (zone priority, zone entry)
+RankedZoneEntry = typing.Tuple[tuple, ZoneEntry]
+
+
+@attr.s(auto_attribs=True)
+class ZoneIndex:
+    """
+    Service zones compiled for constant time location lookups.
+
+    A zone is indexed under its most specific location criterion only (the one
+    `check_location_match` applies). Every bucket is pre-sorted by the
+    `find_best_matching_zone` priority and the recipient buckets are merged
+    in that order (the weight bounds bonus makes specificity ranges overlap
+    across layers): the first candidate whose weight band fits is the best
+    match.
+    """
+
+    weight_unit: str = "KG"
+    postal_codes: typing.Dict[str, typing.List[RankedZoneEntry]] = attr.field(
+        factory=dict
+    )
+    cities: typing.Dict[str, typing.List[RankedZoneEntry]] = attr.field(
+        factory=dict
+    )
+    country_codes: typing.Dict[str, typing.List[RankedZoneEntry]] = attr.field(
+        factory=dict
+    )
+    unrestricted: typing.List[RankedZoneEntry] = attr.field(factory=list)
+    has_weight_bands: bool = False
+
+    @classmethod
+    def compile(
+        cls,
+        zones: typing.List[models.ServiceZone],
+        weight_unit: str = None,
+    ) -> "ZoneIndex":
+        index = cls(weight_unit=weight_unit or "KG")
+
+        for order, zone in enumerate(zones):
+            min_weight = (
+                units.Weight(zone.min_weight, index.weight_unit).value
+                if zone.min_weight is not None
+                else None
+            )
+            max_weight = (
+                units.Weight(zone.max_weight, index.weight_unit).value
+                if zone.max_weight is not None
+                else None
+            )
+            entry: RankedZoneEntry = (
+                zone_priority(zone, order),
+                (min_weight, max_weight, zone),
+            )
+            index.has_weight_bands |= min_weight is not None or max_weight is not None
+
+            if zone.postal_codes:
+                keys = {str(code).lower() for code in zone.postal_codes}
+                layer = index.postal_codes
+            elif zone.cities:
+                keys = {city.lower() for city in zone.cities}
+                layer = index.cities
+            elif zone.country_codes:
+                keys = set(zone.country_codes)
+                layer = index.country_codes
+            else:
+                index.unrestricted.append(entry)
+                continue
+
+            for key in keys:
+                layer.setdefault(key, []).append(entry)
+
+        for bucket in [
+            index.unrestricted,
+            *index.postal_codes.values(),
+            *index.cities.values(),
+            *index.country_codes.values(),
+        ]:
+            bucket.sort(key=lambda item: item[0])
+
+        return index
+
+    def candidates(
+        self, recipient: units.ComputedAddress
+    ) -> typing.Iterator[ZoneEntry]:
+        """Yield the zones matching the recipient location in priority order."""
+        buckets = [
+            self.postal_codes.get(str(recipient.postal_code).lower(), [])
+            if recipient.postal_code is not None
+            else [],
+            self.cities.get(recipient.city.lower(), [])
+            if recipient.city is not None
+            else [],
+            self.country_codes.get(recipient.country_code, []),
+            self.unrestricted,
+        ]
+
+        for _, entry in heapq.merge(*buckets, key=lambda item: item[0]):
+            yield entry
+
+    def find(
+        self,
+        package: units.Package,
+        recipient: units.ComputedAddress,
+    ) -> typing.Optional[models.ServiceZone]:
+        package_weight = (
+            package.weight[self.weight_unit] if self.has_weight_bands else None
+        )
+
+        for min_weight, max_weight, zone in self.candidates(recipient):
+            # inclusive min, exclusive max (see `check_weight_match`)
+            if min_weight is not None and package_weight < min_weight:
+                continue
+            if max_weight is not None and package_weight >= max_weight:
+                continue
+
+            return zone
+
+        return None
+
+
+_zone_indexes = lib.LRUCache(maxsize=ZONE_INDEX_CACHE_SIZE)
+
+
+def get_zone_index(
+    service: models.ServiceLevel,
+    zones: typing.List[models.ServiceZone] = None,
+) -> ZoneIndex:
+    """
+    Return the compiled zone index of a service.
+
+    Indexes are cached per service instance and recompiled when the service
+    zones list or weight unit change (a new rate sheet version).
+    """
+    zones = (service.zones or []) if zones is None else zones
+    key = f"{id(service)}"
+    version = (len(zones), service.weight_unit)
+    entry = _zone_indexes.get(key)
+
+    if (
+        entry is not None
+        and entry[0]() is service
+        and entry[1] is zones
+        and entry[2] == version
+    ):
+        return entry[3]
+
+    index = ZoneIndex.compile(zones, service.weight_unit)
+    _zone_indexes.set(key, (weakref.ref(service), zones, version, index))
+
+    return index
+
+
 def find_best_matching_zone(
     zones: typing.List[models.ServiceZone],
     package: units.Package,
@@ -197,37 +402,7 @@ def find_best_matching_zone(
     Returns:
         Best matching zone, or None if no matches found
     """
-    matching_zones: typing.List[typing.Tuple[int, float, float, models.ServiceZone]] = (
-        []
-    )
-
-    for zone in zones:
-        # Must match location
-        if not check_location_match(zone, recipient):
-            continue
-
-        # Must fit weight range
-        if not check_weight_match(zone, package, service):
-            continue
-
-        # Calculate metrics for sorting
-        specificity = calculate_zone_specificity(zone)
-        weight_range = (zone.max_weight or float("inf")) - (zone.min_weight or 0)
-        rate = zone.rate or 0.0
-
-        # Store as tuple: (specificity, weight_range, rate, zone)
-        matching_zones.append((specificity, weight_range, rate, zone))
-
-    if not matching_zones:
-        return None
-
-    # Sort by priority:
-    # 1. Highest specificity (descending) - use negative
-    # 2. Tightest weight range (ascending)
-    # 3. Lowest rate (ascending)
-    best_match = min(matching_zones, key=lambda t: (-t[0], t[1], t[2]))
-
-    return best_match[3]  # Return the zone
+    return get_zone_index(service, zones).find(package, recipient)
 
 
 def get_available_rates(
@@ -358,7 +533,7 @@ def get_available_rates(
 
         # resolve matching zone using improved algorithm
         selected_zone: typing.Optional[models.ServiceZone] = find_best_matching_zone(
-            zones=service.zones or [],
+            zones=service.zones,
             package=package,
             recipient=recipient,
             service=service,
@@ -443,41 +618,45 @@ def get_available_rates(
             and match_max_weight_requirements
             and selected_zone is not None
         ):
-            carrier_name = getattr(
-                settings,
-                "custom_carrier_name",
-                settings.carrier_name,
-            )
-            transit_days = (
-                service.transit_days
-                if selected_zone.transit_days is None
-                else selected_zone.transit_days
-            )
-
-            rates.append(
-                models.RateDetails(
-                    carrier_name=carrier_name,
-                    carrier_id=settings.carrier_id,
-                    service=service.service_code,
-                    currency=service.currency,
-                    transit_days=transit_days,
-                    total_charge=selected_zone.rate,
-                    extra_charges=[
-                        models.ChargeDetails(
-                            name="Base Charge",
-                            amount=selected_zone.rate,
-                            currency=service.currency,
-                        )
-                    ],
-                    meta=lib.to_dict(  # type: ignore
-                        dict(
-                            carrier_service_code=service.carrier_service_code,
-                            service_name=service.service_name,
-                            shipping_charges=selected_zone.rate,
-                            shipping_currency=service.currency,
-                        )
-                    ),
-                )
-            )
+            rates.append(to_rate_details(service, selected_zone, settings))
 
     return rates, errors
+
+
+def to_rate_details(
+    service: models.ServiceLevel,
+    zone: models.ServiceZone,
+    settings: RatingMixinSettings,
+) -> models.RateDetails:
+    carrier_name = getattr(
+        settings,
+        "custom_carrier_name",
+        settings.carrier_name,
+    )
+    transit_days = (
+        service.transit_days if zone.transit_days is None else zone.transit_days
+    )
+
+    return models.RateDetails(
+        carrier_name=carrier_name,
+        carrier_id=settings.carrier_id,
+        service=service.service_code,
+        currency=service.currency,
+        transit_days=transit_days,
+        total_charge=zone.rate,
+        extra_charges=[
+            models.ChargeDetails(
+                name="Base Charge",
+                amount=zone.rate,
+                currency=service.currency,
+            )
+        ],
+        meta=lib.to_dict(  # type: ignore
+            dict(
+                carrier_service_code=service.carrier_service_code,
+                service_name=service.service_name,
+                shipping_charges=zone.rate,
+                shipping_currency=service.currency,
+            )
+        ),
+    )
@@ -0,0 +1,69 @@
+import io
+import base64
+import PyPDF2
+import unittest
+import PIL.Image
+import karrio.lib as lib
+from karrio.core.utils import zpl
+
+
+class TestStreamingBundle(unittest.TestCase):
+    def test_stream_pdfs(self):
+        chunks = list(lib.stream_bundle(iter([PDF_LABEL, PDF_LABEL, "invalid"]), "PDF"))
+        pdf = PyPDF2.PdfReader(io.BytesIO(b"".join(chunks)), strict=True)
+
+        self.assertGreater(len(chunks), 2)
+        self.assertEqual(len(pdf.pages), 4)
+        self.assertEqual(pdf.pages[3].mediabox, pdf.pages[0].mediabox)
+        self.assertEqual(
+            pdf.pages[0].get_contents().get_data(),
+            pdf.pages[2].get_contents().get_data(),
+        )
+
+    def test_stream_pngs(self):
+        small = _png(PIL.Image.new("RGB", (10, 5), (255, 255, 255)))
+        large = _png(PIL.Image.new("L", (20, 10), 128))
+
+        content = b"".join(lib.stream_bundle([small, large], "PNG"))
+        image = PIL.Image.open(io.BytesIO(content))
+        expected = lib.bundle_imgs([small, large])
+
+        self.assertEqual(image.size, (20, 15))
+        self.assertEqual(image.convert("RGB").tobytes(), expected.tobytes())
+
+    def test_stream_zpls(self):
+        labels = [base64.b64encode(b"^XA^FDONE^FS^XZ").decode()] * 2
+
+        content = b"".join(lib.stream_bundle(labels, "ZPL"))
+
+        self.assertEqual(content.decode(), lib.bundle_zpls(labels))
+
+    def test_bundle_base64(self):
+        pdf = PyPDF2.PdfReader(
+            io.BytesIO(base64.b64decode(lib.bundle_base64([PDF_LABEL] * 3, "PDF")))
+        )
+
+        self.assertEqual(len(pdf.pages), 6)
+
+
+def _png(image: PIL.Image.Image) -> str:
+    buffer = io.BytesIO()
+    image.save(buffer, "PNG")
+    return base64.b64encode(buffer.getvalue()).decode()
+
+
+PDF_LABEL = base64.b64encode(
+    zpl.to_pdf(
+        zpl.render(
+            "^XA^FO50,50^A0N,50,50^FDPAGE 1^FS^XZ^XA^FO50,50^BCN,80^FD123^FS^XZ",
+            4,
+            6,
+            dpmm=8,
+        ),
+        dpmm=8,
+    )
+).decode()
+
+
+if __name__ == "__main__":
+    unittest.main()
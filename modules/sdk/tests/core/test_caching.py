@@ -0,0 +1,109 @@
+import time
+import threading
+import unittest
+import karrio.lib as lib
+import karrio.core.utils.caching as caching
+from karrio.core.utils.caching import LRUCache
+
+
+class SystemCache:
+    def __init__(self):
+        self.values = {}
+        self.reads = 0
+
+    def get(self, key):
+        self.reads += 1
+        return self.values.get(key)
+
+    def set(self, key, value, timeout=None):
+        self.values[key] = value
+
+
+class TestLRUCache(unittest.TestCase):
+    def test_eviction(self):
+        cache = LRUCache(maxsize=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+
+        self.assertEqual(cache.get("a"), 1)
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.stats()["evictions"], 1)
+
+    def test_ttl(self):
+        cache = LRUCache(ttl=0.05)
+        cache.set("a", 1)
+        cache.set("b", 2, timeout=60)
+
+        self.assertEqual(cache.get("a"), 1)
+        time.sleep(0.06)
+        self.assertIsNone(cache.get("a"))
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.stats()["expirations"], 2)
+
+
+class TestCache(unittest.TestCase):
+    def test_local_tier_in_front_of_system_cache(self):
+        system_cache = SystemCache()
+        system_cache.values["token"] = {"access_token": "abc"}
+        cache = lib.Cache(system_cache, local=LRUCache())
+
+        self.assertDictEqual(cache.get("token"), {"access_token": "abc"})
+        self.assertDictEqual(cache.get("token"), {"access_token": "abc"})
+        self.assertEqual(system_cache.reads, 1)
+        self.assertEqual(cache.stats()["local"]["hits"], 1)
+
+    def test_local_tier_expires_values_updated_elsewhere(self):
+        system_cache = SystemCache()
+        system_cache.values["token"] = {"access_token": "abc"}
+        cache = lib.Cache(system_cache, local=LRUCache(ttl=0.05))
+        cache.get("token")
+
+        # another process updates the shared cache
+        system_cache.values["token"] = {"access_token": "xyz"}
+        time.sleep(0.06)
+
+        self.assertDictEqual(cache.get("token"), {"access_token": "xyz"})
+
+    def test_shared_local_tier_is_short_lived(self):
+        cache = lib.Cache(SystemCache())
+
+        self.assertLessEqual(cache._local.ttl, caching.DEFAULT_SHARED_LOCAL_CACHE_TTL)
+        self.assertLess(caching.DEFAULT_SHARED_LOCAL_CACHE_TTL, 60)
+
+    def test_set_callable_value(self):
+        system_cache = SystemCache()
+        cache = lib.Cache(system_cache, local=LRUCache())
+        cache.set("token", lambda: {"access_token": "abc"})
+
+        self.assertDictEqual(cache.get("token"), {"access_token": "abc"})
+        self.assertDictEqual(system_cache.values["token"], {"access_token": "abc"})
+
+    def test_single_flight_loading(self):
+        cache = lib.Cache()
+        calls = []
+
+        def loader():
+            calls.append(1)
+            time.sleep(0.05)
+            return "value"
+
+        threads = [
+            threading.Thread(target=cache.get_or_set, args=("key", loader))
+            for _ in range(10)
+        ]
+        [thread.start() for thread in threads]
+        [thread.join() for thread in threads]
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(cache.get("key"), "value")
+
+    def test_kwargs_initial_values(self):
+        cache = lib.Cache(token={"access_token": "abc"})
+
+        self.assertDictEqual(cache.get("token"), {"access_token": "abc"})
+
+
+if __name__ == "__main__":
+    unittest.main()
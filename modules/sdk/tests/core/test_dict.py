@@ -0,0 +1,128 @@
+import os
+import json
+import timeit
+import unittest
+import karrio.lib as lib
+import karrio.core.units as units
+import karrio.core.models as models
+from karrio.core.utils.dict import DICTPARSE
+
+
+class TestDictParse(unittest.TestCase):
+    def test_to_dict_matches_json_round_trip(self):
+        for entity in [RATE, SHIPMENT, [RATE, RATE], ENTITY_WITH_EXTRAS]:
+            for clear_empty in [None, False]:
+                self.assertEqual(
+                    json.dumps(DICTPARSE.to_dict(entity, clear_empty)),
+                    json.dumps(json_round_trip(entity, clear_empty)),
+                )
+
+    def test_to_dict_prunes_empty_values(self):
+        self.assertDictEqual(
+            DICTPARSE.to_dict(dict(a=None, b=[], c="", d=0, e=False, f=dict(g=None))),
+            dict(d=0, e=False, f={}),
+        )
+
+    def test_to_dict_unsupported_keys_fallback(self):
+        self.assertDictEqual(DICTPARSE.to_dict({1: "a", 2: None}), {"1": "a"})
+
+    def test_to_object_filters_unknown_arguments(self):
+        charge = DICTPARSE.to_object(
+            models.ChargeDetails, dict(name="Fuel", amount=1.5, unknown="value")
+        )
+
+        self.assertEqual(charge, models.ChargeDetails(name="Fuel", amount=1.5))
+
+
+@unittest.skipUnless(os.environ.get("KARRIO_BENCHMARK"), "KARRIO_BENCHMARK is not set")
+class TestDictParseBenchmark(unittest.TestCase):
+    """Micro-benchmark of the direct conversion against the JSON round trip.
+
+    The timings are only reported (shared CI runners make them unreliable).
+    """
+
+    def test_rate_details_to_dict(self):
+        report(
+            "RateDetails",
+            *benchmark(lambda: DICTPARSE.to_dict(RATE), lambda: json_round_trip(RATE)),
+        )
+
+    def test_shipment_details_to_dict(self):
+        report(
+            "ShipmentDetails",
+            *benchmark(
+                lambda: DICTPARSE.to_dict(SHIPMENT), lambda: json_round_trip(SHIPMENT)
+            ),
+        )
+
+
+def json_round_trip(entity, clear_empty=None):
+    _clear_empty = clear_empty is not False
+
+    return json.loads(
+        DICTPARSE.jsonify(entity),
+        object_hook=lambda d: {
+            k: v
+            for k, v in d.items()
+            if (v not in (None, [], "") if _clear_empty else True)
+        },
+    )
+
+
+def benchmark(fast, slow, number: int = 200):
+    """Return the best (fast, slow) timing of `number` calls over 3 repeats."""
+    return (
+        min(timeit.repeat(fast, number=number, repeat=3)),
+        min(timeit.repeat(slow, number=number, repeat=3)),
+    )
+
+
+def report(name: str, fast: float, slow: float):
+    print(f"\n{name}.to_dict: {fast:.4f}s, json round trip: {slow:.4f}s ({slow / fast:.1f}x)")
+
+
+RATE = models.RateDetails(
+    carrier_name="canadapost",
+    carrier_id="canadapost",
+    service="canadapost_priority",
+    currency="CAD",
+    total_charge=106.71,
+    transit_days=2,
+    extra_charges=[
+        models.ChargeDetails(name="Base charge", amount=101.83, currency="CAD"),
+        models.ChargeDetails(name="Fuel surcharge", amount=2.7, currency="CAD"),
+        models.ChargeDetails(name="SMB Savings", amount=-11.74, currency="CAD"),
+        models.ChargeDetails(name="Discount", amount=-9.04, currency="CAD"),
+        models.ChargeDetails(name="Duties and taxes", amount=13.92, currency="CAD"),
+    ],
+    meta=dict(service_name="CANADAPOST PRIORITY", rate_provider="canadapost"),
+)
+
+SHIPMENT = models.ShipmentDetails(
+    carrier_name="canadapost",
+    carrier_id="canadapost",
+    tracking_number="123456789012",
+    shipment_identifier="123456789012",
+    docs=models.Documents(
+        label="JVBERi0xLjQKJeLjz9MKMyAwIG9iago8PC9UeXBlL1hPYmplY3QK" * 40
+    ),
+    selected_rate=RATE,
+    meta=dict(
+        carrier_tracking_link="https://www.canadapost-postescanada.ca/track",
+        service_name="canadapost_priority",
+        manifest_required=False,
+        tracking_numbers=["123456789012", "123456789013"],
+    ),
+)
+
+ENTITY_WITH_EXTRAS = dict(
+    unit=units.WeightUnit.KG,
+    dimension=units.DimensionUnit.CM,
+    pair=("a", None, 1),
+    nested=[dict(z=1, a=[], m=""), None],
+    rate=lib.to_dict(RATE),
+)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,123 @@
+import time
+import asyncio
+import threading
+import unittest
+import karrio.lib as lib
+from karrio.core.utils.executor import Executor, CarrierLimiter, parse_carrier_limits
+
+
+class TestExecutor(unittest.TestCase):
+    def setUp(self):
+        self.executor = Executor(max_workers=2, max_queue_size=4)
+
+    def tearDown(self):
+        self.executor.shutdown()
+
+    def test_results_keep_sequence_order(self):
+        results = self.executor.map_items(lambda x: x * 2, list(range(20)))
+
+        self.assertListEqual(results, [x * 2 for x in range(20)])
+
+    def test_exceptions(self):
+        def action(x):
+            if x == 3:
+                raise ValueError("invalid")
+            return x
+
+        results = self.executor.map_items(action, range(5), return_exceptions=True)
+
+        self.assertListEqual(results[:3], [0, 1, 2])
+        self.assertIsInstance(results[3], ValueError)
+        with self.assertRaises(ValueError):
+            self.executor.map_items(action, range(5))
+
+    def test_nested_fan_out_does_not_deadlock(self):
+        results = self.executor.map_items(
+            lambda x: sum(self.executor.map_items(lambda y: y + x, range(10))),
+            range(10),
+        )
+
+        self.assertListEqual(results, [sum(range(10)) + 10 * x for x in range(10)])
+        self.assertEqual(self.executor.metrics()["queue_depth"], 0)
+
+    def test_stolen_tasks_release_their_queue_slot(self):
+        executor = Executor(max_workers=1, max_queue_size=4)
+        started, release = threading.Event(), threading.Event()
+        executor.submit(lambda: (started.set(), release.wait(5)))
+        started.wait(5)
+
+        # the only worker is busy: every queued item is stolen by the caller
+        results = executor.map_items(lambda x: x * 2, range(3))
+        metrics = executor.metrics()
+        release.set()
+        executor.shutdown()
+
+        self.assertListEqual(results, [0, 2, 4])
+        self.assertEqual(metrics["queue_depth"], 0)
+        self.assertEqual(metrics["caller_runs"], 3)
+        self.assertEqual(executor.metrics()["completed"], 1)
+
+    def test_bounded_threads(self):
+        threads = set()
+
+        def action(_):
+            threads.add(threading.current_thread().name)
+            time.sleep(0.01)
+
+        self.executor.map_items(action, range(50))
+
+        self.assertLessEqual(len(threads), 3)  # 2 workers + the caller
+        self.assertGreater(self.executor.metrics()["caller_runs"], 0)
+
+
+class TestCarrierLimiter(unittest.TestCase):
+    def test_parse_carrier_limits(self):
+        self.assertDictEqual(
+            parse_carrier_limits("canadapost:4, usps:8"),
+            {"canadapost": 4, "usps": 8},
+        )
+
+    def test_carrier_concurrency_limit(self):
+        limiter = CarrierLimiter(default_limit=10, limits={"canadapost": 2})
+        executor = Executor(max_workers=8)
+        active = dict(current=0, max=0)
+        lock = threading.Lock()
+
+        def call(_):
+            with limiter.slot():
+                with lock:
+                    active["current"] += 1
+                    active["max"] = max(active["max"], active["current"])
+                time.sleep(0.01)
+                with lock:
+                    active["current"] -= 1
+
+        with lib.carrier_scope("canadapost"):
+            executor.map_items(call, range(12))
+        executor.shutdown()
+
+        self.assertEqual(active["max"], 2)
+        self.assertEqual(limiter.metrics()["canadapost"]["wait_time"]["count"], 12)
+        self.assertEqual(limiter.metrics()["canadapost"]["active"], 0)
+
+    def test_async_carrier_concurrency_limit(self):
+        limiter = CarrierLimiter(default_limit=3)
+        active = dict(current=0, max=0)
+
+        async def call(_):
+            async with limiter.aslot("usps"):
+                active["current"] += 1
+                active["max"] = max(active["max"], active["current"])
+                await asyncio.sleep(0.01)
+                active["current"] -= 1
+
+        async def run():
+            await asyncio.gather(*[call(_) for _ in range(10)])
+
+        asyncio.run(run())
+
+        self.assertEqual(active["max"], 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
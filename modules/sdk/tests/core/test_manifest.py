@@ -0,0 +1,79 @@
+import os
+import json
+import tempfile
+import unittest
+from unittest import mock
+import karrio.references as references
+import karrio.core.manifest as manifest
+
+REGISTRY = {"ENABLE_ALL_PLUGINS_BY_DEFAULT": True}
+
+
+class TestPluginManifest(unittest.TestCase):
+    def setUp(self):
+        self.maxDiff = None
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "plugins.json")
+
+    def tearDown(self):
+        self.directory.cleanup()
+        references.import_extensions()
+
+    def test_lazy_references_match_eager_references(self):
+        references.import_extensions()
+        expected = _normalize(references.collect_references(REGISTRY))
+        references.build_manifest(self.path)
+
+        with mock.patch.dict(os.environ, {manifest.MANIFEST_ENV: self.path}):
+            references.import_extensions()
+
+        providers = references.PROVIDERS.values()
+        result = _normalize(references.collect_references(REGISTRY))
+
+        self.assertTrue(len(providers) > 0)
+        self.assertTrue(all(isinstance(_, manifest.LazyPluginMetadata) for _ in providers))
+        self.assertFalse(any(_.loaded for _ in providers))
+        self.assertDictEqual(result, expected)
+
+    def test_lazy_plugin_loads_on_first_use(self):
+        references.import_extensions()
+        references.build_manifest(self.path)
+
+        with mock.patch.dict(os.environ, {manifest.MANIFEST_ENV: self.path}):
+            references.import_extensions()
+
+        plugin = references.PROVIDERS["canadapost"]
+        self.assertNotIn("canadapost", references.MAPPERS)
+
+        mapper = plugin.Mapper
+
+        self.assertTrue(plugin.loaded)
+        self.assertIs(references.MAPPERS["canadapost"], mapper)
+        self.assertIs(references.SCHEMAS["canadapost"], plugin.Settings)
+
+    def test_stale_manifest_is_ignored(self):
+        references.build_manifest(self.path)
+
+        with open(self.path) as file:
+            content = json.load(file)
+        with open(self.path, "w") as file:
+            json.dump({**content, "fingerprint": "stale"}, file)
+
+        self.assertIsNone(manifest.read(self.path))
+
+        references.build_manifest(self.path)
+
+        self.assertIsNotNone(manifest.read(self.path))
+
+
+def _normalize(data: dict) -> dict:
+    # capabilities are collected from sets so their order isn't stable
+    data = json.loads(json.dumps(data, default=str))
+    for key in ("carrier_capabilities", "lsp_capabilities"):
+        data[key] = {name: sorted(value) for name, value in data[key].items()}
+
+    return data
+
+
+if __name__ == "__main__":
+    unittest.main()
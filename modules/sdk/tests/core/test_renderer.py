@@ -0,0 +1,64 @@
+import io
+import base64
+import PyPDF2
+import unittest
+from PIL import Image, ImageDraw
+import karrio.addons.renderer as renderer
+
+
+class TestSVGLabelRenderer(unittest.TestCase):
+    def test_compile_svg_label_plan(self):
+        plan = renderer.compile_svg_label(LABEL)
+
+        self.assertListEqual(
+            [type(element).__name__ for element in plan],
+            ["Text", "Line", "Text", "Barcode"],
+        )
+        self.assertEqual(plan[0].font_size, 50)
+        self.assertTrue(plan[0].bold)
+        self.assertTrue(plan[2].is_barcode_text)
+
+    def test_cached_text_matches_draw_text(self):
+        for x, text, bold in [(30, "FROM:", True), (60.66, "4", False)]:
+            expected = Image.new("L", (400, 200), "white")
+            ImageDraw.Draw(expected).text(
+                (x, 40), text, fill="black", font=renderer.get_font(40, bold)
+            )
+            label = Image.new("L", (400, 200), "white")
+            renderer.draw_text(label, x, 40, text, "black", 40, bold)
+
+            self.assertEqual(label.tobytes(), expected.tobytes())
+
+    def test_render_labels_to_multi_page_pdf(self):
+        doc = renderer.render_labels([LABEL, LABEL, LABEL], "PDF", "SVG")
+        pdf = PyPDF2.PdfReader(io.BytesIO(base64.b64decode(doc)))
+
+        self.assertEqual(len(pdf.pages), 3)
+
+    def test_render_labels_to_zpl_stream(self):
+        doc = base64.b64decode(renderer.render_labels([LABEL, LABEL], "ZPL", "SVG"))
+
+        self.assertEqual(doc.decode("utf-8").count("^XA"), 2)
+        self.assertEqual(
+            renderer.render_label(LABEL, "ZPL", "SVG"),
+            base64.b64encode(
+                renderer.generate_zpl_from_svg_label(LABEL).encode("utf-8")
+            ).decode("utf-8"),
+        )
+
+
+LABEL = """
+<svg viewBox="0 0 1200 1800" xmlns="http://www.w3.org/2000/svg">
+    <text x="30" y="60" fill="black" style="font-size: 50; font-weight: bold">FROM:</text>
+    <line x1="20" y1="270" x2="1170" y2="270" stroke="black" stroke-width="3" />
+    <text data-type="barcode-text" x="60" y="620" fill="black" style="font-size: 40">(421) 124H3C2S8</text>
+    <g data-type="barcode" data-value="(421) 124H3C2S8" data-module-width="3" data-width-ratio="2"
+        x="30" y="660" width="460" height="150" style="font-size: 60; font-weight: bold">
+        <rect x="30" y="660" width="460" height="100" fill="transparent" stroke="black"></rect>
+    </g>
+</svg>
+"""
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,119 @@
+import json
+import threading
+import unittest
+import http.server
+import urllib.request
+from unittest import mock
+import karrio.lib as lib
+from karrio.core.utils.transport import PooledTransport, UrllibTransport
+
+
+class Handler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    connections: set = set()
+
+    def setup(self):
+        super().setup()
+        Handler.connections.add(self.client_address)
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        status = 400 if self.path == "/error" else 200
+        content = json.dumps(dict(path=self.path, data=body.decode())).encode()
+
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, *args):
+        pass
+
+
+class TestPooledTransport(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        cls.url = f"http://127.0.0.1:{cls.server.server_port}"
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        Handler.connections.clear()
+
+    def test_reuses_keep_alive_connection(self):
+        transport = PooledTransport()
+        responses = [
+            lib.request(
+                url=f"{self.url}/rates",
+                data=f'{{"index": {index}}}',
+                method="POST",
+                transport=transport,
+            )
+            for index in range(5)
+        ]
+        transport.close()
+
+        self.assertEqual(len(Handler.connections), 1)
+        self.assertDictEqual(
+            lib.to_dict(responses[-1]),
+            {"path": "/rates", "data": '{"index": 4}'},
+        )
+
+    def test_error_response_contract(self):
+        transport = PooledTransport()
+        response = lib.request(
+            url=f"{self.url}/error",
+            data="{}",
+            method="POST",
+            transport=transport,
+            on_error=lambda error: f"{error.code}|{error.read().decode()}",
+        )
+        lib.request(url=f"{self.url}/rates", data="{}", transport=transport)
+        transport.close()
+
+        self.assertEqual(response, '400|{"path": "/error", "data": "{}"}')
+        self.assertEqual(len(Handler.connections), 1)
+
+    def test_unread_response_is_not_reused(self):
+        transport = PooledTransport()
+        for _ in range(2):
+            lib.request(
+                url=f"{self.url}/rates",
+                data="{}",
+                transport=transport,
+                on_ok=lambda _: '{"ok": true}',
+            )
+        transport.close()
+
+        self.assertEqual(len(Handler.connections), 2)
+
+    def test_tunneled_request_uses_stock_handler(self):
+        transport = PooledTransport()
+        request = urllib.request.Request("https://carrier.example/rates", data=b"{}")
+        request.set_proxy("127.0.0.1:3128", "https")
+
+        with mock.patch.object(
+            urllib.request.AbstractHTTPHandler, "do_open", return_value="response"
+        ) as do_open:
+            response = transport._handlers[1].https_open(request)
+
+        self.assertEqual(response, "response")
+        self.assertEqual(do_open.call_args.args[1]._tunnel_host, "carrier.example")
+        self.assertDictEqual(transport.pool_sizes(), {})
+
+    def test_urllib_transport_opens_connection_per_request(self):
+        transport = UrllibTransport()
+        for _ in range(3):
+            lib.request(url=f"{self.url}/rates", data="{}", transport=transport)
+
+        self.assertEqual(len(Handler.connections), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
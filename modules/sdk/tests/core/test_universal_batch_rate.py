@@ -0,0 +1,141 @@
+import sys
+import random
+import unittest
+from unittest.mock import patch
+import importlib.util
+import karrio.lib as lib
+import karrio.core.models as models
+from karrio.universal.mappers.rating_proxy import (
+    RatingMixinSettings,
+    RatingMixinProxy,
+    get_available_rates,
+)
+
+
+@unittest.skipUnless(importlib.util.find_spec("numpy"), "numpy is not installed")
+class TestUniversalBatchRating(unittest.TestCase):
+    def setUp(self):
+        self.maxDiff = None
+        self.rng = random.Random(7)
+        self.settings = RatingMixinSettings(
+            carrier_id="universal",
+            account_country_code="CA",
+            services=[generate_service(self.rng, index) for index in range(6)],
+        )
+        self.proxy = RatingMixinProxy(self.settings)
+
+    def test_batch_rates_match_package_rates(self):
+        parcels = [generate_parcel(self.rng) for _ in range(300)]
+        recipients = [generate_address(self.rng) for _ in range(300)]
+        shipper = models.Address(country_code="CA")
+
+        matrix = self.proxy.get_batch_rates(parcels, recipients, shipper=shipper)
+
+        self.assertEqual(matrix.rates.shape, (300, 6))
+        for row, (package, recipient) in enumerate(
+            zip(lib.to_packages(parcels), recipients)
+        ):
+            is_domicile = recipient.country_code == "CA"
+            expected, _ = get_available_rates(
+                package,
+                lib.to_address(shipper),
+                lib.to_address(recipient),
+                self.settings,
+                is_domicile=is_domicile,
+                is_international=not is_domicile,
+            )
+
+            self.assertListEqual(
+                lib.to_dict(matrix.to_rates(row)), lib.to_dict(expected)
+            )
+
+    def test_batch_rates_service_selection(self):
+        parcels = [generate_parcel(self.rng) for _ in range(20)]
+        recipients = [generate_address(self.rng) for _ in range(20)]
+
+        matrix = self.proxy.get_batch_rates(
+            parcels, recipients, services=["service_1"]
+        )
+
+        self.assertFalse(matrix.available[:, [0, 2, 3, 4, 5]].any())
+        self.assertListEqual(
+            [matrix.cheapest()[row] in (-1, 1) for row in range(20)], [True] * 20
+        )
+
+    def test_batch_rates_length_mismatch(self):
+        with self.assertRaises(ValueError):
+            self.proxy.get_batch_rates([generate_parcel(self.rng)], [])
+
+
+class TestUniversalBatchRatingWithoutNumpy(unittest.TestCase):
+    def test_missing_numpy_error(self):
+        proxy = RatingMixinProxy(RatingMixinSettings(carrier_id="universal"))
+
+        with patch.dict(
+            sys.modules,
+            {"numpy": None, "karrio.universal.mappers.batch_rating": None},
+        ):
+            sys.modules.pop("karrio.universal.mappers.batch_rating")
+
+            with self.assertRaisesRegex(ImportError, "karrio\\[batch\\]"):
+                proxy.get_batch_rates([], [])
+
+
+def generate_service(rng: random.Random, index: int) -> dict:
+    return dict(
+        service_name=f"Service {index}",
+        service_code=f"service_{index}",
+        currency="CAD",
+        transit_days=rng.choice([None, 2, 5]),
+        domicile=rng.choice([None, True]),
+        international=rng.choice([None, True]),
+        weight_unit=rng.choice([None, "KG", "LB"]),
+        max_weight=rng.choice([None, 20.0]),
+        dimension_unit=rng.choice([None, "CM"]),
+        max_length=rng.choice([None, 60.0]),
+        zones=[
+            dict(
+                rate=rng.choice([5.0, 7.5, 10.0, 12.0]),
+                transit_days=rng.choice([None, 1, 3]),
+                min_weight=rng.choice([None, 0.0, 1.0, 5.0]),
+                max_weight=rng.choice([None, 1.0, 5.0, 10.0]),
+                **rng.choice(
+                    [
+                        dict(postal_codes=rng.sample(POSTAL_CODES, 2)),
+                        dict(cities=rng.sample(CITIES, 2)),
+                        dict(country_codes=rng.sample(COUNTRIES, 2)),
+                        dict(),
+                    ]
+                ),
+            )
+            for _ in range(rng.randint(0, 40))
+        ],
+    )
+
+
+def generate_parcel(rng: random.Random) -> models.Parcel:
+    return models.Parcel(
+        weight=rng.choice([0.5, 1.0, 2.5, 8.0, 12.0, 25.0]),
+        weight_unit=rng.choice(["KG", "LB"]),
+        length=rng.choice([None, 30.0, 80.0]),
+        width=rng.choice([None, 20.0]),
+        height=rng.choice([None, 10.0]),
+        dimension_unit="CM",
+    )
+
+
+def generate_address(rng: random.Random) -> models.Address:
+    return models.Address(
+        postal_code=rng.choice([None, *POSTAL_CODES]),
+        city=rng.choice([None, *CITIES]),
+        country_code=rng.choice(COUNTRIES),
+    )
+
+
+POSTAL_CODES = ["H3A 1A1", "M5V 2T6", "V6B 1A1", "K1A 0B1", "10001", "75001"]
+CITIES = ["Montreal", "Toronto", "Vancouver", "New York", "Paris"]
+COUNTRIES = ["CA", "US", "FR"]
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,9 +1,18 @@
+import random
 import unittest
+import karrio.lib as lib
+import karrio.core.units as units
+import karrio.core.models as models
 from karrio.core.utils import DP, Serializable
 from karrio.core.models import RateRequest
 from karrio.universal.mappers.rating_proxy import (
     RatingMixinSettings,
     RatingMixinProxy,
+    calculate_zone_specificity,
+    check_location_match,
+    check_weight_match,
+    find_best_matching_zone,
+    get_zone_index,
 )
 from karrio.universal.providers.rating.rate import parse_rate_response
 
@@ -319,6 +328,107 @@ class TestUniversalRating(unittest.TestCase):
         )
 
 
+class TestZoneIndex(unittest.TestCase):
+    def test_index_matches_zone_scan(self):
+        rng = random.Random(42)
+        service = lib.to_object(
+            models.ServiceLevel,
+            dict(
+                service_name="Standard",
+                service_code="standard",
+                weight_unit="KG",
+                zones=[
+                    dict(
+                        rate=rng.choice([5.0, 10.0, 15.0]),
+                        min_weight=rng.choice([None, 0.0, 1.0, 2.0]),
+                        max_weight=rng.choice([None, 1.0, 2.0, 5.0]),
+                        **rng.choice(
+                            [
+                                dict(postal_codes=rng.sample(POSTAL_CODES, 3)),
+                                dict(cities=rng.sample(CITIES, 2)),
+                                dict(country_codes=rng.sample(COUNTRIES, 2)),
+                                dict(),
+                            ]
+                        ),
+                    )
+                    for _ in range(200)
+                ],
+            ),
+        )
+
+        for _ in range(200):
+            package = units.Package(
+                models.Parcel(weight=rng.choice([0.5, 1.0, 1.5, 3.0]), weight_unit="KG")
+            )
+            recipient = lib.to_address(
+                models.Address(
+                    postal_code=rng.choice(POSTAL_CODES).lower(),
+                    city=rng.choice(CITIES).upper(),
+                    country_code=rng.choice(COUNTRIES),
+                )
+            )
+
+            self.assertIs(
+                find_best_matching_zone(service.zones, package, recipient, service),
+                scan_best_matching_zone(service.zones, package, recipient, service),
+            )
+
+    def test_index_specificity_tie_across_location_layers(self):
+        service = lib.to_object(
+            models.ServiceLevel,
+            dict(
+                service_name="Standard",
+                service_code="standard",
+                weight_unit="KG",
+                zones=[
+                    dict(rate=20.0, country_codes=["CA"]),
+                    dict(rate=10.0, min_weight=0.0, max_weight=10.0),
+                ],
+            ),
+        )
+        package = units.Package(models.Parcel(weight=1.0, weight_unit="KG"))
+        recipient = lib.to_address(models.Address(country_code="CA"))
+
+        zone = find_best_matching_zone(service.zones, package, recipient, service)
+
+        self.assertIs(zone, service.zones[1])
+        self.assertIs(
+            zone, scan_best_matching_zone(service.zones, package, recipient, service)
+        )
+
+    def test_index_cached_per_service_zones(self):
+        service = lib.to_object(models.ServiceLevel, settings_data["services"][0])
+        index = get_zone_index(service)
+
+        self.assertIs(get_zone_index(service), index)
+
+        service.zones = [*service.zones, models.ServiceZone(rate=1.0)]
+
+        self.assertIsNot(get_zone_index(service), index)
+
+
+def scan_best_matching_zone(zones, package, recipient, service):
+    matches = [
+        (
+            -calculate_zone_specificity(zone),
+            (zone.max_weight or float("inf")) - (zone.min_weight or 0),
+            zone.rate or 0.0,
+            order,
+            zone,
+        )
+        for order, zone in enumerate(zones)
+        if check_location_match(zone, recipient)
+        and check_weight_match(zone, package, service)
+    ]
+
+    return min(matches)[-1] if any(matches) else None
+
+
+POSTAL_CODES = ["H3A 1A1", "H2X 1Y4", "M5V 2T6", "V6B 1A1", "K1A 0B1", "T2P 1J9"]
+CITIES = ["Montreal", "Toronto", "Vancouver", "Ottawa", "Calgary"]
+COUNTRIES = ["CA", "US", "FR", "DE"]
+
+
 if __name__ == "__main__":
     unittest.main()
 
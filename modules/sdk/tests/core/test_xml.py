@@ -0,0 +1,46 @@
+import unittest
+import karrio.lib as lib
+import pysoap.envelope as soap
+
+XML = """<Envelope xmlns="http://schemas.xmlsoap.org/soap/envelope/" xmlns:x="urn:x">
+    <Body>
+        <Fault><faultcode>1</faultcode><faultstring>first</faultstring></Fault>
+        <x:items>
+            <x:Fault><faultcode>2</faultcode><faultstring>second</faultstring></x:Fault>
+            <item>A</item><!-- comment --><x:item>B</x:item>
+        </x:items>
+    </Body>
+</Envelope>
+"""
+
+
+class TestFindElement(unittest.TestCase):
+    def setUp(self):
+        self.element = lib.to_element(XML)
+
+    def test_find_matches_local_name_xpath(self):
+        for tag in ["item", "Fault", "faultcode", "Body", "missing", "x:item"]:
+            expected = self.element.xpath(".//*[local-name() = $name]", name=tag)
+
+            self.assertListEqual(lib.find_element(tag, self.element), expected)
+
+    def test_find_in_descendant(self):
+        items = lib.find_element("items", self.element, first=True)
+
+        self.assertListEqual(
+            [_.text for _ in lib.find_element("item", items)], ["A", "B"]
+        )
+        self.assertListEqual(lib.find_element("Body", items), [])
+
+    def test_find_first_typed_object(self):
+        fault = lib.find_element("Fault", self.element, soap.Fault, first=True)
+        faults = lib.find_element("Fault", self.element, soap.Fault)
+
+        self.assertEqual(fault.faultstring, "first")
+        self.assertListEqual([_.faultcode for _ in faults], ["1", "2"])
+        self.assertIsNone(fault.gds_elementtree_node_)
+        self.assertIsNone(lib.find_element("missing", self.element, first=True))
+
+
+if __name__ == "__main__":
+    unittest.main()
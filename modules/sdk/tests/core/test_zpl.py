@@ -0,0 +1,147 @@
+import io
+import base64
+import PyPDF2
+import unittest
+from jinja2 import Template
+import karrio.lib as lib
+from karrio.core.utils import zpl
+from barcode.codex import Code128
+from karrio.addons.label import DEFAULT_ZPL_LABEL_TEMPLATE
+
+
+class TestZPLRenderer(unittest.TestCase):
+    def test_render_label_corpus(self):
+        for name, content, dpmm, pages in LABEL_CORPUS:
+            with self.subTest(name):
+                images = zpl.render(content, 4, 6, dpmm=dpmm)
+
+                self.assertEqual(len(images), pages)
+                self.assertEqual(
+                    images[0].size, (round(4 * dpmm * 25.4), round(6 * dpmm * 25.4))
+                )
+                self.assertLess(images[0].histogram()[0], images[0].histogram()[-1])
+                self.assertGreater(images[0].histogram()[0], 0)
+
+    def test_box_and_reverse_field(self):
+        [image] = zpl.render(
+            "^XA^FO10,10^GB100,50,50^FS^FO20,20^FR^GB20,20,20^FS^XZ", 1, 1, dpmm=8
+        )
+
+        self.assertEqual(image.getpixel((15, 15)), 0)
+        self.assertEqual(image.getpixel((30, 30)), 255)
+        self.assertEqual(image.getpixel((150, 150)), 255)
+
+    def test_code128_modules(self):
+        [image] = zpl.render(
+            "^XA^BY3^FO0,0^BCN,40,N,N,N^FD>;>81Z12345E0205271688^FS^XZ", 4, 1, dpmm=8
+        )
+        modules = Code128("\xf11Z12345E0205271688").build()[0]
+        row = [image.getpixel((x, 20)) == 0 for x in range(len(modules) * 3)]
+
+        self.assertListEqual(row, [bit == "1" for bit in modules for _ in range(3)])
+
+    def test_graphic_field_decoding(self):
+        hex_mask = zpl._decode_graphic("A", 32, 4, "FFFFFFFF81000081:::::FFFFFFFF")
+        z64_mask = zpl._decode_graphic("A", 32, 4, Z64_GRAPHIC)
+
+        self.assertEqual(hex_mask.size, (32, 8))
+        self.assertEqual(hex_mask.tobytes(), z64_mask.tobytes())
+        self.assertEqual(zpl._decode_hex("J0,!", 2), bytes.fromhex("00000000FFFF"))
+
+    def test_datamatrix_codewords(self):
+        codewords = zpl._datamatrix_ascii("123456")
+
+        self.assertListEqual(codewords, [142, 164, 186])
+        self.assertListEqual(zpl._reed_solomon(codewords, 5), [114, 25, 5, 88, 102])
+        self.assertEqual(len(zpl.datamatrix("123456")), 10)
+        self.assertEqual(len(zpl.datamatrix("A" * 100)), 40)
+
+    def test_zpl_to_pdf_batch(self):
+        labels = [
+            base64.b64encode(label.encode()).decode()
+            for _, label, *_ in LABEL_CORPUS[:2]
+        ]
+        pdf = PyPDF2.PdfReader(
+            io.BytesIO(base64.b64decode(lib.zpl_to_pdf(labels, 4, 6, dpmm=8)))
+        )
+
+        self.assertEqual(len(pdf.pages), 2)
+
+    def test_zpl_without_label_raises(self):
+        content = base64.b64encode(b"^FO10,10^FDno label^FS").decode()
+
+        with self.assertRaisesRegex(ValueError, "No ZPL label"):
+            lib.zpl_to_pdf(content, 4, 6, dpmm=8)
+        with self.assertRaisesRegex(ValueError, "No ZPL label"):
+            lib.zpl_to_image(content, 4, 6, dpmm=8)
+
+
+Z64_GRAPHIC = ":Z64:eJz7/////0YGhkZsGCj1HwDnYg4F:1234"
+
+GENERIC_LABEL = Template(DEFAULT_ZPL_LABEL_TEMPLATE).render(
+    shipment=dict(
+        shipper=dict(company_name="Karrio", city="Montreal", postal_code="H3B1A7"),
+        recipient=dict(company_name="Jane", city="Moncton", country_code="CA"),
+    ),
+    carrier=dict(display_name="Custom", metadata={}),
+    metadata={},
+    master_item={},
+    units=dict(CountryISO={}),
+    package_index=1,
+    total_packages=1,
+    total_quantity=1,
+    tracking_number="1234567890",
+)
+
+UPS_LABEL = """
+^XA^LRN^MNY^MFN,N^LH10,12^MCY^POI^PW812^CI27
+^FO5,5^GFA,32,32,4,:Z64:eJz7/////0YGhkZsGCj1HwDnYg4F:1234^FS
+^FO15,7^A0N,20,24^FVJOHN DOE^FS
+^FO15,27^A0N,20,24^FV555-555-5555^FS
+^FO15,47^A0N,20,24^FVKARRIO INC^FS
+^FO15,67^A0N,20,24^FV1 MAIN ST^FS
+^FO15,87^A0N,20,24^FVMONTREAL QC H3B 1A7^FS
+^FO60,166^A0N,28,32^FVJANE DOE^FS
+^FO60,222^A0N,28,32^FV125 CHURCH ST^FS
+^FO60,278^A0N,45,44^FVMONCTON NB E1C 4Z8^FS
+^FO0,320^GB800,0,4^FS
+^FO10,330^BD2^FH^FV001840397H01010001Z12345E0205271688_5B)>_1E01_1D96^FS
+^FO290,349^A0N,80,80^FVNB 1C4 9-04^FS
+^FO300,435^BY3^BCN,103,N,N,,A^FV420E1C4Z8^FS
+^FO0,565^GB800,0,14^FS
+^FO10,580^A0N,56,58^FVUPS GROUND^FS
+^FO10,637^A0N,22,26^FVTRACKING #: 1Z 123 45E 02 0527 1688^FS
+^FO0,665^GB800,0,4^FS
+^FO60,686^BY3^BCN,213,N,N,,A^FV1Z12345E0205271688^FS
+^FO0,915^GB800,0,14^FS
+^FO10,935^A0N,22,26^FVBILLING: P/P^FS
+^FO615,1160^GB178,0,2^FS
+^XZ
+"""
+
+USPS_LABEL = """
+^XA
+^FO0,0^GB812,1218,4^FS
+^FO30,40^GB160,160,160^FS^FO55,80^FR^A0N,110,90^FDP^FS
+^FO260,60^A0N,40,40^FDUSPS PRIORITY MAIL^FS
+^FO40,260^A0N,30,30^FB700,3,0,L^FDKARRIO INC\\&1 MAIN ST\\&MONTREAL QC H3B 1A7^FS
+^FO30,420^GB750,0,6^FS
+^FO250,440^A0N,35,35^FDUSPS TRACKING # EP^FS
+^BY3,3,180^FO70,500^BCN,180,N,N,N,D^FD(420)90210(92)0055500000111234567890^FS
+^FO150,700^A0N,35,35^FD9205 5000 0011 1234 5678 90^FS
+^FO600,880^BQN,2,5^FDQA,https://tools.usps.com/go/TrackConfirmAction^FS
+^FO60,880^BXN,8,200^FD~1010123456789012~117260101^FS
+^FT60,1180^A0R,40,40^FDELECTRONIC RATE APPROVED^FS
+^XZ
+^XA^FO50,50^A0N,50,50^FDPAGE 2^FS^XZ
+"""
+
+LABEL_CORPUS = [
+    ("generic", GENERIC_LABEL, 12, 1),
+    ("ups", UPS_LABEL, 8, 1),
+    ("usps", USPS_LABEL, 8, 2),
+]
+
+
+if __name__ == "__main__":
+    unittest.main()
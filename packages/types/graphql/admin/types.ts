@@ -2328,6 +2328,9 @@ export enum WeightUnitEnum {
 export interface UserFilter {
   offset?: number | null;
   first?: number | null;
+  last?: number | null;
+  after?: string | null;
+  before?: string | null;
   id?: string | null;
   email?: string | null;
   is_staff?: boolean | null;
@@ -2348,6 +2351,9 @@ export interface UsageFilter {
 export interface CarrierFilter {
   offset?: number | null;
   first?: number | null;
+  last?: number | null;
+  after?: string | null;
+  before?: string | null;
   active?: boolean | null;
   metadata_key?: string | null;
   metadata_value?: string | null;
@@ -2358,6 +2364,9 @@ export interface CarrierFilter {
 export interface RateSheetFilter {
   offset?: number | null;
   first?: number | null;
+  last?: number | null;
+  after?: string | null;
+  before?: string | null;
   keyword?: string | null;
 }
 
@@ -2365,6 +2374,9 @@ export interface RateSheetFilter {
 export interface AddonFilter {
   offset?: number | null;
   first?: number | null;
+  last?: number | null;
+  after?: string | null;
+  before?: string | null;
   id?: string | null;
   name?: string | null;
   active?: boolean | null;
@@ -2384,6 +2396,9 @@ export interface OrgUsageFilter {
 export interface AccountFilter {
   offset?: number | null;
   first?: number | null;
+  last?: number | null;
+  after?: string | null;
+  before?: string | null;
   id?: string | null;
   name?: string | null;
   slug?: string | null;
@@ -2395,6 +2410,9 @@ export interface AccountFilter {
 export interface AccountCarrierConnectionFilter {
   offset?: number | null;
   first?: number | null;
+  last?: number | null;
+  after?: string | null;
+  before?: string | null;
   active?: boolean | null;
   metadata_key?: string | null;
   metadata_value?: string | null;
@@ -2406,6 +2424,9 @@ export interface AccountCarrierConnectionFilter {
 export interface SystemShipmentFilter {
   offset?: number | null;
   first?: number | null;
+  last?: number | null;
+  after?: string | null;
+  before?: string | null;
   keyword?: string | null;
   address?: string | null;
   id?: string[] | null;
@@ -2430,6 +2451,9 @@ export interface SystemShipmentFilter {
 export interface SystemTrackerFilter {
   offset?: number | null;
   first?: number | null;
+  last?: number | null;
+  after?: string | null;
+  before?: string | null;
   tracking_number?: string | null;
   created_after?: string | null;
   created_before?: string | null;
@@ -2442,6 +2466,9 @@ export interface SystemTrackerFilter {
 export interface SystemOrderFilter {
   offset?: number | null;
   first?: number | null;
+  last?: number | null;
+  after?: string | null;
+  before?: string | null;
   id?: string[] | null;
   keyword?: string | null;
   source?: string[] | null;
@@ -2996,6 +2996,9 @@ export enum SelectServiceStrategy {
 export interface OAuthAppFilter {
   offset?: number | null;
   first?: number | null;
+  last?: number | null;
+  after?: string | null;
+  before?: string | null;
   display_name?: string | null;
   features?: string[] | null;
   metadata_key?: string | null;
@@ -3008,6 +3011,9 @@ export interface OAuthAppFilter {
 export interface AppInstallationFilter {
   offset?: number | null;
   first?: number | null;
+  last?: number | null;
+  after?: string | null;
+  before?: string | null;
   app_id?: string | null;
   app_type?: string | null;
   is_active?: boolean | null;
@@ -3108,6 +3114,9 @@ export interface UsageFilter {
 export interface OrgFilter {
   offset?: number | null;
   first?: number | null;
+  last?: number | null;
+  after?: string | null;
+  before?: string | null;
   id?: string | null;
   name?: string | null;
   slug?: string | null;
@@ -3189,6 +3198,9 @@ export interface ResendOrganizationInviteMutationInput {
 export interface WorkflowFilter {
   offset?: number | null;
   first?: number | null;
+  last?: number | null;
+  after?: string | null;
+  before?: string | null;
   keyword?: string | null;
   trigger_type?: AutomationTriggerType | null;
   is_active?: boolean | null;
@@ -3198,6 +3210,9 @@ export interface WorkflowFilter {
 export interface WorkflowConnectionFilter {
   offset?: number | null;
   first?: number | null;
+  last?: number | null;
+  after?: string | null;
+  before?: string | null;
   keyword?: string | null;
   auth_type?: AutomationAuthType | null;
 }
@@ -3206,6 +3221,9 @@ export interface WorkflowConnectionFilter {
 export interface WorkflowActionFilter {
   offset?: number | null;
   first?: number | null;
+  last?: number | null;
+  after?: string | null;
+  before?: string | null;
   keyword?: string | null;
   action_type?: AutomationActionType | null;
 }
@@ -3214,6 +3232,9 @@ export interface WorkflowActionFilter {
 export interface WorkflowEventFilter {
   offset?: number | null;
   first?: number | null;
+  last?: number | null;
+  after?: string | null;
+  before?: string | null;
   keyword?: string | null;
   parameters_key?: string[] | null;
   status?: AutomationEventStatus | null;
@@ -3411,6 +3432,9 @@ export interface ValidateCronExpressionInput {
 export interface ShippingRuleFilter {
   offset?: number | null;
   first?: number | null;
+  last?: number | null;
+  after?: string | null;
+  before?: string | null;
   keyword?: string | null;
   is_active?: boolean | null;
   priority?: number | null;
@@ -5366,6 +5366,9 @@ export interface UsageFilter {
 export interface AddressFilter {
   offset?: number | null;
   first?: number | null;
+  last?: number | null;
+  after?: string | null;
+  before?: string | null;
   label?: string | null;
   keyword?: string | null;
   address?: string | null;
@@ -5375,6 +5378,9 @@ export interface AddressFilter {
 export interface TemplateFilter {
   offset?: number | null;
   first?: number | null;
+  last?: number | null;
+  after?: string | null;
+  before?: string | null;
   label?: string | null;
   keyword?: string | null;
 }
@@ -5410,6 +5416,9 @@ export interface DeleteMutationInput {
 export interface LogFilter {
   offset?: number | null;
   first?: number | null;
+  last?: number | null;
+  after?: string | null;
+  before?: string | null;
   query?: string | null;
   api_endpoint?: string | null;
   remote_addr?: string | null;
@@ -5425,6 +5434,9 @@ export interface LogFilter {
 export interface ShipmentFilter {
   offset?: number | null;
   first?: number | null;
+  last?: number | null;
+  after?: string | null;
+  before?: string | null;
   keyword?: string | null;
   address?: string | null;
   id?: string[] | null;
@@ -5578,6 +5590,9 @@ export interface ChangeShipmentStatusMutationInput {
 export interface TrackerFilter {
   offset?: number | null;
   first?: number | null;
+  last?: number | null;
+  after?: string | null;
+  before?: string | null;
   tracking_number?: string | null;
   created_after?: string | null;
   created_before?: string | null;
@@ -5589,6 +5604,9 @@ export interface TrackerFilter {
 export interface WebhookFilter {
   offset?: number | null;
   first?: number | null;
+  last?: number | null;
+  after?: string | null;
+  before?: string | null;
   url?: string | null;
   disabled?: boolean | null;
   test_mode?: boolean | null;
@@ -5601,6 +5619,9 @@ export interface WebhookFilter {
 export interface CarrierFilter {
   offset?: number | null;
   first?: number | null;
+  last?: number | null;
+  after?: string | null;
+  before?: string | null;
   active?: boolean | null;
   metadata_key?: string | null;
   metadata_value?: string | null;
@@ -5783,6 +5804,9 @@ export interface ConfirmPasswordResetMutationInput {
 export interface EventFilter {
   offset?: number | null;
   first?: number | null;
+  last?: number | null;
+  after?: string | null;
+  before?: string | null;
   entity_id?: string | null;
   type?: EventTypes[] | null;
   date_after?: any | null;
@@ -5793,6 +5817,9 @@ export interface EventFilter {
 export interface OrderFilter {
   offset?: number | null;
   first?: number | null;
+  last?: number | null;
+  after?: string | null;
+  before?: string | null;
   id?: string[] | null;
   keyword?: string | null;
   source?: string[] | null;
@@ -5817,6 +5844,9 @@ export interface MetadataMutationInput {
 export interface DocumentTemplateFilter {
   offset?: number | null;
   first?: number | null;
+  last?: number | null;
+  after?: string | null;
+  before?: string | null;
   name?: string | null;
   active?: boolean | null;
   related_object?: TemplateRelatedObject | null;
@@ -5978,6 +6008,9 @@ export interface DeleteRateSheetServiceMutationInput {
 export interface RateSheetFilter {
   offset?: number | null;
   first?: number | null;
+  last?: number | null;
+  after?: string | null;
+  before?: string | null;
   keyword?: string | null;
 }
 
@@ -6015,6 +6048,9 @@ export interface DeleteOrderMutationInput {
 export interface BatchOperationFilter {
   offset?: number | null;
   first?: number | null;
+  last?: number | null;
+  after?: string | null;
+  before?: string | null;
   resource_type?: ResourceStatus[] | null;
   status?: BatchOperationStatus[] | null;
 }
@@ -6046,6 +6082,9 @@ export interface WorkspaceConfigMutationInput {
 export interface ManifestFilter {
   offset?: number | null;
   first?: number | null;
+  last?: number | null;
+  after?: string | null;
+  before?: string | null;
   id?: string[] | null;
   created_after?: any | null;
   created_before?: any | null;